@@ -9,21 +9,18 @@ Usage:
 
 import argparse
 import time
-from pathlib import Path
 
 import mujoco
 import mujoco.viewer
 import numpy as np
-import yaml
 
 from i2rt.robots.utils import GripperType
 from lerobot_robot_yams.forward_kinematics import check_action
+from lerobot_robot_yams.robot_model import load_robot_model
 
 PORTS = {"left": 11333, "right": 11334}
 DT = 0.02  # 50 Hz
 
-_ARMS_CONFIG = Path(__file__).resolve().parents[1] / "configs" / "arms.yaml"
-
 # RGBA: safe=green, collision=red
 _SAFE  = np.array([0.2, 0.8, 0.2, 1.0])
 _CLASH = np.array([1.0, 0.2, 0.2, 1.0])
@@ -36,7 +33,7 @@ def main() -> None:
     parser.add_argument("--angles", type=float, nargs="+", help="Fixed joint angles in radians")
     args = parser.parse_args()
 
-    collision_cfg = yaml.safe_load(_ARMS_CONFIG.read_text()).get("collision", {})
+    collision_cfg = load_robot_model().collision
     ground_z = collision_cfg.get("ground_z", 0.05)
     end_effector_length = collision_cfg.get("end_effector_length", 0.15)
     max_joint_step = np.array(collision_cfg.get("max_joint_step", [0.2] * 6))
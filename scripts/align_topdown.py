@@ -39,8 +39,10 @@ from utils.camera_pose import (  # noqa: E402
     TOL_TX_PX,
     TOL_TY_PX,
     Pose,
+    PoseReference,
     evaluate_pose,
 )
+from utils.episode_watch import sample_mean  # noqa: E402
 from lerobot_camera_cached.camera_realsense_cached import RealSenseCameraCached  # noqa: E402
 from lerobot_camera_cached.realsense_cached_config import RealSenseCameraCachedConfig  # noqa: E402
 
@@ -93,19 +95,10 @@ def _find_topdown_mp4(dataset_root: Path) -> Path:
 
 def _reference_from_dataset(dataset_root: Path, n_frames: int = 30) -> np.ndarray:
     mp4 = _find_topdown_mp4(dataset_root)
-    cap = cv2.VideoCapture(str(mp4))
-    try:
-        frames: list[np.ndarray] = []
-        for _ in range(n_frames):
-            ok, frame = cap.read()
-            if not ok:
-                break
-            frames.append(frame)
-        if not frames:
-            raise SystemExit(f"could not decode frames from {mp4}")
-        return np.mean(np.stack(frames).astype(np.float32), axis=0).astype(np.uint8)
-    finally:
-        cap.release()
+    sampled = sample_mean(mp4, n_frames)
+    if sampled is None:
+        raise SystemExit(f"could not decode frames from {mp4}")
+    return sampled[0]
 
 
 def _latest_dataset() -> Path:
@@ -433,7 +426,9 @@ def main() -> int:
                              "readings (default: 5). 1 disables filtering.")
     args = parser.parse_args()
 
-    reference, reference_label = _resolve_reference(args)
+    reference_image, reference_label = _resolve_reference(args)
+    # Reference features are detected once; each eval only detects the live frame.
+    reference = PoseReference(reference_image)
     camera, cam_label = _start_realsense()
 
     interval_s = 1.0 / max(0.5, args.hz)
@@ -0,0 +1,162 @@
+"""Control-loop jitter with N simulated cameras: one thread per camera vs one epoll thread.
+
+uv run python scripts/bench_capture_jitter.py
+uv run python scripts/bench_capture_jitter.py --cameras 1 3 6 --seconds 5
+
+A child process stands in for the camera hardware: every 1/fps it makes one
+token readable on each camera's pipe. Each camera then decodes the same
+640x480 MJPEG frame, converts it to RGB and publishes it under a lock, either
+from its own blocking thread (the OpenCVCameraCached read loop) or from the
+shared V4L2CaptureEngine. Meanwhile a 250 Hz loop does a little numpy work
+per tick and records how late each tick wakes up.
+"""
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from lerobot_camera_cached.v4l2_capture import V4L2CaptureEngine
+
+LOOP_HZ = 250
+
+
+def _frame_clock(write_fds: list[int], fps: float, stop) -> None:
+    period = 1.0 / fps
+    next_tick = time.perf_counter()
+    while not stop.is_set():
+        # Stagger cameras across the frame period like unsynchronised USB cams.
+        for i, fd in enumerate(write_fds):
+            os.write(fd, bytes([i]))
+            time.sleep(period / (2 * len(write_fds)))
+        next_tick += period
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+
+
+class _SimulatedCamera:
+    def __init__(self, jpeg: bytes):
+        self.jpeg = jpeg
+        self.read_fd, self.write_fd = os.pipe()
+        self.frame_lock = threading.Lock()
+        self.latest_frame = None
+        self.latest_timestamp = None
+        self.frames = 0
+
+    def fileno(self) -> int:
+        return self.read_fd
+
+    def _publish(self, data, capture_time: float) -> None:
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        with self.frame_lock:
+            self.latest_frame = image
+            self.latest_timestamp = capture_time
+        self.frames += 1
+
+    def read_frame(self, on_frame) -> bool:
+        try:
+            os.read(self.read_fd, 1)
+        except BlockingIOError:
+            return False
+        on_frame(memoryview(self.jpeg), time.perf_counter())
+        return True
+
+    def blocking_loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            if not os.read(self.read_fd, 1):
+                return
+            self._publish(self.jpeg, time.perf_counter())
+
+    def close(self) -> None:
+        os.close(self.read_fd)
+
+
+def _control_loop(seconds: float) -> np.ndarray:
+    period = 1.0 / LOOP_HZ
+    rng = np.random.default_rng(0)
+    state = rng.normal(size=(14,))
+    lateness = []
+    next_tick = time.perf_counter() + period
+    end = next_tick + seconds
+    while next_tick < end:
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+        lateness.append(time.perf_counter() - next_tick)
+        state = np.tanh(state @ np.eye(14) + 0.01)
+        next_tick += period
+    return np.array(lateness)
+
+
+def run(mode: str, num_cameras: int, fps: float, seconds: float, jpeg: bytes) -> dict:
+    cameras = [_SimulatedCamera(jpeg) for _ in range(num_cameras)]
+    ctx = multiprocessing.get_context("fork")
+    clock_stop = ctx.Event()
+    clock = ctx.Process(
+        target=_frame_clock, args=([c.write_fd for c in cameras], fps, clock_stop), daemon=True
+    )
+    clock.start()
+    for camera in cameras:
+        os.close(camera.write_fd)
+
+    stop = threading.Event()
+    engine = V4L2CaptureEngine()
+    threads = []
+    if mode == "threads":
+        for camera in cameras:
+            thread = threading.Thread(target=camera.blocking_loop, args=(stop,), daemon=True)
+            thread.start()
+            threads.append(thread)
+    else:
+        for camera in cameras:
+            os.set_blocking(camera.read_fd, False)
+            engine.add(camera, camera._publish)
+
+    try:
+        lateness = _control_loop(seconds)
+    finally:
+        stop.set()
+        clock_stop.set()
+        clock.join()
+        for camera in cameras:
+            engine.remove(camera)
+        for thread in threads:
+            thread.join(timeout=1.0)
+        for camera in cameras:
+            camera.close()
+
+    lateness_us = lateness * 1e6
+    return {
+        "p50": np.percentile(lateness_us, 50),
+        "p99": np.percentile(lateness_us, 99),
+        "max": lateness_us.max(),
+        "fps": sum(c.frames for c in cameras) / seconds / max(num_cameras, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cameras", type=int, nargs="+", default=[1, 3, 6])
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    image = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (9, 9), 3)
+    jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+    print(f"{LOOP_HZ} Hz loop tick lateness in us, {args.fps:.0f} fps 640x480 MJPEG per camera")
+    print(f"{'cameras':>7}  {'mode':<8} {'p50':>7} {'p99':>7} {'max':>7} {'cam fps':>8}")
+    for num_cameras in args.cameras:
+        for mode in ("threads", "epoll"):
+            r = run(mode, num_cameras, args.fps, args.seconds, jpeg)
+            print(
+                f"{num_cameras:>7}  {mode:<8} {r['p50']:7.0f} {r['p99']:7.0f} "
+                f"{r['max']:7.0f} {r['fps']:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
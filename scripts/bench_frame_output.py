@@ -0,0 +1,127 @@
+"""Memory and latency of capture-time crop/resize vs handing out full frames.
+
+uv run python scripts/bench_frame_output.py
+uv run python scripts/bench_frame_output.py --width 640 --height 480 --crop 80 0 480 480
+
+A synthetic RGB frame of --width x --height stands in for the postprocessed
+camera frame. Per captured frame the benchmark runs what the rest of the
+stack does with an observation:
+
+  capture   the capture-thread work (nothing for full frames, FrameOutput.apply
+            for output_size/output_crop)
+  consumer  copying the frame into the observation/dataset buffer and
+            bringing it to the policy input size (a resize for full frames,
+            already done otherwise)
+
+and reports the time per frame, the peak transient allocation (tracemalloc)
+and the memory an episode of --episode-s seconds of frames held in RAM
+takes, as the teleop trajectory buffer does.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from utils.frame_output import FrameOutput
+
+
+def _timed(fn, frames: list[np.ndarray]) -> tuple[float, list]:
+    out = []
+    start = time.perf_counter()
+    for frame in frames:
+        out.append(fn(frame))
+    return (time.perf_counter() - start) / len(frames), out
+
+
+def run(
+    image: np.ndarray,
+    output: FrameOutput | None,
+    policy_size: tuple[int, int],
+    num_frames: int,
+) -> dict[str, float]:
+    frames = [np.roll(image, i, axis=1) for i in range(8)] * (num_frames // 8)
+
+    if output is None:
+        def capture(frame):
+            return frame
+
+        def consume(frame):
+            stored = frame.copy()
+            return stored, cv2.resize(frame, policy_size, interpolation=cv2.INTER_AREA)
+    else:
+        def capture(frame):
+            return output.apply(frame)
+
+        def consume(frame):
+            return frame.copy(), frame
+
+    capture(frames[0])
+    capture_s, published = _timed(capture, frames)
+    consume_s, consumed = _timed(consume, published)
+    del published, consumed
+
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    for frame in frames:
+        consume(capture(frame))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "capture_ms": 1e3 * capture_s,
+        "consumer_ms": 1e3 * consume_s,
+        "stored_bytes": consume(capture(frames[0]))[0].nbytes,
+        "peak_bytes": peak - start_bytes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--crop", type=int, nargs=4, metavar=("X", "Y", "W", "H"))
+    parser.add_argument("--size", type=int, nargs=2, default=[224, 224], metavar=("W", "H"))
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--episode-s", type=float, default=120.0)
+    parser.add_argument("--frames", type=int, default=400)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    rng = np.random.default_rng(0)
+    image = cv2.GaussianBlur(
+        rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8), (15, 15), 5
+    )
+    size = tuple(args.size)
+    crop = args.crop or _centre_square(args.width, args.height)
+
+    full = run(image, None, size, args.frames)
+    cropped = run(image, FrameOutput(crop=crop, size=size), size, args.frames)
+
+    episode_frames = args.episode_s * args.fps
+    print(
+        f"{args.width}x{args.height} RGB -> crop {tuple(crop)} -> {size[0]}x{size[1]}, "
+        f"{args.episode_s:g} s episode @ {args.fps:g} fps"
+    )
+    print(f"  {'':<14}{'capture':>10}{'consumer':>10}{'total':>10}{'per frame':>12}{'episode':>10}")
+    for name, r in (("full frames", full), ("output spec", cropped)):
+        total_ms = r["capture_ms"] + r["consumer_ms"]
+        print(
+            f"  {name:<14}{r['capture_ms']:8.3f}ms{r['consumer_ms']:8.3f}ms{total_ms:8.3f}ms"
+            f"{r['stored_bytes'] / 1e3:9.0f} kB{r['stored_bytes'] * episode_frames / 1e9:8.2f} GB"
+        )
+    print(
+        f"  peak transient allocation per frame: {full['peak_bytes'] / 1e6:.1f} MB full, "
+        f"{cropped['peak_bytes'] / 1e6:.1f} MB with the output spec"
+    )
+
+
+def _centre_square(width: int, height: int) -> list[int]:
+    side = min(width, height)
+    return [(width - side) // 2, (height - side) // 2, side, side]
+
+
+if __name__ == "__main__":
+    main()
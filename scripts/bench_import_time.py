@@ -0,0 +1,101 @@
+"""Check plugin-package import times against a budget with `python -X importtime`.
+
+uv run python scripts/bench_import_time.py            # all four plugin packages
+uv run python scripts/bench_import_time.py --top 15   # also list the slowest modules
+
+Each package is imported in a fresh interpreter; the script exits non-zero if
+any cumulative import time exceeds its budget, so it can gate CI or a
+pre-commit hook. It also times loading the compiled robot model cold (parse
+URDF + arms.yaml) and warm (cached .npz).
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import tempfile
+
+# Cumulative import budgets in ms, measured on the lab machine with a warm disk
+# cache. Most of it is the lerobot/torch chain each plugin registers into.
+BUDGETS_MS = {
+    "lerobot_robot_yams": 2500,
+    "lerobot_teleoperator_gello": 2500,
+    "lerobot_camera_zed": 2500,
+    "lerobot_camera_cached": 2500,
+}
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(module: str) -> list[tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for every import of `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def time_robot_model() -> tuple[float, float]:
+    """(cold, warm) ms to load the compiled robot model in a fresh interpreter."""
+    with tempfile.TemporaryDirectory() as tmp:
+        code = (
+            "import time; from pathlib import Path\n"
+            "from lerobot_robot_yams import robot_model\n"
+            "t = time.perf_counter()\n"
+            f"robot_model.load_robot_model(Path({tmp!r}))\n"
+            "print((time.perf_counter() - t) * 1e3)\n"
+        )
+        times = []
+        for _ in range(2):
+            out = subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True
+            )
+            times.append(float(out.stdout.strip()))
+    return times[0], times[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("packages", nargs="*", default=list(BUDGETS_MS))
+    parser.add_argument("--top", type=int, default=0, help="List the N slowest modules")
+    args = parser.parse_args()
+
+    over_budget = []
+    for package in args.packages:
+        try:
+            rows = import_times(package)
+        except RuntimeError as e:
+            print(f"{package:28s} import failed: {e}")
+            over_budget.append(package)
+            continue
+        total_ms = next(cum for name, _, cum, _ in rows if name == package) / 1e3
+        budget_ms = BUDGETS_MS.get(package, float("inf"))
+        status = "ok" if total_ms <= budget_ms else "OVER BUDGET"
+        print(f"{package:28s} {total_ms:8.1f} ms  (budget {budget_ms:.0f} ms)  {status}")
+        if total_ms > budget_ms:
+            over_budget.append(package)
+        for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[: args.top]:
+            print(f"    {self_us / 1e3:8.1f} ms  {name}")
+
+    try:
+        cold_ms, warm_ms = time_robot_model()
+        print(f"robot model load: cold {cold_ms:.1f} ms, cached {warm_ms:.1f} ms")
+    except subprocess.CalledProcessError as e:
+        print(f"robot model load failed: {e.stderr.strip().splitlines()[-1]}")
+
+    if over_budget:
+        sys.exit(f"Import budget exceeded: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""CPU cost of eager vs lazy postprocessing for a camera captured faster than it is read.
+
+uv run python scripts/bench_lazy_postprocess.py
+uv run python scripts/bench_lazy_postprocess.py --camera-fps 90 --consumer-hz 15 --rotate
+
+A synthetic 640x480 YUYV source delivers --camera-fps frames per simulated
+second and the dataset consumer takes the latest frame at --consumer-hz,
+mirroring OpenCVCameraCached: retrieve() converts YUYV to BGR and
+_postprocess_image() converts to RGB (and rotates with --rotate). Three read
+loops are compared:
+
+  eager   retrieve and postprocess every frame (the default)
+  lazy    retrieve every frame, postprocess only frames that are read
+  hint    lazy plus consumer_fps: frames the decimator drops are grabbed
+          but never retrieved
+
+The loop runs as fast as it can and measures CPU time (time.process_time),
+so the numbers are CPU per recorded second, not wall-clock; each mode is run
+--repeat times and the lowest figure is reported.
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from lerobot_camera_cached.lazy_frame import FrameDecimator, LazyFrame, materialize
+
+
+def synthetic_stream(width: int, height: int, num_frames: int = 60) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (15, 15), 5)
+    yuv = cv2.cvtColor(base, cv2.COLOR_BGR2YUV)
+    # Pack to YUYV 4:2:2: Y for every pixel, U/V from even columns.
+    yuyv = np.empty((height, width, 2), dtype=np.uint8)
+    yuyv[:, :, 0] = yuv[:, :, 0]
+    yuyv[:, 0::2, 1] = yuv[:, 0::2, 1]
+    yuyv[:, 1::2, 1] = yuv[:, 0::2, 2]
+    return [np.roll(yuyv, 4 * i, axis=1) for i in range(num_frames)]
+
+
+def run(
+    stream: list[np.ndarray],
+    seconds: float,
+    camera_fps: float,
+    consumer_hz: float,
+    rotation: int | None,
+    mode: str,
+) -> tuple[float, int]:
+    """CPU seconds per recorded second, and the number of frames postprocessed."""
+
+    postprocessed = 0
+
+    def postprocess(image: np.ndarray) -> np.ndarray:
+        nonlocal postprocessed
+        postprocessed += 1
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return image if rotation is None else cv2.rotate(image, rotation)
+
+    decimator = FrameDecimator(consumer_hz, camera_fps) if mode == "hint" else None
+    ticks = int(seconds * camera_fps)
+    consumer_every = camera_fps / consumer_hz
+    next_consume = 0.0
+    latest = None
+
+    start = time.process_time()
+    for tick in range(ticks):
+        # Read thread: grab() always, retrieve() unless the decimator drops the frame.
+        grabbed = stream[tick % len(stream)]
+        if decimator is None or decimator.keep(tick / camera_fps):
+            bgr = cv2.cvtColor(grabbed, cv2.COLOR_YUV2BGR_YUYV)
+            latest = postprocess(bgr) if mode == "eager" else LazyFrame(bgr, postprocess)
+
+        if tick >= next_consume:
+            next_consume += consumer_every
+            materialize(latest)
+    return (time.process_time() - start) / seconds, postprocessed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--camera-fps", type=float, default=60.0)
+    parser.add_argument("--consumer-hz", type=float, default=30.0)
+    parser.add_argument("--rotate", action="store_true", help="rotate 180 in postprocessing")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    stream = synthetic_stream(args.width, args.height)
+    rotation = cv2.ROTATE_180 if args.rotate else None
+
+    print(
+        f"{args.width}x{args.height} YUYV @ {args.camera_fps:g} fps, "
+        f"consumer {args.consumer_hz:g} Hz{', rotated' if args.rotate else ''}"
+    )
+    results = {
+        mode: min(
+            run(stream, args.seconds, args.camera_fps, args.consumer_hz, rotation, mode)
+            for _ in range(args.repeat)
+        )
+        for mode in ("eager", "lazy", "hint")
+    }
+    eager = results["eager"][0]
+    for mode, (cpu, postprocessed) in results.items():
+        print(
+            f"  {mode:<6} {100 * cpu:6.1f} % of one core  ({eager / cpu:.1f}x less)  "
+            f"{postprocessed / args.seconds:5.1f} postprocess/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
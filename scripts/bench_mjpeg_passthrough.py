@@ -0,0 +1,130 @@
+"""CPU cost of eager MJPEG decoding vs compressed passthrough on recorded streams.
+
+uv run python scripts/bench_mjpeg_passthrough.py left_wrist.mjpeg right_wrist.mjpeg
+uv run python scripts/bench_mjpeg_passthrough.py --consumer-hz 15 --plot-hz 5
+
+Record a stream straight from a wrist camera with
+  v4l2-ctl -d /dev/video6 --set-fmt-video=width=640,height=480,pixelformat=MJPG \\
+      --stream-mmap --stream-count=300 --stream-to=right_wrist.mjpeg
+Without arguments a synthetic 640x480 stream is generated instead.
+
+Each camera delivers --camera-fps frames per simulated second. The dataset
+consumer takes the latest frame at --consumer-hz and the live plot encodes a
+JPEG preview at --plot-hz. The loop runs as fast as it can and measures CPU
+time (time.process_time), so the numbers are CPU per recorded second, not
+wall-clock.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from lerobot_camera_cached.jpeg_frame import EncodedFrame
+
+JPEG_QUALITY = [int(cv2.IMWRITE_JPEG_QUALITY), 80]
+
+
+def split_mjpeg(data: bytes) -> list[bytes]:
+    """Split a concatenated MJPEG stream at JPEG start/end markers."""
+    frames = []
+    start = data.find(b"\xff\xd8")
+    while start != -1:
+        end = data.find(b"\xff\xd9", start)
+        if end == -1:
+            break
+        frames.append(data[start : end + 2])
+        start = data.find(b"\xff\xd8", end + 2)
+    return frames
+
+
+def synthetic_stream(num_frames: int = 90) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (15, 15), 5)
+    frames = []
+    for i in range(num_frames):
+        image = np.roll(base, 4 * i, axis=1)
+        encoded = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), 90])[1]
+        frames.append(encoded.tobytes())
+    return frames
+
+
+def _postprocess(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def run(
+    streams: list[list[bytes]],
+    seconds: float,
+    camera_fps: float,
+    consumer_hz: float,
+    plot_hz: float,
+    passthrough: bool,
+) -> float:
+    """CPU seconds spent per recorded second."""
+    ticks = int(seconds * camera_fps)
+    consumer_every = camera_fps / consumer_hz
+    plot_every = camera_fps / plot_hz
+    latest = [None] * len(streams)
+    next_consume, next_plot = 0.0, 0.0
+
+    start = time.process_time()
+    for tick in range(ticks):
+        # Capture thread: every camera delivers one frame.
+        for cam, stream in enumerate(streams):
+            data = stream[tick % len(stream)]
+            if passthrough:
+                latest[cam] = EncodedFrame(data)
+            else:
+                image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                latest[cam] = _postprocess(image)
+
+        consumed = None
+        if tick >= next_consume:
+            next_consume += consumer_every
+            consumed = [f.decode(_postprocess) if passthrough else f for f in latest]
+        if tick >= next_plot:
+            next_plot += plot_every
+            frames = consumed or [f.decode(_postprocess) if passthrough else f for f in latest]
+            for frame in frames:
+                if getattr(frame, "jpeg", None) is None:
+                    cv2.imencode(".jpg", frame, JPEG_QUALITY)
+    return (time.process_time() - start) / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "streams", nargs="*", type=Path, help="recorded .mjpeg files, one per camera"
+    )
+    parser.add_argument("--cameras", type=int, default=2, help="synthetic cameras if no streams")
+    parser.add_argument("--camera-fps", type=float, default=30.0)
+    parser.add_argument("--consumer-hz", type=float, default=30.0)
+    parser.add_argument("--plot-hz", type=float, default=5.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    if args.streams:
+        streams = [split_mjpeg(path.read_bytes()) for path in args.streams]
+        for path, stream in zip(args.streams, streams):
+            if not stream:
+                raise SystemExit(f"{path}: no JPEG frames found")
+    else:
+        streams = [synthetic_stream()] * args.cameras
+    shape = cv2.imdecode(np.frombuffer(streams[0][0], np.uint8), cv2.IMREAD_COLOR).shape
+
+    print(
+        f"{len(streams)} camera(s) {shape[1]}x{shape[0]} @ {args.camera_fps:.0f} fps, "
+        f"consumer {args.consumer_hz:g} Hz, plot {args.plot_hz:g} Hz"
+    )
+    eager = run(streams, args.seconds, args.camera_fps, args.consumer_hz, args.plot_hz, False)
+    lazy = run(streams, args.seconds, args.camera_fps, args.consumer_hz, args.plot_hz, True)
+    print(f"  eager decode   {100 * eager:6.1f} % of one core")
+    print(f"  passthrough    {100 * lazy:6.1f} % of one core  ({eager / lazy:.1f}x less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Time camera plugin registration (lerobot CLI cold start) with the SDKs stubbed out.
+
+uv run python scripts/bench_plugin_startup.py
+uv run python scripts/bench_plugin_startup.py --sdk-import-ms 300 --runs 5
+
+cv2, pyrealsense2 and pyzed are replaced by empty modules that sleep for
+--sdk-import-ms on import, so the timing reflects our import graph rather than
+which SDKs happen to be installed, and every SDK that registration touches is
+listed.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PLUGINS = ["lerobot_camera_cached", "lerobot_camera_zed", "lerobot_robot_yams"]
+
+_CHILD = """
+import importlib.abc
+import importlib.machinery
+import json
+import sys
+import time
+
+SDKS = ("cv2", "pyrealsense2", "pyzed")
+SDK_IMPORT_S = {sdk_import_s}
+requested = []
+
+
+class _StubSdks(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] not in SDKS:
+            return None
+        requested.append(name)
+        return importlib.machinery.ModuleSpec(name, self, is_package=True)
+
+    def exec_module(self, module):
+        time.sleep(SDK_IMPORT_S)
+        module.__getattr__ = lambda attr: 0
+
+
+sys.meta_path.insert(0, _StubSdks())
+
+start = time.perf_counter()
+import lerobot.cameras  # noqa: E402
+
+for plugin in {plugins!r}:
+    __import__(plugin)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1e3, "sdks": sorted(set(requested))}}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sdk-import-ms", type=float, default=200.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("plugins", nargs="*", default=PLUGINS)
+    args = parser.parse_args()
+
+    code = _CHILD.format(sdk_import_s=args.sdk_import_ms / 1e3, plugins=args.plugins)
+    times = []
+    sdks: list[str] = []
+    for _ in range(args.runs):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if result.returncode != 0:
+            sys.exit(result.stderr.strip().splitlines()[-1])
+        out = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(out["ms"])
+        sdks = out["sdks"]
+
+    print(f"plugins: {', '.join(args.plugins)}")
+    print(f"cold start: median {statistics.median(times):.1f} ms over {args.runs} runs")
+    print(f"SDKs imported ({args.sdk_import_ms:.0f} ms each): {', '.join(sdks) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
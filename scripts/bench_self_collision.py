@@ -0,0 +1,52 @@
+"""Time the bimanual capsule self-collision check against the 250 Hz loop budget.
+
+uv run python scripts/bench_self_collision.py
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from lerobot_robot_yams.self_collision import bimanual_distances
+
+ARMS_CONFIG_PATH = Path(__file__).resolve().parents[1] / "configs" / "arms.yaml"
+LOOP_HZ = 250
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    collision = yaml.safe_load(ARMS_CONFIG_PATH.read_text())["collision"]
+    ee_length = collision["end_effector_length"]
+    radii = np.array(collision["link_radii"])
+    rng = np.random.default_rng(0)
+
+    budget_us = 1e6 / LOOP_HZ
+    for batch in (1, 16, 256):
+        q_left = rng.uniform(-1.5, 1.5, size=(batch, 6))
+        q_right = rng.uniform(-1.5, 1.5, size=(batch, 6))
+        t = _time_per_call(
+            lambda: bimanual_distances(q_left, q_right, ee_length, radii),
+            max(1, args.iterations // batch),
+        )
+        print(
+            f"batch {batch:4d}: {t * 1e6:8.1f} us/call, {t * 1e6 / batch:6.2f} us/config "
+            f"({100 * t * 1e6 / budget_us:.1f}% of a {LOOP_HZ} Hz tick)"
+        )
+
+
+if __name__ == "__main__":
+    main()
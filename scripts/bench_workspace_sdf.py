@@ -0,0 +1,70 @@
+"""Compare voxel-SDF lookups with analytic primitive evaluation.
+
+uv run python scripts/bench_workspace_sdf.py --obstacles 20
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from lerobot_robot_yams.workspace_sdf import WorkspaceSDF, analytic_sdf, link_samples
+
+ARMS_CONFIG_PATH = Path(__file__).resolve().parents[1] / "configs" / "arms.yaml"
+
+
+def _random_boxes(n: int, lo: np.ndarray, hi: np.ndarray, rng) -> list[dict]:
+    return [
+        {
+            "type": "box",
+            "center": rng.uniform(lo, hi).tolist(),
+            "size": rng.uniform(0.05, 0.3, size=3).tolist(),
+        }
+        for _ in range(n)
+    ]
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--obstacles", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    arms_config = yaml.safe_load(ARMS_CONFIG_PATH.read_text())
+    workspace = arms_config["workspace"]
+    ee_length = arms_config["collision"]["end_effector_length"]
+    lo, hi = np.asarray(workspace["bounds"], dtype=float)
+    rng = np.random.default_rng(0)
+    obstacles = (workspace["obstacles"] or []) + _random_boxes(args.obstacles, lo, hi, rng)
+
+    start = time.perf_counter()
+    sdf = WorkspaceSDF.bake(obstacles, workspace["bounds"], workspace["resolution"])
+    print(
+        f"bake: {len(obstacles)} obstacles, grid {sdf.grid.shape}, "
+        f"{sdf.grid.nbytes / 1e6:.1f} MB, {time.perf_counter() - start:.2f}s"
+    )
+
+    for batch in (1, 16, 256):
+        points = link_samples(rng.uniform(-1.5, 1.5, size=(batch, 6)), ee_length)
+        iterations = max(1, args.iterations // batch)
+        t_sdf = _time_per_call(lambda: sdf.query(points), iterations)
+        t_exact = _time_per_call(lambda: analytic_sdf(points, obstacles), iterations)
+        print(
+            f"batch {batch:4d} ({points[..., 0].size:5d} points): "
+            f"sdf {t_sdf * 1e6:8.1f} us, analytic {t_exact * 1e6:8.1f} us "
+            f"({points[..., 0].size / t_sdf / 1e6:.1f} M points/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
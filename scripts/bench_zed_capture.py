@@ -0,0 +1,152 @@
+"""Per-frame cost of ZEDCamera capture: preallocated buffers vs a Mat per frame.
+
+uv run python scripts/bench_zed_capture.py
+uv run python scripts/bench_zed_capture.py --width 2208 --height 1242 --rotate
+
+Runs without the SDK or a camera: ZEDCamera.load_sdk is replaced by a fake
+that copies a synthetic BGRA image into the Mat on retrieve_image, standing
+in for the SDK's host copy. Two capture paths are timed on it:
+
+  per-frame   what read() used to do: a new sl.Mat per grab, then
+              cvtColor/rotate each allocating their own output
+  reused      ZEDCamera._capture: one Mat from connect(), conversion and
+              rotation written into scratch and pooled output buffers
+
+and for each the time per frame and the bytes allocated per frame (peak
+tracemalloc growth across a read) are reported. Frames are held for --hold
+grabs before being dropped, as a consumer queue would.
+"""
+
+import argparse
+import collections
+import time
+import tracemalloc
+import types
+
+import cv2
+import numpy as np
+from lerobot.cameras.configs import Cv2Rotation
+
+from lerobot_camera_zed.zed_camera import ZEDCamera
+from lerobot_camera_zed.zed_config import ZEDCameraConfig
+
+
+class FakeSdk:
+    ERROR_CODE = types.SimpleNamespace(SUCCESS=0)
+    VIEW = types.SimpleNamespace(LEFT="left")
+    MEM = types.SimpleNamespace(CPU="cpu")
+    MAT_TYPE = types.SimpleNamespace(U8_C4="u8c4")
+    UNIT = types.SimpleNamespace(MILLIMETER="mm")
+    RESOLUTION = types.SimpleNamespace(HD2K="2k", HD1080="1080", HD720="720", VGA="vga")
+    DEPTH_MODE = types.SimpleNamespace(
+        NONE="none", PERFORMANCE="perf", QUALITY="q", ULTRA="u", NEURAL="n"
+    )
+    InitParameters = staticmethod(
+        lambda: types.SimpleNamespace(set_from_camera_id=lambda _id: None)
+    )
+    RuntimeParameters = types.SimpleNamespace
+    Resolution = staticmethod(lambda w, h: types.SimpleNamespace(width=w, height=h))
+
+    def __init__(self, image: np.ndarray):
+        sdk = self
+        height, width = image.shape[:2]
+
+        class Mat:
+            def __init__(self, w=0, h=0, mat_type=None, mem=None):
+                self.data = np.empty((h, w, 4), np.uint8) if w else None
+
+            def get_data(self):
+                return self.data
+
+            def free(self, mem=None):
+                self.data = None
+
+        class Camera:
+            def open(self, init_params):
+                return sdk.ERROR_CODE.SUCCESS
+
+            def grab(self, runtime_params):
+                return sdk.ERROR_CODE.SUCCESS
+
+            def retrieve_image(self, mat, view, mem, resolution):
+                if mat.data is None:
+                    mat.data = np.empty((resolution.height, resolution.width, 4), np.uint8)
+                np.copyto(mat.data, image)
+
+            def get_camera_information(self):
+                resolution = types.SimpleNamespace(width=width, height=height)
+                return types.SimpleNamespace(
+                    camera_configuration=types.SimpleNamespace(fps=30, resolution=resolution)
+                )
+
+            def close(self):
+                pass
+
+        self.Mat = Mat
+        self.Camera = Camera
+
+
+def per_frame_read(cam: ZEDCamera) -> np.ndarray:
+    """The capture path before buffers were reused."""
+    sl = cam.sl
+    cam.zed.grab(cam.runtime_params)
+    image_mat = sl.Mat()
+    cam.zed.retrieve_image(image_mat, sl.VIEW.LEFT, sl.MEM.CPU, cam._resolution)
+    frame = cv2.cvtColor(image_mat.get_data(), cv2.COLOR_BGRA2RGB)
+    if cam.rotation is not None:
+        frame = cv2.rotate(frame, cam.rotation)
+    return frame
+
+
+def run(read, num_frames: int, hold: int) -> tuple[float, float]:
+    held = collections.deque(maxlen=hold)
+    for _ in range(hold + 2):
+        held.append(read())
+
+    start = time.perf_counter()
+    for _ in range(num_frames):
+        held.append(read())
+    per_frame_s = (time.perf_counter() - start) / num_frames
+
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(num_frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        held.append(read())
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return per_frame_s, allocated / num_frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--rotate", action="store_true", help="rotate 90 degrees")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--hold", type=int, default=2)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (args.height, args.width, 4), dtype=np.uint8)
+    sdk = FakeSdk(image)
+
+    rotation = Cv2Rotation.ROTATE_90 if args.rotate else Cv2Rotation.NO_ROTATION
+    width, height = (args.height, args.width) if args.rotate else (args.width, args.height)
+    cam_cls = type("BenchZEDCamera", (ZEDCamera,), {"load_sdk": staticmethod(lambda: sdk)})
+    cam = cam_cls(ZEDCameraConfig(fps=30, width=width, height=height, rotation=rotation))
+    cam.connect(warmup=False)
+
+    print(f"{args.width}x{args.height} BGRA{' rotated 90' if args.rotate else ''}")
+    for name, read in (("per-frame", lambda: per_frame_read(cam)), ("reused", cam.read)):
+        per_frame_s, allocated = run(read, args.frames, args.hold)
+        print(
+            f"  {name:<10}{1e3 * per_frame_s:8.3f} ms/frame"
+            f"{allocated / 1e6:9.2f} MB allocated/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
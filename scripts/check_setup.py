@@ -1,10 +1,12 @@
 from pathlib import Path
+import hashlib
 import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
 
 import cv2
@@ -28,49 +30,61 @@ class UI:
         G = Y = R = C = BOLD = DIM = END = ""
 
     _status_active = False
+    # Checks print from worker threads when they run concurrently.
+    _lock = threading.RLock()
 
     @classmethod
     def header(cls, title: str) -> None:
-        bar = "━" * 48
-        print()
-        print(f"{cls.BOLD}{bar}{cls.END}")
-        print(f"{cls.BOLD}  {title}{cls.END}")
-        print(f"{cls.BOLD}{bar}{cls.END}")
+        with cls._lock:
+            bar = "━" * 48
+            print()
+            print(f"{cls.BOLD}{bar}{cls.END}")
+            print(f"{cls.BOLD}  {title}{cls.END}")
+            print(f"{cls.BOLD}{bar}{cls.END}")
 
     @classmethod
     def section(cls, title: str) -> None:
-        cls._clear_status()
-        print()
-        print(f"{cls.BOLD}{title}{cls.END}")
+        with cls._lock:
+            cls._clear_status()
+            print()
+            print(f"{cls.BOLD}{title}{cls.END}")
 
     @classmethod
     def ok(cls, msg: str) -> None:
-        cls._clear_status()
-        print(f"  {cls.G}✓{cls.END}  {msg}")
+        with cls._lock:
+            cls._clear_status()
+            print(f"  {cls.G}✓{cls.END}  {msg}")
 
     @classmethod
     def warn(cls, msg: str) -> None:
-        cls._clear_status()
-        print(f"  {cls.Y}⚠{cls.END}  {msg}")
+        with cls._lock:
+            cls._clear_status()
+            print(f"  {cls.Y}⚠{cls.END}  {msg}")
 
     @classmethod
     def fail(cls, msg: str) -> None:
-        cls._clear_status()
-        print(f"  {cls.R}✗{cls.END}  {msg}")
+        with cls._lock:
+            cls._clear_status()
+            print(f"  {cls.R}✗{cls.END}  {msg}")
 
     @classmethod
     def info(cls, msg: str) -> None:
-        cls._clear_status()
-        print(f"  {cls.DIM}·{cls.END}  {msg}")
+        with cls._lock:
+            cls._clear_status()
+            print(f"  {cls.DIM}·{cls.END}  {msg}")
 
     @classmethod
     def detail(cls, msg: str) -> None:
-        cls._clear_status()
-        for line in str(msg).splitlines():
-            print(f"      {cls.DIM}{line}{cls.END}")
+        with cls._lock:
+            cls._clear_status()
+            for line in str(msg).splitlines():
+                print(f"      {cls.DIM}{line}{cls.END}")
 
     @classmethod
     def status(cls, msg: str) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            # A rewritten status line from several checks at once is noise.
+            return
         if cls._tty:
             sys.stdout.write(f"\r\033[K  {cls.DIM}…{cls.END}  {msg}")
             sys.stdout.flush()
@@ -80,17 +94,19 @@ class UI:
 
     @classmethod
     def _clear_status(cls) -> None:
-        if cls._tty and cls._status_active:
-            sys.stdout.write("\r\033[K")
-            sys.stdout.flush()
-            cls._status_active = False
+        with cls._lock:
+            if cls._tty and cls._status_active:
+                sys.stdout.write("\r\033[K")
+                sys.stdout.flush()
+                cls._status_active = False
 
     @classmethod
     def done(cls) -> None:
-        cls._clear_status()
-        print()
-        print(f"  {cls.BOLD}{cls.G}✓ ready{cls.END}")
-        print()
+        with cls._lock:
+            cls._clear_status()
+            print()
+            print(f"  {cls.BOLD}{cls.G}✓ ready{cls.END}")
+            print()
 
 ROOT = Path(__file__).resolve().parents[1]
 ARMS_CONFIG = ROOT / "configs" / "arms.yaml"
@@ -101,7 +117,7 @@ ALIGN_TOPDOWN_SCRIPT = ROOT / "scripts" / "align_topdown_visual.py"
 RESET_CAN_SCRIPT = ROOT / "third_party" / "i2rt" / "scripts" / "reset_all_can.sh"
 CAMERA_MEMO_PATH = ROOT / ".camera-signatures.json"
 CAN_MEMO_PATH = ROOT / ".can-signatures.json"
-CAMERA_SIGNATURE_KEYS = ("ID_SERIAL_SHORT", "ID_SERIAL", "ID_PATH")
+CHECK_REPORT_PATH = ROOT / "outputs" / "check_setup_report.json"
 WRIST_CAMERA_NAMES = ("right_wrist", "left_wrist")
 IMAGE_MATCH_MIN_SCORE = 0.72
 IMAGE_MATCH_MIN_MARGIN = 0.04
@@ -251,42 +267,29 @@ def apply_memoized_can_ports(config: dict) -> None:
         )
 
 
-def can_state(can: str) -> str | None:
-    state_path = Path("/sys/class/net") / can / "operstate"
-    if not state_path.exists():
-        return None
-    return state_path.read_text().strip()
+def can_health():
+    sys.path.insert(0, str(ROOT / "src"))
+    from utils import can_health  # noqa: E402
+
+    return can_health
 
 
 def find_failing_cans(config: dict) -> list[tuple[str, str, str]]:
     failures: list[tuple[str, str, str]] = []
     for side in ("left", "right"):
         can = config["follower"][f"{side}_arm"]["can_port"]
-        state = can_state(can)
-        if state is None:
-            failures.append((side, can, "missing"))
-        elif state == "down":
-            # CAN interfaces report "unknown" once admin-up because they have
-            # no carrier concept — only literal "down" means not yet brought up.
-            failures.append((side, can, "down"))
+        # CAN interfaces report operstate "unknown" once admin-up because they
+        # have no carrier concept, so this goes by the IFF_UP flag and the
+        # controller state (bus-off, stopped) instead.
+        problem = can_health().read_link(can).problem()
+        if problem:
+            failures.append((side, can, problem))
     return failures
 
 
 def can_link_state_summary(cans: list[str]) -> str:
     """Compact one-line-per-iface state summary for UI.detail."""
-    rows = []
-    for can in cans:
-        _, output = run_command_text(["ip", "link", "show", can])
-        if not output:
-            rows.append(f"{can}  (no output)")
-            continue
-        # First line of `ip link show` looks like:
-        #   "7: can0: <NOARP,UP,LOWER_UP,ECHO> mtu 16 qdisc pfifo_fast state UP ..."
-        head = output.splitlines()[0]
-        m = re.search(r"state (\S+)", head)
-        state = m.group(1) if m else "?"
-        rows.append(f"{can}  {state}")
-    return "\n".join(rows)
+    return "\n".join(can_health().read_link(can).summary() for can in cans)
 
 
 def print_can_link_states(cans: list[str]) -> None:
@@ -319,7 +322,7 @@ def check_cans(config: dict) -> None:
             return
 
         for side, can, reason in failures:
-            label = "not found" if reason == "missing" else "is down"
+            label = "not found" if reason == "missing" else f"is {reason}"
             UI.fail(f"{side} follower CAN interface {label}: {can}")
         UI.detail(can_link_state_summary(cans))
 
@@ -437,14 +440,14 @@ def _check_leader_side(side: str, port: str, config: dict, free_port_fn) -> None
     UI.ok(f"{side} leader  connect ({connect_n}) · sync_read ({sync_n})")
 
 
-def check_leaders(config: dict) -> None:
+def check_leaders(config: dict, sides: tuple[str, ...] = ("left", "right")) -> None:
     UI.section("Leader arms")
     sys.path.insert(0, str(ROOT / "src"))
     from utils.connection import _free_port  # noqa: E402
 
     power_prompted = False
 
-    for side in ("left", "right"):
+    for side in sides:
         port = config["leader"][f"{side}_arm"]["port"]
         if not Path(port).exists():
             raise RuntimeError(f"{side} leader port not found: {port}")
@@ -502,18 +505,11 @@ def normalize_video_path(value) -> str:
     return str(path)
 
 
-def udev_properties(device_path: str | Path) -> dict[str, str]:
-    result = subprocess.run(
-        ["udevadm", "info", "-q", "property", "-n", str(Path(device_path).resolve())],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-    return dict(line.split("=", 1) for line in result.stdout.splitlines() if "=" in line)
-
+def device_inventory():
+    sys.path.insert(0, str(ROOT / "src"))
+    from utils import device_inventory  # noqa: E402
 
-def camera_signature(properties: dict[str, str]) -> dict[str, str]:
-    return {key: properties[key] for key in CAMERA_SIGNATURE_KEYS if properties.get(key)}
+    return device_inventory
 
 
 def load_camera_memo() -> dict[str, dict[str, str]]:
@@ -534,7 +530,8 @@ def save_camera_memo(config: dict) -> None:
             continue
         path = normalize_video_path(camera.get("index_or_path"))
         try:
-            signature = camera_signature(udev_properties(path))
+            inventory = device_inventory()
+            signature = inventory.camera_signature(inventory.udev_properties(path))
         except Exception:
             continue
         if signature:
@@ -544,33 +541,10 @@ def save_camera_memo(config: dict) -> None:
         CAMERA_MEMO_PATH.write_text(json.dumps(memo, indent=2, sort_keys=True) + "\n")
 
 
-def scan_video_device_properties() -> dict[str, dict[str, str]]:
-    devices: dict[str, dict[str, str]] = {}
-    for device in sorted(Path("/dev").glob("video*")):
-        try:
-            devices[str(device)] = udev_properties(device)
-        except Exception:
-            continue
-    return devices
-
-
 def find_devices_from_memo() -> dict[str, str]:
-    memo = load_camera_memo()
-    devices = scan_video_device_properties()
-    found: dict[str, str] = {}
-    used_devices: set[str] = set()
-    for name, expected_signature in memo.items():
-        if name not in WRIST_CAMERA_NAMES or not expected_signature:
-            continue
-        matches = [
-            device
-            for device, properties in devices.items()
-            if all(properties.get(key) == value for key, value in expected_signature.items())
-        ]
-        if len(matches) == 1 and matches[0] not in used_devices:
-            found[name] = matches[0]
-            used_devices.add(matches[0])
-    return found
+    memo = {name: sig for name, sig in load_camera_memo().items() if name in WRIST_CAMERA_NAMES}
+    inventory = device_inventory()
+    return inventory.match_signatures(memo, inventory.video_devices())
 
 
 def replace_camera_paths_in_yaml(paths_by_name: dict[str, str]) -> None:
@@ -712,7 +686,16 @@ def is_wrist_profile_device(path: Path) -> bool:
 
 
 def wrist_profile_devices() -> list[Path]:
-    return [device for device in sorted(Path("/dev").glob("video*")) if is_wrist_profile_device(device)]
+    # Only capture nodes can be wrist cameras; UVC metadata nodes are skipped
+    # without spawning v4l2-ctl for them.
+    inventory = device_inventory()
+    properties = inventory.video_devices()
+    return [
+        device
+        for device in sorted(Path("/dev").glob("video*"))
+        if inventory.is_capture_device(properties.get(str(device), {}))
+        and is_wrist_profile_device(device)
+    ]
 
 
 def captured_image_for_device(path: Path) -> Path:
@@ -737,121 +720,84 @@ def seed_reference_images_from_captures(config: dict) -> None:
             shutil.copyfile(capture, reference)
 
 
-def prepare_image_for_similarity(path: Path) -> np.ndarray | None:
-    image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
-    if image is None:
-        return None
-    image = cv2.resize(image, (160, 120), interpolation=cv2.INTER_AREA)
-    image = cv2.GaussianBlur(image, (5, 5), 0)
-    return image
-
-
-def image_similarity(reference: Path, candidate: Path) -> float | None:
-    reference_image = prepare_image_for_similarity(reference)
-    candidate_image = prepare_image_for_similarity(candidate)
-    if reference_image is None or candidate_image is None:
-        return None
-
-    ref = reference_image.astype(np.float32)
-    cand = candidate_image.astype(np.float32)
-    ref_std = float(ref.std())
-    cand_std = float(cand.std())
-    if ref_std < 1.0 or cand_std < 1.0:
-        return None
-
-    corr = float(np.corrcoef(ref.reshape(-1), cand.reshape(-1))[0, 1])
-    corr_score = max(0.0, min(1.0, (corr + 1.0) / 2.0))
+def camera_identity():
+    sys.path.insert(0, str(ROOT / "src"))
+    from utils import camera_identity  # noqa: E402
 
-    ref_hist = cv2.calcHist([reference_image], [0], None, [32], [0, 256])
-    cand_hist = cv2.calcHist([candidate_image], [0], None, [32], [0, 256])
-    cv2.normalize(ref_hist, ref_hist)
-    cv2.normalize(cand_hist, cand_hist)
-    hist_score = 1.0 - float(cv2.compareHist(ref_hist, cand_hist, cv2.HISTCMP_BHATTACHARYYA))
-    hist_score = max(0.0, min(1.0, hist_score))
+    return camera_identity
 
-    return (0.75 * corr_score) + (0.25 * hist_score)
 
+def image_similarity_matrix(candidates: list[Path]) -> tuple[np.ndarray, list[str]]:
+    """Scores of every wrist reference (rows) against every candidate (columns); NaN if unknown.
 
-def image_similarity_report(candidates: list[Path]) -> tuple[dict[str, dict[str, float]], list[str]]:
-    scores: dict[str, dict[str, float]] = {}
+    Each image is loaded and preprocessed once, however many cameras there are.
+    """
+    identity = camera_identity()
     problems: list[str] = []
+    references = []
     for name in WRIST_CAMERA_NAMES:
         reference = reference_image_for_camera(name)
         if not reference.exists():
             problems.append(f"missing reference image for {name}: {reference}")
+            references.append(None)
             continue
-        scores[name] = {}
-        for candidate in candidates:
-            candidate_image = captured_image_for_device(candidate)
-            if not candidate_image.exists():
-                problems.append(f"missing new capture for {candidate}: {candidate_image}")
-                continue
-            score = image_similarity(reference, candidate_image)
-            if score is None:
-                problems.append(f"could not compare {reference} to {candidate_image}")
-                continue
-            scores[name][str(candidate)] = score
-    return scores, problems
+        features = identity.image_features(reference)
+        if features is None:
+            problems.append(f"could not compare {reference} to new captures")
+        references.append(features)
+    captures = []
+    for candidate in candidates:
+        candidate_image = captured_image_for_device(candidate)
+        if not candidate_image.exists():
+            problems.append(f"missing new capture for {candidate}: {candidate_image}")
+            captures.append(None)
+            continue
+        features = identity.image_features(candidate_image)
+        if features is None:
+            problems.append(f"could not compare {candidate_image} to reference images")
+        captures.append(features)
+    return identity.score_matrix(references, captures), problems
 
 
 def best_image_mapping(candidates: list[Path]) -> tuple[dict[str, str] | None, str]:
     if len(candidates) < len(WRIST_CAMERA_NAMES):
-        return None, "Not enough wrist-like camera candidates to assign left and right."
+        return None, (
+            f"Not enough wrist-like camera candidates to assign {', '.join(WRIST_CAMERA_NAMES)}: "
+            f"found {len(candidates)}, need {len(WRIST_CAMERA_NAMES)}."
+        )
 
-    scores, problems = image_similarity_report(candidates)
-    if any(name not in scores or not scores[name] for name in WRIST_CAMERA_NAMES):
+    matrix, problems = image_similarity_matrix(candidates)
+    if np.isnan(matrix).all(axis=1).any():
         details = "\n".join(problems) if problems else "No usable similarity scores were available."
         return None, f"Image matching cannot run yet.\n{details}"
 
-    candidate_paths = [str(candidate) for candidate in candidates]
-    best_assignment: dict[str, str] | None = None
-    best_total = -1.0
-    second_total = -1.0
-
-    for right_candidate in candidate_paths:
-        for left_candidate in candidate_paths:
-            if left_candidate == right_candidate:
-                continue
-            assignment = {"right_wrist": right_candidate, "left_wrist": left_candidate}
-            try:
-                total = sum(scores[name][path] for name, path in assignment.items())
-            except KeyError:
-                continue
-            if total > best_total:
-                second_total = best_total
-                best_total = total
-                best_assignment = assignment
-            elif total > second_total:
-                second_total = total
-
-    if best_assignment is None:
+    match = camera_identity().match_identities(
+        matrix, list(WRIST_CAMERA_NAMES), [str(candidate) for candidate in candidates]
+    )
+    if match is None:
         return None, "No valid one-to-one image assignment was found."
 
-    selected_scores = {name: scores[name][path] for name, path in best_assignment.items()}
-    lowest_score = min(selected_scores.values())
-    margin = best_total - second_total if second_total >= 0 else best_total
-
     score_lines = [
-        f"{name}: {path} score={score:.3f}"
-        for name, path in best_assignment.items()
-        for score in [selected_scores[name]]
+        f"{name}: {path} score={match.scores[name]:.3f}"
+        for name, path in match.assignment.items()
     ]
-    if lowest_score < IMAGE_MATCH_MIN_SCORE:
+    if match.lowest_score < IMAGE_MATCH_MIN_SCORE:
         return (
             None,
             "Image match was too weak to trust automatically.\n"
             + "\n".join(score_lines)
             + f"\nMinimum required score is {IMAGE_MATCH_MIN_SCORE:.2f}.",
         )
-    if margin < IMAGE_MATCH_MIN_MARGIN:
+    if match.margin < IMAGE_MATCH_MIN_MARGIN:
         return (
             None,
             "Image match was ambiguous, so I will not guess.\n"
             + "\n".join(score_lines)
-            + f"\nBest-vs-second margin was {margin:.3f}; required margin is {IMAGE_MATCH_MIN_MARGIN:.2f}.",
+            + f"\nBest-vs-second margin was {match.margin:.3f}; "
+            f"required margin is {IMAGE_MATCH_MIN_MARGIN:.2f}.",
         )
 
-    return best_assignment, "Auto-matched by comparing fresh captures to saved reference images."
+    return match.assignment, "Auto-matched by comparing fresh captures to saved reference images."
 
 
 def remove_old_opencv_captures() -> None:
@@ -1213,10 +1159,10 @@ def check_topdown_pose(frames: list[np.ndarray]) -> None:
         can offer the alignment tool.
     """
     sys.path.insert(0, str(ROOT / "src"))
-    from utils.camera_pose import evaluate_pose, load_reference  # noqa: E402
+    from utils.camera_pose import evaluate_pose, load_pose_reference  # noqa: E402
 
     avg = np.mean(np.stack(frames).astype(np.float32), axis=0).astype(np.uint8)
-    reference = load_reference()
+    reference = load_pose_reference()
     pose, ok, msg = evaluate_pose(avg, reference)
     if not ok:
         raise TopdownPoseDriftError(msg, pose=pose)
@@ -1303,7 +1249,7 @@ def check_cameras(config: dict) -> None:
         reference_frames = {}
         for name, camera in config.get("cameras", {}).get("configs", {}).items():
             camera_type = camera.get("type")
-            if camera_type in ("opencv", "opencv-cached"):
+            if camera_type in ("opencv", "opencv-cached", "v4l2-cached"):
                 try:
                     frame = check_opencv_camera(name, camera)
                     if name in WRIST_CAMERA_NAMES:
@@ -1380,6 +1326,112 @@ def check_cameras(config: dict) -> None:
     UI.ok("USB cameras receiving frames")
 
 
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def probe_cans(config: dict) -> None:
+    failures = find_failing_cans(config)
+    if failures:
+        raise RuntimeError(", ".join(f"{can} {reason}" for _, can, reason in failures))
+
+
+def opencv_camera_fingerprint(camera: dict) -> str:
+    path = capture_path(opencv_device_path(camera["index_or_path"]))
+    identity = device_inventory().device_fingerprint(path)
+    digest = hashlib.sha256(f"{identity}\0{json.dumps(camera, sort_keys=True)}".encode())
+    return digest.hexdigest()[:16]
+
+
+def unsupported_camera(name: str, camera_type) -> None:
+    raise RuntimeError(f"{name} has unsupported camera type: {camera_type}")
+
+
+def setup_checks(config: dict, check_leader_arms: bool) -> list:
+    """The non-interactive half of every check, as independent scheduler checks.
+
+    Wrist cameras carry a device fingerprint so an unchanged, recently passing
+    camera isn't reopened. Leaders and the topdown pose never do: motor power
+    and the mount can change without the USB device changing.
+    """
+    from functools import partial
+
+    sys.path.insert(0, str(ROOT / "src"))
+    from utils.check_scheduler import Check  # noqa: E402
+
+    checks = [Check("can", partial(probe_cans, config), timeout_s=10.0)]
+    if check_leader_arms:
+        from utils.connection import _free_port  # noqa: E402
+
+        for side in ("left", "right"):
+            port = config["leader"][f"{side}_arm"]["port"]
+            checks.append(Check(
+                f"leader:{side}",
+                partial(_check_leader_side, side, port, config, _free_port),
+                timeout_s=60.0,
+            ))
+
+    for name, camera in config.get("cameras", {}).get("configs", {}).items():
+        camera_type = camera.get("type")
+        if camera_type in ("opencv", "opencv-cached", "v4l2-cached"):
+            checks.append(Check(
+                f"camera:{name}",
+                partial(check_opencv_camera, name, camera),
+                timeout_s=20.0,
+                fingerprint=partial(opencv_camera_fingerprint, camera),
+            ))
+        elif camera_type == "intelrealsense-cached":
+            checks.append(Check(
+                f"camera:{name}", partial(check_realsense_camera, name, camera), timeout_s=45.0
+            ))
+            if name == "topdown" and not env_flag("SKIP_TOPDOWN_POSE"):
+                checks.append(Check(
+                    "pose:topdown", check_topdown_pose, timeout_s=15.0, after=("camera:topdown",)
+                ))
+        else:
+            checks.append(Check(f"camera:{name}", partial(unsupported_camera, name, camera_type)))
+    return checks
+
+
+def report_check_result(result) -> None:
+    if result.status == "ok":
+        UI.ok(f"{result.name}  {result.elapsed_s:.1f} s")
+    elif result.status == "cached":
+        age_min = (time.time() - result.value["passed_at"]) / 60
+        UI.ok(f"{result.name}  passed {age_min:.0f} min ago, device unchanged")
+    else:
+        first_line = str(result.error).strip().splitlines()[0] if result.error else ""
+        UI.warn(f"{result.name}  {result.status}: {first_line}")
+
+
+def run_setup_checks(config: dict, check_leader_arms: bool) -> dict:
+    """Run every check concurrently; returns the results by check name.
+
+    The timing breakdown goes to CHECK_REPORT_PATH. CHECK_SETUP_NO_CACHE=1
+    ignores cached passes and runs everything.
+    """
+    sys.path.insert(0, str(ROOT / "src"))
+    from utils.check_scheduler import HealthCache, run_checks, timing_report  # noqa: E402
+
+    UI.section("Checks")
+    checks = setup_checks(config, check_leader_arms)
+    cache = None if env_flag("CHECK_SETUP_NO_CACHE") else HealthCache()
+    start = time.perf_counter()
+    results = run_checks(checks, cache, on_result=report_check_result)
+    wall_s = time.perf_counter() - start
+    if cache is not None:
+        cache.save()
+
+    report = timing_report(results, wall_s)
+    CHECK_REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CHECK_REPORT_PATH.write_text(json.dumps(report, indent=2) + "\n")
+    UI.detail(
+        f"{wall_s:.1f} s for {report['serial_s']:.1f} s of checks, "
+        f"slowest: {report['critical_path']} · {CHECK_REPORT_PATH.relative_to(ROOT)}"
+    )
+    return {result.name: result for result in results}
+
+
 def kill_stale_lerobot_processes() -> None:
     """Kill any stale lerobot-record / lerobot-teleoperate / yams_server.py
     processes that may still be holding cameras or motor buses open from a
@@ -1399,15 +1451,51 @@ def main() -> None:
     UI.header("yams · setup check")
     kill_stale_lerobot_processes()
     config = load_config()
-    check_cans(config)
-    if os.environ.get("SKIP_LEADERS", "").lower() in ("1", "true", "yes"):
+    skip_leaders = env_flag("SKIP_LEADERS")
+    apply_memoized_can_ports(config)
+    apply_memoized_camera_paths(config)
+
+    # Everything runs at once first; only what fails goes through the
+    # serial, interactive checks below (prompts, CAN reset, remapping).
+    results = run_setup_checks(config, check_leader_arms=not skip_leaders)
+    failed = {name for name, result in results.items() if not result.passed}
+    # A timed-out check's thread can't be stopped and may still hold its serial
+    # port or camera; _free_port never kills this process, so a serial retry
+    # would just wait on it again. Those devices are reported, not reopened.
+    held = sorted(name for name, result in results.items() if result.abandoned)
+
+    if "can" in failed:
+        check_cans(config)
+    else:
+        save_can_memo(config)
+    if skip_leaders:
         # TEMP: leader bus is flaky due to a cut cable into right-leader motor 4.
         # Inference doesn't drive the followers from the leaders, so skip when set.
         UI.section("Leader arms")
         UI.info("skipping leader check (SKIP_LEADERS set)")
     else:
-        check_leaders(config)
-    check_cameras(config)
+        failed_sides = tuple(
+            side for side in ("left", "right")
+            if f"leader:{side}" in failed and f"leader:{side}" not in held
+        )
+        if failed_sides:
+            check_leaders(config, failed_sides)
+    if any(name.startswith(("camera:", "pose:")) for name in failed):
+        # Remapping can move any wrist camera, so recheck all of them.
+        if not any(name.startswith("camera:") for name in held):
+            check_cameras(config)
+    else:
+        save_camera_memo(config)
+        save_reference_frames({
+            name: results[f"camera:{name}"].value
+            for name in WRIST_CAMERA_NAMES
+            if results.get(f"camera:{name}") and results[f"camera:{name}"].status == "ok"
+        })
+    if held:
+        raise RuntimeError(
+            f"{', '.join(held)} timed out and may still hold the device. "
+            "Rerun check_setup; if it times out again, replug the device."
+        )
     UI.done()
 
 
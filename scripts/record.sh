@@ -52,19 +52,31 @@ LEFT_SERVER=$(yq '.follower.left_arm.server_port' "$YAML")
 RIGHT_SERVER=$(yq '.follower.right_arm.server_port' "$YAML")
 cameras=$(yq -c '.cameras.configs' "$YAML")
 if [ "$RECORD_DEPTH" = "true" ]; then
-    # Enable use_depth on every RealSense-backed camera so RealSenseCamera
-    # actually opens a depth stream. Round-trip through proper JSON (yq -c
+    # Enable use_depth on every RealSense-backed and ZED camera so they
+    # actually capture depth. Round-trip through proper JSON (yq -c
     # emits compact YAML, which jq can't parse) before the jq patch, then
     # back to YAML-or-JSON-both-fine for draccus.
     cameras=$(yq -o=json -I=0 '.cameras.configs' "$YAML" | jq -c '
         with_entries(
-            if (.value.type? | tostring | startswith("intelrealsense"))
+            if (.value.type? | tostring | startswith("intelrealsense") or . == "zed")
             then .value.use_depth = true
             else .
             end
         )
     ')
 fi
+# Cameras marked `host: subprocess` run in their own process and hand frames
+# over through shared memory (SubprocessCameraConfig in lerobot_camera_cached).
+if [ "$(yq '[.cameras.configs[] | select(.host == "subprocess")] | length' "$YAML")" -gt 0 ]; then
+    cameras=$(echo "$cameras" | yq -o=json -I=0 '.' | jq -c '
+        map_values(
+            if .host == "subprocess"
+            then {type: "subprocess", camera: del(.host)}
+            else del(.host)
+            end
+        )
+    ')
+fi
 echo "Dataset repo: $REPO"
 echo "Dataset root: /home/ethrc/.cache/huggingface/lerobot/$REPO"
 echo "Task: $TASK"
@@ -79,8 +91,9 @@ if [ "$RECORD_DEPTH" = "true" ]; then
     fi
 fi
 
-PYTHONPATH=src uv run python -c "from utils.connection import _free_port; _free_port('$LEFT_PORT'); _free_port('$RIGHT_PORT'); _free_port(int('$LEFT_SERVER')); _free_port(int('$RIGHT_SERVER'))"
-bash third_party/i2rt/scripts/reset_all_can.sh
+PYTHONPATH=src uv run python -m utils.connection "$LEFT_PORT" "$RIGHT_PORT" "$LEFT_SERVER" "$RIGHT_SERVER"
+# Only bounces links that are down, bus-off or misconfigured.
+PYTHONPATH=src uv run python -m utils.can_health --reset-unhealthy "$LEFT_CAN" "$RIGHT_CAN"
 echo 1 | sudo tee /sys/bus/usb-serial/devices/ttyUSB0/latency_timer
 echo 1 | sudo tee /sys/bus/usb-serial/devices/ttyUSB1/latency_timer
 
@@ -3,9 +3,9 @@
 Installs two monkey-patches before delegating to lerobot.scripts.lerobot_record.main():
 
   1. BiYamsFollower.get_observation: after the normal observation is built,
-     pull the depth snapshot from each RealSenseCameraCached with
-     use_depth=True and stash it under a private __depth__.<cam_name> key
-     in the observation dict.
+     pull the depth snapshot from each RealSenseCameraCached or ZEDCamera
+     with use_depth=True and stash it under a private __depth__.<cam_name>
+     key in the observation dict.
 
   2. LeRobotDataset.add_frame: strip and divert any __depth__.* keys to a
      PNG-16 sidecar writer before upstream validation runs. LeRobotDataset
@@ -40,6 +40,7 @@ from lerobot_camera_cached.camera_realsense_cached import (  # noqa: E402
     RealSenseCameraCached,
 )
 from lerobot_camera_cached.depth_sidecar import DepthSidecar  # noqa: E402
+from lerobot_camera_zed.zed_camera import ZEDCamera  # noqa: E402
 from lerobot_robot_yams.bi_follower import BiYamsFollower  # noqa: E402
 
 logger = logging.getLogger(__name__)
@@ -88,7 +89,7 @@ def _install_get_observation_patch() -> None:
         if not with_cameras:
             return obs
         for cam_key, cam in self.cameras.items():
-            if isinstance(cam, RealSenseCameraCached) and cam.use_depth:
+            if isinstance(cam, (RealSenseCameraCached, ZEDCamera)) and cam.use_depth:
                 depth = cam.pop_depth_snapshot()
                 if depth is not None:
                     obs[DEPTH_KEY_PREFIX + cam_key] = depth
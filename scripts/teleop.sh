@@ -11,8 +11,9 @@ RIGHT_PORT=$(yq '.leader.right_arm.port' "$YAML")
 LEFT_SERVER=$(yq '.follower.left_arm.server_port' "$YAML")
 RIGHT_SERVER=$(yq '.follower.right_arm.server_port' "$YAML")
 cameras=$(yq -c '.cameras.configs' "$YAML")
-PYTHONPATH=src uv run python -c "from utils.connection import _free_port; _free_port('$LEFT_PORT'); _free_port('$RIGHT_PORT'); _free_port(int('$LEFT_SERVER')); _free_port(int('$RIGHT_SERVER'))"
-bash third_party/i2rt/scripts/reset_all_can.sh
+PYTHONPATH=src uv run python -m utils.connection "$LEFT_PORT" "$RIGHT_PORT" "$LEFT_SERVER" "$RIGHT_SERVER"
+# Only bounces links that are down, bus-off or misconfigured.
+PYTHONPATH=src uv run python -m utils.can_health --reset-unhealthy "$LEFT_CAN" "$RIGHT_CAN"
 echo 1 | sudo tee /sys/bus/usb-serial/devices/ttyUSB0/latency_timer
 echo 1 | sudo tee /sys/bus/usb-serial/devices/ttyUSB1/latency_timer
 
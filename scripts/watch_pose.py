@@ -1,10 +1,11 @@
 """Post-episode pose watcher.
 
-Run in the background during recording. Polls the LeRobot dataset videos
-dir every 2s; when a new episode_*.mp4 shows up, decodes the first 30
-frames, averages them, measures pose vs the committed topdown reference,
-and alerts on drift via terminal bell + colored stderr line. OK episodes
-log to outputs/logs/pose-watch.out only.
+Run in the background during recording. Subscribes to an EpisodeWatcher
+(utils/episode_watch.py) on the LeRobot dataset; when a topdown
+episode is finished it gets the mean of its first 30 frames, measures pose
+vs the committed topdown reference, and alerts on drift via terminal
+bell + colored stderr line. OK episodes log to outputs/logs/pose-watch.out
+only.
 
 Launched automatically by scripts/record.sh in the background. Self-exits
 when its parent PID dies, so a SIGKILL of record.sh does not leave an
@@ -18,17 +19,16 @@ import sys
 import time
 from pathlib import Path
 
-import cv2
-import numpy as np
-
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
-from utils.camera_pose import evaluate_pose, load_reference  # noqa: E402
+from utils.camera_pose import evaluate_pose, load_pose_reference  # noqa: E402
+from utils.episode_watch import EpisodeSample, EpisodeWatcher  # noqa: E402
 
 RED = "\033[31m"
 GREEN = "\033[32m"
 RESET = "\033[0m"
 BELL = "\a"
 
+# How often the parent pid is checked; inotify reports new episodes immediately.
 POLL_INTERVAL_S = 2.0
 FRAMES_TO_AVERAGE = 30
 ROOT = Path(__file__).resolve().parents[1]
@@ -43,33 +43,6 @@ def _handle_signal(*_args) -> None:
     _stop = True
 
 
-def _find_videos_dir(repo_root: Path) -> Path | None:
-    candidates = list((repo_root / "videos").glob("chunk-*/observation.images.topdown"))
-    return candidates[0] if candidates else None
-
-
-def _read_first_frames(mp4_path: Path, n: int) -> list[np.ndarray] | None:
-    cap = cv2.VideoCapture(str(mp4_path))
-    try:
-        frames: list[np.ndarray] = []
-        for _ in range(n):
-            ok, frame = cap.read()
-            if not ok:
-                return None
-            frames.append(frame)
-        return frames
-    finally:
-        cap.release()
-
-
-def _average(frames: list[np.ndarray]) -> np.ndarray:
-    return np.mean(np.stack(frames).astype(np.float32), axis=0).astype(np.uint8)
-
-
-def _episode_index(mp4_path: Path) -> str:
-    return mp4_path.stem.replace("episode_", "")
-
-
 def _log(message: str) -> None:
     ts = time.strftime("%H:%M:%S")
     line = f"[{ts}] {message}\n"
@@ -88,53 +61,37 @@ def main() -> int:
     signal.signal(signal.SIGINT, _handle_signal)
 
     repo_root = Path(args.repo_root)
-    reference = load_reference()
-    print(f"pose-watch: reference loaded, polling {repo_root}/videos/", file=sys.stderr)
+    reference = load_pose_reference()
+    print(f"pose-watch: reference loaded, watching {repo_root}/videos/", file=sys.stderr)
     _log(f"watcher started, repo_root={repo_root}")
 
-    seen: set[str] = set()
-    videos_dir: Path | None = None
-
-    while not _stop:
-        # Self-exit if parent died (SIGKILL of record.sh).
-        try:
-            os.kill(args.parent_pid, 0)
-        except ProcessLookupError:
-            _log("parent gone, exiting")
-            break
-
-        if videos_dir is None:
-            videos_dir = _find_videos_dir(repo_root)
-            if videos_dir is None:
-                time.sleep(POLL_INTERVAL_S)
-                continue
-
-        for mp4 in sorted(videos_dir.glob("episode_*.mp4")):
-            key = mp4.name
-            if key in seen:
-                continue
-            frames = _read_first_frames(mp4, FRAMES_TO_AVERAGE)
-            if frames is None:
-                # Mid-write: mp4 has fewer than FRAMES_TO_AVERAGE decodable
-                # frames right now. Skip — we'll retry next poll.
-                continue
-            seen.add(key)
-            avg = _average(frames)
-            pose, ok, msg = evaluate_pose(avg, reference)
-            ep = _episode_index(mp4)
-            if ok:
-                _log(f"ep{ep}: {msg}")
-                print(f"{GREEN}pose-watch ep{ep}: OK{RESET}", file=sys.stderr)
-            else:
-                _log(f"ep{ep}: {msg}")
-                print(
-                    f"{BELL}{RED}pose-watch ep{ep} DRIFT: "
-                    f"roll={pose.roll_deg:+.2f}° tx={pose.tx_px:+.2f}px ty={pose.ty_px:+.2f}px"
-                    f"{RESET}",
-                    file=sys.stderr,
-                )
-
-        time.sleep(POLL_INTERVAL_S)
+    def check_pose(sample: EpisodeSample) -> None:
+        pose, ok, msg = evaluate_pose(sample.mean, reference)
+        ep = sample.episode
+        _log(f"ep{ep}: {msg}")
+        if ok:
+            print(f"{GREEN}pose-watch ep{ep}: OK{RESET}", file=sys.stderr)
+        else:
+            print(
+                f"{BELL}{RED}pose-watch ep{ep} DRIFT: "
+                f"roll={pose.roll_deg:+.2f}° tx={pose.tx_px:+.2f}px ty={pose.ty_px:+.2f}px"
+                f"{RESET}",
+                file=sys.stderr,
+            )
+
+    watcher = EpisodeWatcher(repo_root, n_frames=FRAMES_TO_AVERAGE)
+    watcher.subscribe(check_pose)
+    try:
+        while not _stop:
+            # Self-exit if parent died (SIGKILL of record.sh).
+            try:
+                os.kill(args.parent_pid, 0)
+            except ProcessLookupError:
+                _log("parent gone, exiting")
+                break
+            watcher.poll(timeout_s=POLL_INTERVAL_S)
+    finally:
+        watcher.close()
 
     _log("watcher stopped")
     return 0
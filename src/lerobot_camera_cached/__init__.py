@@ -10,6 +10,10 @@ __all__ = [
     "OpenCVCameraCachedConfig",
     "RealSenseCameraCached",
     "RealSenseCameraCachedConfig",
+    "SubprocessCamera",
+    "SubprocessCameraConfig",
+    "V4L2CameraCached",
+    "V4L2CameraCachedConfig",
 ]
 
 
@@ -30,4 +34,20 @@ def __getattr__(name):
         from .realsense_cached_config import RealSenseCameraCachedConfig
 
         return RealSenseCameraCachedConfig
+    if name == "V4L2CameraCached":
+        from .camera_v4l2_cached import V4L2CameraCached
+
+        return V4L2CameraCached
+    if name == "V4L2CameraCachedConfig":
+        from .cached_config import V4L2CameraCachedConfig
+
+        return V4L2CameraCachedConfig
+    if name == "SubprocessCamera":
+        from .camera_host import SubprocessCamera
+
+        return SubprocessCamera
+    if name == "SubprocessCameraConfig":
+        from .cached_config import SubprocessCameraConfig
+
+        return SubprocessCameraConfig
     raise AttributeError(name)
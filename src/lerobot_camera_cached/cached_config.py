@@ -1,6 +1,12 @@
 from dataclasses import dataclass
 from lerobot.cameras.configs import CameraConfig
-from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
+
+from .lerobot_configs import import_config_module
+from utils.frame_output import output_hw
+
+OpenCVCameraConfig = import_config_module(
+    "lerobot.cameras.opencv.configuration_opencv"
+).OpenCVCameraConfig
 
 
 @CameraConfig.register_subclass("opencv-cached")
@@ -13,3 +19,46 @@ class OpenCVCameraCachedConfig(OpenCVCameraConfig):
     auto_exposure_max: int = 200
     auto_exposure_speed: float = 0.25
     auto_exposure_period_s: float = 0.5
+    # Keep MJPG frames compressed until async_read() needs them (fourcc: MJPG only).
+    compressed_passthrough: bool = False
+    # Publish raw frames and postprocess them in async_read(), once per frame read.
+    lazy_postprocess: bool = False
+    # Rate the frames are actually read at; faster captures are dropped unconverted.
+    consumer_fps: float | None = None
+    # Crop box (x, y, width, height) and size (width, height) of the frames handed
+    # out, applied in the capture thread; output_keep_full keeps the full frame
+    # as `frame.full` for recording.
+    output_crop: tuple[int, int, int, int] | None = None
+    output_size: tuple[int, int] | None = None
+    output_interpolation: str = "area"
+    output_keep_full: bool = False
+
+
+@CameraConfig.register_subclass("v4l2-cached")
+@dataclass
+class V4L2CameraCachedConfig(OpenCVCameraCachedConfig):
+    """Capture straight from /dev/videoN through the shared epoll thread."""
+
+    num_buffers: int = 4
+
+
+@CameraConfig.register_subclass("subprocess")
+@dataclass
+class SubprocessCameraConfig(CameraConfig):
+    """Run `camera` in its own process and read its frames through shared memory.
+
+    Depth snapshots (RealSense/ZED depth sidecars) stay in the worker and are
+    not forwarded.
+    """
+
+    camera: CameraConfig | None = None
+    ring_slots: int = 4
+    start_timeout_s: float = 30.0
+    start_method: str = "spawn"
+
+    def __post_init__(self) -> None:
+        if self.camera is None:
+            raise ValueError("SubprocessCameraConfig needs the `camera` config to run")
+        self.fps = self.camera.fps
+        # The worker hands back the inner camera's output frames.
+        self.height, self.width = output_hw(self.camera)
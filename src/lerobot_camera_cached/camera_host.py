@@ -0,0 +1,313 @@
+"""Run a camera in its own process and read its frames through shared memory.
+
+In the default setup every camera's capture, colour conversion, rotation and
+auto-exposure run as threads of the record process, next to the teleop loop
+and the dataset writer. With `SubprocessCameraConfig` the wrapped camera
+(opencv-cached, v4l2-cached, intelrealsense-cached, zed, ...) runs unchanged
+in a child process. That process writes every new frame into a FrameRing: a
+small ring of fixed-shape slots in POSIX shared memory, each tagged with a
+sequence number and its capture timestamp. SubprocessCamera is the proxy that
+lives in the robot process. Its async_read() maps the latest slot and copies
+it out, so a slow or crashing camera can no longer hold the GIL or stall the
+control path.
+"""
+
+import logging
+import multiprocessing
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Any, Callable
+
+import numpy as np
+from lerobot.cameras.camera import Camera
+from lerobot.utils.errors import DeviceNotConnectedError
+from numpy.typing import NDArray  # type: ignore  # TODO: add type stubs for numpy.typing
+
+from lerobot_camera_cached.cached_config import SubprocessCameraConfig
+
+logger = logging.getLogger(__name__)
+
+# Header words, then a (sequence, timestamp, checksum) triple per slot, then the frames.
+_WRITE_SEQ, _STATE, _HEADER_WORDS = 0, 1, 2
+STATE_STARTING, STATE_RUNNING, STATE_FAILED = 0, 1, 2
+_SEQ_AND_STAMP = struct.Struct("=Qd")
+
+
+def _checksum(seq: int, timestamp: float, frame: NDArray[Any]) -> int:
+    return zlib.crc32(frame, zlib.crc32(_SEQ_AND_STAMP.pack(seq, timestamp)))
+
+
+class FrameRing:
+    """Single-writer ring of (height, width, channels) uint8 frames in shared memory.
+
+    The writer stamps a slot with sequence 0 while filling it and publishes
+    the new sequence afterwards. A reader copies the latest slot and retries
+    if the slot's sequence changed underneath it (the writer lapped it).
+
+    Python has no memory fences, and on weakly ordered CPUs (aarch64) the
+    other process may see the sequence stores and the payload stores in any
+    order. So the sequence check is only the fast path: each slot also
+    carries a CRC32 of its sequence, timestamp and pixels, and a copy is
+    accepted only if it matches. A torn or half-visible frame fails the
+    check and is read again. The only assumption left is that an aligned
+    64-bit word is never seen half-written.
+    """
+
+    def __init__(
+        self, shm: shared_memory.SharedMemory, shape: tuple[int, ...], slots: int, owner: bool
+    ):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.slots = slots
+        self._owner = owner
+        meta_words = _HEADER_WORDS + slots
+        self._header = np.ndarray((meta_words,), dtype=np.uint64, buffer=shm.buf)
+        self._stamps = np.ndarray(
+            (slots,), dtype=np.float64, buffer=shm.buf, offset=8 * meta_words
+        )
+        self._checksums = np.ndarray(
+            (slots,), dtype=np.uint64, buffer=shm.buf, offset=8 * (meta_words + slots)
+        )
+        self._frames = np.ndarray(
+            (slots, *self.shape),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=8 * (meta_words + 2 * slots),
+        )
+        self._slot_seq = self._header[_HEADER_WORDS:]
+
+    @staticmethod
+    def nbytes(shape: tuple[int, ...], slots: int) -> int:
+        return 8 * (_HEADER_WORDS + 3 * slots) + slots * int(np.prod(shape))
+
+    @classmethod
+    def create(cls, shape: tuple[int, ...], slots: int = 4) -> "FrameRing":
+        if slots < 2:
+            raise ValueError("FrameRing needs at least two slots")
+        shm = shared_memory.SharedMemory(create=True, size=cls.nbytes(shape, slots))
+        ring = cls(shm, shape, slots, owner=True)
+        ring._header[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple[int, ...], slots: int) -> "FrameRing":
+        # Workers started through multiprocessing share the parent's resource
+        # tracker, so attaching does not make the segment die with the worker.
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, shape, slots, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def sequence(self) -> int:
+        return int(self._header[_WRITE_SEQ])
+
+    @property
+    def state(self) -> int:
+        return int(self._header[_STATE])
+
+    @state.setter
+    def state(self, value: int) -> None:
+        self._header[_STATE] = value
+
+    def write(self, frame: NDArray[Any], timestamp: float) -> int:
+        if frame.shape != self.shape:
+            raise ValueError(f"frame shape {frame.shape} does not match ring shape {self.shape}")
+        seq = self.sequence + 1
+        slot = seq % self.slots
+        self._slot_seq[slot] = 0
+        self._frames[slot] = frame
+        self._stamps[slot] = timestamp
+        self._checksums[slot] = _checksum(seq, timestamp, self._frames[slot])
+        self._slot_seq[slot] = seq
+        self._header[_WRITE_SEQ] = seq
+        return seq
+
+    def read_latest(self) -> tuple[int, float, NDArray[Any]] | None:
+        """(sequence, timestamp, frame copy) of the newest frame, or None before the first."""
+        while True:
+            seq = self.sequence
+            if seq == 0:
+                return None
+            slot = seq % self.slots
+            frame = self._frames[slot].copy()
+            timestamp = float(self._stamps[slot])
+            checksum = int(self._checksums[slot])
+            if int(self._slot_seq[slot]) == seq and _checksum(seq, timestamp, frame) == checksum:
+                return seq, timestamp, frame
+
+    def close(self) -> None:
+        # Drop the numpy views first, SharedMemory.close() refuses while they exist.
+        self._header = self._stamps = self._checksums = self._frames = self._slot_seq = None
+        self.shm.close()
+        if self._owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def make_camera(config: Any) -> Any:
+    from lerobot.cameras.utils import make_cameras_from_configs
+
+    return make_cameras_from_configs({"camera": config})["camera"]
+
+
+def camera_worker(
+    config: Any,
+    ring_name: str,
+    shape: tuple[int, ...],
+    slots: int,
+    stop_event: Any,
+    factory: Callable[[Any], Any] = make_camera,
+) -> None:
+    """Child-process entry point: connect the camera and publish every new frame."""
+    ring = FrameRing.attach(ring_name, shape, slots)
+    camera = None
+    try:
+        camera = factory(config)
+        camera.connect()
+        ring.state = STATE_RUNNING
+        previous = None
+        while not stop_event.is_set():
+            try:
+                frame = camera.async_read(timeout_ms=500)
+            except TimeoutError:
+                continue
+            # Cached cameras hand back the same array until a new frame lands.
+            if frame is previous:
+                time.sleep(0.002)
+                continue
+            previous = frame
+            timestamp = getattr(camera, "latest_timestamp", None) or time.perf_counter()
+            ring.write(frame, timestamp)
+    except Exception as e:
+        logger.error(f"Camera worker for {config} failed: {e}")
+        ring.state = STATE_FAILED
+    finally:
+        if camera is not None:
+            try:
+                camera.disconnect()
+            except Exception:
+                pass
+        ring.close()
+
+
+class SubprocessCamera(Camera):
+    """Proxy for a camera running in a child process, see SubprocessCameraConfig."""
+
+    factory: Callable[[Any], Any] = staticmethod(make_camera)
+
+    def __init__(self, config: SubprocessCameraConfig):
+        super().__init__(config)
+        self.config = config
+        self.shape = (config.height, config.width, 3)
+        self.ring: FrameRing | None = None
+        self.process: multiprocessing.Process | None = None
+        self.stop_event = None
+        self.latest_timestamp: float | None = None
+        self.last_frame = np.zeros(self.shape, np.uint8)
+        self._last_seq = 0
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}({self.config.camera})"
+
+    @property
+    def is_connected(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    @staticmethod
+    def find_cameras() -> list[dict[str, Any]]:
+        return []
+
+    def connect(self, warmup: bool = True) -> None:
+        ctx = multiprocessing.get_context(self.config.start_method)
+        self.ring = FrameRing.create(self.shape, self.config.ring_slots)
+        self.stop_event = ctx.Event()
+        self.process = ctx.Process(
+            target=camera_worker,
+            args=(
+                self.config.camera,
+                self.ring.name,
+                self.shape,
+                self.config.ring_slots,
+                self.stop_event,
+                type(self).factory,
+            ),
+            name=f"camera-{self.config.camera.type}",
+            daemon=True,
+        )
+        self.process.start()
+
+        deadline = time.monotonic() + self.config.start_timeout_s
+        while self.ring.sequence == 0:
+            if self.ring.state == STATE_FAILED or not self.process.is_alive():
+                self.disconnect()
+                raise ConnectionError(f"{self} worker failed to start, see its log output.")
+            if time.monotonic() > deadline:
+                self.disconnect()
+                raise ConnectionError(
+                    f"{self} produced no frame within {self.config.start_timeout_s} s."
+                )
+            time.sleep(0.01)
+        logger.info(f"{self} connected (pid {self.process.pid}).")
+
+    def _take_latest(self) -> NDArray[Any] | None:
+        latest = self.ring.read_latest()
+        if latest is None or latest[0] == self._last_seq:
+            return None
+        self._last_seq, self.latest_timestamp, frame = latest
+        self.last_frame = frame
+        return frame
+
+    def async_read(self, timeout_ms: float = 200) -> NDArray[Any]:
+        """Latest frame from the worker, or the previous one if it is still fresh.
+
+        Like OpenCVCameraCached, a frame younger than timeout_ms is returned
+        again rather than waiting for the next one.
+        """
+        if self.ring is None or self.process is None:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
+        frame = self._take_latest()
+        if frame is not None:
+            return frame
+        timeout_s = timeout_ms / 1000.0
+        age_s = time.perf_counter() - (self.latest_timestamp or float("-inf"))
+        if age_s <= timeout_s:
+            return self.last_frame
+
+        deadline = time.perf_counter() + timeout_s
+        while time.perf_counter() < deadline:
+            if not self.process.is_alive():
+                raise RuntimeError(f"{self} worker exited with code {self.process.exitcode}.")
+            time.sleep(0.001)
+            frame = self._take_latest()
+            if frame is not None:
+                return frame
+        raise TimeoutError(
+            f"Timed out waiting for frame from camera {self} after {timeout_ms} ms."
+        )
+
+    def read(self) -> NDArray[Any]:
+        return self.async_read(timeout_ms=1000)
+
+    def disconnect(self) -> None:
+        if self.process is None:
+            raise DeviceNotConnectedError(f"{self} not connected.")
+
+        self.stop_event.set()
+        self.process.join(timeout=5.0)
+        if self.process.is_alive():
+            logger.warning(f"{self} worker did not stop, terminating it.")
+            self.process.terminate()
+            self.process.join(timeout=1.0)
+        self.process = None
+        self.ring.close()
+        self.ring = None
+        self._last_seq = 0
+        logger.info(f"{self} disconnected.")
@@ -11,7 +11,10 @@ from numpy.typing import NDArray  # type: ignore  # TODO: add type stubs for num
 from typing import Any
 
 from lerobot_camera_cached.cached_config import OpenCVCameraCachedConfig
-from utils.camera_auto_exposure import CameraAutoExposure, get_exposure
+from lerobot_camera_cached.jpeg_frame import EncodedFrame
+from lerobot_camera_cached.lazy_frame import FrameDecimator, LazyFrame, materialize
+from utils.camera_auto_exposure import AsyncExposureSetter, CameraAutoExposure, get_exposure
+from utils.frame_output import FrameOutput, output_hw
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +25,8 @@ class OpenCVCameraCached(OpenCVCamera):
         self.config = config
         self.ready = False
         self.latest_frame_time = 0.0
-        self.last_frame = np.zeros([self.config.height, self.config.width, 3], np.uint8)
+        self.output = FrameOutput.from_config(config)
+        self.last_frame = np.zeros([*output_hw(config), 3], np.uint8)
         self.auto_exposure = self._build_auto_exposure()
 
     def async_read(self, timeout_ms: float = 200) -> NDArray[Any]:
@@ -56,6 +60,7 @@ class OpenCVCameraCached(OpenCVCamera):
             and frame is not None
             and time.monotonic() - self.latest_frame_time <= timeout_ms / 1000.0
         ):
+            frame = self._decoded(frame)
             self.last_frame = frame
             return frame
 
@@ -63,6 +68,7 @@ class OpenCVCameraCached(OpenCVCamera):
         if self.new_frame_event.wait(timeout=timeout_s):
             frame = self.latest_frame
             if frame is not None:
+                frame = self._decoded(frame)
                 self.ready = True
                 self.latest_frame_time = time.monotonic()
                 self.last_frame = frame
@@ -73,6 +79,21 @@ class OpenCVCameraCached(OpenCVCamera):
             f"Read thread alive: {self.thread.is_alive()}."
         )
 
+    def read_latest(self, max_age_ms: int = 500) -> NDArray[Any]:
+        return self._decoded(super().read_latest(max_age_ms))
+
+    def _decoded(self, frame: NDArray[Any] | EncodedFrame | LazyFrame) -> NDArray[Any]:
+        if isinstance(frame, EncodedFrame):
+            keep_jpeg = self.rotation is None and self.output is None
+            return frame.decode(self._postprocess_image, keep_jpeg=keep_jpeg)
+        return materialize(frame)
+
+    def _postprocess_image(self, image: NDArray[Any]) -> NDArray[Any]:
+        image = super()._postprocess_image(image)
+        if self.output is not None:
+            image = self.output.apply(image)
+        return image
+
     def connect(self, warmup: bool = True) -> None:
         last_error: Exception | None = None
         for attempt in range(3):
@@ -92,6 +113,20 @@ class OpenCVCameraCached(OpenCVCamera):
             raise last_error
         raise RuntimeError(f"{self} failed to connect.")
 
+    def disconnect(self) -> None:
+        try:
+            super().disconnect()
+        finally:
+            if self.auto_exposure is not None:
+                self.auto_exposure.close()
+
+    def _configure_capture_settings(self) -> None:
+        super()._configure_capture_settings()
+        if self.config.compressed_passthrough:
+            # Hand back the device's MJPG buffer undecoded; _read_loop checks
+            # that the backend honoured this.
+            self.videocapture.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
     def _build_auto_exposure(self) -> CameraAutoExposure | None:
         if isinstance(self.index_or_path, int):
             return None
@@ -112,6 +147,7 @@ class OpenCVCameraCached(OpenCVCamera):
             min_exposure=self.config.auto_exposure_min,
             max_exposure=self.config.auto_exposure_max,
             period_s=self.config.auto_exposure_period_s,
+            setter=AsyncExposureSetter(device),
         )
 
     def _reconnect_hardware(self, max_attempts: int = 10, retry_delay: float = 2.0) -> bool:
@@ -138,6 +174,8 @@ class OpenCVCameraCached(OpenCVCamera):
                     continue
                 self.videocapture = cap
                 self._configure_capture_settings()
+                if self.auto_exposure is not None:
+                    self.auto_exposure.close()
                 self.auto_exposure = self._build_auto_exposure()
                 logger.info(f"{self} reconnected on attempt {attempt + 1}.")
                 return True
@@ -147,31 +185,66 @@ class OpenCVCameraCached(OpenCVCamera):
         logger.error(f"{self} failed to reconnect after {max_attempts} attempts.")
         return False
 
+    def _publish_frame(
+        self, processed_frame: NDArray[Any] | EncodedFrame | LazyFrame, capture_time: float
+    ) -> None:
+        with self.frame_lock:
+            self.latest_frame = processed_frame
+            self.latest_timestamp = capture_time
+        self.new_frame_event.set()
+
+        if self.auto_exposure is not None and self.auto_exposure.due():
+            try:
+                if isinstance(processed_frame, (EncodedFrame, LazyFrame)):
+                    processed_frame = processed_frame.preview()
+                # An undecoded buffer with no cheap preview: wait for the next frame.
+                if processed_frame is not None:
+                    exposure = self.auto_exposure.tick(processed_frame)
+                    if exposure is not None:
+                        logger.info("%s exposure_time_absolute=%s", self, exposure)
+            except Exception as e:
+                logger.warning(f"{self} auto-exposure error, disabling: {e}")
+                self.auto_exposure = None
+
+    def _read_decimated(self, decimator: FrameDecimator) -> NDArray[Any] | None:
+        """Dequeue the next frame, but only decode it if `decimator` keeps it.
+
+        grab() takes the buffer off the driver queue; the MJPG decode and
+        colour conversion happen in retrieve(), which skipped frames never reach.
+        """
+        if self.videocapture is None:
+            raise DeviceNotConnectedError(f"{self} videocapture is not initialized")
+        if not self.videocapture.grab():
+            raise RuntimeError(f"{self} grab failed.")
+        if not decimator.keep(time.perf_counter()):
+            return None
+        ret, frame = self.videocapture.retrieve()
+        if not ret:
+            raise RuntimeError(f"{self} retrieve failed (status={ret}).")
+        return frame
+
     def _read_loop(self) -> None:
         if self.stop_event is None:
             raise RuntimeError(f"{self}: stop_event is not initialized before starting read loop.")
 
         failure_count = 0
+        decimator = FrameDecimator.from_config(self.config, self.fps)
         while not self.stop_event.is_set():
             try:
-                raw_frame = self._read_from_hardware()
-                processed_frame = self._postprocess_image(raw_frame)
-                capture_time = time.perf_counter()
-
-                with self.frame_lock:
-                    self.latest_frame = processed_frame
-                    self.latest_timestamp = capture_time
-                self.new_frame_event.set()
-
-                if self.auto_exposure is not None:
-                    try:
-                        exposure = self.auto_exposure.tick(processed_frame)
-                        if exposure is not None:
-                            logger.info("%s exposure_time_absolute=%s", self, exposure)
-                    except Exception as e:
-                        logger.warning(f"{self} auto-exposure error, disabling: {e}")
-                        self.auto_exposure = None
-
+                if decimator is None:
+                    raw_frame = self._read_from_hardware()
+                else:
+                    raw_frame = self._read_decimated(decimator)
+                    if raw_frame is None:
+                        failure_count = 0
+                        continue
+                if raw_frame.ndim != 3:
+                    processed_frame = EncodedFrame(raw_frame.tobytes())
+                elif self.config.lazy_postprocess:
+                    processed_frame = LazyFrame(raw_frame, self._postprocess_image)
+                else:
+                    processed_frame = self._postprocess_image(raw_frame)
+                self._publish_frame(processed_frame, time.perf_counter())
                 failure_count = 0
 
             except DeviceNotConnectedError:
@@ -3,16 +3,22 @@ import logging
 import re
 import threading
 import time
+from functools import partial
 from pathlib import Path
 from typing import Any
 
+import cv2
 import numpy as np
 import pyrealsense2 as rs
 from lerobot.cameras.realsense.camera_realsense import RealSenseCamera
 from numpy.typing import NDArray
 
+from .lazy_frame import FrameDecimator, LazyFrame, materialize
 from .realsense_cached_config import RealSenseCameraCachedConfig
+from .realsense_filters import FilterPipeline, build_stages
+from .realsense_profile import RealSenseProfileCache, profile_applied
 from utils.connection import _free_v4l_devices
+from utils.frame_output import FrameOutput, output_hw
 
 logger = logging.getLogger(__name__)
 UNSUPPORTED_PROFILE_KEY = re.compile(r"([A-Za-z0-9_-]+) key is not supported")
@@ -35,18 +41,33 @@ def _remove_unsupported_key(profile_text: str, error: Exception) -> str | None:
 
 
 class RealSenseCameraCached(RealSenseCamera):
+    profile_cache = RealSenseProfileCache()
+
     def __init__(self, config: RealSenseCameraCachedConfig):
         super().__init__(config)
         self.config = config
         self.ready = False
         self.latest_frame_time = 0.0
-        self.last_frame = np.zeros([self.config.height, self.config.width, 3], np.uint8)
+        self.output = FrameOutput.from_config(config)
+        self.depth_output = FrameOutput.from_config(config, depth=True)
+        self.last_frame = np.zeros([*output_hw(config), 3], np.uint8)
         # Depth snapshot captured atomically with the color frame returned by
         # async_read(). Callers (e.g. the record-with-depth sidecar writer)
         # pop it after each get_observation() so color and depth in the saved
         # dataset come from the same read-loop iteration.
         self._depth_snapshot_lock = threading.Lock()
         self._last_depth_snapshot: NDArray[Any] | None = None
+        # Built here so a bad filter config fails at construction; the worker
+        # thread runs alongside the read loop.
+        self.filter_stages = build_stages(
+            rs, config.depth_filters, config.depth_filter_options, config.align_depth_to_color
+        )
+        if "decimation" in config.depth_filters and self.depth_output is not None:
+            raise ValueError(
+                f"{self}: the decimation filter changes the depth resolution, which "
+                "output_crop/output_size are given in; use output_size alone instead."
+            )
+        self.filters: FilterPipeline | None = None
 
     def _find_device(self) -> Any:
         for device in rs.context().query_devices():
@@ -78,7 +99,15 @@ class RealSenseCameraCached(RealSenseCamera):
         if not profile_path:
             return
 
-        profile_text = Path(profile_path).read_text()
+        source_text = Path(profile_path).read_text()
+        device = self._wait_for_device()
+        firmware = device.get_info(rs.camera_info.firmware_version)
+        profile_text = self.profile_cache.cleaned(source_text, firmware)
+        advanced = rs.rs400_advanced_mode(device)
+        if advanced.is_enabled() and profile_applied(profile_text, advanced.serialize_json()):
+            logger.info("%s already runs the RealSense profile from %s", self, profile_path)
+            return
+
         busy_retry = True
         for _ in range(20):
             device = self._wait_for_device()
@@ -104,6 +133,7 @@ class RealSenseCameraCached(RealSenseCamera):
                 raise
         else:
             raise RuntimeError(f"{self} profile load failed after dropping unsupported keys.")
+        self.profile_cache.store(source_text, firmware, profile_text)
         logger.info("Loaded RealSense profile from %s", profile_path)
 
     def _snapshot_pair_locked(self) -> NDArray[Any] | None:
@@ -113,13 +143,15 @@ class RealSenseCameraCached(RealSenseCamera):
         _last_depth_snapshot. The parent class's _read_loop updates color
         and depth together under the same lock, so pairs snapshotted here
         come from one read-loop iteration — no drift between the channels
-        that get persisted as the "same frame" of the dataset.
+        that get persisted as the "same frame" of the dataset. Pending
+        lazy postprocessing runs here, outside the lock.
         """
         with self.frame_lock:
             color = self.latest_color_frame
             depth = self.latest_depth_frame if self.use_depth else None
+        color = materialize(color)
         if depth is not None:
-            depth_copy = depth.copy()
+            depth_copy = materialize(depth).copy()
             with self._depth_snapshot_lock:
                 self._last_depth_snapshot = depth_copy
         return color
@@ -131,6 +163,28 @@ class RealSenseCameraCached(RealSenseCamera):
             self._last_depth_snapshot = None
         return snap
 
+    def _postprocess_image(self, image: NDArray[Any], depth_frame: bool = False) -> NDArray[Any]:
+        if depth_frame and image.shape[:2] != (self.capture_height, self.capture_width):
+            # Decimated depth: the parent's size check doesn't apply, rotation does.
+            if self.rotation in [
+                cv2.ROTATE_90_CLOCKWISE,
+                cv2.ROTATE_90_COUNTERCLOCKWISE,
+                cv2.ROTATE_180,
+            ]:
+                image = cv2.rotate(image, self.rotation)
+        else:
+            image = super()._postprocess_image(image, depth_frame=depth_frame)
+        output = self.depth_output if depth_frame else self.output
+        if output is not None:
+            image = output.apply(image)
+        return image
+
+    def read_latest(self, max_age_ms: int = 500) -> NDArray[Any]:
+        return materialize(super().read_latest(max_age_ms))
+
+    def read_depth(self, timeout_ms: int = 200) -> NDArray[Any]:
+        return materialize(super().read_depth(timeout_ms))
+
     def async_read(self, timeout_ms: float = 200) -> NDArray[Any]:
         if self.thread is None or not self.thread.is_alive():
             raise RuntimeError(f"{self} read thread is not running.")
@@ -179,34 +233,80 @@ class RealSenseCameraCached(RealSenseCamera):
             raise last_error
         raise RuntimeError(f"{self} failed to connect.")
 
+    def _start_filters(self) -> FilterPipeline | None:
+        if not self.filter_stages:
+            return None
+        if not self.use_depth:
+            logger.info(f"{self} has depth filters configured but use_depth off; not filtering.")
+            return None
+        if self.config.filter_budget_ms is not None:
+            budget_s = self.config.filter_budget_ms / 1e3
+        else:
+            budget_s = 1.0 / (self.fps or 30)
+        return FilterPipeline(
+            self.filter_stages, self._publish_frames, budget_s, name=f"{self}_filters"
+        )
+
+    def filter_metrics(self) -> dict[str, Any]:
+        """Per-stage timings, drops and latency of the depth filter worker, if any."""
+        return self.filters.metrics() if self.filters is not None else {}
+
+    def _publish_frames(
+        self, color_frame_raw: Any, depth_frame_raw: Any, capture_time: float | None = None
+    ) -> None:
+        """Postprocess (or wrap, when lazy) one colour/depth pair and publish it together."""
+        lazy = self.config.lazy_postprocess
+        color_frame = np.asanyarray(color_frame_raw.get_data())
+        if lazy:
+            processed_color_frame = LazyFrame(color_frame, self._postprocess_image)
+        else:
+            processed_color_frame = self._postprocess_image(color_frame)
+
+        if self.use_depth:
+            depth_frame = np.asanyarray(depth_frame_raw.get_data())
+            postprocess_depth = partial(self._postprocess_image, depth_frame=True)
+            if lazy:
+                processed_depth_frame = LazyFrame(depth_frame, postprocess_depth)
+            else:
+                processed_depth_frame = postprocess_depth(depth_frame)
+
+        if capture_time is None:
+            capture_time = time.perf_counter()
+        with self.frame_lock:
+            self.latest_color_frame = processed_color_frame
+            if self.use_depth:
+                self.latest_depth_frame = processed_depth_frame
+            self.latest_timestamp = capture_time
+        self.new_frame_event.set()
+
     def _read_loop(self) -> None:
         failure_count = 0
-        while True:
-            stop_event = self.stop_event
-            if stop_event is None or stop_event.is_set():
-                break
-            try:
-                frame = self._read_from_hardware()
-                color_frame_raw = frame.get_color_frame()
-                color_frame = np.asanyarray(color_frame_raw.get_data())
-                processed_color_frame = self._postprocess_image(color_frame)
-
-                if self.use_depth:
-                    depth_frame_raw = frame.get_depth_frame()
-                    depth_frame = np.asanyarray(depth_frame_raw.get_data())
-                    processed_depth_frame = self._postprocess_image(depth_frame, depth_frame=True)
-
-                capture_time = time.perf_counter()
-                with self.frame_lock:
-                    self.latest_color_frame = processed_color_frame
-                    if self.use_depth:
-                        self.latest_depth_frame = processed_depth_frame
-                    self.latest_timestamp = capture_time
-                self.new_frame_event.set()
-                failure_count = 0
-            except Exception as e:
-                if failure_count <= 10:
-                    failure_count += 1
-                    logger.warning(f"Error reading frame in background thread for {self}: {e}")
-                else:
-                    raise RuntimeError(f"{self} exceeded maximum consecutive read failures.") from e
+        decimator = FrameDecimator.from_config(self.config, self.fps)
+        self.filters = filters = self._start_filters()
+        try:
+            while True:
+                stop_event = self.stop_event
+                if stop_event is None or stop_event.is_set():
+                    break
+                try:
+                    frame = self._read_from_hardware()
+                    if decimator is not None and not decimator.keep(time.perf_counter()):
+                        failure_count = 0
+                        continue
+                    if filters is not None:
+                        filters.submit(frame, time.perf_counter())
+                    else:
+                        depth_frame_raw = frame.get_depth_frame() if self.use_depth else None
+                        self._publish_frames(frame.get_color_frame(), depth_frame_raw)
+                    failure_count = 0
+                except Exception as e:
+                    if failure_count <= 10:
+                        failure_count += 1
+                        logger.warning(f"Error reading frame in background thread for {self}: {e}")
+                    else:
+                        raise RuntimeError(
+                            f"{self} exceeded maximum consecutive read failures."
+                        ) from e
+        finally:
+            if filters is not None:
+                filters.close()
@@ -0,0 +1,130 @@
+import logging
+import time
+from typing import Any
+
+from lerobot.utils.errors import DeviceNotConnectedError
+from numpy.typing import NDArray  # type: ignore  # TODO: add type stubs for numpy.typing
+
+from lerobot_camera_cached.cached_config import V4L2CameraCachedConfig
+from lerobot_camera_cached.camera_opencv_cached import OpenCVCameraCached
+from lerobot_camera_cached.jpeg_frame import EncodedFrame
+from lerobot_camera_cached.lazy_frame import FrameDecimator, LazyFrame
+from lerobot_camera_cached.v4l2_capture import (
+    V4L2CaptureEngine,
+    V4L2Device,
+    decode_frame,
+    preview_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class V4L2CameraCached(OpenCVCameraCached):
+    """OpenCVCameraCached fed by the shared epoll capture thread instead of a per-camera thread.
+
+    async_read() and the cached-frame behaviour are inherited unchanged;
+    latest_timestamp is the kernel capture time of the frame.
+    """
+
+    def __init__(self, config: V4L2CameraCachedConfig):
+        super().__init__(config)
+        self.device: V4L2Device | None = None
+        self.engine: V4L2CaptureEngine | None = None
+        self.decimator: FrameDecimator | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.device is not None
+
+    def connect(self, warmup: bool = True) -> None:
+        last_error: Exception | None = None
+        for attempt in range(3):
+            try:
+                self._open_device()
+                break
+            except Exception as e:
+                last_error = e
+                logger.warning(f"{self} connect attempt {attempt + 1}/3 failed: {e}")
+                self._close_device()
+                time.sleep(0.2)
+        else:
+            raise ConnectionError(f"Failed to open {self}: {last_error}")
+
+        if warmup and self.warmup_s > 0:
+            start_time = time.time()
+            while time.time() - start_time < self.warmup_s:
+                self.async_read(timeout_ms=self.warmup_s * 1000)
+                time.sleep(0.1)
+            with self.frame_lock:
+                if self.latest_frame is None:
+                    raise ConnectionError(f"{self} failed to capture frames during warmup.")
+
+        logger.info(f"{self} connected.")
+
+    def _open_device(self) -> None:
+        self.device = V4L2Device(
+            self.index_or_path,
+            self.capture_width,
+            self.capture_height,
+            self.fps,
+            pixel_format=self.config.fourcc or "MJPG",
+            num_buffers=self.config.num_buffers,
+        )
+        if (self.device.width, self.device.height) != (self.capture_width, self.capture_height):
+            raise RuntimeError(
+                f"{self} negotiated {self.device.width}x{self.device.height}, "
+                f"requested {self.capture_width}x{self.capture_height}"
+            )
+        self.decimator = FrameDecimator.from_config(self.config, self.fps)
+        self.engine = V4L2CaptureEngine.shared()
+        self.engine.add(self.device, self._on_frame)
+        self.thread = self.engine.thread
+
+    def _close_device(self) -> None:
+        if self.device is None:
+            return
+        if self.engine is not None:
+            self.engine.remove(self.device)
+        self.device.close()
+        self.device = None
+        self.thread = None
+
+    def _on_frame(self, data: memoryview, capture_time: float) -> None:
+        if self.decimator is not None and not self.decimator.keep(capture_time):
+            return
+        # The mmap buffer is requeued after this call, so deferred work keeps a copy.
+        if self.config.compressed_passthrough and self.device.pixel_format == "MJPG":
+            self._publish_frame(EncodedFrame(bytes(data)), capture_time)
+        elif self.config.lazy_postprocess:
+            self._publish_frame(
+                LazyFrame(bytes(data), self._decode_and_postprocess, self._preview), capture_time
+            )
+        else:
+            self._publish_frame(self._decode_and_postprocess(data), capture_time)
+
+    def _decode_and_postprocess(self, data: bytes | memoryview) -> NDArray[Any]:
+        image = decode_frame(data, self.device.pixel_format, self.device.width, self.device.height)
+        return self._postprocess_image(image)
+
+    def _preview(self, data: bytes) -> NDArray[Any] | None:
+        return preview_frame(data, self.device.pixel_format, self.device.width, self.device.height)
+
+    def disconnect(self) -> None:
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} not connected.")
+
+        self._close_device()
+        with self.frame_lock:
+            self.latest_frame = None
+            self.latest_timestamp = None
+            self.new_frame_event.clear()
+        self.ready = False
+        if self.auto_exposure is not None:
+            self.auto_exposure.close()
+
+        logger.info(f"{self} disconnected.")
+
+    def async_read(self, timeout_ms: float = 200) -> NDArray[Any]:
+        if self.device is None:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+        return super().async_read(timeout_ms)
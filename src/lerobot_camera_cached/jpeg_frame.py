@@ -0,0 +1,67 @@
+"""Compressed-passthrough frames for MJPEG cameras.
+
+With `compressed_passthrough` the capture thread keeps the JPEG bytes the
+device sent and publishes an EncodedFrame instead of decoding every frame.
+The frame is decoded the first time a consumer asks for it (async_read) and
+at most once, so frames that nobody reads are never decoded. The decoded
+image is a JpegFrame: a plain ndarray that also carries the original bytes,
+so consumers that would re-encode it (the live plot preview, trajectory JPEG
+saving) can reuse them.
+"""
+
+import threading
+from typing import Any, Callable
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray  # type: ignore  # TODO: add type stubs for numpy.typing
+
+
+class JpegFrame(np.ndarray):
+    """Decoded frame that remembers the JPEG it came from.
+
+    `jpeg` is only set on the array returned by the decode; slices, copies
+    and arithmetic results are new images and get None.
+    """
+
+    jpeg: bytes | None
+
+    def __array_finalize__(self, obj: Any) -> None:
+        self.jpeg = None
+
+
+class EncodedFrame:
+    """A raw MJPEG buffer from the device that is decoded on first use."""
+
+    __slots__ = ("data", "_decoded", "_lock")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._decoded: NDArray[Any] | None = None
+        self._lock = threading.Lock()
+
+    def decode(
+        self, postprocess: Callable[[NDArray[Any]], NDArray[Any]], keep_jpeg: bool = True
+    ) -> NDArray[Any]:
+        """BGR-decode and postprocess once; later calls return the same array.
+
+        keep_jpeg should be False when postprocess changes the geometry
+        (rotation), since the bytes would no longer match the image.
+        """
+        with self._lock:
+            if self._decoded is None:
+                image = cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if image is None:
+                    raise RuntimeError("corrupt MJPG frame")
+                decoded = postprocess(image)
+                # Array subclasses (FullResFrame) carry their own metadata and
+                # never match the JPEG geometry; keep them as they are.
+                if type(decoded) is np.ndarray:
+                    decoded = decoded.view(JpegFrame)
+                    decoded.jpeg = self.data if keep_jpeg else None
+                self._decoded = decoded
+            return self._decoded
+
+    def preview(self) -> NDArray[Any]:
+        """Quarter-resolution BGR decode, enough for brightness estimates."""
+        return cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_REDUCED_COLOR_4)
@@ -0,0 +1,95 @@
+"""Lazy postprocessing and consumer-rate decimation for cached cameras.
+
+The read threads run at device FPS, but the dataset loop reads the latest
+frame at its own, usually lower, rate; everything in between is overwritten
+unread. With `lazy_postprocess` the read thread publishes a LazyFrame (the
+raw buffer plus the function that would have turned it into the published
+image) and the work runs on the consumer's thread, once per frame actually
+read. With a `consumer_fps` hint the read thread also stops touching frames
+that arrive faster than that: they are still dequeued, so the device queue
+never backs up, but nothing is converted or published.
+"""
+
+import math
+import threading
+from typing import Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray  # type: ignore  # TODO: add type stubs for numpy.typing
+
+
+class LazyFrame:
+    """A captured buffer whose postprocessing runs on first use, at most once."""
+
+    __slots__ = ("raw", "_process", "_preview", "_result", "_lock")
+
+    def __init__(
+        self,
+        raw: Any,
+        process: Callable[[Any], NDArray[Any]],
+        preview: Callable[[Any], NDArray[Any] | None] | None = None,
+    ):
+        self.raw = raw
+        self._process = process
+        self._preview = preview
+        self._result: NDArray[Any] | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> NDArray[Any]:
+        """Postprocess once; concurrent and later calls return the same array."""
+        with self._lock:
+            if self._result is None:
+                self._result = self._process(self.raw)
+                # Drop the raw buffer: for RealSense it pins a librealsense frame.
+                self.raw = None
+            return self._result
+
+    def preview(self) -> NDArray[Any] | None:
+        """The image as far as it has been processed, for brightness estimates.
+
+        Unprocessed buffers go through the `preview` callable if one was given;
+        without one, only a raw ndarray is usable and anything else is None.
+        """
+        # get() sets the result before dropping raw, so reading raw first
+        # leaves at least one of the two set.
+        raw = self.raw
+        result = self._result
+        if result is not None:
+            return result
+        if self._preview is not None:
+            return self._preview(raw)
+        return raw if isinstance(raw, np.ndarray) else None
+
+
+def materialize(frame: Any) -> Any:
+    """The published image for `frame`, running its postprocessing if still pending."""
+    if isinstance(frame, LazyFrame):
+        return frame.get()
+    return frame
+
+
+class FrameDecimator:
+    """Decides which captures are worth publishing for a consumer reading at `consumer_fps`.
+
+    A frame is kept once a consumer period has passed since the last kept
+    one, less half a device period, so a 60 fps device read at 30 Hz keeps
+    every second frame even with arrival jitter. The consumer then sees
+    frames up to one consumer period old instead of one device period.
+    """
+
+    def __init__(self, consumer_fps: float, device_fps: float | None = None):
+        slack = 0.5 / device_fps if device_fps else 0.0
+        self.min_interval = max(0.0, 1.0 / consumer_fps - slack)
+        self.last_kept = -math.inf
+
+    @classmethod
+    def from_config(cls, config: Any, device_fps: float | None) -> "FrameDecimator | None":
+        if not config.consumer_fps:
+            return None
+        return cls(config.consumer_fps, device_fps)
+
+    def keep(self, now: float) -> bool:
+        if now - self.last_kept < self.min_interval:
+            return False
+        self.last_kept = now
+        return True
@@ -0,0 +1,42 @@
+"""Import lerobot camera configuration modules without their camera classes.
+
+`lerobot.cameras.opencv` and `lerobot.cameras.realsense` import the camera
+implementation (and with it cv2 / pyrealsense2) from their package __init__,
+so merely subclassing their config dataclasses would load the SDKs during
+plugin discovery. Their `configuration_*` modules only need
+`lerobot.cameras.configs`, so they are loaded here directly from the file
+under their real module name. When the package is imported later it finds
+the module in sys.modules and nothing is registered twice.
+"""
+
+import importlib
+import importlib.util
+import logging
+import sys
+from pathlib import Path
+from types import ModuleType
+
+logger = logging.getLogger(__name__)
+
+
+def import_config_module(module_name: str) -> ModuleType:
+    """Import e.g. "lerobot.cameras.realsense.configuration_realsense" without its package."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    package, _, leaf = module_name.rpartition(".")
+    if package in sys.modules:
+        return importlib.import_module(module_name)
+
+    try:
+        grandparent, _, subpackage = package.rpartition(".")
+        parent_spec = importlib.util.find_spec(grandparent)
+        path = Path(parent_spec.submodule_search_locations[0]) / subpackage / f"{leaf}.py"
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    except Exception as e:
+        sys.modules.pop(module_name, None)
+        logger.debug(f"Falling back to a full import of {module_name}: {e}")
+        return importlib.import_module(module_name)
+    return module
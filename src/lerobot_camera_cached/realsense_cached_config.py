@@ -1,11 +1,37 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from lerobot.cameras.configs import CameraConfig
-from lerobot.cameras.realsense.configuration_realsense import RealSenseCameraConfig
+
+from .lerobot_configs import import_config_module
+
+RealSenseCameraConfig = import_config_module(
+    "lerobot.cameras.realsense.configuration_realsense"
+).RealSenseCameraConfig
 
 
 @CameraConfig.register_subclass("intelrealsense-cached")
 @dataclass
 class RealSenseCameraCachedConfig(RealSenseCameraConfig):
     profile_path: str | Path | None = str(Path(__file__).resolve().parents[2] / "configs" / "realsense.json")
+    # Publish raw color/depth and postprocess them in async_read(), once per frame read.
+    lazy_postprocess: bool = False
+    # Rate the frames are actually read at; faster framesets are dropped unconverted.
+    consumer_fps: float | None = None
+    # Crop box (x, y, width, height) and size (width, height) of the frames handed
+    # out, applied in the capture thread (depth uses nearest-neighbour);
+    # output_keep_full keeps the full frame as `frame.full` for recording.
+    output_crop: tuple[int, int, int, int] | None = None
+    output_size: tuple[int, int] | None = None
+    output_interpolation: str = "area"
+    output_keep_full: bool = False
+    # librealsense depth filters run on a worker thread after capture, in this
+    # order: any of "decimation", "spatial", "temporal", "hole_filling".
+    # depth_filter_options sets rs.option values per filter, e.g.
+    # {"spatial": {"filter_magnitude": 3}}. align_depth_to_color runs first.
+    depth_filters: tuple[str, ...] = ()
+    depth_filter_options: dict[str, dict[str, float]] = field(default_factory=dict)
+    align_depth_to_color: bool = False
+    # Capture-to-publish latency allowed for filtered frames (default: one
+    # frame period); slower stages are dropped until the chain fits again.
+    filter_budget_ms: float | None = None
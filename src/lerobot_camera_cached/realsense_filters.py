@@ -0,0 +1,260 @@
+"""librealsense post-processing filters, run on a worker thread after capture.
+
+The read loop only waits for framesets; FilterPipeline takes them over a
+newest-wins queue and runs align-to-colour and the depth filter chain
+(decimation, spatial, temporal, hole filling) before publishing the
+colour/depth pair together. Latency is bounded two ways: framesets that
+waited longer than the budget are dropped unfiltered, and when the chain
+itself takes longer than the budget the most expensive droppable stage is
+switched off until there is headroom again. Stages that change the depth
+geometry (align, decimation) are never dropped, so the recorded depth keeps
+one shape for the whole episode.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEPTH_FILTERS = {
+    "decimation": "decimation_filter",
+    "spatial": "spatial_filter",
+    "temporal": "temporal_filter",
+    "hole_filling": "hole_filling_filter",
+}
+# Filters whose output has a different size than their input.
+_GEOMETRY_FILTERS = frozenset({"decimation"})
+
+_EMA_ALPHA = 0.1
+# A dropped stage comes back once the chain plus that stage (at the cost it
+# had when dropped) fits in this fraction of the budget, for this many
+# frames in a row.
+_RECOVER_HEADROOM = 0.9
+_RECOVER_FRAMES = 60
+
+
+@dataclass
+class FilterStage:
+    """One processing block and its timing.
+
+    `frameset` stages (align) take and return the whole frameset; the others
+    process the depth frame only.
+    """
+
+    name: str
+    block: Any
+    droppable: bool = True
+    frameset: bool = False
+    enabled: bool = True
+    frames: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    ema_s: float = 0.0
+
+    def run(self, frame: Any) -> tuple[Any, float]:
+        start = time.perf_counter()
+        out = self.block.process(frame)
+        elapsed = time.perf_counter() - start
+        self.frames += 1
+        self.total_s += elapsed
+        self.max_s = max(self.max_s, elapsed)
+        if self.frames == 1:
+            self.ema_s = elapsed
+        else:
+            self.ema_s += _EMA_ALPHA * (elapsed - self.ema_s)
+        if self.frameset:
+            out = out.as_frameset()
+        return out, elapsed
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "frames": self.frames,
+            "mean_ms": 1e3 * self.total_s / self.frames if self.frames else 0.0,
+            "ema_ms": 1e3 * self.ema_s,
+            "max_ms": 1e3 * self.max_s,
+        }
+
+
+def build_stages(
+    rs: Any,
+    names: Sequence[str],
+    options: dict[str, dict[str, float]] | None = None,
+    align_to_color: bool = False,
+) -> list[FilterStage]:
+    """Instantiate the configured filters, align first, the rest in the given order.
+
+    `options` maps a filter name to rs.option names and values, e.g.
+    {"spatial": {"filter_magnitude": 3, "filter_smooth_alpha": 0.4}}.
+    """
+    options = options or {}
+    unknown = [name for name in [*names, *options] if name not in DEPTH_FILTERS]
+    if unknown:
+        raise ValueError(
+            f"Unknown depth filters {unknown}; expected some of {list(DEPTH_FILTERS)}."
+        )
+    for name in options:
+        if name not in names:
+            raise ValueError(
+                f"depth_filter_options given for {name!r}, which is not in depth_filters."
+            )
+    if len(set(names)) != len(names):
+        raise ValueError(f"depth_filters lists a filter more than once: {list(names)}")
+
+    stages = []
+    if align_to_color:
+        stages.append(
+            FilterStage("align", rs.align(rs.stream.color), droppable=False, frameset=True)
+        )
+    for name in names:
+        block = getattr(rs, DEPTH_FILTERS[name])()
+        for option, value in options.get(name, {}).items():
+            block.set_option(getattr(rs.option, option), value)
+        stages.append(FilterStage(name, block, droppable=name not in _GEOMETRY_FILTERS))
+    return stages
+
+
+class FilterPipeline:
+    """Worker thread that filters framesets and hands (color, depth) frames to `publish`.
+
+    submit() never blocks the capture thread: with the queue full the oldest
+    pending frameset is dropped. `publish(color, depth, capture_time)` runs on
+    the worker thread with the filtered rs frames.
+    """
+
+    def __init__(
+        self,
+        stages: list[FilterStage],
+        publish: Callable[[Any, Any, float], None],
+        budget_s: float,
+        queue_size: int = 1,
+        name: str = "realsense-filters",
+    ):
+        self.stages = stages
+        self.publish = publish
+        self.budget_s = budget_s
+        self.queue_size = queue_size
+        self.name = name
+        self.frames = 0
+        self.dropped = 0
+        self.stale = 0
+        self.errors = 0
+        self.latency_ema_s = 0.0
+        self._chain_ema_s = 0.0
+        self._dropped_stages: list[FilterStage] = []
+        self._headroom_frames = 0
+        self._pending: collections.deque[tuple[Any, float]] = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, frameset: Any, capture_time: float) -> None:
+        # Frames normally return to librealsense's pool when the pipeline
+        # moves on; keep() lets this one outlive the capture iteration.
+        frameset.keep()
+        with self._cond:
+            if len(self._pending) >= self.queue_size:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append((frameset, capture_time))
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                frameset, capture_time = self._pending.popleft()
+            if time.perf_counter() - capture_time > self.budget_s:
+                self.stale += 1
+                continue
+            try:
+                color, depth = self.process(frameset)
+                self.publish(color, depth, capture_time)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"{self.name}: filtering frameset failed: {e}")
+                continue
+            self.frames += 1
+            latency = time.perf_counter() - capture_time
+            self.latency_ema_s += _EMA_ALPHA * (latency - self.latency_ema_s)
+
+    def process(self, frameset: Any) -> tuple[Any, Any]:
+        """Run the enabled stages on one frameset; returns (color, depth) frames."""
+        depth = None
+        chain_s = 0.0
+        for stage in self.stages:
+            if not stage.enabled:
+                continue
+            if stage.frameset:
+                frameset, elapsed = stage.run(frameset)
+            else:
+                if depth is None:
+                    depth = frameset.get_depth_frame()
+                depth, elapsed = stage.run(depth)
+            chain_s += elapsed
+        if depth is None:
+            depth = frameset.get_depth_frame()
+        self._adapt(chain_s)
+        return frameset.get_color_frame(), depth
+
+    def _adapt(self, chain_s: float) -> None:
+        """Drop the most expensive stage while over budget; restore it with headroom."""
+        self._chain_ema_s += _EMA_ALPHA * (chain_s - self._chain_ema_s)
+        if self._chain_ema_s > self.budget_s:
+            self._headroom_frames = 0
+            candidates = [s for s in self.stages if s.enabled and s.droppable]
+            if candidates:
+                stage = max(candidates, key=lambda s: s.ema_s)
+                stage.enabled = False
+                self._dropped_stages.append(stage)
+                logger.warning(
+                    f"{self.name}: filters take {1e3 * self._chain_ema_s:.1f} ms of a "
+                    f"{1e3 * self.budget_s:.1f} ms budget, dropping {stage.name} "
+                    f"({1e3 * stage.ema_s:.1f} ms)"
+                )
+                # Take the stage's cost off right away so that staying over
+                # budget for a few more frames doesn't drop further stages.
+                self._chain_ema_s = max(0.0, self._chain_ema_s - stage.ema_s)
+            return
+        if not self._dropped_stages:
+            return
+        stage = self._dropped_stages[-1]
+        if self._chain_ema_s + stage.ema_s < _RECOVER_HEADROOM * self.budget_s:
+            self._headroom_frames += 1
+        else:
+            self._headroom_frames = 0
+        if self._headroom_frames >= _RECOVER_FRAMES:
+            self._dropped_stages.pop()
+            stage.enabled = True
+            self._headroom_frames = 0
+            logger.info(f"{self.name}: re-enabling {stage.name}")
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "stale": self.stale,
+            "errors": self.errors,
+            "latency_ms": 1e3 * self.latency_ema_s,
+            "chain_ms": 1e3 * self._chain_ema_s,
+            "stages": {stage.name: stage.metrics() for stage in self.stages},
+        }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
@@ -0,0 +1,109 @@
+"""Advanced-mode profile bookkeeping that makes RealSense reconnects cheap.
+
+Loading configs/realsense.json is the slow part of connecting a D4xx:
+load_json can be refused for keys the firmware doesn't know (each one costs
+a retry), and a busy device gets a hardware reset. Two things avoid that on
+a warm reconnect:
+
+  - the device's current settings (serialize_json) are compared with the
+    profile first, and load_json is skipped when they already match;
+  - the profile as the firmware accepted it, unsupported keys stripped, is
+    cached on disk keyed by the profile text and firmware version, so the
+    stripping retries happen once per firmware rather than per connect.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from utils.disk_cache import CACHE_ROOT, cache_key, read_cache, write_cache
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_DIR = CACHE_ROOT / "realsense_profiles"
+_FORMAT_VERSION = 1
+# Controls the firmware keeps adjusting while their auto mode is on (auto
+# exposure drives gain as well), so the device's current value says nothing
+# about whether the profile was applied.
+_AUTO_OVERRIDES = {
+    "controls-autoexposure-auto": ("controls-autoexposure-manual", "controls-depth-gain"),
+    "controls-color-autoexposure-auto": (
+        "controls-color-autoexposure-manual",
+        "controls-color-gain",
+    ),
+    "controls-color-white-balance-auto": ("controls-color-white-balance-manual",),
+}
+
+
+def profile_fingerprint(profile_text: str, firmware: str) -> str:
+    return cache_key(_FORMAT_VERSION, firmware, profile_text)
+
+
+def _parameters(profile: dict) -> dict:
+    # Viewer-exported profiles nest the settings under "parameters"; older
+    # ones keep them at the top level.
+    params = profile.get("parameters", profile)
+    return {k: v for k, v in params.items() if not isinstance(v, (dict, list))}
+
+
+def _same_value(a: object, b: object) -> bool:
+    try:
+        x, y = float(a), float(b)
+    except (TypeError, ValueError):
+        return str(a) == str(b)
+    return abs(x - y) <= 1e-6 * max(1.0, abs(x), abs(y))
+
+
+def _overridden(params: dict) -> set[str]:
+    """Manual controls that an auto mode switched on in `params` takes over."""
+    return {
+        key
+        for auto, keys in _AUTO_OVERRIDES.items()
+        if str(params.get(auto, "")).strip().lower() in ("true", "1", "on")
+        for key in keys
+    }
+
+
+def profile_applied(profile_text: str, device_json: str) -> bool:
+    """True when every setting in the profile already has its value on the device.
+
+    Manual values under an enabled auto mode (exposure, gain, white balance)
+    drift on their own and are not compared.
+    """
+    try:
+        wanted = _parameters(json.loads(profile_text))
+        current = _parameters(json.loads(device_json))
+    except (json.JSONDecodeError, AttributeError):
+        return False
+    volatile = _overridden(wanted)
+    for key, value in wanted.items():
+        if key in volatile:
+            continue
+        if key not in current or not _same_value(value, current[key]):
+            logger.debug(f"RealSense profile differs from the device at {key}")
+            return False
+    return True
+
+
+class RealSenseProfileCache:
+    """Profiles as accepted by each firmware, stored under `cache_dir`."""
+
+    def __init__(self, cache_dir: Path = PROFILE_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, profile_text: str, firmware: str) -> Path:
+        return self.cache_dir / f"{profile_fingerprint(profile_text, firmware)}.json"
+
+    def cleaned(self, profile_text: str, firmware: str) -> str:
+        """The profile with this firmware's unsupported keys already removed, if known."""
+        cached = read_cache(
+            self._path(profile_text, firmware),
+            lambda path: json.loads(path.read_text())["profile"],
+            "RealSense profile",
+        )
+        return profile_text if cached is None else cached
+
+    def store(self, profile_text: str, firmware: str, cleaned_text: str) -> None:
+        path = self._path(profile_text, firmware)
+        entry = json.dumps({"firmware": firmware, "profile": cleaned_text}).encode()
+        write_cache(path, lambda f: f.write(entry), "RealSense profile")
@@ -0,0 +1,391 @@
+"""Direct V4L2 capture: mmap streaming devices multiplexed on one epoll thread.
+
+OpenCVCameraCached runs one Python thread per camera, each blocking in
+VideoCapture.read() and then post-processing, and with three or more cameras
+those threads compete for the GIL with the control loop. Here every device is
+opened with O_NONBLOCK and kernel mmap buffers, and one shared thread waits on
+all of them with epoll, dequeues whichever buffer is ready and hands it to the
+camera's callback together with the kernel capture timestamp
+(CLOCK_MONOTONIC, the clock behind time.perf_counter()).
+"""
+
+import ctypes
+import errno
+import fcntl
+import logging
+import mmap
+import os
+import select
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Protocol
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --- linux/videodev2.h ------------------------------------------------------
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_MEMORY_MMAP = 1
+V4L2_FIELD_NONE = 1
+V4L2_BUF_FLAG_TIMESTAMP_MASK = 0xE000
+V4L2_BUF_FLAG_TIMESTAMP_MONOTONIC = 0x2000
+
+
+def fourcc(code: str) -> int:
+    a, b, c, d = code
+    return ord(a) | ord(b) << 8 | ord(c) << 16 | ord(d) << 24
+
+
+class v4l2_pix_format(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_uint32),
+        ("height", ctypes.c_uint32),
+        ("pixelformat", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("bytesperline", ctypes.c_uint32),
+        ("sizeimage", ctypes.c_uint32),
+        ("colorspace", ctypes.c_uint32),
+        ("priv", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("ycbcr_enc", ctypes.c_uint32),
+        ("quantization", ctypes.c_uint32),
+        ("xfer_func", ctypes.c_uint32),
+    ]
+
+
+class _v4l2_format_union(ctypes.Union):
+    # The kernel union also holds v4l2_window, whose pointers make it 8-byte aligned.
+    _fields_ = [
+        ("pix", v4l2_pix_format),
+        ("raw_data", ctypes.c_uint8 * 200),
+        ("_align", ctypes.c_void_p),
+    ]
+
+
+class v4l2_format(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("fmt", _v4l2_format_union)]
+
+
+class v4l2_fract(ctypes.Structure):
+    _fields_ = [("numerator", ctypes.c_uint32), ("denominator", ctypes.c_uint32)]
+
+
+class v4l2_captureparm(ctypes.Structure):
+    _fields_ = [
+        ("capability", ctypes.c_uint32),
+        ("capturemode", ctypes.c_uint32),
+        ("timeperframe", v4l2_fract),
+        ("extendedmode", ctypes.c_uint32),
+        ("readbuffers", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 4),
+    ]
+
+
+class _v4l2_streamparm_union(ctypes.Union):
+    _fields_ = [("capture", v4l2_captureparm), ("raw_data", ctypes.c_uint8 * 200)]
+
+
+class v4l2_streamparm(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("parm", _v4l2_streamparm_union)]
+
+
+class v4l2_requestbuffers(ctypes.Structure):
+    _fields_ = [
+        ("count", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("flags", ctypes.c_uint8),
+        ("reserved", ctypes.c_uint8 * 3),
+    ]
+
+
+class timeval(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_usec", ctypes.c_long)]
+
+
+class v4l2_timecode(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("frames", ctypes.c_uint8),
+        ("seconds", ctypes.c_uint8),
+        ("minutes", ctypes.c_uint8),
+        ("hours", ctypes.c_uint8),
+        ("userbits", ctypes.c_uint8 * 4),
+    ]
+
+
+class _v4l2_buffer_m(ctypes.Union):
+    _fields_ = [
+        ("offset", ctypes.c_uint32),
+        ("userptr", ctypes.c_ulong),
+        ("planes", ctypes.c_void_p),
+        ("fd", ctypes.c_int32),
+    ]
+
+
+class v4l2_buffer(ctypes.Structure):
+    _fields_ = [
+        ("index", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("bytesused", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("timestamp", timeval),
+        ("timecode", v4l2_timecode),
+        ("sequence", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("m", _v4l2_buffer_m),
+        ("length", ctypes.c_uint32),
+        ("reserved2", ctypes.c_uint32),
+        ("request_fd", ctypes.c_int32),
+    ]
+
+
+def _ioc(direction: int, nr: int, struct_type) -> int:
+    return direction << 30 | ctypes.sizeof(struct_type) << 16 | ord("V") << 8 | nr
+
+
+_IOC_WRITE, _IOC_READ = 1, 2
+VIDIOC_S_FMT = _ioc(_IOC_READ | _IOC_WRITE, 5, v4l2_format)
+VIDIOC_REQBUFS = _ioc(_IOC_READ | _IOC_WRITE, 8, v4l2_requestbuffers)
+VIDIOC_QUERYBUF = _ioc(_IOC_READ | _IOC_WRITE, 9, v4l2_buffer)
+VIDIOC_QBUF = _ioc(_IOC_READ | _IOC_WRITE, 15, v4l2_buffer)
+VIDIOC_DQBUF = _ioc(_IOC_READ | _IOC_WRITE, 17, v4l2_buffer)
+VIDIOC_STREAMON = _ioc(_IOC_WRITE, 18, ctypes.c_int)
+VIDIOC_STREAMOFF = _ioc(_IOC_WRITE, 19, ctypes.c_int)
+VIDIOC_S_PARM = _ioc(_IOC_READ | _IOC_WRITE, 22, v4l2_streamparm)
+
+# ----------------------------------------------------------------------------
+
+FrameCallback = Callable[[memoryview, float], None]
+
+
+class CaptureDevice(Protocol):
+    def fileno(self) -> int: ...
+
+    def read_frame(self, on_frame: FrameCallback) -> bool: ...
+
+
+class V4L2Device:
+    """One V4L2 capture device streaming into mmap'd kernel buffers."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        width: int,
+        height: int,
+        fps: float | None = None,
+        pixel_format: str = "MJPG",
+        num_buffers: int = 4,
+    ):
+        self.path = str(path)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        self._buffers: list[mmap.mmap] = []
+        self._streaming = False
+        try:
+            self._configure(width, height, fps, pixel_format)
+            self._map_buffers(num_buffers)
+            buf_type = ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE)
+            fcntl.ioctl(self.fd, VIDIOC_STREAMON, buf_type)
+            self._streaming = True
+        except Exception:
+            self.close()
+            raise
+
+    def _configure(self, width: int, height: int, fps: float | None, pixel_format: str) -> None:
+        fmt = v4l2_format(type=V4L2_BUF_TYPE_VIDEO_CAPTURE)
+        fmt.fmt.pix.width = width
+        fmt.fmt.pix.height = height
+        fmt.fmt.pix.pixelformat = fourcc(pixel_format)
+        fmt.fmt.pix.field = V4L2_FIELD_NONE
+        fcntl.ioctl(self.fd, VIDIOC_S_FMT, fmt)
+        self.width = fmt.fmt.pix.width
+        self.height = fmt.fmt.pix.height
+        self.pixel_format = fmt.fmt.pix.pixelformat.to_bytes(4, "little").decode()
+
+        if fps:
+            parm = v4l2_streamparm(type=V4L2_BUF_TYPE_VIDEO_CAPTURE)
+            parm.parm.capture.timeperframe.numerator = 1000
+            parm.parm.capture.timeperframe.denominator = round(fps * 1000)
+            fcntl.ioctl(self.fd, VIDIOC_S_PARM, parm)
+
+    def _map_buffers(self, num_buffers: int) -> None:
+        req = v4l2_requestbuffers(
+            count=num_buffers, type=V4L2_BUF_TYPE_VIDEO_CAPTURE, memory=V4L2_MEMORY_MMAP
+        )
+        fcntl.ioctl(self.fd, VIDIOC_REQBUFS, req)
+        for index in range(req.count):
+            buf = v4l2_buffer(
+                index=index, type=V4L2_BUF_TYPE_VIDEO_CAPTURE, memory=V4L2_MEMORY_MMAP
+            )
+            fcntl.ioctl(self.fd, VIDIOC_QUERYBUF, buf)
+            self._buffers.append(
+                mmap.mmap(self.fd, buf.length, mmap.MAP_SHARED, mmap.PROT_READ, offset=buf.m.offset)
+            )
+            fcntl.ioctl(self.fd, VIDIOC_QBUF, buf)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read_frame(self, on_frame: FrameCallback) -> bool:
+        """Dequeue one filled buffer, pass it to `on_frame`, and requeue it.
+
+        The memoryview is only valid during the callback. Returns False if no
+        buffer was ready.
+        """
+        buf = v4l2_buffer(type=V4L2_BUF_TYPE_VIDEO_CAPTURE, memory=V4L2_MEMORY_MMAP)
+        try:
+            fcntl.ioctl(self.fd, VIDIOC_DQBUF, buf)
+        except BlockingIOError:
+            return False
+        try:
+            if buf.flags & V4L2_BUF_FLAG_TIMESTAMP_MASK == V4L2_BUF_FLAG_TIMESTAMP_MONOTONIC:
+                timestamp = buf.timestamp.tv_sec + buf.timestamp.tv_usec * 1e-6
+            else:
+                timestamp = time.perf_counter()
+            with memoryview(self._buffers[buf.index]) as view:
+                on_frame(view[: buf.bytesused], timestamp)
+        finally:
+            fcntl.ioctl(self.fd, VIDIOC_QBUF, buf)
+        return True
+
+    def close(self) -> None:
+        if self._streaming:
+            try:
+                fcntl.ioctl(self.fd, VIDIOC_STREAMOFF, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+            except OSError:
+                pass
+            self._streaming = False
+        for buffer in self._buffers:
+            buffer.close()
+        self._buffers = []
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class V4L2CaptureEngine:
+    """One thread serving every registered device through a single epoll set."""
+
+    _shared: "V4L2CaptureEngine | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, poll_timeout_s: float = 0.1):
+        self._poll_timeout_s = poll_timeout_s
+        self._epoll = select.epoll()
+        self._devices: dict[int, tuple[CaptureDevice, FrameCallback]] = {}
+        self._lock = threading.Lock()
+        # fd whose frame the poll thread is handling right now; remove() waits on it.
+        self._serving: int | None = None
+        self._served = threading.Condition(self._lock)
+        self.thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def shared(cls) -> "V4L2CaptureEngine":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def add(self, device: CaptureDevice, on_frame: FrameCallback) -> None:
+        with self._lock:
+            self._devices[device.fileno()] = (device, on_frame)
+            self._epoll.register(device.fileno(), select.EPOLLIN)
+            if self.thread is None or not self.thread.is_alive():
+                self._stop_event.clear()
+                self.thread = threading.Thread(target=self._run, name="v4l2-capture", daemon=True)
+                self.thread.start()
+
+    def remove(self, device: CaptureDevice) -> None:
+        """Stop serving `device`; once this returns no callback for it runs or will run.
+
+        The caller can then close the device. Called from inside the device's
+        own callback it can't wait for that callback, and returns at once.
+        """
+        fd = device.fileno()
+        with self._lock:
+            self._unregister(fd)
+            if threading.current_thread() is not self.thread:
+                self._served.wait_for(lambda: self._serving != fd)
+            if self._devices or self.thread is None:
+                return
+            self._stop_event.set()
+            thread, self.thread = self.thread, None
+        if thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    def _unregister(self, fd: int) -> None:
+        if self._devices.pop(fd, None) is not None:
+            try:
+                self._epoll.unregister(fd)
+            except (OSError, ValueError):
+                pass
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                events = self._epoll.poll(self._poll_timeout_s)
+            except InterruptedError:
+                continue
+            for fd, _ in events:
+                with self._lock:
+                    entry = self._devices.get(fd)
+                    if entry is None:
+                        continue
+                    self._serving = fd
+                device, on_frame = entry
+                try:
+                    device.read_frame(on_frame)
+                except OSError as e:
+                    if e.errno in (errno.ENODEV, errno.EBADF, errno.EIO):
+                        logger.error(f"V4L2 device fd {fd} lost ({e}), dropping it")
+                        with self._lock:
+                            self._unregister(fd)
+                    else:
+                        logger.warning(f"V4L2 read on fd {fd} failed: {e}")
+                except Exception as e:
+                    logger.warning(f"V4L2 frame callback on fd {fd} failed: {e}")
+                finally:
+                    with self._lock:
+                        self._serving = None
+                        self._served.notify_all()
+
+
+def decode_frame(data: memoryview, pixel_format: str, width: int, height: int) -> np.ndarray:
+    """Decode an MJPG or YUYV buffer into a BGR image."""
+    import cv2
+
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if pixel_format == "MJPG":
+        image = cv2.imdecode(raw, cv2.IMREAD_COLOR)
+        if image is None:
+            raise RuntimeError("corrupt MJPG frame")
+        return image
+    if pixel_format == "YUYV":
+        yuyv = raw[: width * height * 2].reshape(height, width, 2)
+        return cv2.cvtColor(yuyv, cv2.COLOR_YUV2BGR_YUYV)
+    raise ValueError(f"Unsupported V4L2 pixel format {pixel_format!r}")
+
+
+def preview_frame(data: bytes, pixel_format: str, width: int, height: int) -> np.ndarray | None:
+    """A cheap image of an MJPG or YUYV buffer for brightness estimates.
+
+    MJPG is decoded at quarter resolution in grayscale; YUYV yields its Y plane.
+    Both come back as (h, w, 1) so they read like a one-channel image. A corrupt
+    MJPG frame gives None rather than an error, so one bad frame is just skipped.
+    """
+    import cv2
+
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if pixel_format == "MJPG":
+        image = cv2.imdecode(raw, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        return None if image is None else image[:, :, None]
+    if pixel_format == "YUYV":
+        return raw[: width * height * 2].reshape(height, width, 2)[:, :, :1]
+    raise ValueError(f"Unsupported V4L2 pixel format {pixel_format!r}")
@@ -1,12 +1,15 @@
-from .opencv import find_opencv_cameras
 from .zed_config import ZEDCameraConfig
 
 __all__ = ["ZEDCameraConfig", "ZEDCamera", "find_opencv_cameras"]
 
 
 def __getattr__(name):
-    if name != "ZEDCamera":
-        raise AttributeError(name)
-    from .zed_camera import ZEDCamera
+    if name == "ZEDCamera":
+        from .zed_camera import ZEDCamera
 
-    return ZEDCamera
+        return ZEDCamera
+    if name == "find_opencv_cameras":
+        from .opencv import find_opencv_cameras
+
+        return find_opencv_cameras
+    raise AttributeError(name)
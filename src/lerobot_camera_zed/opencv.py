@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import platform
 from typing import Any
@@ -5,47 +6,60 @@ from typing import Any
 import cv2
 
 MAX_OPENCV_INDEX = 15
+MAX_PROBE_WORKERS = 8
 
 
 def find_opencv_cameras() -> list[dict[str, Any]]:
-    found_cameras_info = []
-
     targets_to_scan: list[str | int]
     if platform.system() == "Linux":
+        from utils.device_inventory import is_capture_device, video_devices
+
+        # Every UVC camera has a metadata node next to its capture node; it
+        # can't be opened as a camera, so don't wait on it.
+        properties = video_devices()
         possible_paths = sorted(Path("/dev").glob("video*"), key=lambda p: p.name)
-        targets_to_scan = [str(p) for p in possible_paths]
+        targets_to_scan = [
+            str(p) for p in possible_paths if is_capture_device(properties.get(str(p), {}))
+        ]
     else:
         targets_to_scan = [int(i) for i in range(MAX_OPENCV_INDEX)]
 
-    for target in targets_to_scan:
-        camera = cv2.VideoCapture(target)
-        if camera.isOpened():
-            default_width = int(camera.get(cv2.CAP_PROP_FRAME_WIDTH))
-            default_height = int(camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            default_fps = camera.get(cv2.CAP_PROP_FPS)
-            default_format = camera.get(cv2.CAP_PROP_FORMAT)
-
-            default_fourcc_code = camera.get(cv2.CAP_PROP_FOURCC)
-            default_fourcc_code_int = int(default_fourcc_code)
-            default_fourcc = "".join(
-                [chr((default_fourcc_code_int >> 8 * i) & 0xFF) for i in range(4)]
-            )
-
-            camera_info = {
-                "name": f"OpenCV Camera @ {target}",
-                "type": "OpenCV",
-                "id": target,
-                "backend_api": camera.getBackendName(),
-                "default_stream_profile": {
-                    "format": default_format,
-                    "fourcc": default_fourcc,
-                    "width": default_width,
-                    "height": default_height,
-                    "fps": default_fps,
-                },
-            }
-
-            found_cameras_info.append(camera_info)
-            camera.release()
-
-    return found_cameras_info
+    if not targets_to_scan:
+        return []
+    # Opening a device blocks in the driver, so probe them concurrently.
+    with ThreadPoolExecutor(min(MAX_PROBE_WORKERS, len(targets_to_scan))) as pool:
+        found_cameras_info = pool.map(_probe_opencv_camera, targets_to_scan)
+    return [camera_info for camera_info in found_cameras_info if camera_info is not None]
+
+
+def _probe_opencv_camera(target: str | int) -> dict[str, Any] | None:
+    camera = cv2.VideoCapture(target)
+    try:
+        if not camera.isOpened():
+            return None
+        default_width = int(camera.get(cv2.CAP_PROP_FRAME_WIDTH))
+        default_height = int(camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        default_fps = camera.get(cv2.CAP_PROP_FPS)
+        default_format = camera.get(cv2.CAP_PROP_FORMAT)
+
+        default_fourcc_code = camera.get(cv2.CAP_PROP_FOURCC)
+        default_fourcc_code_int = int(default_fourcc_code)
+        default_fourcc = "".join(
+            [chr((default_fourcc_code_int >> 8 * i) & 0xFF) for i in range(4)]
+        )
+
+        return {
+            "name": f"OpenCV Camera @ {target}",
+            "type": "OpenCV",
+            "id": target,
+            "backend_api": camera.getBackendName(),
+            "default_stream_profile": {
+                "format": default_format,
+                "fourcc": default_fourcc,
+                "width": default_width,
+                "height": default_height,
+                "fps": default_fps,
+            },
+        }
+    finally:
+        camera.release()
@@ -5,34 +5,72 @@ from typing import Any
 
 import cv2
 import numpy as np
-import pyzed.sl as sl
 from lerobot.cameras import Camera, ColorMode
 from lerobot.cameras.utils import get_cv2_rotation
 from lerobot.utils.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
 from numpy.typing import NDArray
 
+from utils.frame_output import BufferPool, FrameOutput, output_hw
+
 from .zed_config import ZEDCameraConfig
+from .zed_sdk import load_sdk
 
 logger = logging.getLogger(__name__)
 
 
 class ZEDCamera(Camera):
+    """ZED left-eye camera that captures without allocating per frame.
+
+    The SDK retrieves into one preallocated sl.Mat; its BGRA pixels are
+    converted (and rotated) straight into a BufferPool of output frames.
+    latest_timestamp (time.perf_counter at grab) and latest_seq identify the
+    frame in latest_frame.
+
+    With use_depth, the depth measure of the same grab is retrieved the same
+    way and published as uint16 millimetres in latest_depth_frame;
+    async_read() snapshots the pair for pop_depth_snapshot().
+    """
+
+    load_sdk = staticmethod(load_sdk)
+
     def __init__(self, config: ZEDCameraConfig):
         super().__init__(config)
 
+        self.sl = self.load_sdk()
         self.config = config
         self.camera_id = config.camera_id
         self.color_mode = config.color_mode
         self.depth_mode = config.depth_mode
+        self.use_depth = config.use_depth
 
-        self.zed: sl.Camera | None = None
-        self.runtime_params: sl.RuntimeParameters | None = None
+        self.zed: Any | None = None
+        self.runtime_params: Any | None = None
 
         self.thread: Thread | None = None
         self.stop_event: Event | None = None
         self.frame_lock: Lock = Lock()
-        self.latest_frame: NDArray[Any] = np.zeros([self.config.height, self.config.width, 3], np.uint8)
+        self.output = FrameOutput.from_config(config)
+        self.depth_output = FrameOutput.from_config(config, depth=True)
+        self.latest_frame: NDArray[Any] = np.zeros([*output_hw(config), 3], np.uint8)
+        self.latest_timestamp: float | None = None
+        self.latest_seq = 0
+        self.latest_depth_frame: NDArray[Any] | None = None
         self.new_frame_event: Event = Event()
+        # Depth captured with the colour frame returned by async_read(), popped
+        # by the record-with-depth sidecar writer after each observation.
+        self._depth_snapshot_lock = Lock()
+        self._last_depth_snapshot: NDArray[Any] | None = None
+
+        # Capture buffers, allocated in connect() once the resolution is known.
+        self._grab_lock = Lock()
+        self._resolution: Any | None = None
+        self._image_mat: Any | None = None
+        self._image_bgra: NDArray[Any] | None = None
+        self._depth_mat: Any | None = None
+        self._depth_mm: NDArray[Any] | None = None
+        self._scratch: dict[tuple[Any, ...], NDArray[Any]] = {}
+        self._frames = BufferPool()
+        self._depth_frames = BufferPool()
 
         self.rotation: int | None = get_cv2_rotation(config.rotation)
 
@@ -56,7 +94,7 @@ class ZEDCamera(Camera):
     @staticmethod
     def find_cameras() -> list[dict[str, Any]]:
         found_cameras = []
-        cameras = sl.Camera.get_device_list()
+        cameras = load_sdk().Camera.get_device_list()
 
         for idx, cam_info in enumerate(cameras):
             camera_dict = {
@@ -73,6 +111,7 @@ class ZEDCamera(Camera):
         if self.is_connected:
             raise DeviceAlreadyConnectedError(f"{self} is already connected.")
 
+        sl = self.sl
         self.zed = sl.Camera()
 
         init_params = sl.InitParameters()
@@ -90,6 +129,9 @@ class ZEDCamera(Camera):
             )
 
         self.runtime_params = sl.RuntimeParameters()
+        # depth_mode is fixed at open; without use_depth nothing retrieves
+        # the measure, so don't compute it on every grab.
+        self.runtime_params.enable_depth = self.use_depth
 
         cam_info = self.zed.get_camera_information()
         if self.fps is None:
@@ -110,6 +152,8 @@ class ZEDCamera(Camera):
                 self.width, self.height = actual_width, actual_height
                 self.capture_width, self.capture_height = actual_width, actual_height
 
+        self._allocate_capture_buffers()
+
         if warmup:
             for _ in range(10):
                 self.read()
@@ -117,7 +161,23 @@ class ZEDCamera(Camera):
 
         logger.info(f"{self} connected.")
 
-    def _get_resolution(self) -> sl.RESOLUTION:
+    def _allocate_capture_buffers(self) -> None:
+        sl = self.sl
+        self._resolution = sl.Resolution(self.capture_width, self.capture_height)
+        self._image_mat = sl.Mat(
+            self.capture_width, self.capture_height, sl.MAT_TYPE.U8_C4, sl.MEM.CPU
+        )
+        # A view of the Mat's CPU memory; retrieve_image refills it in place.
+        self._image_bgra = self._image_mat.get_data()
+        if self.use_depth:
+            self._depth_mat = sl.Mat(
+                self.capture_width, self.capture_height, sl.MAT_TYPE.F32_C1, sl.MEM.CPU
+            )
+            self._depth_mm = self._depth_mat.get_data()
+        self._scratch = {}
+
+    def _get_resolution(self) -> Any:
+        sl = self.sl
         if self.width is None or self.height is None:
             return sl.RESOLUTION.HD720
 
@@ -135,7 +195,8 @@ class ZEDCamera(Camera):
             )
             return sl.RESOLUTION.HD720
 
-    def _get_depth_mode(self) -> sl.DEPTH_MODE:
+    def _get_depth_mode(self) -> Any:
+        sl = self.sl
         depth_modes = {
             "NONE": sl.DEPTH_MODE.NONE,
             "PERFORMANCE": sl.DEPTH_MODE.PERFORMANCE,
@@ -146,68 +207,142 @@ class ZEDCamera(Camera):
         return depth_modes.get(self.depth_mode.upper(), sl.DEPTH_MODE.PERFORMANCE)
 
     def read(self, color_mode: ColorMode | None = None) -> NDArray[Any]:
+        return self._capture(color_mode)[0]
+
+    def _capture(
+        self, color_mode: ColorMode | None = None
+    ) -> tuple[NDArray[Any], NDArray[Any] | None, float]:
+        """Grab, retrieve and convert one frame.
+
+        Returns the colour frame, its depth (None without use_depth) and the
+        grab time.
+        """
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
         if self.zed is None or self.runtime_params is None:
             raise RuntimeError(f"{self}: zed camera not initialized.")
 
+        sl = self.sl
         start_time = time.perf_counter()
 
-        if self.zed.grab(self.runtime_params) != sl.ERROR_CODE.SUCCESS:
-            raise RuntimeError(f"{self} failed to grab frame.")
-
-        image_zed = sl.Mat()
-
-        resolution = (
-            sl.Resolution(self.capture_width, self.capture_height)
-            if self.width and self.height
-            else sl.Resolution(width=1280, height=720)
-        )  # TODO: Set default resolution properly
-        self.zed.retrieve_image(image_zed, sl.VIEW.LEFT, sl.MEM.CPU, resolution)
-
-        frame = image_zed.get_data()
-        processed_frame = self._postprocess_image(frame, color_mode)
+        with self._grab_lock:
+            if self.zed.grab(self.runtime_params) != sl.ERROR_CODE.SUCCESS:
+                raise RuntimeError(f"{self} failed to grab frame.")
+            capture_time = time.perf_counter()
+            self.zed.retrieve_image(self._image_mat, sl.VIEW.LEFT, sl.MEM.CPU, self._resolution)
+            processed_frame = self._postprocess_image(self._image_bgra, color_mode)
+            depth_frame = None
+            if self.use_depth:
+                self.zed.retrieve_measure(
+                    self._depth_mat, sl.MEASURE.DEPTH, sl.MEM.CPU, self._resolution
+                )
+                depth_frame = self._postprocess_depth(self._depth_mm)
 
         read_duration_ms = (time.perf_counter() - start_time) * 1e3
         logger.debug(f"{self} read took: {read_duration_ms:.1f}ms")
 
-        return processed_frame
+        return processed_frame, depth_frame, capture_time
 
     def _postprocess_image(
         self, image: NDArray[Any], color_mode: ColorMode | None = None
     ) -> NDArray[Any]:
-        processed = image
+        """Colour-convert, rotate and crop/resize without allocating per frame.
 
+        Intermediate results go into scratch buffers owned by the camera; the
+        frame handed out comes from the BufferPool, so it stays valid for as
+        long as a consumer holds it.
+        """
         target_mode = color_mode if color_mode else self.color_mode
-        # ZED SDK returns BGRA (4 channels), convert to RGB (3 channels)
-        if processed.shape[2] == 4:
-            if target_mode == ColorMode.RGB:
-                processed = cv2.cvtColor(processed, cv2.COLOR_BGRA2RGB)
-            else:
-                processed = cv2.cvtColor(processed, cv2.COLOR_BGRA2BGR)
-        elif target_mode == ColorMode.RGB and processed.shape[2] == 3:
-            processed = cv2.cvtColor(processed, cv2.COLOR_BGR2RGB)
+        # ZED SDK returns BGRA (4 channels), convert to RGB/BGR (3 channels)
+        if image.shape[2] == 4:
+            code = cv2.COLOR_BGRA2RGB if target_mode == ColorMode.RGB else cv2.COLOR_BGRA2BGR
+        elif target_mode == ColorMode.RGB:
+            code = cv2.COLOR_BGR2RGB
+        else:
+            code = None
 
-        if self.rotation in [
+        rotate = self.rotation in [
             cv2.ROTATE_90_CLOCKWISE,
             cv2.ROTATE_90_COUNTERCLOCKWISE,
             cv2.ROTATE_180,
-        ]:
-            processed = cv2.rotate(processed, self.rotation)
+        ]
+        h, w = image.shape[:2]
+        processed = image
+        if code is not None:
+            processed = cv2.cvtColor(image, code, dst=self._buffer((h, w, 3), final=not rotate))
+        if rotate:
+            if self.rotation != cv2.ROTATE_180:
+                h, w = w, h
+            dst = self._buffer((h, w, 3), final=True)
+            processed = cv2.rotate(processed, self.rotation, dst=dst)
+        elif code is None and (self.output is None or self.output.keep_full):
+            # Already in the target layout, but `image` is the Mat view that
+            # the next retrieve overwrites.
+            processed = self._frames.take((h, w, 3))
+            np.copyto(processed, image)
+
+        if self.output is not None:
+            processed = self.output.apply(processed)
+        return processed
+
+    def _postprocess_depth(self, depth: NDArray[np.float32]) -> NDArray[np.uint16]:
+        """Float millimetres from the SDK to the sidecar's uint16 mm, 0 = invalid.
 
+        Works in the depth Mat's own memory, which the next retrieve
+        overwrites anyway: NaN (occluded), +/-inf (out of range) and anything
+        that doesn't fit uint16 become 0 before the cast.
+        """
+        cv2.patchNaNs(depth, 0)
+        cv2.threshold(depth, np.iinfo(np.uint16).max, 0, cv2.THRESH_TOZERO_INV, dst=depth)
+        cv2.threshold(depth, 0, 0, cv2.THRESH_TOZERO, dst=depth)
+        np.rint(depth, out=depth)
+
+        rotate = self.rotation in [
+            cv2.ROTATE_90_CLOCKWISE,
+            cv2.ROTATE_90_COUNTERCLOCKWISE,
+            cv2.ROTATE_180,
+        ]
+        h, w = depth.shape[:2]
+        processed = self._buffer((h, w), final=not rotate, depth=True)
+        np.copyto(processed, depth, casting="unsafe")
+        if rotate:
+            if self.rotation != cv2.ROTATE_180:
+                h, w = w, h
+            dst = self._buffer((h, w), final=True, depth=True)
+            processed = cv2.rotate(processed, self.rotation, dst=dst)
+
+        if self.depth_output is not None:
+            processed = self.depth_output.apply(processed)
         return processed
 
+    def _buffer(self, shape: tuple[int, ...], final: bool, depth: bool = False) -> NDArray[Any]:
+        # The last full-resolution step is the frame consumers get, unless
+        # the output spec cuts a smaller one out of it (and doesn't keep it).
+        if depth:
+            pool, output, dtype = self._depth_frames, self.depth_output, np.uint16
+        else:
+            pool, output, dtype = self._frames, self.output, np.uint8
+        if final and (output is None or output.keep_full):
+            return pool.take(shape, dtype)
+        key = (shape, dtype)
+        if key not in self._scratch:
+            self._scratch[key] = np.empty(shape, dtype)
+        return self._scratch[key]
+
     def _read_loop(self) -> None:
         if self.stop_event is None:
             raise RuntimeError(f"{self}: stop_event not initialized.")
 
         while not self.stop_event.is_set():
             try:
-                frame = self.read()
+                frame, depth, capture_time = self._capture()
 
                 with self.frame_lock:
                     self.latest_frame = frame
+                    self.latest_depth_frame = depth
+                    self.latest_timestamp = capture_time
+                    self.latest_seq += 1
                 self.new_frame_event.set()
 
             except DeviceNotConnectedError:
@@ -246,9 +381,7 @@ class ZEDCamera(Camera):
             self._start_read_thread()
 
         if self.config.cached_frames:
-            with self.frame_lock:
-                frame = self.latest_frame
-                return frame
+            return self._snapshot_pair()
 
         if not self.new_frame_event.wait(timeout=timeout_ms / 1000.0):
             thread_alive = self.thread is not None and self.thread.is_alive()
@@ -257,9 +390,8 @@ class ZEDCamera(Camera):
                 f"Read thread alive: {thread_alive}."
             )
 
-        with self.frame_lock:
-            frame = self.latest_frame
-            self.new_frame_event.clear()
+        frame = self._snapshot_pair()
+        self.new_frame_event.clear()
 
         if frame is None:
             raise RuntimeError(
@@ -268,6 +400,28 @@ class ZEDCamera(Camera):
 
         return frame
 
+    def _snapshot_pair(self) -> NDArray[Any]:
+        """Return latest_frame and stash the depth from the same grab.
+
+        The read loop publishes both under frame_lock, so the pair comes from
+        one grab. Both are pooled buffers, which stay untouched while the
+        snapshot holds them, so no copy is needed.
+        """
+        with self.frame_lock:
+            frame = self.latest_frame
+            depth = self.latest_depth_frame
+        if depth is not None:
+            with self._depth_snapshot_lock:
+                self._last_depth_snapshot = depth
+        return frame
+
+    def pop_depth_snapshot(self) -> NDArray[Any] | None:
+        """Return and clear the depth snapshot stashed by the last async_read()."""
+        with self._depth_snapshot_lock:
+            snap = self._last_depth_snapshot
+            self._last_depth_snapshot = None
+        return snap
+
     def disconnect(self) -> None:
         if not self.is_connected and self.thread is None:
             raise DeviceNotConnectedError(
@@ -281,5 +435,13 @@ class ZEDCamera(Camera):
             self.zed.close()
             self.zed = None
             self.runtime_params = None
+        if self._image_mat is not None:
+            self._image_mat.free(self.sl.MEM.CPU)
+            self._image_mat = None
+            self._image_bgra = None
+        if self._depth_mat is not None:
+            self._depth_mat.free(self.sl.MEM.CPU)
+            self._depth_mat = None
+            self._depth_mm = None
 
         logger.info(f"{self} disconnected.")
@@ -9,7 +9,17 @@ class ZEDCameraConfig(CameraConfig):
     color_mode: ColorMode = ColorMode.RGB
     rotation: Cv2Rotation = Cv2Rotation.ROTATE_180
     depth_mode: str = "PERFORMANCE"
+    # Retrieve depth with every frame (uint16 mm, 0 = no measurement), for
+    # pop_depth_snapshot(). Off, grabs skip the depth computation entirely.
+    use_depth: bool = False
     cached_frames: bool = True
+    # Crop box (x, y, width, height) and size (width, height) of the frames handed
+    # out, applied in the capture thread; output_keep_full keeps the full frame
+    # as `frame.full` for recording.
+    output_crop: tuple[int, int, int, int] | None = None
+    output_size: tuple[int, int] | None = None
+    output_interpolation: str = "area"
+    output_keep_full: bool = False
 
     def __post_init__(self) -> None:
         if self.color_mode not in (ColorMode.RGB, ColorMode.BGR):
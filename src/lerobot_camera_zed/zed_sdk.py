@@ -0,0 +1,27 @@
+"""Where ZEDCamera gets the ZED SDK from.
+
+ZEDCamera never imports pyzed itself; it calls `ZEDCamera.load_sdk()` and
+uses the returned module. Replacing that staticmethod (or this function)
+with something that provides the same names runs the camera without the
+SDK or hardware, as tests/test_zed_camera.py and scripts/bench_zed_capture.py
+do. The names used are:
+
+  Camera            open, grab, retrieve_image, retrieve_measure,
+                    get_camera_information, close; get_device_list (static)
+  Mat               Mat(width, height, MAT_TYPE, MEM), get_data, free
+  Resolution        Resolution(width, height)
+  InitParameters    set_from_camera_id, camera_resolution, camera_fps,
+                    depth_mode, coordinate_units
+  RuntimeParameters enable_depth
+  enums             ERROR_CODE.SUCCESS, VIEW.LEFT, MEASURE.DEPTH, MEM.CPU,
+                    MAT_TYPE.U8_C4, MAT_TYPE.F32_C1, RESOLUTION, DEPTH_MODE,
+                    UNIT.MILLIMETER
+"""
+
+from types import ModuleType
+
+
+def load_sdk() -> ModuleType:
+    import pyzed.sl as sl
+
+    return sl
@@ -3,22 +3,30 @@ import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from functools import cached_property
-from pathlib import Path
 from typing import Any
 
 import numpy as np
-import yaml
 from lerobot.cameras import CameraConfig
 from lerobot.cameras.utils import make_cameras_from_configs
 from lerobot.robots import Robot, RobotConfig
 
 from lerobot_robot_yams.follower import YamsFollower, YamsFollowerConfig
-from lerobot_robot_yams.forward_kinematics import check_action
+from lerobot_robot_yams.forward_kinematics import SafetyStatus, check_action
+from lerobot_robot_yams.robot_model import load_robot_model
+from utils.can_health import CanHealthMonitor
+from utils.frame_output import output_hw
+from utils.pose_drift import PoseDriftTracker
 
 logger = logging.getLogger(__name__)
 
-_ARMS_CONFIG_PATH = Path(__file__).resolve().parents[2] / "configs" / "arms.yaml"
-_COLLISION = yaml.safe_load(_ARMS_CONFIG_PATH.read_text())["collision"]
+
+# arms.yaml is read through the compiled robot model on first use, not at import.
+def _collision() -> dict[str, Any]:
+    return load_robot_model().collision
+
+
+def _workspace() -> dict[str, Any]:
+    return load_robot_model().workspace
 
 
 class CameraReadError(RuntimeError):
@@ -32,13 +40,46 @@ class BiYamsFollowerConfig(RobotConfig):
     left_arm_server_port: int = 11333
     right_arm_can_port: str = "can_follower_r"
     right_arm_server_port: int = 11334
-    ground_z: float = field(default_factory=lambda: _COLLISION["ground_z"])
+    ground_z: float = field(default_factory=lambda: _collision()["ground_z"])
     end_effector_length: float = field(
-        default_factory=lambda: _COLLISION["end_effector_length"]
+        default_factory=lambda: _collision()["end_effector_length"]
     )
     max_joint_step: np.ndarray = field(
-        default_factory=lambda: np.array(_COLLISION["max_joint_step"])
+        default_factory=lambda: np.array(_collision()["max_joint_step"])
+    )
+    max_joint_vel: np.ndarray = field(
+        default_factory=lambda: np.array(_collision()["max_joint_vel"])
+    )
+    max_joint_acc: np.ndarray = field(
+        default_factory=lambda: np.array(_collision()["max_joint_acc"])
+    )
+    link_radii: np.ndarray = field(
+        default_factory=lambda: np.array(_collision()["link_radii"])
     )
+    # Reject actions that bring the two arms closer than this (capsule model);
+    # None disables the bimanual self-collision check.
+    self_collision_margin: float | None = field(
+        default_factory=lambda: _collision()["self_collision_margin"]
+    )
+    # Static obstacles (see workspace_sdf.py); empty disables the check.
+    workspace_obstacles: list[dict[str, Any]] = field(
+        default_factory=lambda: list(_workspace().get("obstacles") or [])
+    )
+    workspace_margin: float = field(default_factory=lambda: _workspace().get("margin", 0.0))
+    # "clamp": rate-limit each joint and stop at the ground plane (JointLimiter).
+    # "reject": drop the whole action when any limit is exceeded (check_action).
+    joint_limit_mode: str = "clamp"
+    # Run the ground/step-limit check inside each robot server instead of here.
+    server_side_safety: bool = False
+    # >0 streams arm state from each robot server at this rate (e.g. 500).
+    state_stream_hz: float = 0.0
+    # >0 polls both CAN links at this interval during the session and logs
+    # state changes, bus-offs and error bursts; 0 disables it.
+    can_health_interval_s: float = 1.0
+    # >0 samples `pose_drift_camera` at this interval and warns when it has
+    # moved since the session started (see utils/pose_drift.py); 0 disables it.
+    pose_drift_interval_s: float = 1.0
+    pose_drift_camera: str = "topdown"
     cameras: dict[str, CameraConfig] = field(default_factory=dict)
 
 
@@ -49,28 +90,71 @@ class BiYamsFollower(Robot):
 
     config_class = BiYamsFollowerConfig
     name = "bi_yams_follower"
+    _pose_drift: PoseDriftTracker | None = None
 
     def __init__(self, config: BiYamsFollowerConfig):
         super().__init__(config)
 
         self.config = config
 
+        safety = None
+        if self.config.server_side_safety:
+            from lerobot_robot_yams.robot_core.safety_filter import SafetyLimits
+
+            safety = SafetyLimits(
+                ground_z=self.config.ground_z,
+                end_effector_length=self.config.end_effector_length,
+                max_joint_step=list(map(float, self.config.max_joint_step)),
+            )
         left_arm_config = YamsFollowerConfig(
             can_port=self.config.left_arm_can_port,
             server_port=self.config.left_arm_server_port,
             side="left",
+            state_stream_hz=self.config.state_stream_hz,
+            safety=safety,
         )
         right_arm_config = YamsFollowerConfig(
             can_port=self.config.right_arm_can_port,
             server_port=self.config.right_arm_server_port,
             side="right",
+            state_stream_hz=self.config.state_stream_hz,
+            safety=safety,
         )
 
         self.cameras = make_cameras_from_configs(config.cameras)
         self.left_arm = YamsFollower(left_arm_config)
         self.right_arm = YamsFollower(right_arm_config)
         self._last_angles: dict[str, np.ndarray | None] = {"left": None, "right": None}
+        self._last_action_time: float | None = None
+        if self.config.joint_limit_mode == "clamp":
+            from lerobot_robot_yams.joint_limiter import JointLimiter
+
+            self._limiters = {
+                side: JointLimiter(
+                    max_joint_step=self.config.max_joint_step,
+                    max_joint_vel=self.config.max_joint_vel,
+                    max_joint_acc=self.config.max_joint_acc,
+                    ground_z=self.config.ground_z,
+                    end_effector_length=self.config.end_effector_length,
+                )
+                for side in ("left", "right")
+            }
+        elif self.config.joint_limit_mode != "reject":
+            raise ValueError(
+                "joint_limit_mode must be 'clamp' or 'reject', "
+                f"got {self.config.joint_limit_mode!r}"
+            )
+        self._workspace_sdf = None
+        if self.config.workspace_obstacles:
+            from lerobot_robot_yams.workspace_sdf import WorkspaceSDF
+
+            self._workspace_sdf = WorkspaceSDF.load_or_bake(
+                self.config.workspace_obstacles,
+                _workspace()["bounds"],
+                _workspace()["resolution"],
+            )
         self._obs_pool = ThreadPoolExecutor(max_workers=max(2, len(self.cameras) + 2))
+        self._can_monitor: CanHealthMonitor | None = None
 
     @property
     def _motors_ft(self) -> dict[str, type]:
@@ -81,7 +165,7 @@ class BiYamsFollower(Robot):
     @property
     def _cameras_ft(self) -> dict[str, tuple]:
         return {
-            cam: (self.config.cameras[cam].height, self.config.cameras[cam].width, 3)
+            cam: (*output_hw(self.config.cameras[cam]), 3)
             for cam in self.cameras
         }
 
@@ -108,6 +192,28 @@ class BiYamsFollower(Robot):
         self.left_arm.connect()
         self.right_arm.connect()
 
+        if self.config.can_health_interval_s > 0:
+            self._can_monitor = CanHealthMonitor(
+                [self.config.left_arm_can_port, self.config.right_arm_can_port],
+                self.config.can_health_interval_s,
+            )
+            self._can_monitor.start()
+
+        if self.config.pose_drift_interval_s > 0 and self.config.pose_drift_camera in self.cameras:
+            self._pose_drift = PoseDriftTracker.for_camera(
+                self.config.cameras[self.config.pose_drift_camera],
+                self.config.pose_drift_interval_s,
+                name=self.config.pose_drift_camera,
+            )
+
+    def can_health(self) -> dict[str, Any]:
+        """Latest CAN link state and the errors seen since connect()."""
+        return self._can_monitor.metrics() if self._can_monitor is not None else {}
+
+    def pose_drift(self) -> dict[str, Any]:
+        """Topdown camera motion since connect(), and whether it is over tolerance."""
+        return self._pose_drift.metrics() if self._pose_drift is not None else {}
+
     @property
     def is_calibrated(self) -> bool:
         return True
@@ -129,17 +235,22 @@ class BiYamsFollower(Robot):
                 return frame
             raise CameraReadError(f"{cam_key} read failed: {exc}") from exc
 
-    def get_observation(self, with_cameras=True) -> dict[str, Any]:
-        obs_dict = {}
-
-        left_future = self._obs_pool.submit(self.left_arm.get_observation)
-        right_future = self._obs_pool.submit(self.right_arm.get_observation)
+    def _observation_timestamp(self) -> float:
+        """Capture time the arm state is sampled at: the cameras' mean, else now.
 
-        left_obs = left_future.result()
-        right_obs = right_future.result()
-        obs_dict.update({f"left_{key}": value for key, value in left_obs.items()})
-        obs_dict.update({f"right_{key}": value for key, value in right_obs.items()})
+        Cameras that report `latest_timestamp` (time.perf_counter() clock) set
+        it when they publish a frame, so the joint positions line up with the
+        images instead of with the moment they were read.
+        """
+        stamps = [
+            stamp
+            for cam in self.cameras.values()
+            if (stamp := getattr(cam, "latest_timestamp", None)) is not None
+        ]
+        return sum(stamps) / len(stamps) if stamps else time.perf_counter()
 
+    def get_observation(self, with_cameras=True) -> dict[str, Any]:
+        frames = {}
         if with_cameras:
             cam_futures = {
                 cam_key: self._obs_pool.submit(cam.async_read)
@@ -147,14 +258,93 @@ class BiYamsFollower(Robot):
             }
             for cam_key, future in cam_futures.items():
                 start = time.perf_counter()
-                obs_dict[cam_key] = self._read_camera_or_last_frame(
+                frames[cam_key] = self._read_camera_or_last_frame(
                     cam_key=cam_key, future=future, cam=self.cameras[cam_key]
                 )
                 dt_ms = (time.perf_counter() - start) * 1e3
                 logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
+            if self._pose_drift is not None:
+                self._pose_drift.offer(frames[self.config.pose_drift_camera])
+            timestamp = self._observation_timestamp()
+        else:
+            timestamp = time.perf_counter()
+
+        # Both arms at the same instant, so the pair is consistent with each other
+        # and with the frames above.
+        left_future = self._obs_pool.submit(self.left_arm.get_observation, timestamp=timestamp)
+        right_future = self._obs_pool.submit(self.right_arm.get_observation, timestamp=timestamp)
+
+        obs_dict = {}
+        left_obs = left_future.result()
+        right_obs = right_future.result()
+        obs_dict.update({f"left_{key}": value for key, value in left_obs.items()})
+        obs_dict.update({f"right_{key}": value for key, value in right_obs.items()})
+        obs_dict.update(frames)
 
         return obs_dict
 
+    def _clamp_arm_actions(
+        self, arm_actions: list[tuple[str, dict[str, Any]]], joint_names: list[str]
+    ) -> bool:
+        """Rate-limit both arms' joint targets in place; False if nothing safe exists."""
+        now = time.perf_counter()
+        dt = None if self._last_action_time is None else now - self._last_action_time
+        self._last_action_time = now
+
+        for side, arm_action in arm_actions:
+            angles = np.array([arm_action[f"{j}.pos"] for j in joint_names])
+            clamped = self._limiters[side].clamp(angles, dt)
+            if clamped is None:
+                logger.warning(f"{side} arm action rejected: target is unsafe")
+                for limiter in self._limiters.values():
+                    limiter.reset()
+                self._last_action_time = None
+                return False
+            if self._limiters[side].clamped:
+                logger.debug(f"{side} arm action clamped to {np.round(clamped, 3)}")
+            arm_action.update({f"{j}.pos": float(q) for j, q in zip(joint_names, clamped)})
+        return True
+
+    def _arms_collide(
+        self, left_action: dict[str, Any], right_action: dict[str, Any], joint_names: list[str]
+    ) -> bool:
+        from lerobot_robot_yams.self_collision import bimanual_distances
+
+        distances = bimanual_distances(
+            np.array([left_action[f"{j}.pos"] for j in joint_names]),
+            np.array([right_action[f"{j}.pos"] for j in joint_names]),
+            self.config.end_effector_length,
+            self.config.link_radii,
+        )[0]
+        if distances.min() >= self.config.self_collision_margin:
+            return False
+        i, j = np.unravel_index(distances.argmin(), distances.shape)
+        logger.warning(
+            f"action rejected: left capsule {i} and right capsule {j} "
+            f"{distances[i, j] * 1e3:.0f}mm apart"
+        )
+        return True
+
+    def _hits_obstacle(
+        self, arm_actions: list[tuple[str, dict[str, Any]]], joint_names: list[str]
+    ) -> bool:
+        from lerobot_robot_yams.workspace_sdf import obstacle_clearance
+
+        for side, arm_action in arm_actions:
+            clearance = obstacle_clearance(
+                self._workspace_sdf,
+                np.array([arm_action[f"{j}.pos"] for j in joint_names]),
+                self.config.end_effector_length,
+                self.config.link_radii,
+                side=side,
+            )[0]
+            if clearance < self.config.workspace_margin:
+                logger.warning(
+                    f"{side} arm action rejected: {clearance * 1e3:.0f}mm from a workspace obstacle"
+                )
+                return True
+        return False
+
     def send_action(self, action: dict[str, Any]) -> dict[str, Any]:
         left_action = {
             key.removeprefix("left_"): value
@@ -168,7 +358,23 @@ class BiYamsFollower(Robot):
         }
 
         joint_names_6 = self.left_arm.config.joint_names[:6]
-        for side, arm_action in [("left", left_action), ("right", right_action)]:
+        both_arms = [("left", left_action), ("right", right_action)]
+        arm_actions = both_arms
+        if self.config.joint_limit_mode == "clamp":
+            if not self._clamp_arm_actions(arm_actions, joint_names_6):
+                return self.get_observation(with_cameras=False)
+            arm_actions = []
+        elif self.config.server_side_safety:
+            arm_actions = []
+        if (
+            self.config.self_collision_margin is not None
+            and self._arms_collide(left_action, right_action, joint_names_6)
+        ) or (self._workspace_sdf is not None and self._hits_obstacle(both_arms, joint_names_6)):
+            if self.config.joint_limit_mode == "clamp":
+                for limiter in self._limiters.values():
+                    limiter.hold()
+            return self.get_observation(with_cameras=False)
+        for side, arm_action in arm_actions:
             angles = np.array([arm_action[f"{j}.pos"] for j in joint_names_6])
             rejected, reason = check_action(
                 angles,
@@ -182,19 +388,54 @@ class BiYamsFollower(Robot):
                 return self.get_observation(with_cameras=False)
             self._last_angles[side] = angles
 
-        send_action_left = self.left_arm.send_action(left_action)
-        send_action_right = self.right_arm.send_action(right_action)
-
-        prefixed_send_action_left = {
-            f"left_{key}": value for key, value in send_action_left.items()
+        # Both commands are in flight before either verdict is awaited.
+        arms = {
+            "left": (self.left_arm, left_action, self.left_arm.command_action(left_action)),
+            "right": (self.right_arm, right_action, self.right_arm.command_action(right_action)),
         }
-        prefixed_send_action_right = {
-            f"right_{key}": value for key, value in send_action_right.items()
+        rejected = {
+            side: status
+            for side, (arm, _, future) in arms.items()
+            if (status := arm.action_status(future)) != SafetyStatus.OK
         }
-
-        return {**prefixed_send_action_left, **prefixed_send_action_right}
+        if rejected:
+            return self._hold_both_arms(arms, rejected)
+
+        sent = {}
+        for side, (arm, arm_action, _) in arms.items():
+            arm.accept_action(arm_action)
+            sent.update({f"{side}_{key}": value for key, value in arm_action.items()})
+        return sent
+
+    def _hold_both_arms(
+        self, arms: dict[str, tuple[YamsFollower, dict[str, Any], Any]], rejected: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Drop the whole bimanual action after a server-side rejection of either arm.
+
+        The rejecting server never forwarded its command; the other one already
+        did, so that arm is sent back to its last accepted action.
+        """
+        reasons = ", ".join(f"{side}: {status.name}" for side, status in rejected.items())
+        logger.warning(f"Action rejected by server ({reasons}); holding both arms")
+        held = {}
+        for side, (arm, arm_action, _) in arms.items():
+            hold = arm.held_action()
+            if side not in rejected:
+                status = arm.action_status(arm.command_action(hold))
+                if status != SafetyStatus.OK:
+                    logger.warning(f"{side} arm hold rejected by server: {status.name}")
+            held.update({f"{side}_{key}": hold[key] for key in arm_action})
+        if self.config.joint_limit_mode == "clamp":
+            for limiter in self._limiters.values():
+                limiter.hold()
+        return held
 
     def disconnect(self):
+        if self._can_monitor is not None:
+            self._can_monitor.stop()
+            self._can_monitor = None
+        self._pose_drift = None
+
         with ThreadPoolExecutor(max_workers=2) as ex:
             ex.submit(self.left_arm.disconnect)
             ex.submit(self.right_arm.disconnect)
@@ -11,13 +11,26 @@ import yaml
 from lerobot.cameras import CameraConfig, make_cameras_from_configs
 from lerobot.robots import Robot, RobotConfig
 from lerobot.utils.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
+from lerobot_robot_yams.robot_core.safety_filter import SafetyLimits, SafetyStatus
+from lerobot_robot_yams.robot_core.state_stream import (
+    STATE_STREAM_PORT_OFFSET,
+    StateBuffer,
+    StateSubscriber,
+    joint_pos_from_observation,
+)
 from lerobot_robot_yams.robot_core.yams_server import run_robot_server
+from utils.frame_output import output_hw
 
 # from i2rt.robots.get_robot import get_yam_robot
 # from i2rt.robots.utils import GripperType
 
 logger = logging.getLogger(__name__)
 
+# Streamed state older than this is treated as lost and get_observation falls
+# back to a synchronous RPC.
+STATE_STREAM_STALE_S = 0.1
+
+
 @RobotConfig.register_subclass("yams_follower")
 @dataclass
 class YamsFollowerConfig(RobotConfig):
@@ -26,6 +39,13 @@ class YamsFollowerConfig(RobotConfig):
     cameras: dict[str, CameraConfig] = field(default_factory=dict)
     gripper: str = "linear_3507"
     side: str = "right"
+    # >0 makes the server push joint state at this rate; get_observation then
+    # interpolates from the client-side buffer instead of doing an RPC.
+    state_stream_hz: float = 0.0
+    max_extrapolation_s: float = 0.02
+    # When set, the robot server checks every joint command against these
+    # limits and send_action reports rejections as a SafetyStatus.
+    safety: SafetyLimits | None = None
     joint_names: list[str] = field(
         default_factory=lambda: [
             "joint_1",
@@ -47,6 +67,8 @@ class YamsFollower(Robot):
         super().__init__(config)
         self.config = config
         self._client = None
+        self._state_subscriber: StateSubscriber | None = None
+        self._last_accepted_action: dict[str, Any] | None = None
         self.cameras = make_cameras_from_configs(config.cameras)
         self.connected_once = False
 
@@ -57,7 +79,7 @@ class YamsFollower(Robot):
     @property
     def _cameras_ft(self) -> dict[str, tuple]:
         return {
-            cam: (self.config.cameras[cam].height, self.config.cameras[cam].width, 3)
+            cam: (*output_hw(self.config.cameras[cam]), 3)
             for cam in self.cameras
         }
 
@@ -89,6 +111,13 @@ class YamsFollower(Robot):
         if self.is_connected:
             raise DeviceAlreadyConnectedError(f"{self} already connected")
 
+        if self.config.state_stream_hz > 0:
+            self._state_subscriber = StateSubscriber(
+                self.config.server_port + STATE_STREAM_PORT_OFFSET,
+                StateBuffer(max_extrapolation_s=self.config.max_extrapolation_s),
+            )
+            self._state_subscriber.start()
+
         ctx = mp.get_context("spawn")
         self._robot_process = ctx.Process(
             target=run_robot_server,
@@ -111,7 +140,22 @@ class YamsFollower(Robot):
     def configure(self) -> None:
         pass
 
-    def get_observation(self) -> dict[str, Any]:
+    def _streamed_joint_pos(self, timestamp: float) -> np.ndarray | None:
+        if self._state_subscriber is None:
+            return None
+        buffer = self._state_subscriber.buffer
+        latest = buffer.latest_time
+        if latest is None or time.perf_counter() - latest > STATE_STREAM_STALE_S:
+            return None
+        return buffer.sample(timestamp)
+
+    def get_observation(self, timestamp: float | None = None) -> dict[str, Any]:
+        """Read arm state and cameras.
+
+        With state streaming enabled, joint positions are interpolated to
+        `timestamp` (time.perf_counter() clock, default now) from the pushed
+        state buffer, without a round trip to the server.
+        """
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
@@ -119,8 +163,10 @@ class YamsFollower(Robot):
         start = time.perf_counter()
 
         obs_dict = {}
-        obs = self._client.get_observations().result()  # type: ignore
-        joint_pos = np.concatenate([obs["joint_pos"], obs.get("gripper_pos", np.array([]))])
+        joint_pos = self._streamed_joint_pos(start if timestamp is None else timestamp)
+        if joint_pos is None:
+            obs = self._client.get_observations().result()  # type: ignore
+            joint_pos = joint_pos_from_observation(obs)
         for i, key in enumerate(self.config.joint_names):
             obs_dict[f"{key}.pos"] = joint_pos[i]
 
@@ -136,15 +182,43 @@ class YamsFollower(Robot):
 
         return obs_dict
 
-    def send_action(self, action: dict[str, Any]) -> dict[str, Any]:
+    def command_action(self, action: dict[str, Any]) -> Any:
+        """Send `action` to the server without waiting; pass the result to action_status()."""
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
         goal_pos = np.array(
             [action[f"{joint_name}.pos"] for joint_name in self.config.joint_names]
         )
-        self._client.command_joint_pos(goal_pos)  # type: ignore
+        return self._client.command_joint_pos(goal_pos)  # type: ignore
 
+    def action_status(self, future: Any) -> SafetyStatus:
+        """The server's verdict on a command_action() future; OK without safety limits."""
+        if self.config.safety is None:
+            return SafetyStatus.OK
+        return SafetyStatus(future.result())
+
+    def accept_action(self, action: dict[str, Any]) -> None:
+        self._last_accepted_action = action
+
+    def held_action(self) -> dict[str, Any]:
+        """The last accepted action, or the current joint positions before the first."""
+        if self._last_accepted_action is not None:
+            return self._last_accepted_action
+        obs = self.get_observation()
+        return {f"{name}.pos": obs[f"{name}.pos"] for name in self.config.joint_names}
+
+    def send_action(self, action: dict[str, Any]) -> dict[str, Any]:
+        future = self.command_action(action)
+        if self.config.safety is None:
+            return action
+
+        status = self.action_status(future)
+        if status != SafetyStatus.OK:
+            logger.warning(f"{self} action rejected by server: {status.name}")
+            held = self.held_action()
+            return {key: held[key] for key in action}
+        self.accept_action(action)
         return action
 
     def disconnect(self):
@@ -157,6 +231,9 @@ class YamsFollower(Robot):
         slow_move(self, zero_pos, duration=2.0)
 
         self._client.close()
+        if self._state_subscriber is not None:
+            self._state_subscriber.stop()
+            self._state_subscriber = None
         self._robot_process.terminate()
         self._robot_process.join()
 
@@ -1,56 +1,25 @@
-"""Forward kinematics for YAM arm, parsed from dual_yam.urdf using only numpy."""
+"""Forward kinematics for YAM arm, from the compiled dual_yam.urdf model using only numpy."""
 
-import xml.etree.ElementTree as ET
-from pathlib import Path
+from enum import IntEnum
 
 import numpy as np
 
-_URDF = Path(__file__).parents[2] / "urdf" / "dual_yam.urdf"
+from lerobot_robot_yams.robot_model import (
+    JOINT_ORDER as _JOINT_ORDER,
+    _make_tf,
+    _rot_z,
+    load_robot_model,
+)
 
-# Joint chain for a single arm in order from base to tip (revolute joints only).
-_JOINT_ORDER = ["joint1", "joint2", "joint3", "joint4", "joint5", "joint6"]
 
+class SafetyStatus(IntEnum):
+    """Why an action was rejected; cheap to send back over RPC."""
 
-def _parse_urdf(urdf_path: Path = _URDF) -> list[tuple[np.ndarray, np.ndarray]]:
-    """Return (xyz, rpy) for each joint in _JOINT_ORDER, from the URDF."""
-    root = ET.parse(urdf_path).getroot()
-    by_name = {j.get("name"): j for j in root.iter("joint")}
-    frames = []
-    for name in _JOINT_ORDER:
-        origin = by_name[name].find("origin")
-        xyz = np.fromstring(origin.get("xyz", "0 0 0"), sep=" ")
-        rpy = np.fromstring(origin.get("rpy", "0 0 0"), sep=" ")
-        frames.append((xyz, rpy))
-    return frames
-
-
-_JOINT_FRAMES = _parse_urdf()
-
-
-def _rot_x(a: float) -> np.ndarray:
-    c, s = np.cos(a), np.sin(a)
-    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
-
-
-def _rot_y(a: float) -> np.ndarray:
-    c, s = np.cos(a), np.sin(a)
-    return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
-
-
-def _rot_z(a: float) -> np.ndarray:
-    c, s = np.cos(a), np.sin(a)
-    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
-
-
-def _rpy_to_rot(r: float, p: float, y: float) -> np.ndarray:
-    return _rot_z(y) @ _rot_y(p) @ _rot_x(r)
-
-
-def _make_tf(rot: np.ndarray, pos: np.ndarray) -> np.ndarray:
-    T = np.eye(4)
-    T[:3, :3] = rot
-    T[:3, 3] = pos
-    return T
+    OK = 0
+    JOINT1_LIMIT = 1
+    JOINT_STEP = 2
+    LINK_BELOW_GROUND = 3
+    EE_BELOW_GROUND = 4
 
 
 def arm_fk(joint_angles: np.ndarray) -> list[np.ndarray]:
@@ -69,9 +38,7 @@ def arm_fk(joint_angles: np.ndarray) -> list[np.ndarray]:
     T = np.eye(4)
     positions = [T[:3, 3].copy()]
 
-    for (xyz, rpy), q in zip(_JOINT_FRAMES, joint_angles):
-        # Fixed part of the joint frame
-        T_joint = _make_tf(_rpy_to_rot(*rpy), xyz)
+    for T_joint, q in zip(load_robot_model().joint_tfs, joint_angles):
         # Revolve about local z by q
         T_q = _make_tf(_rot_z(q), np.zeros(3))
         T = T @ T_joint @ T_q
@@ -80,6 +47,57 @@ def arm_fk(joint_angles: np.ndarray) -> list[np.ndarray]:
     return positions, T
 
 
+def arm_fk_batch(joint_angles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized arm_fk over a batch of configurations.
+
+    Parameters
+    ----------
+    joint_angles : (N, 6) array of joint angles in radians.
+
+    Returns
+    -------
+    positions : (N, 7, 3) link origins, base first, as in arm_fk.
+    T_tip : (N, 4, 4) last-link transforms.
+    """
+    q = np.atleast_2d(joint_angles)
+    n = q.shape[0]
+    T = np.broadcast_to(np.eye(4), (n, 4, 4)).copy()
+    positions = np.zeros((n, len(_JOINT_ORDER) + 1, 3))
+    T_q = np.broadcast_to(np.eye(4), (n, 4, 4)).copy()
+    for j, T_joint in enumerate(load_robot_model().joint_tfs):
+        c, s = np.cos(q[:, j]), np.sin(q[:, j])
+        T_q[:, 0, 0] = c
+        T_q[:, 0, 1] = -s
+        T_q[:, 1, 0] = s
+        T_q[:, 1, 1] = c
+        T = T @ T_joint @ T_q
+        positions[:, j + 1] = T[:, :3, 3]
+    return positions, T
+
+
+def check_action_batch(
+    joint_angles: np.ndarray,
+    ground_z: float,
+    end_effector_length: float,
+) -> np.ndarray:
+    """Vectorized joint1-limit and ground checks of check_action.
+
+    Returns an (N,) int array of SafetyStatus codes (0 = OK). The joint-step
+    limit depends on the previous command and is checked by the caller.
+    """
+    q = np.atleast_2d(joint_angles)
+    status = np.full(q.shape[0], SafetyStatus.OK, dtype=np.int8)
+    positions, T_tip = arm_fk_batch(q)
+    # The end-effector segment is linear in t, so its lowest point is one of
+    # its two ends — the same answer as sampling it densely.
+    ee_end_z = positions[:, -1, 2] + end_effector_length * T_tip[:, 2, 2]
+    ee_below = np.minimum(positions[:, -1, 2], ee_end_z) < ground_z
+    status[ee_below] = SafetyStatus.EE_BELOW_GROUND
+    status[np.any(positions[:, 1:, 2] < ground_z, axis=1)] = SafetyStatus.LINK_BELOW_GROUND
+    status[np.abs(q[:, 0]) > np.pi / 2] = SafetyStatus.JOINT1_LIMIT
+    return status
+
+
 def check_action(
     joint_angles: np.ndarray,
     last_joint_angles: np.ndarray | None,
@@ -0,0 +1,143 @@
+"""Rate-limiting action filter for the follower arms.
+
+Instead of rejecting a whole action when a joint moves too far in one tick,
+JointLimiter projects the commanded configuration onto the feasible set for
+this tick:
+
+  1. joint1 is clipped to +/-90 deg,
+  2. each joint's velocity is limited, braking early enough to stop at the
+     target without overshoot, then limited in acceleration relative to the
+     previous tick, and the resulting step is clipped to the per-action limit,
+  3. if the clipped target puts a link or the end effector below ground, the
+     step is shortened to the furthest safe point along it, found with a few
+     rounds of batched FK over candidate step fractions. Joints whose own
+     remaining motion is still safe from there (e.g. the wrist) keep moving,
+     so the arm slides along the ground instead of sticking to it.
+
+The output is always reachable from the previous output, so the follower keeps
+moving at full loop rate and catches up with the leader as fast as the limits
+allow.
+"""
+
+import numpy as np
+
+from lerobot_robot_yams.forward_kinematics import SafetyStatus, check_action_batch
+
+JOINT1_LIMIT = np.pi / 2
+
+
+class JointLimiter:
+    def __init__(
+        self,
+        max_joint_step: np.ndarray,
+        max_joint_vel: np.ndarray,
+        max_joint_acc: np.ndarray,
+        ground_z: float,
+        end_effector_length: float,
+        ground_samples: int = 8,
+        ground_iterations: int = 3,
+    ):
+        self.max_joint_step = np.asarray(max_joint_step, dtype=float)
+        self.max_joint_vel = np.asarray(max_joint_vel, dtype=float)
+        self.max_joint_acc = np.asarray(max_joint_acc, dtype=float)
+        self.ground_z = ground_z
+        self.end_effector_length = end_effector_length
+        self.ground_samples = ground_samples
+        self.ground_iterations = ground_iterations
+        self.last_command: np.ndarray | None = None
+        self.last_velocity = np.zeros_like(self.max_joint_step)
+        self._previous_command: np.ndarray | None = None
+        self.clamped = False
+        self.ground_limited = False
+
+    def reset(self) -> None:
+        self.last_command = None
+        self.last_velocity = np.zeros_like(self.max_joint_step)
+        self._previous_command = None
+
+    def hold(self) -> None:
+        """Undo the last clamp() (its command was not sent) and stop.
+
+        After the first clamp() since a reset there is nothing to go back to,
+        so the next clamp() starts over from its target.
+        """
+        self.last_command = self._previous_command
+        self.last_velocity = np.zeros_like(self.max_joint_step)
+
+    def _is_safe(self, q: np.ndarray) -> np.ndarray:
+        status = check_action_batch(q, self.ground_z, self.end_effector_length)
+        return status == SafetyStatus.OK
+
+    def _safe_fraction(self, start: np.ndarray, delta: np.ndarray) -> float:
+        """Largest alpha in [0, 1] with start + alpha * delta safe, given start is safe."""
+        lo, hi = 0.0, 1.0
+        for _ in range(self.ground_iterations):
+            alphas = np.linspace(lo, hi, self.ground_samples + 1)[1:]
+            safe = self._is_safe(start + alphas[:, None] * delta)
+            unsafe = np.flatnonzero(~safe)
+            if unsafe.size == 0:
+                return hi
+            first = unsafe[0]
+            hi = alphas[first]
+            if first > 0:
+                lo = alphas[first - 1]
+        return lo
+
+    def _ground_limited_step(self, start: np.ndarray, delta: np.ndarray) -> np.ndarray:
+        alpha = self._safe_fraction(start, delta)
+        step = alpha * delta
+        remaining = delta - step
+        # One batch: each joint's leftover motion applied on its own.
+        single_joint_safe = self._is_safe(start + step + np.diag(remaining))
+        slide = remaining * single_joint_safe
+        if single_joint_safe.any() and self._is_safe(start + step + slide)[0]:
+            step = step + slide
+        return step
+
+    def _limited_velocity(self, distance: np.ndarray, dt: float) -> np.ndarray:
+        """Velocity for this tick towards `distance`, within vel/acc limits.
+
+        The speed is also capped at sqrt(2 * a * |distance|) so each joint
+        starts braking early enough to stop at the target instead of
+        overshooting it.
+        """
+        v_stop = np.sqrt(2.0 * self.max_joint_acc * np.abs(distance))
+        v_cap = np.minimum(self.max_joint_vel, v_stop)
+        v = np.clip(distance / dt, -v_cap, v_cap)
+        dv = self.max_joint_acc * dt
+        return np.clip(v, self.last_velocity - dv, self.last_velocity + dv)
+
+    def clamp(self, joint_angles: np.ndarray, dt: float | None) -> np.ndarray | None:
+        """Return the feasible command closest to `joint_angles` (6,).
+
+        `dt` is the time since the previous command; None skips the velocity
+        and acceleration limits. Returns None only when there is no previous
+        command and the target itself is unsafe.
+        """
+        target = np.asarray(joint_angles, dtype=float).copy()
+        target[0] = np.clip(target[0], -JOINT1_LIMIT, JOINT1_LIMIT)
+
+        if self.last_command is None:
+            if not self._is_safe(target)[0]:
+                return None
+            self.clamped = not np.array_equal(target, joint_angles)
+            self._previous_command = None
+            self.last_command = target
+            return target.copy()
+
+        delta = target - self.last_command
+        if dt is not None and dt > 0:
+            delta = self._limited_velocity(delta, dt) * dt
+        delta = np.clip(delta, -self.max_joint_step, self.max_joint_step)
+
+        self.ground_limited = not self._is_safe(self.last_command + delta)[0]
+        if self.ground_limited:
+            delta = self._ground_limited_step(self.last_command, delta)
+
+        command = self.last_command + delta
+        self.clamped = not np.allclose(command, joint_angles)
+        if dt is not None and dt > 0:
+            self.last_velocity = delta / dt
+        self._previous_command = self.last_command
+        self.last_command = command
+        return command.copy()
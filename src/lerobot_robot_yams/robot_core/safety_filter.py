@@ -0,0 +1,56 @@
+"""Ground/step-limit safety filter evaluated inside the robot server process.
+
+Mirrors the client-side check_action, but runs next to the motors: every
+joint command that reaches the server (from the client or from a server-side
+trajectory) is checked before it is forwarded to the robot. The segment from
+the last accepted command to the new one is subdivided and all substeps are
+checked in one vectorized FK pass, so a fast command cannot dip through the
+ground between two safe endpoints. Rejections are reported as a SafetyStatus
+code instead of a second observation round trip.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from lerobot_robot_yams.forward_kinematics import SafetyStatus, check_action_batch
+
+
+@dataclass
+class SafetyLimits:
+    ground_z: float
+    end_effector_length: float
+    max_joint_step: list[float] = field(default_factory=lambda: [0.5] * 6)
+    # Substeps checked between consecutive commands (motor loop rate / command rate).
+    substeps: int = 4
+
+
+class SafetyFilter:
+    def __init__(self, limits: SafetyLimits):
+        self.limits = limits
+        self._max_joint_step = np.asarray(limits.max_joint_step, dtype=float)
+        self._alphas = np.arange(1, limits.substeps + 1)[:, None] / limits.substeps
+        self.last_command: np.ndarray | None = None
+
+    def check(self, joint_angles: np.ndarray) -> SafetyStatus:
+        """Check the segment from the last accepted command to `joint_angles` (6,)."""
+        q = np.asarray(joint_angles, dtype=float)
+        if self.last_command is None:
+            segment = q[None]
+        else:
+            if np.any(np.abs(q - self.last_command) > self._max_joint_step):
+                return SafetyStatus.JOINT_STEP
+            segment = self.last_command + self._alphas * (q - self.last_command)
+
+        status = check_action_batch(segment, self.limits.ground_z, self.limits.end_effector_length)
+        rejected = np.flatnonzero(status)
+        if rejected.size:
+            return SafetyStatus(int(status[rejected[0]]))
+        return SafetyStatus.OK
+
+    def filter_command(self, joint_angles: np.ndarray) -> SafetyStatus:
+        """Check and, if accepted, remember `joint_angles` as the last command."""
+        status = self.check(joint_angles)
+        if status == SafetyStatus.OK:
+            self.last_command = np.array(joint_angles, dtype=float)
+        return status
@@ -0,0 +1,202 @@
+"""Fixed-rate arm-state streaming from the robot server to its client.
+
+The server process samples the robot at a fixed rate and pushes timestamped
+joint positions over a localhost UDP socket. The client keeps the most recent
+samples in a ring buffer and answers "where was the arm at time t" by
+interpolating between the bracketing samples, or extrapolating a short way
+past the newest one. Reads never block on the server.
+
+Timestamps come from time.perf_counter(), the same monotonic clock the cached
+cameras stamp their frames with (CLOCK_MONOTONIC, shared across processes on
+Linux), so arm state can be sampled at a camera frame's capture time.
+"""
+
+import logging
+import socket
+import struct
+import threading
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STATE_STREAM_HOST = "127.0.0.1"
+# Stream port = RPC server port + offset, so left/right arms never collide.
+STATE_STREAM_PORT_OFFSET = 100
+
+# Packet: seq (uint64), timestamp (float64), n (uint32), then n float64 positions.
+_HEADER = struct.Struct("<QdI")
+
+
+def joint_pos_from_observation(obs: dict[str, Any]) -> np.ndarray:
+    """Flatten an i2rt observation into [joint_1..joint_6, gripper]."""
+    return np.concatenate([obs["joint_pos"], obs.get("gripper_pos", np.array([]))])
+
+
+def encode_state(seq: int, timestamp: float, joint_pos: np.ndarray) -> bytes:
+    joint_pos = np.ascontiguousarray(joint_pos, dtype=np.float64)
+    return _HEADER.pack(seq, timestamp, joint_pos.size) + joint_pos.tobytes()
+
+
+def decode_state(packet: bytes) -> tuple[int, float, np.ndarray]:
+    seq, timestamp, n = _HEADER.unpack_from(packet)
+    joint_pos = np.frombuffer(packet, dtype=np.float64, count=n, offset=_HEADER.size)
+    return seq, timestamp, joint_pos
+
+
+class StateBuffer:
+    """Thread-safe ring of (timestamp, joint_pos) samples in arrival order."""
+
+    def __init__(
+        self, capacity: int = 256, max_extrapolation_s: float = 0.02, slope_window: int = 5
+    ):
+        self.capacity = capacity
+        self.max_extrapolation_s = max_extrapolation_s
+        self.slope_window = slope_window
+        self._times = np.zeros(capacity)
+        self._values: np.ndarray | None = None
+        self._head = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def latest_time(self) -> float | None:
+        with self._lock:
+            if self._count == 0:
+                return None
+            return float(self._times[(self._head - 1) % self.capacity])
+
+    def push(self, timestamp: float, joint_pos: np.ndarray) -> None:
+        with self._lock:
+            if self._values is None or self._values.shape[1] != joint_pos.size:
+                self._values = np.zeros((self.capacity, joint_pos.size))
+                self._head = 0
+                self._count = 0
+            if self._count and timestamp <= self._times[(self._head - 1) % self.capacity]:
+                return
+            self._times[self._head] = timestamp
+            self._values[self._head] = joint_pos
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _snapshot(self) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            idx = np.arange(self._head - self._count, self._head) % self.capacity
+            return self._times[idx], self._values[idx]
+
+    def sample(self, timestamp: float) -> np.ndarray | None:
+        """Joint positions at `timestamp`, or None if nothing was received yet.
+
+        Inside the buffered window the two bracketing samples are linearly
+        interpolated. Past the newest sample the recent slope is extrapolated
+        for at most max_extrapolation_s, then held. Before the oldest sample
+        the oldest value is returned.
+        """
+        if self._count == 0:
+            return None
+        times, values = self._snapshot()
+
+        if timestamp >= times[-1]:
+            if len(times) == 1:
+                return values[-1].copy()
+            k = min(self.slope_window, len(times))
+            slope = (values[-1] - values[-k]) / (times[-1] - times[-k])
+            dt = min(timestamp - times[-1], self.max_extrapolation_s)
+            return values[-1] + slope * dt
+
+        if timestamp <= times[0]:
+            return values[0].copy()
+
+        i = int(np.searchsorted(times, timestamp))
+        w = (timestamp - times[i - 1]) / (times[i] - times[i - 1])
+        return (1.0 - w) * values[i - 1] + w * values[i]
+
+
+class StatePublisher:
+    """Server side: sample `read_joint_pos` at `hz` and push it to `port`."""
+
+    def __init__(self, read_joint_pos: Callable[[], np.ndarray], port: int, hz: float):
+        self._read_joint_pos = read_joint_pos
+        self._addr = (STATE_STREAM_HOST, port)
+        self._period = 1.0 / hz
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="yams-state-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._sock.close()
+
+    def _run(self) -> None:
+        seq = 0
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            # Stamp at the midpoint of the read: i2rt does not expose the
+            # motor-side timestamp, and the read itself is the only latency.
+            t0 = time.perf_counter()
+            try:
+                joint_pos = self._read_joint_pos()
+            except Exception as e:
+                logger.warning(f"State publisher read failed: {e}")
+                joint_pos = None
+            t1 = time.perf_counter()
+            if joint_pos is not None:
+                try:
+                    self._sock.sendto(encode_state(seq, 0.5 * (t0 + t1), joint_pos), self._addr)
+                except OSError:
+                    pass
+                seq += 1
+
+            next_tick += self._period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (e.g. a slow read); resync instead of bursting.
+                next_tick = time.perf_counter()
+
+
+class StateSubscriber:
+    """Client side: receive pushed state packets into a StateBuffer."""
+
+    def __init__(self, port: int, buffer: StateBuffer):
+        self.buffer = buffer
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((STATE_STREAM_HOST, port))
+        self._sock.settimeout(0.1)
+        self._last_seq = -1
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="yams-state-subscriber", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._sock.close()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                packet = self._sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            seq, timestamp, joint_pos = decode_state(packet)
+            # A restarted server begins again at seq 0.
+            if seq <= self._last_seq and seq != 0:
+                continue
+            self._last_seq = seq
+            self.buffer.push(timestamp, joint_pos)
@@ -4,18 +4,31 @@ import os
 import signal
 from pathlib import Path
 
+import numpy as np
 import portal
 from i2rt.robots.get_robot import get_yam_robot
 from i2rt.robots.robot import Robot
 from i2rt.robots.utils import GripperType
 
+from lerobot_robot_yams.robot_core.safety_filter import SafetyFilter, SafetyStatus
+from lerobot_robot_yams.robot_core.state_stream import (
+    STATE_STREAM_PORT_OFFSET,
+    StatePublisher,
+    joint_pos_from_observation,
+)
+
 
 def run_robot_server(config) -> None:
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     gripper_type = GripperType.from_string_name(config.gripper)
     robot = get_yam_robot(channel=config.can_port, gripper_type=gripper_type)
 
-    server = YamsServer(robot, config.server_port)
+    safety_filter = SafetyFilter(config.safety) if config.safety is not None else None
+    server = YamsServer(robot, config.server_port, safety_filter=safety_filter)
+    if config.state_stream_hz > 0:
+        server.start_state_stream(
+            config.server_port + STATE_STREAM_PORT_OFFSET, config.state_stream_hz
+        )
     if os.getenv("YAMS_SERVER_PROFILE"):
         prof = cProfile.Profile()
         prof.enable()
@@ -43,18 +56,46 @@ def run_robot_server(config) -> None:
 class YamsServer:
     """A simple server for a Yams robot."""
 
-    def __init__(self, robot: Robot, port: int):
+    def __init__(self, robot: Robot, port: int, safety_filter: SafetyFilter | None = None):
         self._robot = robot
         self._server = portal.Server(port)
+        self._state_publisher: StatePublisher | None = None
+        self._safety_filter = safety_filter
         print(f"Robot Server Binding to {port}, Robot: {robot}")
 
         self._server.bind("num_dofs", self._robot.num_dofs)
         self._server.bind("get_joint_pos", self._robot.get_joint_pos)
-        self._server.bind("command_joint_pos", self._robot.command_joint_pos)
-        self._server.bind("command_joint_state", self._robot.command_joint_state)
+        if safety_filter is None:
+            self._server.bind("command_joint_pos", self._robot.command_joint_pos)
+            self._server.bind("command_joint_state", self._robot.command_joint_state)
+        else:
+            print("Robot Server filtering joint commands server-side")
+            self._server.bind("command_joint_pos", self.command_joint_pos)
+            self._server.bind("command_joint_state", self.command_joint_state)
         self._server.bind("get_observations", self._robot.get_observations)
         self._server.bind("get_robot_info", self._robot.get_robot_info)
 
+    def command_joint_pos(self, joint_pos: np.ndarray) -> int:
+        """Forward `joint_pos` only if the safety filter accepts it; return the status."""
+        status = self._safety_filter.filter_command(np.asarray(joint_pos)[:6])
+        if status == SafetyStatus.OK:
+            self._robot.command_joint_pos(joint_pos)
+        return int(status)
+
+    def command_joint_state(self, joint_state: dict) -> int:
+        status = self._safety_filter.filter_command(np.asarray(joint_state["pos"])[:6])
+        if status == SafetyStatus.OK:
+            self._robot.command_joint_state(joint_state)
+        return int(status)
+
+    def start_state_stream(self, port: int, hz: float) -> None:
+        """Push timestamped joint positions to the client at a fixed rate."""
+        self._state_publisher = StatePublisher(
+            lambda: joint_pos_from_observation(self._robot.get_observations()), port, hz
+        )
+        self._state_publisher.start()
+        print(f"Robot Server streaming state to {port} at {hz:g} Hz")
+
     def serve(self) -> None:
         """Serve the leader robot."""
         self._server.start()
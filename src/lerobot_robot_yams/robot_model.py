@@ -0,0 +1,135 @@
+"""Compiled robot model shared by FK, collision checks and the follower config.
+
+Everything the runtime needs from urdf/dual_yam.urdf (fixed joint transforms,
+the second arm's base offset) and configs/arms.yaml (collision and workspace
+parameters) is compiled once into a small .npz keyed by the content hash of
+both files. Later processes load that instead of parsing XML and YAML, and
+nothing is loaded until the first FK or config call needs it, so importing
+the package stays cheap.
+"""
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+
+from utils.disk_cache import CACHE_ROOT, cache_key, read_cache, write_cache
+
+URDF_PATH = Path(__file__).resolve().parents[2] / "urdf" / "dual_yam.urdf"
+ARMS_CONFIG_PATH = Path(__file__).resolve().parents[2] / "configs" / "arms.yaml"
+MODEL_CACHE_DIR = CACHE_ROOT / "robot_model"
+
+# Joint chain for a single arm in order from base to tip (revolute joints only).
+JOINT_ORDER = ["joint1", "joint2", "joint3", "joint4", "joint5", "joint6"]
+
+_FORMAT_VERSION = 1
+
+
+def _rot_x(a: float) -> np.ndarray:
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+
+
+def _rot_y(a: float) -> np.ndarray:
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+
+
+def _rot_z(a: float) -> np.ndarray:
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+
+def _rpy_to_rot(r: float, p: float, y: float) -> np.ndarray:
+    return _rot_z(y) @ _rot_y(p) @ _rot_x(r)
+
+
+def _make_tf(rot: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    T = np.eye(4)
+    T[:3, :3] = rot
+    T[:3, 3] = pos
+    return T
+
+
+@dataclass(frozen=True)
+class RobotModel:
+    joint_frames: np.ndarray  # (6, 2, 3): xyz and rpy of each joint origin
+    joint_tfs: np.ndarray  # (6, 4, 4): fixed part of each joint transform
+    right_base_offset: np.ndarray  # (3,): arm2 base relative to arm1 base
+    collision: dict[str, Any]
+    workspace: dict[str, Any]
+
+
+def source_hash(urdf_path: Path = URDF_PATH, arms_config_path: Path = ARMS_CONFIG_PATH) -> str:
+    return cache_key(
+        _FORMAT_VERSION, Path(urdf_path).read_bytes(), Path(arms_config_path).read_bytes()
+    )
+
+
+def compile_robot_model(
+    urdf_path: Path = URDF_PATH, arms_config_path: Path = ARMS_CONFIG_PATH
+) -> RobotModel:
+    """Parse the URDF and arms.yaml into a RobotModel (the slow path)."""
+    import xml.etree.ElementTree as ET
+
+    import yaml
+
+    root = ET.parse(urdf_path).getroot()
+    by_name = {j.get("name"): j for j in root.iter("joint")}
+
+    def origin(name: str) -> tuple[np.ndarray, np.ndarray]:
+        element = by_name[name].find("origin")
+        xyz = np.fromstring(element.get("xyz", "0 0 0"), sep=" ")
+        rpy = np.fromstring(element.get("rpy", "0 0 0"), sep=" ")
+        return xyz, rpy
+
+    joint_frames = np.array([origin(name) for name in JOINT_ORDER])
+    joint_tfs = np.stack([_make_tf(_rpy_to_rot(*rpy), xyz) for xyz, rpy in joint_frames])
+    if "base_to_arm2_base_joint" not in by_name:
+        raise ValueError(f"base_to_arm2_base_joint not found in {urdf_path}")
+    right_base_offset, _ = origin("base_to_arm2_base_joint")
+
+    arms_config = yaml.safe_load(Path(arms_config_path).read_text())
+    return RobotModel(
+        joint_frames=joint_frames,
+        joint_tfs=joint_tfs,
+        right_base_offset=right_base_offset,
+        collision=arms_config["collision"],
+        workspace=arms_config.get("workspace") or {},
+    )
+
+
+def _save(model: RobotModel, f: IO[bytes]) -> None:
+    np.savez(
+        f,
+        joint_frames=model.joint_frames,
+        joint_tfs=model.joint_tfs,
+        right_base_offset=model.right_base_offset,
+        params=np.array(json.dumps({"collision": model.collision, "workspace": model.workspace})),
+    )
+
+
+def _load(path: Path) -> RobotModel:
+    with np.load(path) as data:
+        params = json.loads(str(data["params"]))
+        return RobotModel(
+            joint_frames=data["joint_frames"],
+            joint_tfs=data["joint_tfs"],
+            right_base_offset=data["right_base_offset"],
+            collision=params["collision"],
+            workspace=params["workspace"],
+        )
+
+
+@lru_cache(maxsize=None)
+def load_robot_model(cache_dir: Path = MODEL_CACHE_DIR) -> RobotModel:
+    """Load the compiled model for the current URDF/arms.yaml, compiling it on a miss."""
+    path = Path(cache_dir) / f"{source_hash()}.npz"
+    model = read_cache(path, _load, "robot model")
+    if model is None:
+        model = compile_robot_model()
+        write_cache(path, lambda f: _save(model, f), "robot model")
+    return model
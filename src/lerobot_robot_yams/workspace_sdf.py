@@ -0,0 +1,174 @@
+"""Static workspace obstacles as a precomputed signed-distance field.
+
+Obstacles (table, fixtures, walls) are listed under `workspace:` in
+configs/arms.yaml as simple primitives in the left arm's base frame:
+
+  - {type: box, center: [x, y, z], size: [sx, sy, sz]}
+  - {type: halfspace, point: [x, y, z], normal: [nx, ny, nz]}   # normal points to free space
+
+The union of their analytic SDFs is baked once into a voxel grid over the
+workspace bounds and cached on disk under a hash of the geometry, so a query
+is a single trilinear lookup regardless of how many obstacles there are.
+Link geometry is sampled along the same capsules as the self-collision check.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from lerobot_robot_yams.robot_model import load_robot_model
+from lerobot_robot_yams.self_collision import arm_capsules
+from utils.disk_cache import CACHE_ROOT, cache_key, read_cache, write_cache
+
+SDF_CACHE_DIR = CACHE_ROOT / "workspace_sdf"
+# Bump when bake() or the cache layout changes, so old grids are not reused.
+_FORMAT_VERSION = 1
+
+
+def box_sdf(points: np.ndarray, center: np.ndarray, size: np.ndarray) -> np.ndarray:
+    q = np.abs(points - center) - 0.5 * np.asarray(size)
+    outside = np.linalg.norm(np.maximum(q, 0.0), axis=-1)
+    inside = np.minimum(q.max(axis=-1), 0.0)
+    return outside + inside
+
+
+def halfspace_sdf(points: np.ndarray, point: np.ndarray, normal: np.ndarray) -> np.ndarray:
+    normal = np.asarray(normal, dtype=float)
+    return (points - point) @ (normal / np.linalg.norm(normal))
+
+
+_PRIMITIVES = {
+    "box": lambda p, o: box_sdf(p, np.asarray(o["center"]), np.asarray(o["size"])),
+    "halfspace": lambda p, o: halfspace_sdf(p, np.asarray(o["point"]), o["normal"]),
+}
+
+
+def analytic_sdf(points: np.ndarray, obstacles: list[dict[str, Any]]) -> np.ndarray:
+    """Exact signed distance to the union of `obstacles` (+inf if there are none)."""
+    points = np.asarray(points, dtype=float)
+    d = np.full(points.shape[:-1], np.inf)
+    for obstacle in obstacles:
+        try:
+            primitive = _PRIMITIVES[obstacle["type"]]
+        except KeyError:
+            raise ValueError(f"Unknown workspace obstacle type: {obstacle.get('type')!r}")
+        d = np.minimum(d, primitive(points, obstacle))
+    return d
+
+
+class WorkspaceSDF:
+    """Voxel SDF over an axis-aligned box, sampled at voxel corners."""
+
+    def __init__(self, origin: np.ndarray, resolution: float, grid: np.ndarray):
+        self.origin = np.asarray(origin, dtype=float)
+        self.resolution = float(resolution)
+        self.grid = grid
+        self._max_index = np.array(grid.shape) - 1
+
+    @classmethod
+    def bake(
+        cls,
+        obstacles: list[dict[str, Any]],
+        bounds: list[list[float]],
+        resolution: float,
+        max_distance: float = 0.5,
+    ) -> "WorkspaceSDF":
+        """Evaluate the analytic SDF on the grid; distances are capped at max_distance."""
+        lo, hi = np.asarray(bounds, dtype=float)
+        shape = np.ceil((hi - lo) / resolution).astype(int) + 1
+        axes = [lo[i] + resolution * np.arange(shape[i]) for i in range(3)]
+        grid = np.empty(tuple(shape), dtype=np.float32)
+        # One x-slab at a time keeps peak memory at a single (ny, nz, 3) block.
+        yz = np.stack(np.meshgrid(axes[1], axes[2], indexing="ij"), axis=-1)
+        for i, x in enumerate(axes[0]):
+            points = np.concatenate([np.full(yz.shape[:-1] + (1,), x), yz], axis=-1)
+            grid[i] = np.minimum(analytic_sdf(points, obstacles), max_distance)
+        return cls(lo, resolution, grid)
+
+    @classmethod
+    def load_or_bake(
+        cls,
+        obstacles: list[dict[str, Any]],
+        bounds: list[list[float]],
+        resolution: float,
+        cache_dir: Path = SDF_CACHE_DIR,
+    ) -> "WorkspaceSDF":
+        geometry = json.dumps(
+            {"obstacles": obstacles, "bounds": bounds, "resolution": resolution}, sort_keys=True
+        )
+        path = Path(cache_dir) / f"{cache_key(_FORMAT_VERSION, geometry)}.npz"
+        cached = cls._load(path)
+        if cached is not None:
+            return cached
+
+        sdf = cls.bake(obstacles, bounds, resolution)
+        write_cache(
+            path,
+            lambda f: np.savez(f, origin=sdf.origin, resolution=sdf.resolution, grid=sdf.grid),
+            "workspace SDF",
+        )
+        return sdf
+
+    @classmethod
+    def _load(cls, path: Path) -> "WorkspaceSDF | None":
+        def load(path: Path) -> "WorkspaceSDF":
+            with np.load(path) as data:
+                return cls(data["origin"], float(data["resolution"]), data["grid"])
+
+        # A truncated or foreign file reads as None: bake again and overwrite it.
+        return read_cache(path, load, "workspace SDF")
+
+    def query(self, points: np.ndarray) -> np.ndarray:
+        """Trilinearly interpolated distance at `points` (..., 3).
+
+        Points outside the grid are clamped onto its boundary.
+        """
+        u = (np.asarray(points, dtype=float) - self.origin) / self.resolution
+        u = np.clip(u, 0.0, self._max_index)
+        i0 = np.minimum(u.astype(np.intp), self._max_index - 1)
+        w = u - i0
+        x0, y0, z0 = i0[..., 0], i0[..., 1], i0[..., 2]
+        wx, wy, wz = w[..., 0], w[..., 1], w[..., 2]
+        g = self.grid
+
+        c00 = g[x0, y0, z0] * (1 - wx) + g[x0 + 1, y0, z0] * wx
+        c10 = g[x0, y0 + 1, z0] * (1 - wx) + g[x0 + 1, y0 + 1, z0] * wx
+        c01 = g[x0, y0, z0 + 1] * (1 - wx) + g[x0 + 1, y0, z0 + 1] * wx
+        c11 = g[x0, y0 + 1, z0 + 1] * (1 - wx) + g[x0 + 1, y0 + 1, z0 + 1] * wx
+        c0 = c00 * (1 - wy) + c10 * wy
+        c1 = c01 * (1 - wy) + c11 * wy
+        return c0 * (1 - wz) + c1 * wz
+
+
+def link_samples(
+    joint_angles: np.ndarray,
+    end_effector_length: float,
+    samples_per_link: int = 8,
+    base_offset: np.ndarray | None = None,
+) -> np.ndarray:
+    """(N, 7, samples_per_link, 3) points along each link capsule axis."""
+    starts, ends = arm_capsules(joint_angles, end_effector_length)
+    t = np.linspace(0.0, 1.0, samples_per_link)[:, None]
+    points = starts[:, :, None] + t * (ends - starts)[:, :, None]
+    if base_offset is not None:
+        points = points + base_offset
+    return points
+
+
+def obstacle_clearance(
+    sdf: WorkspaceSDF,
+    joint_angles: np.ndarray,
+    end_effector_length: float,
+    link_radii: np.ndarray,
+    side: str = "left",
+    samples_per_link: int = 8,
+) -> np.ndarray:
+    """(N,) smallest distance from any link capsule surface to an obstacle."""
+    base_offset = load_robot_model().right_base_offset if side == "right" else None
+    points = link_samples(
+        np.atleast_2d(joint_angles), end_effector_length, samples_per_link, base_offset
+    )
+    d = sdf.query(points) - np.asarray(link_radii)[:, None]
+    return d.reshape(d.shape[0], -1).min(axis=1)
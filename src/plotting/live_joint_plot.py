@@ -286,12 +286,18 @@ class LiveJointPlotter:
             for key, value in observation.items():
                 if key in self.joint_keys or not isinstance(value, np.ndarray) or value.ndim != 3:
                     continue
-                frame = value
-                if frame.dtype != np.uint8:
-                    frame = np.clip(frame, 0, 255).astype(np.uint8)
-                ok, encoded = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-                if ok:
-                    cams[key] = f"data:image/jpeg;base64,{b64encode(encoded).decode('ascii')}"
+                # Compressed-passthrough cameras still carry the device's own JPEG.
+                # Otherwise the frame is RGB and imencode wants BGR.
+                encoded = getattr(value, 'jpeg', None)
+                if encoded is None:
+                    frame = value
+                    if frame.dtype != np.uint8:
+                        frame = np.clip(frame, 0, 255).astype(np.uint8)
+                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                    ok, encoded = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
+                    if not ok:
+                        continue
+                cams[key] = f"data:image/jpeg;base64,{b64encode(encoded).decode('ascii')}"
             self._last_camera_t = now
 
         payload = json.dumps({'t': now, 'obs': obs, 'act': act, 'cams': cams}, separators=(',', ':'))
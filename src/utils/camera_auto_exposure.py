@@ -1,15 +1,31 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import errno
+import fcntl
+import logging
+import os
 from pathlib import Path
-import subprocess
+import struct
+import threading
 import time
 
 import numpy as np
 
+logger = logging.getLogger(__name__)
 
-def frame_brightness(frame: np.ndarray) -> float:
+# linux/v4l2-controls.h and videodev2.h: struct v4l2_control {__u32 id; __s32 value;}
+V4L2_CID_EXPOSURE_ABSOLUTE = 0x009A0902
+_V4L2_CONTROL = struct.Struct("Ii")
+VIDIOC_G_CTRL = 3 << 30 | _V4L2_CONTROL.size << 16 | ord("V") << 8 | 27
+VIDIOC_S_CTRL = 3 << 30 | _V4L2_CONTROL.size << 16 | ord("V") << 8 | 28
+
+
+def frame_brightness(frame: np.ndarray, stride: int = 4) -> float:
+    """75th-percentile brightness of the centre crop, sampled every `stride` pixels."""
     h, w = frame.shape[:2]
-    crop = frame[h // 4 : 3 * h // 4, w // 4 : 3 * w // 4]
-    return float(np.percentile(crop.mean(axis=2), 75))
+    crop = frame[h // 4 : 3 * h // 4 : stride, w // 4 : 3 * w // 4 : stride]
+    luma = crop.reshape(-1, crop.shape[-1]).sum(axis=1, dtype=np.uint32)
+    k = (3 * (luma.size - 1)) // 4
+    return float(np.partition(luma, k)[k]) / crop.shape[-1]
 
 
 def next_exposure(
@@ -28,6 +44,83 @@ def next_exposure(
     return max(min_exposure, min(max_exposure, round(exposure * scale)))
 
 
+class V4L2Control:
+    """One V4L2 control of a video device, read and written with VIDIOC_G/S_CTRL."""
+
+    def __init__(self, device: str | Path, control_id: int = V4L2_CID_EXPOSURE_ABSOLUTE):
+        self.device = device
+        self.control_id = control_id
+        self.fd = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+
+    def get(self) -> int:
+        buf = fcntl.ioctl(self.fd, VIDIOC_G_CTRL, _V4L2_CONTROL.pack(self.control_id, 0))
+        return _V4L2_CONTROL.unpack(buf)[1]
+
+    def set(self, value: int) -> None:
+        fcntl.ioctl(self.fd, VIDIOC_S_CTRL, _V4L2_CONTROL.pack(self.control_id, value))
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class AsyncExposureSetter:
+    """Applies exposure values on its own thread so the capture thread never blocks.
+
+    Only the newest pending value is kept; a burst of submits results in one
+    ioctl. The first failure is kept in `error` and stops the thread.
+    """
+
+    def __init__(self, device: str | Path):
+        self.device = device
+        self.error: Exception | None = None
+        self._pending: int | None = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, exposure: int) -> None:
+        with self._cond:
+            self._pending = exposure
+            self._closed = False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"exposure-{Path(self.device).name}", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        try:
+            control = V4L2Control(self.device)
+        except OSError as e:
+            self.error = e
+            return
+        try:
+            while True:
+                with self._cond:
+                    while self._pending is None and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    exposure, self._pending = self._pending, None
+                control.set(exposure)
+        except OSError as e:
+            logger.warning(f"Setting exposure on {self.device} failed: {e}")
+            self.error = e
+        finally:
+            control.close()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=1.0)
+
+
 @dataclass
 class CameraAutoExposure:
     device: str | Path
@@ -39,12 +132,19 @@ class CameraAutoExposure:
     max_exposure: int
     period_s: float
     last_update: float = 0.0
+    # None applies each change synchronously in tick().
+    setter: AsyncExposureSetter | None = field(default=None, repr=False)
+
+    def due(self) -> bool:
+        return time.monotonic() - self.last_update >= self.period_s
 
     def tick(self, frame: np.ndarray) -> int | None:
         now = time.monotonic()
         if now - self.last_update < self.period_s:
             return None
         self.last_update = now
+        if self.setter is not None and self.setter.error is not None:
+            raise self.setter.error
         exposure = next_exposure(
             exposure=self.exposure,
             brightness=frame_brightness(frame),
@@ -57,24 +157,32 @@ class CameraAutoExposure:
         if exposure == self.exposure:
             return None
         self.exposure = exposure
-        _set_exposure(self.device, exposure)
+        if self.setter is not None:
+            self.setter.submit(exposure)
+        else:
+            _set_exposure(self.device, exposure)
         return exposure
 
+    def close(self) -> None:
+        if self.setter is not None:
+            self.setter.close()
+
 
 def _set_exposure(device: str | Path, exposure: int) -> None:
-    subprocess.run(
-        ["v4l2-ctl", "-d", str(device), f"--set-ctrl=exposure_time_absolute={exposure}"],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
+    control = V4L2Control(device)
+    try:
+        control.set(exposure)
+    finally:
+        control.close()
 
 
 def get_exposure(device: str | Path) -> int:
-    result = subprocess.run(
-        ["v4l2-ctl", "-d", str(device), "--get-ctrl=exposure_time_absolute"],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-    return int(result.stdout.strip().split(":")[-1])
+    control = V4L2Control(device)
+    try:
+        return control.get()
+    except OSError as e:
+        if e.errno in (errno.EINVAL, errno.ENOTTY):
+            raise RuntimeError(f"{device} has no exposure_time_absolute control") from e
+        raise
+    finally:
+        control.close()
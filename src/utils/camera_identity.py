@@ -0,0 +1,178 @@
+"""Match fresh camera captures to saved reference images, for any number of cameras.
+
+check_setup used to score every (reference, capture) pair by reloading,
+resizing and blurring both images and recomputing their histograms. It
+then tried every ordered pair of captures, which only works for exactly
+two wrist cameras.
+
+Here each image is preprocessed once into a feature vector. The score
+matrix for all references × captures is then two matrix products. The
+score is the same as before: 0.75 × rescaled pixel correlation + 0.25 ×
+(1 − Bhattacharyya distance of 32-bin histograms). The best one-to-one
+assignment is found with the Hungarian algorithm. The runner-up
+assignment, used for the confidence margin, comes from re-solving with
+each chosen pair forbidden in turn. Both are polynomial in the number of
+cameras.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+SIMILARITY_SIZE = (160, 120)
+HISTOGRAM_BINS = 32
+# Images flatter than this (lens cap, black frame) can't be compared.
+MIN_PIXEL_STD = 1.0
+
+
+@dataclass
+class ImageFeatures:
+    zscores: np.ndarray  # blurred 160×120 grayscale, zero mean, unit variance
+    sqrt_hist: np.ndarray  # sqrt of the L1-normalised histogram
+
+
+def prepare_image(path: Path) -> np.ndarray | None:
+    image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return None
+    image = cv2.resize(image, SIMILARITY_SIZE, interpolation=cv2.INTER_AREA)
+    return cv2.GaussianBlur(image, (5, 5), 0)
+
+
+def image_features(path: Path) -> ImageFeatures | None:
+    """None when the image can't be read or is too flat to compare."""
+    image = prepare_image(path)
+    if image is None:
+        return None
+    pixels = image.astype(np.float64).reshape(-1)
+    std = pixels.std()
+    if std < MIN_PIXEL_STD:
+        return None
+    hist = np.bincount(image.reshape(-1) // (256 // HISTOGRAM_BINS), minlength=HISTOGRAM_BINS)
+    return ImageFeatures((pixels - pixels.mean()) / std, np.sqrt(hist / hist.sum()))
+
+
+def score_matrix(
+    references: list[ImageFeatures | None], candidates: list[ImageFeatures | None]
+) -> np.ndarray:
+    """Similarity in [0, 1] of every reference to every candidate; NaN where unknown."""
+    scores = np.full((len(references), len(candidates)), np.nan)
+    rows = [i for i, f in enumerate(references) if f is not None]
+    cols = [j for j, f in enumerate(candidates) if f is not None]
+    if not rows or not cols:
+        return scores
+    z_ref = np.stack([references[i].zscores for i in rows])
+    z_cand = np.stack([candidates[j].zscores for j in cols])
+    corr = z_ref @ z_cand.T / z_ref.shape[1]
+    corr_score = np.clip((corr + 1.0) / 2.0, 0.0, 1.0)
+
+    h_ref = np.stack([references[i].sqrt_hist for i in rows])
+    h_cand = np.stack([candidates[j].sqrt_hist for j in cols])
+    bhattacharyya = np.sqrt(np.clip(1.0 - h_ref @ h_cand.T, 0.0, None))
+    hist_score = np.clip(1.0 - bhattacharyya, 0.0, 1.0)
+
+    scores[np.ix_(rows, cols)] = 0.75 * corr_score + 0.25 * hist_score
+    return scores
+
+
+def _min_cost_assignment(cost: np.ndarray) -> list[int]:
+    """Column for each row minimising the total cost (rows <= columns).
+
+    Hungarian algorithm with potentials, O(rows² × columns).
+    """
+    n, m = cost.shape
+    u, v = np.zeros(n + 1), np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)  # 1-based row assigned to each column, 0 = free
+    for row in range(1, n + 1):
+        owner[0] = row
+        col = 0
+        min_slack = np.full(m + 1, np.inf)
+        came_from = np.zeros(m + 1, dtype=int)
+        used = np.zeros(m + 1, dtype=bool)
+        while owner[col] != 0:
+            used[col] = True
+            r = owner[col]
+            free = ~used[1:]
+            slack = cost[r - 1] - u[r] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            came_from[1:][better] = col
+            candidates = np.where(free, min_slack[1:], np.inf)
+            nxt = int(np.argmin(candidates)) + 1
+            delta = candidates[nxt - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+            col = nxt
+        while col:
+            prev = came_from[col]
+            owner[col] = owner[prev]
+            col = prev
+    assignment = [0] * n
+    for col in range(1, m + 1):
+        if owner[col]:
+            assignment[owner[col] - 1] = col - 1
+    return assignment
+
+
+def _best_assignment(scores: np.ndarray) -> tuple[list[int], float] | None:
+    """Highest-scoring one-to-one assignment; NaN or -inf pairs are not allowed."""
+    allowed = np.isfinite(scores)
+    # Forbidden pairs cost more than any assignment of allowed pairs could.
+    cost = np.where(allowed, -scores, scores.shape[0] * 2.0 + 1.0)
+    cols = _min_cost_assignment(cost)
+    if not all(allowed[i, j] for i, j in enumerate(cols)):
+        return None
+    return cols, float(sum(scores[i, j] for i, j in enumerate(cols)))
+
+
+@dataclass
+class IdentityMatch:
+    """Best assignment of references to candidates, and how clear-cut it was."""
+
+    assignment: dict[str, str]
+    scores: dict[str, float]
+    total: float
+    # Best total over assignments that differ from the chosen one; None if it's the only one.
+    runner_up: float | None
+
+    @property
+    def lowest_score(self) -> float:
+        return min(self.scores.values())
+
+    @property
+    def margin(self) -> float:
+        return self.total - self.runner_up if self.runner_up is not None else self.total
+
+
+def match_identities(
+    scores: np.ndarray, names: list[str], candidates: list[str]
+) -> IdentityMatch | None:
+    """Optimal assignment of `names` (rows) to `candidates` (columns) of `scores`."""
+    if len(names) > len(candidates):
+        return None
+    best = _best_assignment(scores)
+    if best is None:
+        return None
+    cols, total = best
+
+    # Any other assignment drops at least one chosen pair, so the runner-up is
+    # the best solution with one of them forbidden.
+    runner_up = None
+    for i, j in enumerate(cols):
+        restricted = scores.copy()
+        restricted[i, j] = -np.inf
+        alternative = _best_assignment(restricted)
+        if alternative is not None and (runner_up is None or alternative[1] > runner_up):
+            runner_up = alternative[1]
+
+    return IdentityMatch(
+        assignment={names[i]: candidates[j] for i, j in enumerate(cols)},
+        scores={names[i]: float(scores[i, j]) for i, j in enumerate(cols)},
+        total=total,
+        runner_up=runner_up,
+    )
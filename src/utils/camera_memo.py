@@ -1,9 +1,14 @@
 import json
-import subprocess
 from pathlib import Path
 
+from utils.device_inventory import (
+    camera_signature,
+    match_signatures,
+    udev_properties,
+    video_devices,
+)
+
 CAMERA_MEMO_PATH = Path(__file__).resolve().parents[2] / ".camera-signatures.json"
-CAMERA_SIGNATURE_KEYS = ("ID_SERIAL_SHORT", "ID_SERIAL", "ID_PATH")
 
 
 def _device_path(index_or_path):
@@ -12,20 +17,6 @@ def _device_path(index_or_path):
     return str(index_or_path)
 
 
-def _udev_properties(device_path: str) -> dict[str, str]:
-    result = subprocess.run(
-        ["udevadm", "info", "-q", "property", "-n", str(Path(device_path).resolve())],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-    return dict(line.split("=", 1) for line in result.stdout.splitlines() if "=" in line)
-
-
-def _camera_signature(properties: dict[str, str]) -> dict[str, str]:
-    return {key: properties[key] for key in CAMERA_SIGNATURE_KEYS if properties.get(key)}
-
-
 def _load_camera_memo() -> dict[str, dict[str, str]] | None:
     if not CAMERA_MEMO_PATH.exists():
         return None
@@ -40,47 +31,18 @@ def _save_camera_memo(memo: dict[str, dict[str, str]]) -> None:
     CAMERA_MEMO_PATH.write_text(json.dumps(memo, indent=2, sort_keys=True) + "\n")
 
 
-def _scan_video_devices() -> dict[str, dict[str, str]]:
-    devices: dict[str, dict[str, str]] = {}
-    for path in sorted(Path("/dev").glob("video*")):
-        try:
-            devices[str(path)] = _udev_properties(str(path))
-        except Exception:
-            continue
-    return devices
-
-
-def _find_devices_from_memo(
-    memo_by_name: dict[str, dict[str, str]],
-    devices_with_properties: dict[str, dict[str, str]],
-) -> dict[str, str]:
-    device_by_name: dict[str, str] = {}
-    used_devices: set[str] = set()
-    for name, expected_signature in memo_by_name.items():
-        if not expected_signature:
-            continue
-        matches = [
-            device
-            for device, properties in devices_with_properties.items()
-            if all(properties.get(k) == v for k, v in expected_signature.items())
-        ]
-        if len(matches) == 1 and matches[0] not in used_devices:
-            used_devices.add(matches[0])
-            device_by_name[name] = matches[0]
-    return device_by_name
-
-
 def resolve_camera_configs(camera_configs: dict, logger=None) -> dict:
     configs = {name: dict(cfg) for name, cfg in camera_configs.items()}
     opencv_camera_names = [
-        name for name, cfg in configs.items() if cfg.get("type", "zed") in ("opencv", "opencv-cached")
+        name
+        for name, cfg in configs.items()
+        if cfg.get("type", "zed") in ("opencv", "opencv-cached", "v4l2-cached")
     ]
     if not opencv_camera_names:
         return configs
 
-    devices_with_properties = _scan_video_devices()
     memo_by_name = _load_camera_memo() or {}
-    for name, device in _find_devices_from_memo(memo_by_name, devices_with_properties).items():
+    for name, device in match_signatures(memo_by_name, video_devices()).items():
         if name in configs:
             configs[name]["index_or_path"] = device
 
@@ -91,7 +53,7 @@ def resolve_camera_configs(camera_configs: dict, logger=None) -> dict:
             continue
         camera_path = _device_path(camera_path)
         try:
-            signature = _camera_signature(_udev_properties(camera_path))
+            signature = camera_signature(udev_properties(camera_path))
         except Exception:
             continue
         if signature:
@@ -7,6 +7,11 @@ image, restricted to the top 25% of the frame (warehouse background — the
 only region that is rigid across sessions). Used pre-recording to abort if
 the camera is mounted at the wrong angle, and between episodes to detect
 mid-session drift.
+
+The reference side of the ORB match never changes, so PoseReference detects
+its features once and keeps them on disk keyed by a hash of the image;
+repeated measurements (the live alignment TUI, the post-episode watcher)
+only run detection on the live frame.
 """
 from __future__ import annotations
 import math
@@ -16,6 +21,8 @@ from pathlib import Path
 import cv2
 import numpy as np
 
+from utils.disk_cache import CACHE_ROOT, cache_key, read_cache, write_cache
+
 REFERENCE_PATH = (
     Path(__file__).resolve().parents[2]
     / "outputs" / "camera_reference_images" / "topdown.png"
@@ -39,6 +46,12 @@ RECOMMEND_ALIGNMENT_MULTIPLIER = 25.0
 
 BAND_TOP_FRACTION = 0.25  # top 25% = warehouse background, rigid across sessions
 
+ORB_FEATURES = 4000
+
+FEATURE_CACHE_DIR = CACHE_ROOT / "pose_reference"
+# Bump when the cached feature layout or the detector settings change.
+_FORMAT_VERSION = 1
+
 
 @dataclass
 class Pose:
@@ -60,18 +73,21 @@ def top_band_mask(height: int, width: int) -> np.ndarray:
     return mask
 
 
-def measure_pose_topband(ref_a: np.ndarray, ref_b: np.ndarray, band_mask: np.ndarray) -> Pose:
-    """ORB+RANSAC homography ref_a → ref_b, restricted to `band_mask`.
+def _orb_features(image: np.ndarray, band_mask: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+    """Keypoint positions (N×2 float32) and ORB descriptors inside `band_mask`."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    keypoints, descriptors = cv2.ORB_create(nfeatures=ORB_FEATURES).detectAndCompute(
+        gray, band_mask
+    )
+    points = np.array([kp.pt for kp in keypoints], dtype=np.float32).reshape(-1, 2)
+    return points, descriptors
 
-    Extracts in-plane rotation via SVD polar decomposition of the homography's
-    top-left 2×2. tx, ty read directly from the translation column.
-    """
-    ga = cv2.cvtColor(ref_a, cv2.COLOR_BGR2GRAY)
-    gb = cv2.cvtColor(ref_b, cv2.COLOR_BGR2GRAY)
-    orb = cv2.ORB_create(nfeatures=4000)
-    kpa, da = orb.detectAndCompute(ga, band_mask)
-    kpb, db = orb.detectAndCompute(gb, band_mask)
-    if da is None or db is None or len(kpa) < 8 or len(kpb) < 8:
+
+def _pose_from_features(
+    pts_a: np.ndarray, da: np.ndarray | None, pts_b: np.ndarray, db: np.ndarray | None
+) -> Pose:
+    """Match a → b and fit the homography; see measure_pose_topband."""
+    if da is None or db is None or len(pts_a) < 8 or len(pts_b) < 8:
         return _nan_pose()
     bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
     raw = bf.knnMatch(da, db, k=2)
@@ -79,8 +95,8 @@ def measure_pose_topband(ref_a: np.ndarray, ref_b: np.ndarray, band_mask: np.nda
             for m, n in [pair] if m.distance < 0.75 * n.distance]
     if len(good) < 8:
         return _nan_pose()
-    src = np.array([kpa[g.queryIdx].pt for g in good], dtype=np.float32).reshape(-1, 1, 2)
-    dst = np.array([kpb[g.trainIdx].pt for g in good], dtype=np.float32).reshape(-1, 1, 2)
+    src = pts_a[[g.queryIdx for g in good]].reshape(-1, 1, 2)
+    dst = pts_b[[g.trainIdx for g in good]].reshape(-1, 1, 2)
     hmat, inl = cv2.findHomography(src, dst, cv2.RANSAC, 3.0)
     if hmat is None or inl is None:
         return _nan_pose()
@@ -110,6 +126,81 @@ def measure_pose_topband(ref_a: np.ndarray, ref_b: np.ndarray, band_mask: np.nda
     )
 
 
+def measure_pose_topband(ref_a: np.ndarray, ref_b: np.ndarray, band_mask: np.ndarray) -> Pose:
+    """ORB+RANSAC homography ref_a → ref_b, restricted to `band_mask`.
+
+    Extracts in-plane rotation via SVD polar decomposition of the homography's
+    top-left 2×2. tx, ty read directly from the translation column.
+    """
+    return _pose_from_features(
+        *_orb_features(ref_a, band_mask), *_orb_features(ref_b, band_mask)
+    )
+
+
+class PoseReference:
+    """A reference image with its top-band ORB features computed once.
+
+    Features are cached in `cache_dir` under a hash of the image pixels, so
+    a replaced reference PNG is picked up automatically. `cache_dir=None`
+    keeps them in memory only.
+    """
+
+    def __init__(self, image: np.ndarray, cache_dir: Path | None = FEATURE_CACHE_DIR):
+        self.image = image
+        h, w = image.shape[:2]
+        self.band_mask = top_band_mask(h, w)
+        self.key = cache_key(
+            _FORMAT_VERSION, str(ORB_FEATURES), str(image.shape), np.ascontiguousarray(image).data
+        )
+        self.cache_path = None if cache_dir is None else Path(cache_dir) / f"{self.key}.npz"
+
+        cached = self._load()
+        if cached is None:
+            self.points, self.descriptors = _orb_features(image, self.band_mask)
+            self._save()
+        else:
+            self.points, self.descriptors = cached
+
+    @classmethod
+    def from_file(cls, path: Path, cache_dir: Path | None = FEATURE_CACHE_DIR) -> PoseReference:
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if image is None:
+            raise RuntimeError(f"failed to read {path}")
+        return cls(image, cache_dir)
+
+    def _load(self) -> tuple[np.ndarray, np.ndarray | None] | None:
+        if self.cache_path is None:
+            return None
+
+        def load(path: Path) -> tuple[np.ndarray, np.ndarray]:
+            with np.load(path) as data:
+                return data["points"], data["descriptors"]
+
+        cached = read_cache(self.cache_path, load, "pose reference")
+        if cached is None:
+            return None
+        points, descriptors = cached
+        return points, descriptors if len(descriptors) else None
+
+    def _save(self) -> None:
+        if self.cache_path is None:
+            return
+        descriptors = self.descriptors
+        if descriptors is None:
+            descriptors = np.zeros((0, 32), dtype=np.uint8)
+        write_cache(
+            self.cache_path,
+            lambda f: np.savez(f, points=self.points, descriptors=descriptors),
+            "pose reference",
+        )
+
+    def measure(self, live: np.ndarray) -> Pose:
+        """Pose of `live` relative to this reference (same as measure_pose_topband)."""
+        return _pose_from_features(
+            *_orb_features(live, self.band_mask), self.points, self.descriptors
+        )
+
+
 def worst_tolerance_ratio(pose: Pose) -> float:
     """Return max(|drift_i| / tol_i) across roll/tx/ty.
 
@@ -143,18 +234,23 @@ def format_drift_breakdown(pose: Pose) -> str:
     return "\n".join(lines)
 
 
-def evaluate_pose(captured: np.ndarray, reference: np.ndarray) -> tuple[Pose, bool, str]:
+def evaluate_pose(
+    captured: np.ndarray, reference: np.ndarray | PoseReference
+) -> tuple[Pose, bool, str]:
     """Compute pose and verdict.
 
     Returns (pose, ok, message). `ok` is True for both OK and MARGINAL
     verdicts — callers should proceed in both cases but print the message
     when it contains "MARGINAL" so the operator knows the setup drifted a
     bit. `ok` is False only for true DRIFT (beyond DRIFT_MULTIPLIER× tol)
-    or low confidence.
+    or low confidence. Pass a PoseReference when evaluating repeatedly
+    against the same reference.
     """
-    h, w = reference.shape[:2]
-    mask = top_band_mask(h, w)
-    pose = measure_pose_topband(captured, reference, mask)
+    if isinstance(reference, PoseReference):
+        pose = reference.measure(captured)
+    else:
+        h, w = reference.shape[:2]
+        pose = measure_pose_topband(captured, reference, top_band_mask(h, w))
     if pose.low_conf:
         return pose, False, (
             f"pose check: view obstructed / too few features "
@@ -181,13 +277,23 @@ def evaluate_pose(captured: np.ndarray, reference: np.ndarray) -> tuple[Pose, bo
     return pose, ok, msg
 
 
-def load_reference() -> np.ndarray:
+def _check_reference_exists() -> None:
     if not REFERENCE_PATH.exists():
         raise RuntimeError(
             f"topdown reference image missing: {REFERENCE_PATH}\n"
             f"Run: uv run python scripts/save_topdown_reference.py"
         )
+
+
+def load_reference() -> np.ndarray:
+    _check_reference_exists()
     img = cv2.imread(str(REFERENCE_PATH), cv2.IMREAD_COLOR)
     if img is None:
         raise RuntimeError(f"failed to read {REFERENCE_PATH}")
     return img
+
+
+def load_pose_reference() -> PoseReference:
+    """The committed reference with its features, for repeated evaluate_pose calls."""
+    _check_reference_exists()
+    return PoseReference.from_file(REFERENCE_PATH)
@@ -0,0 +1,386 @@
+"""CAN link state, error counters and bus-off events without shelling out to `ip`.
+
+The kernel reports everything `ip -details -statistics link show canX`
+prints over rtnetlink: the controller state (error-active, warning,
+passive, bus-off), the TX/RX error counters, the bitrate, and running
+totals of bus errors, bus-offs and restarts. read_link asks for one
+interface with a single RTM_GETLINK request, which takes microseconds, and
+falls back to /sys/class/net (up/down and packet error counts only) where
+netlink isn't available.
+
+Two uses: reset_unhealthy_links replaces the unconditional
+reset_all_can.sh before a session, bouncing only links that are down,
+bus-off, stopped or at the wrong bitrate; and CanHealthMonitor polls the
+follower links during a session, logging when a bus degrades so error
+bursts show up before they turn into dropped follower commands.
+
+    python -m utils.can_health can_follower_l can_follower_r
+    python -m utils.can_health --watch can_follower_l can_follower_r
+    python -m utils.can_health --reset-unhealthy can_follower_l can_follower_r
+"""
+
+from __future__ import annotations
+
+import argparse
+import errno
+import logging
+import os
+import socket
+import struct
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SYSFS_NET = Path("/sys/class/net")
+RESET_ALL_CAN_SCRIPT = (
+    Path(__file__).resolve().parents[2] / "third_party/i2rt/scripts/reset_all_can.sh"
+)
+# The YAM motors run at 1 Mbit/s, as reset_all_can.sh configures them.
+DEFAULT_BITRATE = 1_000_000
+
+# linux/rtnetlink.h, linux/if_link.h, linux/can/netlink.h
+_RTM_NEWLINK = 16
+_RTM_GETLINK = 18
+_NLM_F_REQUEST = 1
+_NLMSG_ERROR = 2
+_NLA_TYPE_MASK = 0x3FFF
+_IFF_UP = 0x1
+_IFLA_OPERSTATE = 16
+_IFLA_LINKINFO = 18
+_IFLA_STATS64 = 23
+_IFLA_INFO_KIND = 1
+_IFLA_INFO_DATA = 2
+_IFLA_INFO_XSTATS = 3
+_IFLA_CAN_BITTIMING = 1
+_IFLA_CAN_STATE = 4
+_IFLA_CAN_BERR_COUNTER = 8
+
+_OPERSTATES = ("unknown", "notpresent", "down", "lowerlayerdown", "testing", "dormant", "up")
+CAN_STATES = (
+    "ERROR-ACTIVE", "ERROR-WARNING", "ERROR-PASSIVE", "BUS-OFF", "STOPPED", "SLEEPING"
+)
+# Controller states where the link passes no traffic until it is restarted.
+_DEAD_STATES = frozenset({"BUS-OFF", "STOPPED", "SLEEPING"})
+# Controller states that still pass traffic but mean the bus is seeing errors.
+_DEGRADED_STATES = frozenset({"ERROR-WARNING", "ERROR-PASSIVE"})
+
+
+@dataclass
+class CanLinkStatus:
+    """One snapshot of a CAN interface. Fields netlink didn't report are None."""
+
+    iface: str
+    present: bool
+    up: bool = False
+    operstate: str = "unknown"
+    state: str | None = None
+    bitrate: int | None = None
+    tx_error_counter: int | None = None
+    rx_error_counter: int | None = None
+    bus_errors: int | None = None
+    bus_off: int | None = None
+    error_passive: int | None = None
+    restarts: int | None = None
+    rx_errors: int = 0
+    tx_errors: int = 0
+    rx_dropped: int = 0
+    tx_dropped: int = 0
+    source: str = "netlink"
+
+    def problem(self, bitrate: int | None = None) -> str | None:
+        """Why the link can't carry follower traffic, or None if it can."""
+        if not self.present:
+            return "missing"
+        if not self.up:
+            return "down"
+        if self.state in _DEAD_STATES:
+            return self.state.lower()
+        if bitrate is not None and self.bitrate is not None and self.bitrate != bitrate:
+            return f"bitrate {self.bitrate}"
+        return None
+
+    @property
+    def degraded(self) -> bool:
+        return self.state in _DEGRADED_STATES
+
+    def summary(self) -> str:
+        parts = [self.iface, (self.state or self.operstate.upper()) if self.present else "missing"]
+        if self.present and not self.up:
+            parts.append("admin-down")
+        if self.bitrate:
+            parts.append(f"{self.bitrate // 1000} kbit/s")
+        if self.tx_error_counter is not None:
+            parts.append(f"tec {self.tx_error_counter} rec {self.rx_error_counter}")
+        if self.bus_off:
+            parts.append(f"bus-off x{self.bus_off}")
+        if self.rx_errors or self.tx_errors:
+            parts.append(f"errors rx {self.rx_errors} tx {self.tx_errors}")
+        return "  ".join(parts)
+
+
+def _attrs(data: bytes, offset: int = 0) -> dict[int, bytes]:
+    attrs = {}
+    while offset + 4 <= len(data):
+        length, kind = struct.unpack_from("=HH", data, offset)
+        if length < 4:
+            break
+        attrs[kind & _NLA_TYPE_MASK] = data[offset + 4:offset + length]
+        offset += (length + 3) & ~3
+    return attrs
+
+
+def parse_link_message(iface: str, payload: bytes) -> CanLinkStatus:
+    """CanLinkStatus from an RTM_NEWLINK payload (ifinfomsg and attributes)."""
+    _, _, _, flags, _ = struct.unpack_from("=BxHiII", payload)
+    attrs = _attrs(payload, 16)
+    status = CanLinkStatus(iface, present=True, up=bool(flags & _IFF_UP))
+    if _IFLA_OPERSTATE in attrs:
+        operstate = attrs[_IFLA_OPERSTATE][0]
+        status.operstate = _OPERSTATES[operstate] if operstate < len(_OPERSTATES) else "unknown"
+    if len(attrs.get(_IFLA_STATS64, b"")) >= 64:
+        (_, _, _, _, status.rx_errors, status.tx_errors, status.rx_dropped,
+         status.tx_dropped) = struct.unpack_from("=8Q", attrs[_IFLA_STATS64])
+
+    info = _attrs(attrs.get(_IFLA_LINKINFO, b""))
+    if info.get(_IFLA_INFO_KIND, b"").rstrip(b"\0") != b"can":
+        return status
+    data = _attrs(info.get(_IFLA_INFO_DATA, b""))
+    if len(data.get(_IFLA_CAN_BITTIMING, b"")) >= 4:
+        status.bitrate = struct.unpack_from("=I", data[_IFLA_CAN_BITTIMING])[0]
+    if len(data.get(_IFLA_CAN_STATE, b"")) >= 4:
+        state = struct.unpack_from("=I", data[_IFLA_CAN_STATE])[0]
+        status.state = CAN_STATES[state] if state < len(CAN_STATES) else f"STATE-{state}"
+    if len(data.get(_IFLA_CAN_BERR_COUNTER, b"")) >= 4:
+        status.tx_error_counter, status.rx_error_counter = struct.unpack_from(
+            "=HH", data[_IFLA_CAN_BERR_COUNTER]
+        )
+    xstats = info.get(_IFLA_INFO_XSTATS, b"")
+    if len(xstats) >= 24:
+        # struct can_device_stats: bus_error, error_warning, error_passive,
+        # bus_off, arbitration_lost, restarts
+        bus_errors, _, error_passive, bus_off, _, restarts = struct.unpack_from("=6I", xstats)
+        status.bus_errors, status.error_passive = bus_errors, error_passive
+        status.bus_off, status.restarts = bus_off, restarts
+    return status
+
+
+def _netlink_link(iface: str) -> CanLinkStatus:
+    try:
+        index = socket.if_nametoindex(iface)
+    except OSError:
+        return CanLinkStatus(iface, present=False)
+    request = struct.pack("=BxHiII", socket.AF_UNSPEC, 0, index, 0, 0)
+    header = struct.pack("=IHHII", 16 + len(request), _RTM_GETLINK, _NLM_F_REQUEST, 1, 0)
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE) as sock:
+        sock.settimeout(1.0)
+        sock.send(header + request)
+        reply = sock.recv(65536)
+    length, kind = struct.unpack_from("=IH", reply)
+    if kind == _NLMSG_ERROR:
+        error = -struct.unpack_from("=i", reply, 16)[0]
+        if error == errno.ENODEV:  # unplugged between the lookup and the request
+            return CanLinkStatus(iface, present=False)
+        raise OSError(error, os.strerror(error))
+    if kind != _RTM_NEWLINK:
+        raise OSError(f"unexpected netlink reply type {kind} for {iface}")
+    return parse_link_message(iface, reply[16:length])
+
+
+def sysfs_link(iface: str, sysfs_net: Path = SYSFS_NET) -> CanLinkStatus:
+    """What sysfs knows about a link: present, up, and packet error counts."""
+    root = sysfs_net / iface
+    if not root.exists():
+        return CanLinkStatus(iface, present=False, source="sysfs")
+
+    def read(name: str, default: str = "0") -> str:
+        try:
+            return (root / name).read_text().strip()
+        except OSError:
+            return default
+
+    status = CanLinkStatus(
+        iface,
+        present=True,
+        up=bool(int(read("flags"), 16) & _IFF_UP),
+        operstate=read("operstate", "unknown"),
+        source="sysfs",
+    )
+    for field in ("rx_errors", "tx_errors", "rx_dropped", "tx_dropped"):
+        setattr(status, field, int(read(f"statistics/{field}")))
+    return status
+
+
+def read_link(iface: str) -> CanLinkStatus:
+    try:
+        return _netlink_link(iface)
+    except (OSError, AttributeError, struct.error) as e:
+        # AttributeError: no AF_NETLINK on this platform.
+        logger.debug(f"netlink query for {iface} failed ({e}); reading sysfs")
+        return sysfs_link(iface)
+
+
+def unhealthy_links(
+    ifaces: Sequence[str],
+    bitrate: int | None = DEFAULT_BITRATE,
+    read: Callable[[str], CanLinkStatus] = read_link,
+) -> dict[str, str]:
+    """Interfaces that can't carry traffic, mapped to the reason."""
+    problems = {iface: read(iface).problem(bitrate) for iface in ifaces}
+    return {iface: problem for iface, problem in problems.items() if problem}
+
+
+def _run(command: list[str]) -> None:
+    subprocess.run(command, check=True)
+
+
+def reset_unhealthy_links(
+    ifaces: Sequence[str],
+    bitrate: int = DEFAULT_BITRATE,
+    read: Callable[[str], CanLinkStatus] = read_link,
+    run: Callable[[list[str]], None] = _run,
+) -> dict[str, str]:
+    """Bounce only the links that need it; returns what was wrong with each.
+
+    A link that is missing can't be bounced, so then the full
+    reset_all_can.sh runs instead, as it did before every session.
+    """
+    problems = unhealthy_links(ifaces, bitrate, read)
+    if not problems:
+        logger.info(f"CAN links healthy, no reset needed: {', '.join(ifaces)}")
+        return problems
+    if "missing" in problems.values():
+        logger.warning(f"CAN links missing ({problems}); running {RESET_ALL_CAN_SCRIPT.name}")
+        run(["bash", str(RESET_ALL_CAN_SCRIPT)])
+        return problems
+    for iface, problem in problems.items():
+        logger.warning(f"Resetting CAN link {iface} ({problem})")
+        run(["sudo", "ip", "link", "set", iface, "down"])
+        run(["sudo", "ip", "link", "set", iface, "up", "type", "can", "bitrate", str(bitrate)])
+    return problems
+
+
+class CanHealthMonitor:
+    """Polls CAN links on a daemon thread and logs when one degrades.
+
+    A warning is logged when a link's controller state changes, when it goes
+    bus-off or is restarted, and when its error counts grow. metrics() has
+    the latest snapshot of each link plus the errors seen since start().
+    """
+
+    def __init__(
+        self,
+        ifaces: Sequence[str],
+        interval_s: float = 1.0,
+        read: Callable[[str], CanLinkStatus] = read_link,
+    ):
+        self.ifaces = list(ifaces)
+        self.interval_s = interval_s
+        self.read = read
+        self.latest: dict[str, CanLinkStatus] = {}
+        self._baseline: dict[str, CanLinkStatus] = {}
+        self.warnings = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.poll()
+        self._thread = threading.Thread(target=self._run, name="can-health", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning(f"CAN health poll failed: {e}")
+
+    def poll(self) -> dict[str, CanLinkStatus]:
+        snapshot = {iface: self.read(iface) for iface in self.ifaces}
+        with self._lock:
+            for iface, status in snapshot.items():
+                previous = self.latest.get(iface)
+                self._baseline.setdefault(iface, status)
+                changes = _changes(previous, status)
+                if changes:
+                    self.warnings += 1
+                    logger.warning(f"CAN {iface}: {'; '.join(changes)}  [{status.summary()}]")
+            self.latest = snapshot
+        return snapshot
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            links = {}
+            for iface, status in self.latest.items():
+                baseline = self._baseline[iface]
+                links[iface] = {
+                    **asdict(status),
+                    "problem": status.problem(),
+                    "new_rx_errors": status.rx_errors - baseline.rx_errors,
+                    "new_tx_errors": status.tx_errors - baseline.tx_errors,
+                    "new_bus_off": (status.bus_off or 0) - (baseline.bus_off or 0),
+                }
+            return {"warnings": self.warnings, "links": links}
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval_s + 1.0)
+
+
+def _changes(previous: CanLinkStatus | None, status: CanLinkStatus) -> list[str]:
+    if previous is None:
+        problem = status.problem()
+        return [f"{problem} at start"] if problem else []
+    changes = []
+    if previous.present != status.present:
+        changes.append("reappeared" if status.present else "disappeared")
+    elif previous.up != status.up:
+        changes.append("came up" if status.up else "went down")
+    if previous.state != status.state and status.state is not None:
+        changes.append(f"{previous.state or 'unknown'} -> {status.state}")
+    if (status.bus_off or 0) > (previous.bus_off or 0):
+        changes.append(f"went bus-off ({status.bus_off - (previous.bus_off or 0)}x)")
+    if (status.restarts or 0) > (previous.restarts or 0):
+        changes.append("controller restarted")
+    new_errors = (status.rx_errors + status.tx_errors) - (previous.rx_errors + previous.tx_errors)
+    if new_errors > 0:
+        changes.append(f"{new_errors} new frame errors")
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("ifaces", nargs="+")
+    parser.add_argument("--bitrate", type=int, default=DEFAULT_BITRATE)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--reset-unhealthy", action="store_true")
+    mode.add_argument("--watch", type=float, nargs="?", const=1.0, metavar="INTERVAL_S")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.reset_unhealthy:
+        reset_unhealthy_links(args.ifaces, args.bitrate)
+        for iface in args.ifaces:
+            print(read_link(iface).summary())
+    elif args.watch:
+        monitor = CanHealthMonitor(args.ifaces, args.watch)
+        try:
+            while True:
+                print("  |  ".join(status.summary() for status in monitor.poll().values()))
+                time.sleep(args.watch)
+        except KeyboardInterrupt:
+            pass
+    else:
+        for iface in args.ifaces:
+            print(read_link(iface).summary())
+
+
+if __name__ == "__main__":
+    main()
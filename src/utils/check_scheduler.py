@@ -0,0 +1,241 @@
+"""Run independent setup checks concurrently, with timeouts and a pass cache.
+
+check_setup used to probe the CAN buses, both leaders and every camera one
+after another, so the wait was the sum of all of them (RealSense reset and
+warmup alone is several seconds). run_checks starts every check whose
+dependencies have passed on its own daemon thread and collects results as
+they finish, so the wait is the slowest chain instead. A check that
+overruns its timeout is reported as "timeout" and abandoned; Python can't
+cancel the thread, but nothing waits on it any more. Until that thread
+returns it may still hold whatever it opened, so callers must not reopen
+a device whose result is `abandoned` in the same process.
+
+A check with a `fingerprint` (e.g. device node identity plus its config)
+can be skipped: HealthCache remembers when it last passed with that
+fingerprint, and a pass younger than `max_age_s` is reused as "cached".
+Checks whose answer can change without the device changing (leader motor
+power, camera mount pose) should leave `fingerprint` unset.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from utils.disk_cache import CACHE_ROOT, read_cache, write_cache
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CACHE_PATH = CACHE_ROOT / "check_setup.json"
+_FORMAT_VERSION = 1
+
+
+@dataclass
+class Check:
+    """`run` is called with the values returned by the `after` checks, in order."""
+
+    name: str
+    run: Callable[[], Any]
+    timeout_s: float = 30.0
+    after: tuple[str, ...] = ()
+    fingerprint: Callable[[], str | None] | None = None
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one check; `start_s` is relative to the start of run_checks."""
+
+    name: str
+    status: str  # "ok", "cached", "failed", "timeout" or "skipped"
+    start_s: float = 0.0
+    elapsed_s: float = 0.0
+    value: Any = None
+    error: BaseException | None = None
+    fingerprint: str | None = field(default=None, repr=False)
+    thread: threading.Thread | None = field(default=None, repr=False)
+
+    @property
+    def passed(self) -> bool:
+        return self.status in ("ok", "cached")
+
+    @property
+    def abandoned(self) -> bool:
+        """Timed out and still running, so its device may still be held."""
+        return self.status == "timeout" and self.thread is not None and self.thread.is_alive()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "start_s": round(self.start_s, 3),
+            "elapsed_s": round(self.elapsed_s, 3),
+            "error": None if self.error is None else f"{type(self.error).__name__}: {self.error}",
+        }
+
+
+class HealthCache:
+    """When each check last passed, and with which device fingerprint."""
+
+    def __init__(self, path: Path = HEALTH_CACHE_PATH, max_age_s: float = 900.0):
+        self.path = Path(path)
+        self.max_age_s = max_age_s
+        self.entries: dict[str, dict[str, Any]] = {}
+        data = read_cache(self.path, lambda path: json.loads(path.read_text()), "check")
+        if isinstance(data, dict) and data.get("version") == _FORMAT_VERSION:
+            self.entries = data.get("checks", {})
+
+    def recent_pass(self, name: str, fingerprint: str) -> dict[str, Any] | None:
+        entry = self.entries.get(name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        if time.time() - entry.get("passed_at", 0.0) > self.max_age_s:
+            return None
+        return entry
+
+    def update(self, results: Iterable[CheckResult]) -> None:
+        for result in results:
+            if result.status == "ok" and result.fingerprint is not None:
+                self.entries[result.name] = {
+                    "fingerprint": result.fingerprint,
+                    "passed_at": time.time(),
+                    "elapsed_s": result.elapsed_s,
+                }
+            elif not result.passed:
+                self.entries.pop(result.name, None)
+
+    def save(self) -> None:
+        data = json.dumps({"version": _FORMAT_VERSION, "checks": self.entries}).encode()
+        write_cache(self.path, lambda f: f.write(data), "check")
+
+
+def _fingerprint(check: Check) -> str | None:
+    if check.fingerprint is None:
+        return None
+    try:
+        return check.fingerprint()
+    except Exception as e:
+        logger.debug(f"{check.name}: no fingerprint ({e}); running the check")
+        return None
+
+
+def run_checks(
+    checks: list[Check],
+    cache: HealthCache | None = None,
+    on_result: Callable[[CheckResult], None] | None = None,
+) -> list[CheckResult]:
+    """Run `checks` concurrently, respecting `after`; results come back in input order.
+
+    `on_result` is called on the calling thread as each check finishes, so it
+    can print without racing the other checks' output.
+    """
+    by_name = {check.name: check for check in checks}
+    unknown = {dep for check in checks for dep in check.after if dep not in by_name}
+    if unknown:
+        raise ValueError(f"Checks depend on unknown checks: {sorted(unknown)}")
+
+    t0 = time.perf_counter()
+    results: dict[str, CheckResult] = {}
+    running: dict[str, tuple[float, CheckResult]] = {}
+    finished: queue.Queue[tuple[str, Any, BaseException | None, float]] = queue.Queue()
+
+    def finish(result: CheckResult) -> None:
+        results[result.name] = result
+        if on_result is not None:
+            on_result(result)
+
+    def worker(check: Check, args: list[Any]) -> None:
+        start = time.perf_counter()
+        try:
+            value, error = check.run(*args), None
+        except Exception as e:  # handed to the caller, which decides what is fatal
+            value, error = None, e
+        finished.put((check.name, value, error, time.perf_counter() - start))
+
+    def start_ready() -> None:
+        for check in checks:
+            if check.name in results or check.name in running:
+                continue
+            deps = [results.get(dep) for dep in check.after]
+            if any(dep is not None and not dep.passed for dep in deps):
+                failed = [dep.name for dep in deps if dep is not None and not dep.passed]
+                finish(CheckResult(
+                    check.name, "skipped", time.perf_counter() - t0,
+                    error=RuntimeError(f"skipped because {', '.join(failed)} did not pass"),
+                ))
+                continue
+            if any(dep is None for dep in deps):
+                continue
+            fingerprint = _fingerprint(check)
+            cached = cache.recent_pass(check.name, fingerprint) if cache and fingerprint else None
+            if cached is not None:
+                finish(CheckResult(
+                    check.name, "cached", time.perf_counter() - t0,
+                    value=cached, fingerprint=fingerprint,
+                ))
+                continue
+            result = CheckResult(
+                check.name, "running", time.perf_counter() - t0, fingerprint=fingerprint
+            )
+            running[check.name] = (time.perf_counter() + check.timeout_s, result)
+            result.thread = threading.Thread(
+                target=worker,
+                args=(check, [dep.value for dep in deps]),
+                name=f"check-{check.name}",
+                daemon=True,
+            )
+            result.thread.start()
+
+    start_ready()
+    while running:
+        deadline = min(deadline for deadline, _ in running.values())
+        try:
+            name, value, error, elapsed = finished.get(
+                timeout=max(0.0, deadline - time.perf_counter())
+            )
+        except queue.Empty:
+            now = time.perf_counter()
+            for name, (deadline, result) in list(running.items()):
+                if deadline <= now:
+                    del running[name]
+                    result.status = "timeout"
+                    result.elapsed_s = now - t0 - result.start_s
+                    result.error = TimeoutError(
+                        f"{name} did not finish within {by_name[name].timeout_s:g} s"
+                    )
+                    finish(result)
+        else:
+            if name not in running:
+                continue  # already reported as timed out
+            _, result = running.pop(name)
+            result.status = "failed" if error is not None else "ok"
+            result.value, result.error, result.elapsed_s = value, error, elapsed
+            finish(result)
+        start_ready()
+
+    for check in checks:
+        if check.name not in results:
+            finish(CheckResult(
+                check.name, "skipped", time.perf_counter() - t0,
+                error=RuntimeError(f"{check.name} is part of a dependency cycle"),
+            ))
+    if cache is not None:
+        cache.update(results.values())
+    return [results[check.name] for check in checks]
+
+
+def timing_report(results: list[CheckResult], wall_s: float) -> dict[str, Any]:
+    """JSON-ready summary: per-check status and timing, and which check set the wall time."""
+    slowest = max(results, key=lambda r: r.start_s + r.elapsed_s, default=None)
+    return {
+        "wall_s": round(wall_s, 3),
+        "serial_s": round(sum(r.elapsed_s for r in results if r.status != "cached"), 3),
+        "critical_path": slowest.name if slowest else None,
+        "checks": [result.as_dict() for result in results],
+    }
@@ -1,13 +1,29 @@
+"""Reclaim serial ports, TCP ports and video devices held by stale processes.
+
+Holders are found by reading /proc/<pid>/fd once for every target at once
+(the same lookup `fuser` does, but one pass instead of one `fuser` process
+per target), and after killing them we poll until their descriptors are
+gone instead of sleeping a fixed amount.
+
+    python -m utils.connection /dev/ttyUSB0 /dev/ttyUSB1 6001 6002
+
+frees the given device paths and TCP ports (bare numbers) in one batch.
+"""
+
+import argparse
 import logging
 import os
 import signal
 import socket
-import subprocess
+import sys
 import time
+from collections.abc import Iterable
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+PROC = Path("/proc")
+
 
 def _kill_pids(pids: list[int], label: str) -> None:
     for pid in pids:
@@ -19,45 +35,128 @@ def _kill_pids(pids: list[int], label: str) -> None:
             pass
 
 
-def _pids_using(target: str) -> list[int]:
+def _target_label(target: int | str) -> str:
+    return f"port {target}" if isinstance(target, int) else str(target)
+
+
+def _socket_inodes(ports: set[int], proc: Path = PROC) -> dict[str, int]:
+    """Map `socket:[inode]` fd link targets to the TCP port they are bound to."""
+    inodes = {}
+    for table in ("tcp", "tcp6"):
+        try:
+            lines = (proc / "net" / table).read_text().splitlines()[1:]
+        except OSError:
+            continue
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            port = int(fields[1].rsplit(":", 1)[1], 16)
+            if port in ports and fields[9] != "0":
+                inodes[f"socket:[{fields[9]}]"] = port
+    return inodes
+
+
+def _fd_links(pid: int, proc: Path = PROC) -> list[str]:
+    fd_dir = proc / str(pid) / "fd"
+    links = []
     try:
-        out = subprocess.check_output(
-            ["fuser", target],
-            stderr=subprocess.DEVNULL,
-        ).decode().strip()
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return []
-    return [int(pid) for pid in out.split() if pid.isdigit()]
+        names = os.listdir(fd_dir)
+    except OSError:  # exited, or not ours to inspect
+        return links
+    for name in names:
+        try:
+            links.append(os.readlink(fd_dir / name))
+        except OSError:
+            continue
+    return links
+
+
+def pids_holding(
+    targets: Iterable[int | str],
+    pids: Iterable[int] | None = None,
+    proc: Path = PROC,
+) -> dict[int | str, list[int]]:
+    """Which processes hold each target open, from a single pass over /proc.
+
+    Integer targets are TCP ports, strings are paths (symlinks such as
+    /dev/serial/by-id/... are resolved). Only `pids` are inspected if given.
+    Like fuser, processes of other users are only visible to root.
+    """
+    targets = list(dict.fromkeys(targets))
+    ports = {t for t in targets if isinstance(t, int)}
+    sockets = _socket_inodes(ports, proc) if ports else {}
+    paths = {os.path.realpath(t): t for t in targets if isinstance(t, str)}
+    if pids is None:
+        pids = (int(name) for name in os.listdir(proc) if name.isdigit())
+
+    holders: dict[int | str, list[int]] = {target: [] for target in targets}
+    for pid in pids:
+        for link in set(_fd_links(pid, proc)):
+            target = sockets.get(link) if link.startswith("socket:") else paths.get(link)
+            if target is not None and pid not in holders[target]:
+                holders[target].append(pid)
+    return holders
+
+
+def free_resources(
+    *targets: int | str, timeout_s: float = 2.0, proc: Path = PROC
+) -> dict[int | str, list[int]]:
+    """Kill whatever holds `targets` and wait until it has let go.
+
+    Returns the pids killed per target (empty lists included). Waiting polls
+    the killed processes with a growing interval, so a release that takes a
+    few milliseconds costs a few milliseconds.
+    """
+    holders = pids_holding(targets, proc=proc)
+    own = os.getpid()
+    killed = {target: [pid for pid in pids if pid != own] for target, pids in holders.items()}
+    for target, pids in killed.items():
+        _kill_pids(pids, _target_label(target))
+
+    waiting = {pid for pids in killed.values() for pid in pids}
+    deadline = time.monotonic() + timeout_s
+    delay = 0.005
+    while waiting:
+        still = pids_holding(targets, pids=waiting, proc=proc)
+        waiting = {pid for pids in still.values() for pid in pids}
+        if not waiting:
+            break
+        if time.monotonic() >= deadline:
+            logger.warning(
+                f"Processes {sorted(waiting)} still hold "
+                f"{', '.join(_target_label(t) for t, p in still.items() if p)} "
+                f"after {timeout_s:g}s"
+            )
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+    return killed
+
+
+def _pids_using(target: str) -> list[int]:
+    """Holders of a path, or of a TCP port written as `<port>/tcp` (fuser syntax)."""
+    port, _, proto = target.partition("/")
+    key: int | str = int(port) if proto == "tcp" and port.isdigit() else target
+    return pids_holding([key])[key]
 
 
 def _free_port(port: int | str) -> None:
     """Kill any process currently using *port*."""
-    target = f"{port}/tcp" if isinstance(port, int) else port
-    pids = _pids_using(target)
-    if not pids:
-        return
-    _kill_pids(pids, f"port {port}")
-
-    # Give the OS a moment to release the socket
-    time.sleep(0.3)
+    free_resources(port)
 
 
 def _free_v4l_devices(name: str) -> None:
-    found = False
+    video_paths = []
     for device_dir in Path("/sys/class/video4linux").glob("video*"):
         label_path = device_dir / "name"
         if not label_path.exists():
             continue
         if name.lower() not in label_path.read_text().lower():
             continue
-        video_path = f"/dev/{device_dir.name}"
-        pids = _pids_using(video_path)
-        if not pids:
-            continue
-        found = True
-        _kill_pids(pids, video_path)
-    if found:
-        time.sleep(0.3)
+        video_paths.append(f"/dev/{device_dir.name}")
+    if video_paths:
+        free_resources(*video_paths)
 
 
 def _wait_for_server(port: int, timeout: float = 120.0, poll: float = 0.5) -> None:
@@ -70,3 +169,22 @@ def _wait_for_server(port: int, timeout: float = 120.0, poll: float = 0.5) -> No
         except OSError:
             time.sleep(poll)
     raise TimeoutError(f"Server on port {port} did not start within {timeout}s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="+", help="device paths, or TCP port numbers")
+    parser.add_argument("--timeout", type=float, default=2.0, help="seconds to wait for release")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    targets = [int(t) if t.isdigit() else t for t in args.targets]
+    killed = free_resources(*targets, timeout_s=args.timeout)
+    for target, pids in killed.items():
+        if pids:
+            print(f"{_target_label(target)}: killed {' '.join(map(str, pids))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""udev properties of /dev/video* nodes without a udevadm process per node.
+
+`udevadm info -q property` costs a fork/exec and a udevd round trip per
+device, and teleop, record and check_setup each scanned every video node
+that way. The same properties are plain files: udev keeps its database in
+/run/udev/data/c<major>:<minor> (E: lines are properties, S: lines are
+/dev symlinks) and the kernel's part is in /sys/dev/char/<major>:<minor>.
+DeviceInventory reads those directly, on a thread pool for the nodes it
+hasn't seen, and caches each node's properties under its device number,
+inode and ctime plus the udev db mtime, so a replug or a udev re-trigger
+invalidates the entry and an unchanged setup rescans in milliseconds.
+udevadm is still used for a node that has no udev db entry.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+UDEV_DATA_DIR = Path("/run/udev/data")
+SYSFS_DEV_CHAR = Path("/sys/dev/char")
+CAMERA_SIGNATURE_KEYS = ("ID_SERIAL_SHORT", "ID_SERIAL", "ID_PATH")
+
+
+def _read_udevadm(device_path: str) -> dict[str, str]:
+    result = subprocess.run(
+        ["udevadm", "info", "-q", "property", "-n", device_path],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return dict(line.split("=", 1) for line in result.stdout.splitlines() if "=" in line)
+
+
+class DeviceInventory:
+    """Cached udev properties of the character devices under `dev_dir`."""
+
+    def __init__(
+        self,
+        dev_dir: Path = Path("/dev"),
+        udev_data_dir: Path = UDEV_DATA_DIR,
+        sysfs_char_dir: Path = SYSFS_DEV_CHAR,
+        max_workers: int = 8,
+    ):
+        self.dev_dir = Path(dev_dir)
+        self.udev_data_dir = Path(udev_data_dir)
+        self.sysfs_char_dir = Path(sysfs_char_dir)
+        self.max_workers = max_workers
+        self._cache: dict[str, tuple[tuple, dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _stat(self, path: str) -> os.stat_result:
+        return os.stat(path)
+
+    def _db_path(self, st: os.stat_result) -> Path:
+        return self.udev_data_dir / f"c{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+
+    def _key(self, path: str) -> tuple[tuple, os.stat_result]:
+        st = self._stat(path)
+        try:
+            db_mtime = self._db_path(st).stat().st_mtime_ns
+        except OSError:
+            db_mtime = None
+        return (st.st_rdev, st.st_ino, st.st_ctime_ns, db_mtime), st
+
+    def _read(self, path: str, st: os.stat_result) -> dict[str, str]:
+        try:
+            db = self._db_path(st).read_text()
+        except OSError:
+            return _read_udevadm(path)
+
+        major, minor = os.major(st.st_rdev), os.minor(st.st_rdev)
+        sys_dir = self.sysfs_char_dir / f"{major}:{minor}"
+        properties = {"MAJOR": str(major), "MINOR": str(minor), "DEVNAME": path}
+        try:
+            uevent = (sys_dir / "uevent").read_text()
+        except OSError:
+            uevent = ""
+        for line in uevent.splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                properties[key] = value
+        if not properties["DEVNAME"].startswith("/"):
+            properties["DEVNAME"] = str(self.dev_dir / properties["DEVNAME"])
+        try:
+            sys_path = sys_dir.resolve(strict=True)
+            properties["DEVPATH"] = "/" + str(sys_path.relative_to(sys_dir.parents[2]))
+            properties["SUBSYSTEM"] = (sys_path / "subsystem").resolve().name
+        except (OSError, ValueError):
+            pass
+
+        links = []
+        for line in db.splitlines():
+            tag, _, value = line.partition(":")
+            if tag == "E" and "=" in value:
+                key, value = value.split("=", 1)
+                properties[key] = value
+            elif tag == "S":
+                links.append(str(self.dev_dir / value))
+        if links:
+            properties["DEVLINKS"] = " ".join(links)
+        return properties
+
+    def fingerprint(self, device_path: str | Path) -> str:
+        """Changes whenever the node is recreated (replug, re-enumeration) or udev re-runs."""
+        key, _ = self._key(str(Path(device_path).resolve()))
+        return ":".join(str(part) for part in key)
+
+    def properties(self, device_path: str | Path) -> dict[str, str]:
+        """udev properties of one node; symlinks like /dev/v4l/by-id/... are resolved."""
+        return self.scan([device_path])[str(Path(device_path).resolve())]
+
+    def scan(self, device_paths: Iterable[str | Path]) -> dict[str, dict[str, str]]:
+        """Properties of each node keyed by resolved path, reading uncached ones in parallel.
+
+        Raises the first node's error if any node can't be read; use
+        video_devices() to skip unreadable nodes instead.
+        """
+        results = self._scan(device_paths)
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _scan(self, device_paths: Iterable[str | Path]) -> dict[str, dict | Exception]:
+        results: dict[str, dict | Exception] = {}
+        misses: list[tuple[str, tuple, os.stat_result]] = []
+        for device_path in device_paths:
+            path = str(Path(device_path).resolve())
+            try:
+                key, st = self._key(path)
+            except OSError as e:
+                results[path] = e
+                continue
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached is not None and cached[0] == key:
+                results[path] = cached[1]
+            else:
+                results[path] = {}
+                misses.append((path, key, st))
+
+        def read(miss):
+            path, key, st = miss
+            try:
+                properties = self._read(path, st)
+            except (OSError, subprocess.SubprocessError) as e:
+                return path, e
+            with self._lock:
+                self._cache[path] = (key, properties)
+            return path, properties
+
+        if len(misses) == 1:
+            results.update([read(misses[0])])
+        elif misses:
+            with ThreadPoolExecutor(min(self.max_workers, len(misses))) as pool:
+                results.update(pool.map(read, misses))
+        return results
+
+    def video_devices(self) -> dict[str, dict[str, str]]:
+        """Every readable /dev/video* node and its properties, in path order."""
+        return {
+            path: properties
+            for path, properties in self._scan(sorted(self.dev_dir.glob("video*"))).items()
+            if not isinstance(properties, Exception)
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+def camera_signature(properties: dict[str, str]) -> dict[str, str]:
+    return {key: properties[key] for key in CAMERA_SIGNATURE_KEYS if properties.get(key)}
+
+
+def is_capture_device(properties: dict[str, str]) -> bool:
+    """False for V4L2 nodes udev reports as not capturing (UVC metadata nodes)."""
+    capabilities = properties.get("ID_V4L_CAPABILITIES")
+    return capabilities is None or ":capture:" in capabilities
+
+
+def match_signatures(
+    memo_by_name: dict[str, dict[str, str]],
+    devices_with_properties: dict[str, dict[str, str]],
+) -> dict[str, str]:
+    """Device for each memoized name whose signature matches exactly one unused node."""
+    device_by_name: dict[str, str] = {}
+    used_devices: set[str] = set()
+    for name, expected_signature in memo_by_name.items():
+        if not expected_signature:
+            continue
+        matches = [
+            device
+            for device, properties in devices_with_properties.items()
+            if all(properties.get(k) == v for k, v in expected_signature.items())
+        ]
+        if len(matches) == 1 and matches[0] not in used_devices:
+            used_devices.add(matches[0])
+            device_by_name[name] = matches[0]
+    return device_by_name
+
+
+_inventory = DeviceInventory()
+
+
+def udev_properties(device_path: str | Path) -> dict[str, str]:
+    return _inventory.properties(device_path)
+
+
+def video_devices() -> dict[str, dict[str, str]]:
+    return _inventory.video_devices()
+
+
+def device_fingerprint(device_path: str | Path) -> str:
+    return _inventory.fingerprint(device_path)
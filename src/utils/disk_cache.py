@@ -0,0 +1,65 @@
+"""Derived data kept under ~/.cache/yams-robot-server between runs.
+
+The compiled robot model, the workspace SDF, RealSense profiles, pose
+reference features and check_setup results are all expensive to rebuild
+and cheap to store. Each entry is named by cache_key, which mixes in the
+owner's format version so bumping it leaves stale files unread. Reading
+treats a missing or unreadable file as a miss, and writing goes through a
+temp file unique to the writer, so concurrent processes filling the same
+entry never rename each other's half-written output into place.
+"""
+
+import hashlib
+import logging
+import tempfile
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CACHE_ROOT = Path.home() / ".cache" / "yams-robot-server"
+
+# What a truncated, foreign or half-written file raises while being parsed.
+_UNREADABLE = (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile)
+
+T = TypeVar("T")
+
+
+def cache_key(version: int, *parts: str | bytes | memoryview) -> str:
+    """Short hex digest of the format version and everything the entry depends on."""
+    digest = hashlib.sha256(f"v{version}".encode())
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(part.encode() if isinstance(part, str) else part)
+    return digest.hexdigest()[:16]
+
+
+def read_cache(path: Path, load: Callable[[Path], T], what: str) -> T | None:
+    """`load(path)`, or None when the file is missing or can't be parsed."""
+    try:
+        return load(path)
+    except FileNotFoundError:
+        return None
+    except _UNREADABLE as e:
+        logger.warning(f"Ignoring unreadable {what} cache {path}: {e}")
+        return None
+
+
+def write_cache(path: Path, dump: Callable[[IO[bytes]], object], what: str) -> None:
+    """Atomically replace `path` with what `dump` writes; failures are only logged."""
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            tmp = Path(f.name)
+            dump(f)
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not save {what} cache {path}: {e}")
+    finally:
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,403 @@
+"""Watch a LeRobot dataset for finished episode videos and sample them cheaply.
+
+watch_pose used to glob the videos dir every 2 s and decode the first 30
+frames of each new mp4 into a list before averaging them. EpisodeWatcher
+gets close-after-write and rename events from inotify instead (it falls
+back to rescanning when inotify is unavailable). Each new or rewritten
+video of the watched camera is sampled once: only keyframes are decoded
+(PyAV), or every `stride`-th frame (OpenCV), and the frames are summed
+into one float32 accumulator. Every subscriber receives the result, so
+the pose check is just one consumer.
+
+Both dataset layouts are handled:
+videos/chunk-*/<camera>/episode_*.mp4 and videos/<camera>/chunk-*/file-*.mp4.
+A chunk file holds many episodes and grows as each one is appended, so
+the watcher remembers how many frames it had last time and samples from
+there: the start of the episode just added. A chunk file seen for the
+first time is sampled from its first frame.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import logging
+import os
+import select
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOPDOWN_CAMERA = "observation.images.topdown"
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct("=iIII")
+
+
+@dataclass
+class EpisodeSample:
+    """Mean frame of the start of one episode, which may begin part-way into `path`."""
+
+    path: Path
+    episode: str
+    mean: np.ndarray  # uint8, same layout as the decoded frames (BGR)
+    n_frames: int
+    decode_s: float
+
+
+class FrameAccumulator:
+    """Running sum of frames; `mean()` matches np.mean(...).astype(np.uint8)."""
+
+    def __init__(self):
+        self._sum: np.ndarray | None = None
+        self.count = 0
+
+    def add(self, frame: np.ndarray) -> None:
+        if self._sum is None:
+            self._sum = np.zeros(frame.shape, dtype=np.float32)
+        cv2.accumulate(frame, self._sum)
+        self.count += 1
+
+    def mean(self) -> np.ndarray | None:
+        if self._sum is None:
+            return None
+        return (self._sum / self.count).astype(np.uint8)
+
+
+def _sample_keyframes(
+    path: Path, n_frames: int, start_frame: int, acc: FrameAccumulator
+) -> bool:
+    """Decode only keyframes with PyAV; False when PyAV is not installed."""
+    try:
+        import av
+    except ImportError:
+        return False
+    with av.open(str(path)) as container:
+        stream = container.streams.video[0]
+        stream.codec_context.skip_frame = "NONKEY"
+        start_pts = None
+        if start_frame:
+            start_pts = int(start_frame / stream.average_rate / stream.time_base)
+            # Lands on the keyframe at or before start_pts.
+            container.seek(start_pts, stream=stream)
+        for frame in container.decode(stream):
+            if start_pts is not None and frame.pts is not None and frame.pts < start_pts:
+                continue
+            acc.add(frame.to_ndarray(format="bgr24"))
+            if acc.count >= n_frames:
+                break
+    return True
+
+
+def _sample_stride(
+    path: Path, n_frames: int, stride: int, start_frame: int, acc: FrameAccumulator
+) -> None:
+    cap = cv2.VideoCapture(str(path))
+    try:
+        if start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        index = 0
+        while acc.count < n_frames:
+            # grab() demuxes and decodes; only retrieve() converts to BGR and copies.
+            if not cap.grab():
+                break
+            if index % stride == 0:
+                ok, frame = cap.retrieve()
+                if not ok:
+                    break
+                acc.add(frame)
+            index += 1
+    finally:
+        cap.release()
+
+
+def sample_mean(
+    path: Path,
+    n_frames: int = 30,
+    stride: int = 1,
+    keyframes: bool = False,
+    start_frame: int = 0,
+) -> tuple[np.ndarray, int] | None:
+    """Mean of the first `n_frames` sampled frames from `start_frame`, and how many were read.
+
+    `keyframes=True` decodes only keyframes when PyAV is available and
+    otherwise falls back to every `stride`-th frame. Returns None if no
+    frame could be decoded.
+    """
+    acc = FrameAccumulator()
+    if not (keyframes and _sample_keyframes(path, n_frames, start_frame, acc)):
+        _sample_stride(path, n_frames, max(1, stride), start_frame, acc)
+    mean = acc.mean()
+    return None if mean is None else (mean, acc.count)
+
+
+def frame_count(path: Path) -> int:
+    """Frames in the video according to its container; 0 if it can't be opened."""
+    cap = cv2.VideoCapture(str(path))
+    try:
+        return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        cap.release()
+
+
+def is_chunk_file(path: Path) -> bool:
+    """True for the many-episodes-per-file layout (chunk-*/file-*.mp4)."""
+    return not path.stem.startswith("episode_")
+
+
+def episode_label(path: Path, start_frame: int = 0) -> str:
+    """`000012` for episode_000012.mp4, otherwise `chunk-000/file-000`.
+
+    An episode that starts part-way into a chunk file gets `@<start_frame>`.
+    """
+    if not is_chunk_file(path):
+        return path.stem.removeprefix("episode_")
+    label = f"{path.parent.name}/{path.stem}"
+    return f"{label}@{start_frame}" if start_frame else label
+
+
+class _Inotify:
+    """Minimal inotify binding over libc; raises OSError where unsupported."""
+
+    def __init__(self):
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            raise OSError(errno.ENOSYS, f"inotify unavailable: {e}") from e
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._dirs: dict[int, Path] = {}
+
+    def add(self, directory: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(directory))
+        self._dirs[wd] = directory
+
+    def read(self, timeout_s: float) -> list[tuple[Path, int]] | None:
+        """Paths with their event masks; None if the kernel queue overflowed."""
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout_s))
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset: offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+            elif wd in self._dirs and name:
+                events.append((self._dirs[wd] / os.fsdecode(name), mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class EpisodeWatcher:
+    """Publishes an EpisodeSample for each finished video of `camera` under `repo_root`.
+
+    Call `poll()` in a loop (or `run()`); subscribers are called on that
+    thread. Videos present at start are reported too unless
+    `include_existing` is False. Encoders may close and reopen a file while
+    writing it, so a video is only sampled once its size and mtime have been
+    unchanged for `settle_s`. One with fewer than `n_frames` samples is
+    assumed to be still in progress and is retried when it changes.
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        camera: str = TOPDOWN_CAMERA,
+        n_frames: int = 30,
+        stride: int = 1,
+        keyframes: bool = False,
+        rescan_s: float = 10.0,
+        settle_s: float = 0.5,
+        include_existing: bool = True,
+        use_inotify: bool = True,
+    ):
+        self.videos_root = Path(repo_root) / "videos"
+        self.camera = camera
+        self.n_frames = n_frames
+        self.stride = stride
+        self.keyframes = keyframes
+        self.rescan_s = rescan_s
+        self.settle_s = settle_s
+        self.latest: EpisodeSample | None = None
+        self._subscribers: list[Callable[[EpisodeSample], None]] = []
+        self._done: dict[Path, tuple[int, int]] = {}
+        # Frames in each chunk file when it was last sampled: where the next episode starts.
+        self._chunk_frames: dict[Path, int] = {}
+        # Changed videos waiting to settle: version and when it was first seen.
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+        self._watched: set[Path] = set()
+        self._next_rescan = 0.0
+        self._inotify: _Inotify | None = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except OSError as e:
+                logger.info(f"inotify unavailable ({e}); rescanning every {rescan_s:g}s")
+        if not include_existing:
+            for path in self._scan():
+                self._done[path] = self._version(path)
+                if is_chunk_file(path):
+                    self._chunk_frames[path] = frame_count(path)
+
+    def subscribe(self, callback: Callable[[EpisodeSample], None]) -> None:
+        self._subscribers.append(callback)
+
+    def _is_video(self, path: Path) -> bool:
+        return path.suffix == ".mp4" and self.camera in path.parts
+
+    @staticmethod
+    def _version(path: Path) -> tuple[int, int]:
+        st = path.stat()
+        return st.st_size, st.st_mtime_ns
+
+    def _watch_tree(self, directory: Path) -> list[Path]:
+        """Add watches under `directory`; returns the videos already in it."""
+        videos = []
+        for dirpath, _dirnames, filenames in os.walk(directory):
+            dirpath = Path(dirpath)
+            if self._inotify is not None and dirpath not in self._watched:
+                try:
+                    self._inotify.add(dirpath)
+                    self._watched.add(dirpath)
+                except OSError as e:
+                    logger.warning(f"Cannot watch {dirpath}: {e}")
+            videos += [dirpath / name for name in filenames if self._is_video(dirpath / name)]
+        return videos
+
+    def _scan(self) -> list[Path]:
+        if not self.videos_root.is_dir():
+            return []
+        return sorted(self._watch_tree(self.videos_root))
+
+    def _candidates(self, timeout_s: float) -> list[Path]:
+        # A periodic full rescan retries videos that were still being written
+        # and catches anything inotify missed.
+        if time.monotonic() >= self._next_rescan:
+            self._next_rescan = time.monotonic() + self.rescan_s
+            found = self._scan()
+            if found:
+                return found
+        if self._inotify is None or not self._watched:
+            # Nothing to wait on (no inotify, or no videos dir yet): sleep and rescan.
+            time.sleep(timeout_s)
+            self._next_rescan = time.monotonic() + self.rescan_s
+            return self._scan()
+
+        events = self._inotify.read(timeout_s)
+        if events is None:
+            logger.warning("inotify queue overflowed; rescanning")
+            return self._scan()
+        found = []
+        for path, mask in events:
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    found += self._watch_tree(path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and self._is_video(path):
+                found.append(path)
+        return sorted(set(found))
+
+    def _mark_changed(self, paths: list[Path]) -> None:
+        now = time.monotonic()
+        for path in paths:
+            try:
+                version = self._version(path)
+            except FileNotFoundError:
+                self._pending.pop(path, None)
+                continue
+            if self._done.get(path) == version:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != version:
+                self._pending[path] = (version, now)
+
+    def _sample(self, path: Path, version: tuple[int, int]) -> EpisodeSample | None:
+        start = time.perf_counter()
+        start_frame, total = 0, None
+        try:
+            if is_chunk_file(path):
+                total = frame_count(path)
+                start_frame = self._chunk_frames.get(path, 0)
+                if total < start_frame:
+                    start_frame = 0  # rewritten from scratch rather than appended to
+            sampled = sample_mean(path, self.n_frames, self.stride, self.keyframes, start_frame)
+        except Exception as e:  # a half-written container can fail in many ways
+            logger.debug(f"Could not sample {path} yet: {e}")
+            return None
+        if sampled is None or sampled[1] < self.n_frames:
+            return None  # still being written; retried on the next change or rescan
+        self._done[path] = version
+        if total is not None:
+            self._chunk_frames[path] = total
+        return EpisodeSample(
+            path,
+            episode_label(path, start_frame),
+            sampled[0],
+            sampled[1],
+            time.perf_counter() - start,
+        )
+
+    def poll(self, timeout_s: float = 1.0) -> list[EpisodeSample]:
+        """Wait up to `timeout_s` for finished videos and publish their samples."""
+        if self._pending:
+            settles_at = min(seen for _, seen in self._pending.values()) + self.settle_s
+            timeout_s = min(timeout_s, max(0.0, settles_at - time.monotonic()))
+        self._mark_changed(self._candidates(timeout_s))
+
+        published = []
+        now = time.monotonic()
+        for path, (version, seen) in sorted(self._pending.items()):
+            if now - seen < self.settle_s:
+                continue
+            del self._pending[path]
+            sample = self._sample(path, version)
+            if sample is None:
+                continue
+            self.latest = sample
+            published.append(sample)
+            for callback in self._subscribers:
+                try:
+                    callback(sample)
+                except Exception:
+                    logger.exception(f"Episode subscriber failed on {path}")
+        return published
+
+    def run(self, should_stop: Callable[[], bool], timeout_s: float = 1.0) -> None:
+        while not should_stop():
+            self.poll(timeout_s)
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,149 @@
+"""Capture-time crop and resize of camera frames to the size the policy uses.
+
+Cameras configured with `output_crop` / `output_size` hand out the cropped,
+resized frame from their capture thread, so the observation dict, plotter
+and encoders only ever copy the small image. The output goes into a
+BufferPool: a few preallocated buffers, each reused once nothing outside the
+pool references it any more, so frames a consumer still holds are never
+overwritten.
+"""
+
+import sys
+import threading
+from typing import Any, Sequence
+
+import numpy as np
+
+# Camera configs import output_hw() while registering, before any SDK (cv2
+# included) may be imported, so cv2 flags are looked up by name.
+INTERPOLATIONS = {
+    "nearest": "INTER_NEAREST",
+    "linear": "INTER_LINEAR",
+    "cubic": "INTER_CUBIC",
+    "area": "INTER_AREA",
+    "lanczos": "INTER_LANCZOS4",
+}
+
+
+class FullResFrame(np.ndarray):
+    """Output frame that also carries the full-resolution frame it was cut from.
+
+    `full` is only set on the array the capture thread publishes; slices,
+    copies and arithmetic results get None.
+    """
+
+    full: np.ndarray | None
+
+    def __array_finalize__(self, obj: Any) -> None:
+        self.full = None
+
+
+def output_hw(config: Any) -> tuple[int, int]:
+    """(height, width) of the frames a camera with `config` hands out."""
+    size = getattr(config, "output_size", None)
+    if size:
+        return int(size[1]), int(size[0])
+    crop = getattr(config, "output_crop", None)
+    if crop:
+        return int(crop[3]), int(crop[2])
+    return config.height, config.width
+
+
+class BufferPool:
+    """Up to `size` preallocated arrays, handed out again once they are unreferenced.
+
+    A buffer counts as free when the pool holds the only reference to it;
+    views of it (slices, FullResFrame) keep it busy. When every buffer is
+    busy take() returns a fresh, unpooled array.
+    """
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self.buffers: list[np.ndarray] = []
+        self._free_refs = 0
+
+    def take(self, shape: tuple[int, ...], dtype: Any = np.uint8) -> np.ndarray:
+        for i in range(len(self.buffers)):
+            if (
+                sys.getrefcount(self.buffers[i]) <= self._free_refs
+                and self.buffers[i].shape == shape
+                and self.buffers[i].dtype == dtype
+            ):
+                return self.buffers[i]
+        buf = np.empty(shape, dtype)
+        if len(self.buffers) >= self.size:
+            return buf
+        self.buffers.append(buf)
+        del buf
+        # Reference count of a pooled buffer nobody else holds, measured the
+        # same way as the check above.
+        self._free_refs = sys.getrefcount(self.buffers[-1])
+        return self.buffers[-1]
+
+
+class FrameOutput:
+    """Crop box, target size and interpolation applied to every captured frame."""
+
+    def __init__(
+        self,
+        crop: Sequence[int] | None = None,
+        size: Sequence[int] | None = None,
+        interpolation: str = "area",
+        keep_full: bool = False,
+        pool_size: int = 4,
+    ):
+        if crop is not None:
+            if len(crop) != 4 or min(crop) < 0 or crop[2] == 0 or crop[3] == 0:
+                raise ValueError(f"output_crop must be (x, y, width, height), got {crop}")
+            crop = tuple(int(v) for v in crop)
+        if size is not None:
+            if len(size) != 2 or min(size) <= 0:
+                raise ValueError(f"output_size must be (width, height), got {size}")
+            size = (int(size[0]), int(size[1]))
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(
+                f"output_interpolation must be one of {sorted(INTERPOLATIONS)}, "
+                f"got {interpolation!r}"
+            )
+        import cv2
+
+        self.crop = crop
+        self.size = size
+        self.interpolation = getattr(cv2, INTERPOLATIONS[interpolation])
+        self.keep_full = keep_full
+        self._resize = cv2.resize
+        self._pool = BufferPool(pool_size)
+        # Lazy postprocessing can run apply() on consumer threads.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Any, depth: bool = False) -> "FrameOutput | None":
+        crop = getattr(config, "output_crop", None)
+        size = getattr(config, "output_size", None)
+        if crop is None and size is None:
+            return None
+        # Interpolated depth invents distances between edges; always sample it.
+        interpolation = "nearest" if depth else config.output_interpolation
+        return cls(crop, size, interpolation, keep_full=config.output_keep_full)
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        src = image
+        if self.crop is not None:
+            x, y, w, h = self.crop
+            if x + w > image.shape[1] or y + h > image.shape[0]:
+                raise ValueError(
+                    f"output_crop {self.crop} exceeds the {image.shape[1]}x{image.shape[0]} frame"
+                )
+            src = image[y : y + h, x : x + w]
+        width, height = self.size or (src.shape[1], src.shape[0])
+        with self._lock:
+            out = self._pool.take((height, width, *src.shape[2:]), src.dtype)
+            if (width, height) == (src.shape[1], src.shape[0]):
+                np.copyto(out, src)
+            else:
+                self._resize(src, (width, height), dst=out, interpolation=self.interpolation)
+        if not self.keep_full:
+            return out
+        frame = out.view(FullResFrame)
+        frame.full = image
+        return frame
@@ -1,7 +1,8 @@
 import subprocess
 from pathlib import Path
 
-from utils.connection import _free_port
+from utils.can_health import reset_unhealthy_links
+from utils.connection import free_resources
 
 RESET_ALL_CAN_SCRIPT = Path(__file__).resolve().parents[2] / "third_party/i2rt/scripts/reset_all_can.sh"
 
@@ -39,12 +40,14 @@ def build_cleanup_and_sigint(
     return cleanup, handle_sigint
 
 
-def run_pre_setup(*server_ports: int, usb_ports: list[str] = []):
-    subprocess.run(["bash", str(RESET_ALL_CAN_SCRIPT)], check=True)
+def run_pre_setup(*server_ports: int, usb_ports: list[str] = [], can_ports: list[str] = []):
+    if can_ports:
+        reset_unhealthy_links(can_ports)
+    else:
+        subprocess.run(["bash", str(RESET_ALL_CAN_SCRIPT)], check=True)
     for usb_port in usb_ports:
         device = Path(usb_port).resolve().name
         latency_timer = Path("/sys/bus/usb-serial/devices") / device / "latency_timer"
         if latency_timer.exists():
             subprocess.run(["sudo", "tee", str(latency_timer)], input="1\n", text=True, check=True)
-    for port in server_ports:
-        _free_port(port)
+    free_resources(*server_ports)
@@ -0,0 +1,240 @@
+"""Track topdown camera drift live, from frames the robot already reads.
+
+watch_pose.py only notices a bumped camera after an episode's mp4 is on
+disk, by decoding it and running the full ORB+RANSAC gate. PoseDriftTracker
+instead samples the topdown frames passing through
+BiYamsFollower.get_observation at a low rate. It compares the top band
+(the rigid background, see camera_pose) against a baseline taken at the
+start of the session.
+
+Each sample is downsampled to grayscale, and the left and right halves of
+the band are phase-correlated against the baseline. The mean of the two
+shifts is the translation and their vertical difference is the roll. The
+result is reported like camera_pose.Pose (live → baseline, tx/ty at the
+image origin), so the same tolerances apply. Those tolerances are in the
+camera's native pixels: frames shrunk with `output_size` are scaled back
+with `native_size`, and cropped frames are only tracked through the full
+frame the camera keeps with `output_keep_full` (see for_camera). A sample
+costs well under a millisecond, so at one sample per second the tracker
+stays far below the budget of a few ms per second.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import cv2
+import numpy as np
+
+from utils.camera_pose import BAND_TOP_FRACTION, format_drift_breakdown, worst_tolerance_ratio
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DriftEstimate:
+    """Motion of the live band relative to the baseline, in full-resolution pixels."""
+
+    roll_deg: float
+    tx_px: float
+    ty_px: float
+    response: float  # weaker half's phase-correlation peak; ~1 for a clean match
+    at: float
+
+    @property
+    def ratio(self) -> float:
+        return worst_tolerance_ratio(self)
+
+
+class PoseDriftTracker:
+    """Compares sampled topdown frames with the session's first frames.
+
+    `offer()` is cheap to call on every frame; only one frame per
+    `interval_s` is processed. The first `baseline_samples` processed frames
+    are averaged into the baseline. An alert is logged once the drift
+    exceeds tolerance on `confirm_samples` consecutive confident samples,
+    and cleared when it is back within tolerance.
+    """
+
+    def __init__(
+        self,
+        interval_s: float = 1.0,
+        width: int = 320,
+        baseline_samples: int = 3,
+        confirm_samples: int = 3,
+        min_response: float = 0.1,
+        name: str = "topdown",
+        native_size: tuple[int, int] | None = None,
+    ):
+        self.interval_s = interval_s
+        self.width = width
+        # (width, height) the offered frames were resized from; None if they weren't.
+        self.native_size = native_size
+        self.baseline_samples = baseline_samples
+        self.confirm_samples = confirm_samples
+        self.min_response = min_response
+        self.name = name
+        self.reset()
+
+    @classmethod
+    def for_camera(
+        cls, camera_config: Any, interval_s: float, name: str
+    ) -> PoseDriftTracker | None:
+        """A tracker for the frames of a camera with `camera_config`; None if they can't be.
+
+        A crop may not contain the top band at all, so cropped frames are
+        only tracked when the camera also hands out the full frame.
+        """
+        inner = getattr(camera_config, "camera", None)
+        # Subprocess cameras forward the inner camera's output, without `full`.
+        config = inner if inner is not None else camera_config
+        if inner is None and getattr(config, "output_keep_full", False):
+            return cls(interval_s, name=name)
+        if getattr(config, "output_crop", None):
+            logger.warning(
+                f"{name} frames are cropped (output_crop); pose drift tracking is off. "
+                "Set output_keep_full to track the full frame."
+            )
+            return None
+        native_size = None
+        if getattr(config, "output_size", None):
+            if not (config.width and config.height):
+                logger.warning(
+                    f"{name} frames are resized from an unknown capture size; "
+                    "pose drift tracking is off."
+                )
+                return None
+            native_size = (config.width, config.height)
+        return cls(interval_s, name=name, native_size=native_size)
+
+    def reset(self) -> None:
+        """Forget the baseline; the next frames become the new one."""
+        self._baseline_sum: np.ndarray | None = None
+        self._baseline_n = 0
+        self._baseline: tuple[np.ndarray, np.ndarray] | None = None
+        self._window: np.ndarray | None = None
+        self._scale = 1.0
+        self._next_at = 0.0
+        self._over = 0
+        self.alerting = False
+        self.last: DriftEstimate | None = None
+        self.samples = 0
+        self.alerts = 0
+        self.busy_s = 0.0
+
+    def _band(self, frame: np.ndarray) -> np.ndarray:
+        h, w = frame.shape[:2]
+        band = frame[: int(h * BAND_TOP_FRACTION)]
+        if band.ndim == 3:
+            band = cv2.cvtColor(band, cv2.COLOR_RGB2GRAY)
+        native_w, native_h = self.native_size or (w, h)
+        # Work in native-resolution pixels scaled by one factor, even if the
+        # frame was resized to another aspect ratio.
+        self._scale = native_w / self.width
+        size = (self.width, max(8, round(band.shape[0] * native_h / h / self._scale)))
+        return cv2.resize(band, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def _halves(self, band: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        half = band.shape[1] // 2
+        return band[:, :half], band[:, half: 2 * half]
+
+    def offer(self, frame: np.ndarray, now: float | None = None) -> DriftEstimate | None:
+        """Process `frame` if a sample is due; returns the new estimate, if any."""
+        now = time.monotonic() if now is None else now
+        if now < self._next_at:
+            return None
+        self._next_at = now + self.interval_s
+        start = time.perf_counter()
+        try:
+            return self._sample(frame, now)
+        finally:
+            self.busy_s += time.perf_counter() - start
+
+    def _sample(self, frame: np.ndarray, now: float) -> DriftEstimate | None:
+        full = getattr(frame, "full", None)
+        if full is not None:
+            frame = full  # output_keep_full: the native frame behind the cropped output
+        band = self._band(frame)
+        if self._baseline is None:
+            if self._baseline_sum is None or self._baseline_sum.shape != band.shape:
+                self._baseline_sum, self._baseline_n = np.zeros_like(band), 0
+            self._baseline_sum += band
+            self._baseline_n += 1
+            if self._baseline_n >= self.baseline_samples:
+                self._baseline = self._halves(self._baseline_sum / self._baseline_n)
+                left = self._baseline[0]
+                self._window = cv2.createHanningWindow(left.shape[::-1], cv2.CV_32F)
+            return None
+        if band.shape[0] != self._baseline[0].shape[0]:
+            logger.warning(f"{self.name} frame size changed; restarting drift baseline")
+            self.reset()
+            return None
+
+        estimate = self._estimate(band, now)
+        self.samples += 1
+        self.last = estimate
+        self._update_alert(estimate)
+        return estimate
+
+    def _estimate(self, band: np.ndarray, now: float) -> DriftEstimate:
+        live_halves = self._halves(band)
+        half_w, band_h = live_halves[0].shape[1], live_halves[0].shape[0]
+        shifts, responses = [], []
+        for live, base in zip(live_halves, self._baseline):
+            # Shift that maps the live half onto the baseline half.
+            (dx, dy), response = cv2.phaseCorrelate(live, base, self._window)
+            shifts.append((dx * self._scale, dy * self._scale))
+            responses.append(response)
+        (dxl, dyl), (dxr, dyr) = shifts
+
+        # Half centres in full-resolution coordinates.
+        s = self._scale
+        yc = band_h * s / 2
+        xl, xr = half_w * s / 2, half_w * s * 1.5
+        roll = math.atan2(dyr - dyl, (xr - xl) + (dxr - dxl))
+        # The band centre moves by the mean shift; express the similarity
+        # transform with its translation at the image origin, like the gate.
+        xm, dxm, dym = (xl + xr) / 2, (dxl + dxr) / 2, (dyl + dyr) / 2
+        c, sn = math.cos(roll), math.sin(roll)
+        tx = xm + dxm - (c * xm - sn * yc)
+        ty = yc + dym - (sn * xm + c * yc)
+        return DriftEstimate(math.degrees(roll), tx, ty, float(min(responses)), now)
+
+    def _update_alert(self, estimate: DriftEstimate) -> None:
+        if estimate.response < self.min_response:
+            return  # band occluded or blurred; neither confirms nor clears drift
+        if estimate.ratio <= 1.0:
+            self._over = 0
+            if self.alerting:
+                self.alerting = False
+                logger.info(f"{self.name} camera back within pose tolerance")
+            return
+        self._over += 1
+        if self._over >= self.confirm_samples and not self.alerting:
+            self.alerting = True
+            self.alerts += 1
+            logger.warning(
+                f"{self.name} camera moved since the session started "
+                f"({estimate.ratio:.1f}× tolerance):\n{format_drift_breakdown(estimate)}"
+            )
+
+    def metrics(self) -> dict[str, Any]:
+        last = self.last
+        return {
+            "baseline_ready": self._baseline is not None,
+            "samples": self.samples,
+            "alerting": self.alerting,
+            "alerts": self.alerts,
+            "busy_ms": round(self.busy_s * 1e3, 3),
+            "last": None if last is None else {
+                "roll_deg": round(last.roll_deg, 3),
+                "tx_px": round(last.tx_px, 2),
+                "ty_px": round(last.ty_px, 2),
+                "response": round(last.response, 3),
+                "ratio": round(last.ratio, 2),
+            },
+        }
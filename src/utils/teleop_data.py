@@ -85,7 +85,20 @@ def save_trajectory(traj: list[dict[str, Any]], task: str, logger) -> Path:
             if cam_key not in cam_dirs:
                 cam_dirs[cam_key] = ep_dir / cam_key
                 cam_dirs[cam_key].mkdir()
-            cv2.imwrite(str(cam_dirs[cam_key] / f"{i:06d}.jpg"), frame)
+            path = cam_dirs[cam_key] / f"{i:06d}.jpg"
+            # Cameras with output_keep_full hand out the policy-sized crop and
+            # keep the full frame alongside it; trajectories store the full one.
+            full = getattr(frame, "full", None)
+            if full is not None:
+                frame = full
+            # Camera frames are RGB; the device's own JPEG bytes already
+            # encode true colour, and anything else must be swapped to the
+            # BGR order cv2.imwrite expects.
+            jpeg = getattr(frame, "jpeg", None)
+            if jpeg is not None:
+                path.write_bytes(jpeg)
+            else:
+                cv2.imwrite(str(path), cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
 
     save_run_history(traj, time.time(), ep_dir, logger)
     # Write initial metadata
@@ -1,12 +1,8 @@
 from pathlib import Path
 
 import yaml
-from lerobot.cameras.opencv import OpenCVCameraConfig
 from lerobot.cameras.configs import Cv2Rotation
 
-from lerobot_camera_cached.cached_config import OpenCVCameraCachedConfig
-from lerobot_camera_cached.realsense_cached_config import RealSenseCameraCachedConfig
-from lerobot_camera_zed.zed_config import ZEDCameraConfig
 from lerobot_robot_yams.bi_follower import BiYamsFollower, BiYamsFollowerConfig
 from lerobot_teleoperator_gello.bi_leader import BiYamsLeader, BiYamsLeaderConfig
 
@@ -31,7 +27,12 @@ def setup_arms_cameras_plotter(args, arms_config_path: Path, logger):
     right_follower_can_port = follower_config["right_arm"]["can_port"]
     left_leader_port = leader_config["left_arm"]["port"]
     right_leader_port = leader_config["right_arm"]["port"]
-    run_pre_setup(left_follower_server_port, right_follower_server_port, usb_ports=[left_leader_port, right_leader_port])
+    run_pre_setup(
+        left_follower_server_port,
+        right_follower_server_port,
+        usb_ports=[left_leader_port, right_leader_port],
+        can_ports=[left_follower_can_port, right_follower_can_port],
+    )
 
     cameras = {}
     had_camera_config = False
@@ -50,13 +51,29 @@ def setup_arms_cameras_plotter(args, arms_config_path: Path, logger):
                 for name, cfg in resolved_camera_configs.items():
                     cfg = dict(cfg)
                     camera_type = cfg.pop("type", "zed")
+                    host = cfg.pop("host", "inprocess")
+                    # Config classes are imported per type so unused camera SDKs never load.
                     if camera_type == "opencv":
+                        from lerobot.cameras.opencv import OpenCVCameraConfig
+
                         cameras[name] = OpenCVCameraConfig(**cfg)
                     elif camera_type == "opencv-cached":
+                        from lerobot_camera_cached.cached_config import OpenCVCameraCachedConfig
+
                         cameras[name] = OpenCVCameraCachedConfig(**cfg)
+                    elif camera_type == "v4l2-cached":
+                        from lerobot_camera_cached.cached_config import V4L2CameraCachedConfig
+
+                        cameras[name] = V4L2CameraCachedConfig(**cfg)
                     elif camera_type == "intelrealsense-cached":
+                        from lerobot_camera_cached.realsense_cached_config import (
+                            RealSenseCameraCachedConfig,
+                        )
+
                         cameras[name] = RealSenseCameraCachedConfig(**cfg)
                     else:
+                        from lerobot_camera_zed.zed_config import ZEDCameraConfig
+
                         if zed_cam_id is None:
                             from lerobot_camera_zed.zed_camera import ZEDCamera
 
@@ -68,6 +85,10 @@ def setup_arms_cameras_plotter(args, arms_config_path: Path, logger):
                             logger.info("Using ZED camera id=%s", zed_cam_id)
                         cfg["rotation"] = Cv2Rotation[cfg["rotation"]]
                         cameras[name] = ZEDCameraConfig(camera_id=zed_cam_id, **cfg)
+                    if host == "subprocess":
+                        from lerobot_camera_cached.cached_config import SubprocessCameraConfig
+
+                        cameras[name] = SubprocessCameraConfig(camera=cameras[name])
             except Exception as exc:
                 logger.warning("Camera setup failed (%s). Continuing without cameras.", exc)
                 cameras = {}
@@ -0,0 +1,23 @@
+"""YamsFollower stand-in that records what BiYamsFollower sends it."""
+
+import types
+
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
+from lerobot_robot_yams.forward_kinematics import SafetyStatus
+
+
+class FakeArm:
+    def __init__(self):
+        self.config = types.SimpleNamespace(
+            joint_names=[f"joint_{i}" for i in range(1, 7)] + ["gripper"]
+        )
+        self.sent = []
+
+    def command_action(self, action):
+        self.sent.append(action)
+
+    def action_status(self, _future):
+        return SafetyStatus.OK
+
+    def accept_action(self, action):
+        pass
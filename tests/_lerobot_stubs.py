@@ -0,0 +1,193 @@
+"""Stand-ins for lerobot, portal, i2rt and the camera SDKs so the packages import without them.
+
+Import this module before anything from lerobot_robot_yams, lerobot_camera_cached
+or lerobot_camera_zed. Each stub is only installed (or completed) where nothing
+else provided it, so test files can share one session regardless of order.
+The only package modules stubbed are the camera config modules, which need
+lerobot's config registry.
+"""
+
+import enum
+import sys
+import threading
+import types
+from dataclasses import dataclass
+
+import cv2
+
+
+def _module(name: str) -> types.ModuleType:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+    return sys.modules[name]
+
+
+class CameraConfig:
+    pass
+
+
+class Robot:
+    def __init__(self, config):
+        self.config = config
+
+
+class RobotConfig:
+    @classmethod
+    def register_subclass(cls, _name):
+        def decorator(subcls):
+            return subcls
+
+        return decorator
+
+
+class Camera:
+    def __init__(self, config):
+        self.fps = config.fps
+        self.width = config.width
+        self.height = config.height
+
+
+@dataclass
+class ConfigsCameraConfig:
+    fps: int | None = None
+    width: int | None = None
+    height: int | None = None
+
+    @classmethod
+    def register_subclass(cls, _name):
+        return lambda subcls: subcls
+
+
+class ColorMode(str, enum.Enum):
+    RGB = "rgb"
+    BGR = "bgr"
+
+
+class Cv2Rotation(int, enum.Enum):
+    NO_ROTATION = 0
+    ROTATE_90 = 90
+    ROTATE_180 = 180
+    ROTATE_270 = -90
+
+
+_CV2_ROTATIONS = {
+    Cv2Rotation.NO_ROTATION: None,
+    Cv2Rotation.ROTATE_90: cv2.ROTATE_90_CLOCKWISE,
+    Cv2Rotation.ROTATE_180: cv2.ROTATE_180,
+    Cv2Rotation.ROTATE_270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
+
+class OpenCVCamera:
+    def __init__(self, config):
+        self.config = config
+        self.thread = None
+        self.latest_frame = None
+        self.latest_timestamp = None
+        self.frame_lock = threading.Lock()
+        self.new_frame_event = threading.Event()
+
+
+class RealSenseCamera:
+    def __init__(self, config):
+        self.config = config
+
+
+class PortalServer:
+    def __init__(self, port):
+        self.bound = {}
+
+    def bind(self, name, fn):
+        self.bound[name] = fn
+
+
+def install() -> None:
+    _module("lerobot")
+
+    cameras = _module("lerobot.cameras")
+    if not hasattr(cameras, "CameraConfig"):
+        cameras.CameraConfig = CameraConfig
+        cameras.make_cameras_from_configs = lambda configs: configs
+    cameras_utils = _module("lerobot.cameras.utils")
+    if not hasattr(cameras_utils, "make_cameras_from_configs"):
+        cameras_utils.make_cameras_from_configs = lambda configs: configs
+
+    robots = _module("lerobot.robots")
+    if not hasattr(robots, "Robot"):
+        robots.Robot = Robot
+        robots.RobotConfig = RobotConfig
+
+    _module("lerobot.utils")
+    errors = _module("lerobot.utils.errors")
+    for name in ("DeviceAlreadyConnectedError", "DeviceNotConnectedError"):
+        if not hasattr(errors, name):
+            setattr(errors, name, type(name, (Exception,), {}))
+
+    _install_cameras()
+
+    portal = _module("portal")
+    if not hasattr(portal, "Server"):
+        portal.Server = PortalServer
+
+    for name in ("i2rt", "i2rt.robots"):
+        _module(name)
+    get_robot = _module("i2rt.robots.get_robot")
+    if not hasattr(get_robot, "get_yam_robot"):
+        get_robot.get_yam_robot = None
+    robot = _module("i2rt.robots.robot")
+    if not hasattr(robot, "Robot"):
+        robot.Robot = object
+    i2rt_utils = _module("i2rt.robots.utils")
+    if not hasattr(i2rt_utils, "GripperType"):
+        i2rt_utils.GripperType = None
+
+
+def _install_cameras() -> None:
+    cameras = _module("lerobot.cameras")
+    camera = _module("lerobot.cameras.camera")
+    if not hasattr(camera, "Camera"):
+        camera.Camera = getattr(cameras, "Camera", Camera)
+    if not hasattr(cameras, "Camera"):
+        cameras.Camera = camera.Camera
+
+    configs = _module("lerobot.cameras.configs")
+    for name, stub in (
+        ("CameraConfig", ConfigsCameraConfig),
+        ("ColorMode", ColorMode),
+        ("Cv2Rotation", Cv2Rotation),
+    ):
+        if not hasattr(configs, name):
+            setattr(configs, name, stub)
+    if not hasattr(cameras, "ColorMode"):
+        cameras.ColorMode = configs.ColorMode
+    cameras_utils = _module("lerobot.cameras.utils")
+    if not hasattr(cameras_utils, "get_cv2_rotation"):
+        cameras_utils.get_cv2_rotation = _CV2_ROTATIONS.get
+
+    for package in ("lerobot.cameras.opencv", "lerobot.cameras.realsense"):
+        _module(package)
+    opencv = _module("lerobot.cameras.opencv.camera_opencv")
+    if not hasattr(opencv, "OpenCVCamera"):
+        opencv.OpenCVCamera = OpenCVCamera
+    if not hasattr(opencv.OpenCVCamera, "_postprocess_image"):
+        opencv.OpenCVCamera._postprocess_image = lambda self, image: image
+    realsense = _module("lerobot.cameras.realsense.camera_realsense")
+    if not hasattr(realsense, "RealSenseCamera"):
+        realsense.RealSenseCamera = RealSenseCamera
+    if not hasattr(realsense.RealSenseCamera, "_postprocess_image"):
+        realsense.RealSenseCamera._postprocess_image = (
+            lambda self, image, depth_frame=False: image
+        )
+    _module("pyrealsense2")
+
+    # The real config modules register with lerobot's config registry on import.
+    cached_config = _module("lerobot_camera_cached.cached_config")
+    for name in ("OpenCVCameraCachedConfig", "V4L2CameraCachedConfig", "SubprocessCameraConfig"):
+        if not hasattr(cached_config, name):
+            setattr(cached_config, name, types.SimpleNamespace)
+    realsense_config = _module("lerobot_camera_cached.realsense_cached_config")
+    if not hasattr(realsense_config, "RealSenseCameraCachedConfig"):
+        realsense_config.RealSenseCameraCachedConfig = types.SimpleNamespace
+
+
+install()
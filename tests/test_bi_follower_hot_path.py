@@ -1,96 +1,8 @@
-import sys
 import time
 import types
 import unittest
 
-
-def _install_lerobot_stubs() -> None:
-    if "lerobot" in sys.modules:
-        return
-
-    lerobot = types.ModuleType("lerobot")
-    cameras = types.ModuleType("lerobot.cameras")
-    cameras_utils = types.ModuleType("lerobot.cameras.utils")
-    robots = types.ModuleType("lerobot.robots")
-
-    class CameraConfig:
-        pass
-
-    def make_cameras_from_configs(configs):
-        return configs
-
-    class Robot:
-        def __init__(self, config):
-            self.config = config
-
-    class RobotConfig:
-        @classmethod
-        def register_subclass(cls, _name):
-            def decorator(subcls):
-                return subcls
-
-            return decorator
-
-    cameras.CameraConfig = CameraConfig
-    cameras_utils.make_cameras_from_configs = make_cameras_from_configs
-    robots.Robot = Robot
-    robots.RobotConfig = RobotConfig
-
-    sys.modules["lerobot"] = lerobot
-    sys.modules["lerobot.cameras"] = cameras
-    sys.modules["lerobot.cameras.utils"] = cameras_utils
-    sys.modules["lerobot.robots"] = robots
-
-
-def _install_yams_follower_stub() -> None:
-    module_name = "lerobot_robot_yams.follower"
-    if module_name in sys.modules:
-        return
-
-    follower = types.ModuleType(module_name)
-
-    class YamsFollowerConfig:
-        def __init__(self, can_port, server_port, side):
-            self.can_port = can_port
-            self.server_port = server_port
-            self.side = side
-            self.joint_names = [
-                "joint_1",
-                "joint_2",
-                "joint_3",
-                "joint_4",
-                "joint_5",
-                "joint_6",
-                "gripper",
-            ]
-
-    class YamsFollower:
-        def __init__(self, config):
-            self.config = config
-
-    follower.YamsFollower = YamsFollower
-    follower.YamsFollowerConfig = YamsFollowerConfig
-    sys.modules[module_name] = follower
-
-
-def _install_check_action_stub() -> None:
-    module_name = "lerobot_robot_yams.forward_kinematics"
-    if module_name in sys.modules:
-        return
-
-    fk = types.ModuleType(module_name)
-
-    def check_action(*args, **kwargs):
-        return False, ""
-
-    fk.check_action = check_action
-    sys.modules[module_name] = fk
-
-
-_install_lerobot_stubs()
-_install_yams_follower_stub()
-_install_check_action_stub()
-
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
 from lerobot_robot_yams.bi_follower import BiYamsFollower
 
 
@@ -110,7 +22,8 @@ class _FakeArm:
             ]
         )
 
-    def get_observation(self):
+    def get_observation(self, timestamp=None):
+        self.timestamp = timestamp
         time.sleep(self.delay)
         return {"joint_1.pos": self.delay}
 
@@ -150,6 +63,8 @@ class TestBiFollowerHotPath(unittest.TestCase):
         self.assertLess(elapsed, 0.2)
         self.assertEqual(obs["left_joint_1.pos"], 0.12)
         self.assertEqual(obs["right_joint_1.pos"], 0.12)
+        self.assertIsNotNone(follower.left_arm.timestamp)
+        self.assertEqual(follower.left_arm.timestamp, follower.right_arm.timestamp)
 
     def test_camera_reads_run_in_parallel(self):
         follower = BiYamsFollower.__new__(BiYamsFollower)
@@ -174,6 +89,24 @@ class TestBiFollowerHotPath(unittest.TestCase):
         self.assertEqual(obs["cam_b"], "B")
         self.assertEqual(obs["cam_c"], "C")
 
+    def test_topdown_frames_feed_the_drift_tracker(self):
+        follower = BiYamsFollower.__new__(BiYamsFollower)
+        from concurrent.futures import ThreadPoolExecutor
+
+        offered = []
+        follower.config = types.SimpleNamespace(pose_drift_camera="cam_b")
+        follower._pose_drift = types.SimpleNamespace(offer=offered.append)
+        follower._obs_pool = ThreadPoolExecutor(max_workers=4)
+        follower.left_arm = _FakeArm("left", 0.0)
+        follower.right_arm = _FakeArm("right", 0.0)
+        follower.cameras = {"cam_a": _FakeCamera("A", 0.0), "cam_b": _FakeCamera("B", 0.0)}
+
+        follower.get_observation(with_cameras=True)
+        follower.get_observation(with_cameras=False)
+        follower._obs_pool.shutdown(wait=True)
+
+        self.assertEqual(offered, ["B"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,49 @@
+import errno
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
 import numpy as np
 
-from utils.camera_auto_exposure import CameraAutoExposure, frame_brightness, next_exposure
+from utils import camera_auto_exposure
+from utils.camera_auto_exposure import (
+    AsyncExposureSetter,
+    CameraAutoExposure,
+    V4L2_CID_EXPOSURE_ABSOLUTE,
+    frame_brightness,
+    get_exposure,
+    next_exposure,
+)
+
+
+class _FakeV4L2Driver:
+    """Stands in for fcntl.ioctl on a plain file that plays the video device."""
+
+    def __init__(self, device: str, exposure: int, delay_s: float = 0.0):
+        self.device = os.path.realpath(device)
+        self.controls = {V4L2_CID_EXPOSURE_ABSOLUTE: exposure}
+        self.delay_s = delay_s
+        self.writes = []
+        self.threads = set()
+
+    def ioctl(self, fd, request, arg):
+        if os.readlink(f"/proc/self/fd/{fd}") != self.device:
+            raise OSError(errno.ENOTTY, "not the fake device")
+        control_id, value = camera_auto_exposure._V4L2_CONTROL.unpack(arg)
+        if control_id not in self.controls:
+            raise OSError(errno.EINVAL, "unknown control")
+        if request == camera_auto_exposure.VIDIOC_G_CTRL:
+            return camera_auto_exposure._V4L2_CONTROL.pack(control_id, self.controls[control_id])
+        if request == camera_auto_exposure.VIDIOC_S_CTRL:
+            time.sleep(self.delay_s)
+            self.threads.add(threading.current_thread().name)
+            self.controls[control_id] = value
+            self.writes.append(value)
+            return arg
+        raise OSError(errno.ENOTTY, "unsupported ioctl")
 
 
 class TestCameraAutoExposure(unittest.TestCase):
@@ -12,6 +52,13 @@ class TestCameraAutoExposure(unittest.TestCase):
         frame[2:6, 2:6] = 100
         self.assertEqual(frame_brightness(frame), 100.0)
 
+    def test_strided_brightness_tracks_full_percentile(self):
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+        frame[:, 320:] //= 2
+        crop = frame[120:360, 160:480].mean(axis=2)
+        self.assertAlmostEqual(frame_brightness(frame), np.percentile(crop, 75), delta=3.0)
+
     def test_next_exposure_increases_when_too_dark(self):
         self.assertEqual(next_exposure(50, 50, 100, 5, 0.5, 5, 200), 62)
 
@@ -42,5 +89,78 @@ class TestCameraAutoExposure(unittest.TestCase):
         self.assertEqual(set_exposure.call_count, 2)
 
 
+class TestV4L2ExposureControl(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.NamedTemporaryFile(prefix="video", delete=False)
+        tmp.close()
+        self.device = tmp.name
+        self.addCleanup(os.unlink, self.device)
+
+    def test_get_and_set_through_ioctl(self):
+        driver = _FakeV4L2Driver(self.device, exposure=80)
+        with patch("utils.camera_auto_exposure.fcntl.ioctl", driver.ioctl), patch(
+            "subprocess.run", side_effect=AssertionError("no subprocess")
+        ):
+            self.assertEqual(get_exposure(self.device), 80)
+            camera_auto_exposure._set_exposure(self.device, 120)
+            self.assertEqual(get_exposure(self.device), 120)
+
+    def test_device_without_exposure_control_is_reported(self):
+        driver = _FakeV4L2Driver(self.device, exposure=80)
+        driver.controls.clear()
+        with patch("utils.camera_auto_exposure.fcntl.ioctl", driver.ioctl):
+            with self.assertRaises(RuntimeError):
+                get_exposure(self.device)
+
+    def test_tick_does_not_wait_for_slow_driver(self):
+        driver = _FakeV4L2Driver(self.device, exposure=50, delay_s=0.1)
+        setter = AsyncExposureSetter(self.device)
+        controller = CameraAutoExposure(
+            device=self.device,
+            exposure=50,
+            target=100,
+            deadband=5,
+            speed=0.5,
+            min_exposure=5,
+            max_exposure=200,
+            period_s=0.0,
+            setter=setter,
+        )
+        dark = np.full((8, 8, 3), 20, dtype=np.uint8)
+        with patch("utils.camera_auto_exposure.fcntl.ioctl", driver.ioctl):
+            start = time.perf_counter()
+            for _ in range(5):
+                controller.tick(dark)
+            elapsed = time.perf_counter() - start
+            deadline = time.monotonic() + 2.0
+            while driver.writes[-1:] != [controller.exposure] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            setter.close()
+
+        self.assertLess(elapsed, 0.05)
+        self.assertNotIn(threading.current_thread().name, driver.threads)
+        # Intermediate values are coalesced; the newest one always lands.
+        self.assertLess(len(driver.writes), 6)
+        self.assertEqual(driver.controls[V4L2_CID_EXPOSURE_ABSOLUTE], controller.exposure)
+
+    def test_setter_failure_surfaces_on_next_tick(self):
+        setter = AsyncExposureSetter("/nonexistent/video99")
+        setter.submit(10)
+        setter._thread.join(timeout=1.0)
+        controller = CameraAutoExposure(
+            device="/nonexistent/video99",
+            exposure=50,
+            target=100,
+            deadband=5,
+            speed=0.5,
+            min_exposure=5,
+            max_exposure=200,
+            period_s=0.0,
+            setter=setter,
+        )
+        with self.assertRaises(OSError):
+            controller.tick(np.zeros((8, 8, 3), dtype=np.uint8))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+import threading
+import time
+import types
+import unittest
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the camera packages)
+from lerobot_camera_cached.camera_host import FrameRing, SubprocessCamera
+
+HEIGHT, WIDTH = 48, 64
+
+
+class SyntheticCamera:
+    """Frame generator standing in for a real camera: frame k is filled with k % 256."""
+
+    def __init__(self, config):
+        self.config = config
+        self.count = 0
+        self.latest_timestamp = None
+
+    def connect(self):
+        if self.config.fail:
+            raise RuntimeError("no such device")
+        self.next_frame = time.perf_counter()
+
+    def async_read(self, timeout_ms=200):
+        self.next_frame += 1.0 / self.config.fps
+        time.sleep(max(0.0, self.next_frame - time.perf_counter()))
+        self.count += 1
+        self.latest_timestamp = time.perf_counter()
+        return np.full((HEIGHT, WIDTH, 3), self.count % 256, dtype=np.uint8)
+
+    def disconnect(self):
+        pass
+
+
+class SyntheticSubprocessCamera(SubprocessCamera):
+    factory = staticmethod(SyntheticCamera)
+
+
+def _config(fps=200, fail=False):
+    inner = types.SimpleNamespace(type="synthetic", fps=fps, fail=fail)
+    return types.SimpleNamespace(
+        camera=inner,
+        fps=fps,
+        width=WIDTH,
+        height=HEIGHT,
+        ring_slots=3,
+        start_timeout_s=10.0,
+        start_method="fork",
+    )
+
+
+class TestFrameRing(unittest.TestCase):
+    def test_reader_gets_newest_frame_after_writer_laps_the_ring(self):
+        ring = FrameRing.create((HEIGHT, WIDTH, 3), slots=3)
+        try:
+            reader = FrameRing.attach(ring.name, (HEIGHT, WIDTH, 3), 3)
+            self.assertIsNone(reader.read_latest())
+            for k in range(1, 11):
+                ring.write(np.full((HEIGHT, WIDTH, 3), k, np.uint8), timestamp=float(k))
+
+            seq, timestamp, frame = reader.read_latest()
+            self.assertEqual(seq, 10)
+            self.assertEqual(timestamp, 10.0)
+            self.assertTrue(np.all(frame == 10))
+            frame[:] = 0
+            self.assertTrue(np.all(reader.read_latest()[2] == 10))
+            reader.close()
+        finally:
+            ring.close()
+
+    def test_torn_slot_is_not_returned(self):
+        ring = FrameRing.create((HEIGHT, WIDTH, 3), slots=3)
+        try:
+            ring.write(np.full((HEIGHT, WIDTH, 3), 1, np.uint8), timestamp=1.0)
+            # What a reader on a weakly ordered CPU can see: the sequence is
+            # published but only part of the pixels have landed.
+            ring._frames[1, : HEIGHT // 2] = 0
+            rewrite = threading.Timer(
+                0.05, ring.write, args=(np.full((HEIGHT, WIDTH, 3), 2, np.uint8), 2.0)
+            )
+            rewrite.start()
+
+            seq, timestamp, frame = ring.read_latest()
+            rewrite.join()
+
+            self.assertEqual((seq, timestamp), (2, 2.0))
+            self.assertTrue(np.all(frame == 2))
+        finally:
+            ring.close()
+
+    def test_wrong_shape_is_rejected(self):
+        ring = FrameRing.create((HEIGHT, WIDTH, 3), slots=2)
+        try:
+            with self.assertRaises(ValueError):
+                ring.write(np.zeros((WIDTH, HEIGHT, 3), np.uint8), 0.0)
+        finally:
+            ring.close()
+
+
+class TestSubprocessCamera(unittest.TestCase):
+    def test_frames_from_worker_process_reach_async_read(self):
+        cam = SyntheticSubprocessCamera(_config())
+        cam.connect()
+        try:
+            self.assertTrue(cam.is_connected)
+            ring_name = cam.ring.name
+            values, stamps = [], []
+            deadline = time.monotonic() + 5.0
+            while len(values) < 20 and time.monotonic() < deadline:
+                frame = cam.async_read(timeout_ms=100)
+                if not values or frame[0, 0, 0] != values[-1]:
+                    values.append(int(frame[0, 0, 0]))
+                    stamps.append(cam.latest_timestamp)
+                time.sleep(0.002)
+
+            self.assertEqual(len(values), 20)
+            self.assertEqual(frame.shape, (HEIGHT, WIDTH, 3))
+            self.assertTrue(all(b > a for a, b in zip(values, values[1:])))
+            self.assertTrue(all(b > a for a, b in zip(stamps, stamps[1:])))
+            # Capture timestamps come from the worker's CLOCK_MONOTONIC.
+            self.assertLess(abs(time.perf_counter() - stamps[-1]), 1.0)
+        finally:
+            cam.disconnect()
+
+        self.assertFalse(cam.is_connected)
+        with self.assertRaises(FileNotFoundError):
+            FrameRing.attach(ring_name, (HEIGHT, WIDTH, 3), 3)
+
+    def test_fresh_frame_is_returned_without_waiting(self):
+        cam = SyntheticSubprocessCamera(_config(fps=5))
+        cam.connect()
+        try:
+            first = cam.async_read(timeout_ms=1000)
+            start = time.perf_counter()
+            again = cam.async_read(timeout_ms=1000)
+            self.assertLess(time.perf_counter() - start, 0.05)
+            self.assertTrue(np.array_equal(first, again))
+        finally:
+            cam.disconnect()
+
+    def test_worker_connect_failure_raises(self):
+        cam = SyntheticSubprocessCamera(_config(fail=True))
+        with self.assertRaises(ConnectionError):
+            cam.connect()
+        self.assertIsNone(cam.process)
+        self.assertIsNone(cam.ring)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Vectorized camera identity scoring and assignment against the per-pair reference."""
+
+import itertools
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from utils.camera_identity import image_features, match_identities, prepare_image, score_matrix
+
+
+def _pairwise_similarity(reference: Path, candidate: Path) -> float | None:
+    """The per-pair score check_setup computed before the matrix version."""
+    ref_image, cand_image = prepare_image(reference), prepare_image(candidate)
+    ref, cand = ref_image.astype(np.float32), cand_image.astype(np.float32)
+    if ref.std() < 1.0 or cand.std() < 1.0:
+        return None
+    corr = float(np.corrcoef(ref.reshape(-1), cand.reshape(-1))[0, 1])
+    corr_score = max(0.0, min(1.0, (corr + 1.0) / 2.0))
+    ref_hist = cv2.calcHist([ref_image], [0], None, [32], [0, 256])
+    cand_hist = cv2.calcHist([cand_image], [0], None, [32], [0, 256])
+    cv2.normalize(ref_hist, ref_hist)
+    cv2.normalize(cand_hist, cand_hist)
+    hist_score = 1.0 - float(cv2.compareHist(ref_hist, cand_hist, cv2.HISTCMP_BHATTACHARYYA))
+    return 0.75 * corr_score + 0.25 * max(0.0, min(1.0, hist_score))
+
+
+def _brute_force(scores: np.ndarray) -> tuple[float, float | None] | None:
+    n, m = scores.shape
+    totals = sorted(
+        (
+            float(sum(scores[i, j] for i, j in enumerate(cols)))
+            for cols in itertools.permutations(range(m), n)
+            if all(np.isfinite(scores[i, j]) for i, j in enumerate(cols))
+        ),
+        reverse=True,
+    )
+    if not totals:
+        return None
+    return totals[0], (totals[1] if len(totals) > 1 else None)
+
+
+class TestScoreMatrix(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        rng = np.random.default_rng(0)
+        self.paths = []
+        for i in range(4):
+            image = cv2.GaussianBlur(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (9, 9), 0)
+            if i == 3:
+                image = cv2.flip(self._read(self.paths[0]), 1)  # same histogram, different layout
+            self.paths.append(self._write(Path(tmp.name) / f"cam{i}.png", image))
+        self.flat = self._write(Path(tmp.name) / "flat.png", np.full((240, 320, 3), 90, np.uint8))
+        self.missing = Path(tmp.name) / "missing.png"
+
+    @staticmethod
+    def _write(path: Path, image: np.ndarray) -> Path:
+        cv2.imwrite(str(path), image)
+        return path
+
+    @staticmethod
+    def _read(path: Path) -> np.ndarray:
+        return cv2.imread(str(path))
+
+    def test_matches_pairwise_scores(self):
+        features = [image_features(p) for p in self.paths]
+        matrix = score_matrix(features[:2], features)
+        for i, j in np.ndindex(matrix.shape):
+            self.assertAlmostEqual(
+                matrix[i, j], _pairwise_similarity(self.paths[i], self.paths[j]), places=5
+            )
+        self.assertAlmostEqual(matrix[0, 0], 1.0, places=5)
+
+    def test_flat_and_missing_images_are_unknown(self):
+        self.assertIsNone(image_features(self.flat))
+        self.assertIsNone(image_features(self.missing))
+        features = [image_features(self.paths[0]), None]
+        matrix = score_matrix(features, features)
+        self.assertFalse(np.isnan(matrix[0, 0]))
+        self.assertTrue(np.isnan(matrix[1]).all() and np.isnan(matrix[:, 1]).all())
+        self.assertTrue(np.isnan(score_matrix([None], features)).all())
+
+
+class TestMatchIdentities(unittest.TestCase):
+    def test_agrees_with_brute_force(self):
+        rng = np.random.default_rng(1)
+        for n, m in [(2, 2), (2, 5), (3, 3), (3, 6), (4, 4), (4, 7)]:
+            for _ in range(20):
+                scores = rng.uniform(0.3, 1.0, (n, m))
+                scores[rng.uniform(size=(n, m)) < 0.15] = np.nan
+                names = [f"cam{i}" for i in range(n)]
+                candidates = [f"/dev/video{j}" for j in range(m)]
+                match = match_identities(scores, names, candidates)
+                expected = _brute_force(scores)
+                with self.subTest(n=n, m=m):
+                    if expected is None:
+                        self.assertIsNone(match)
+                        continue
+                    best, runner_up = expected
+                    self.assertAlmostEqual(match.total, best)
+                    if runner_up is None:
+                        self.assertIsNone(match.runner_up)
+                    else:
+                        self.assertAlmostEqual(match.runner_up, runner_up)
+                    self.assertEqual(len(set(match.assignment.values())), n)
+                    self.assertAlmostEqual(sum(match.scores.values()), match.total)
+
+    def test_margin_and_lowest_score(self):
+        scores = np.array([[0.95, 0.40, 0.50], [0.45, 0.90, 0.88]])
+        match = match_identities(scores, ["right_wrist", "left_wrist"], ["a", "b", "c"])
+        self.assertEqual(match.assignment, {"right_wrist": "a", "left_wrist": "b"})
+        self.assertAlmostEqual(match.lowest_score, 0.90)
+        self.assertAlmostEqual(match.margin, 0.02)
+
+    def test_unique_assignment_has_no_runner_up(self):
+        scores = np.array([[0.9, np.nan], [np.nan, 0.8]])
+        match = match_identities(scores, ["right_wrist", "left_wrist"], ["a", "b"])
+        self.assertIsNone(match.runner_up)
+        self.assertAlmostEqual(match.margin, match.total)
+
+    def test_impossible_assignments(self):
+        # Both references only comparable to the same capture.
+        scores = np.array([[0.9, np.nan], [0.8, np.nan]])
+        self.assertIsNone(match_identities(scores, ["a", "b"], ["x", "y"]))
+        self.assertIsNone(match_identities(np.ones((2, 1)), ["a", "b"], ["x"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
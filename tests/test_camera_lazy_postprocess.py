@@ -0,0 +1,218 @@
+"""Lazy postprocessing and consumer-rate decimation in the cached camera read loops."""
+
+import sys
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the camera packages)
+from lerobot_camera_cached import camera_opencv_cached
+from lerobot_camera_cached.camera_opencv_cached import OpenCVCameraCached
+from lerobot_camera_cached.camera_realsense_cached import RealSenseCameraCached
+from lerobot_camera_cached.lazy_frame import FrameDecimator, LazyFrame
+
+H, W = 6, 8
+
+
+def _image(value: int) -> np.ndarray:
+    return np.full((H, W, 3), value, dtype=np.uint8)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Capture:
+    """VideoCapture over a list of frames delivered at `fps` on a fake clock."""
+
+    def __init__(self, camera, frames, clock, fps):
+        self.camera = camera
+        self.frames = list(frames)
+        self.clock = clock
+        self.period = 1.0 / fps
+        self.current = None
+        self.retrieved = 0
+
+    def _next(self):
+        if not self.frames:
+            self.camera.stop_event.set()
+            raise sys.modules["lerobot.utils.errors"].DeviceNotConnectedError()
+        self.clock.now += self.period
+        self.current = self.frames.pop(0)
+
+    def read(self):
+        self._next()
+        self.retrieved += 1
+        return True, self.current
+
+    def grab(self):
+        self._next()
+        return True
+
+    def retrieve(self):
+        self.retrieved += 1
+        return True, self.current
+
+
+def _opencv_camera(frames, clock, lazy=False, consumer_fps=None, fps=60):
+    cam = OpenCVCameraCached.__new__(OpenCVCameraCached)
+    cam.config = types.SimpleNamespace(
+        compressed_passthrough=False, lazy_postprocess=lazy, consumer_fps=consumer_fps
+    )
+    cam.fps = fps
+    cam.output = None
+    cam.thread = types.SimpleNamespace(is_alive=lambda: True)
+    cam.stop_event = threading.Event()
+    cam.frame_lock = threading.Lock()
+    cam.new_frame_event = threading.Event()
+    cam.latest_frame = None
+    cam.latest_timestamp = None
+    cam.ready = False
+    cam.latest_frame_time = 0.0
+    cam.auto_exposure = None
+    cam.postprocessed = 0
+
+    def postprocess(image):
+        cam.postprocessed += 1
+        return image[:, :, ::-1].copy()
+
+    cam._postprocess_image = postprocess
+    cam.videocapture = _Capture(cam, frames, clock, fps)
+
+    def read():
+        return cam.videocapture.read()[1]
+
+    cam._read_from_hardware = read
+    return cam
+
+
+class TestLazyFrame(unittest.TestCase):
+    def test_concurrent_consumers_postprocess_once(self):
+        calls = []
+        frame = LazyFrame(_image(7), lambda raw: calls.append(1) or raw + 1)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(frame.get())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(int(results[0][0, 0, 0]), 8)
+        self.assertIsNone(frame.raw)
+        self.assertIs(frame.preview(), results[0])
+
+
+class TestFrameDecimator(unittest.TestCase):
+    def test_keeps_every_second_frame_of_60fps_at_30hz_despite_jitter(self):
+        decimator = FrameDecimator(consumer_fps=30, device_fps=60)
+        jitter = [0.0, 0.004, -0.003, 0.005, -0.004, 0.002, 0.0, -0.005, 0.003, 0.0]
+        kept = [i for i, j in enumerate(jitter) if decimator.keep(i / 60 + j)]
+        self.assertEqual(kept, [0, 2, 4, 6, 8])
+
+    def test_no_hint_means_no_decimator(self):
+        config = types.SimpleNamespace(consumer_fps=None)
+        self.assertIsNone(FrameDecimator.from_config(config, 60))
+
+
+class TestOpenCVLazyPostprocess(unittest.TestCase):
+    def test_only_consumed_frame_is_postprocessed(self):
+        clock = _Clock()
+        cam = _opencv_camera([_image(v) for v in (10, 20, 30, 40)], clock, lazy=True)
+        cam._read_loop()
+
+        self.assertEqual(cam.postprocessed, 0)
+        self.assertIsInstance(cam.latest_frame, LazyFrame)
+
+        first = cam.async_read(timeout_ms=200)
+        second = cam.async_read(timeout_ms=200)
+        self.assertEqual(cam.postprocessed, 1)
+        self.assertIs(first, second)
+        self.assertEqual(int(first[0, 0, 0]), 40)
+
+    def test_eager_mode_is_unchanged(self):
+        cam = _opencv_camera([_image(v) for v in (10, 20, 30)], _Clock())
+        cam._read_loop()
+        self.assertEqual(cam.postprocessed, 3)
+        self.assertIsInstance(cam.latest_frame, np.ndarray)
+
+    def test_consumer_hint_skips_retrieve_of_dropped_frames(self):
+        clock = _Clock()
+        cam = _opencv_camera([_image(v) for v in range(12)], clock, consumer_fps=30)
+        with patch.object(camera_opencv_cached.time, "perf_counter", clock):
+            cam._read_loop()
+
+        self.assertEqual(cam.videocapture.retrieved, 6)
+        self.assertEqual(cam.postprocessed, 6)
+        self.assertEqual(int(cam.async_read(timeout_ms=200)[0, 0, 0]), 10)
+
+
+class _Frameset:
+    def __init__(self, color, depth):
+        self.color = color
+        self.depth = depth
+
+    def get_color_frame(self):
+        return types.SimpleNamespace(get_data=lambda: self.color)
+
+    def get_depth_frame(self):
+        return types.SimpleNamespace(get_data=lambda: self.depth)
+
+
+class TestRealSenseLazyPostprocess(unittest.TestCase):
+    def test_color_and_depth_postprocessed_once_when_read(self):
+        cam = RealSenseCameraCached.__new__(RealSenseCameraCached)
+        cam.config = types.SimpleNamespace(lazy_postprocess=True, consumer_fps=None)
+        cam.fps = 30
+        cam.use_depth = True
+        cam.thread = types.SimpleNamespace(is_alive=lambda: True)
+        cam.stop_event = threading.Event()
+        cam.frame_lock = threading.Lock()
+        cam.new_frame_event = threading.Event()
+        cam.latest_color_frame = None
+        cam.latest_depth_frame = None
+        cam.latest_timestamp = None
+        cam.ready = False
+        cam.latest_frame_time = 0.0
+        cam._depth_snapshot_lock = threading.Lock()
+        cam._last_depth_snapshot = None
+        cam.filter_stages = []
+        calls = []
+
+        def postprocess(image, depth_frame=False):
+            calls.append(depth_frame)
+            return image + 1
+
+        framesets = [
+            _Frameset(_image(v), np.full((H, W), 1000 + v, dtype=np.uint16)) for v in (1, 2, 3)
+        ]
+
+        def read():
+            if not framesets:
+                cam.stop_event.set()
+                raise RuntimeError("end of recording")
+            return framesets.pop(0)
+
+        cam._postprocess_image = postprocess
+        cam._read_from_hardware = read
+        cam._read_loop()
+
+        self.assertEqual(calls, [])
+        color = cam.async_read(timeout_ms=200)
+        depth = cam.pop_depth_snapshot()
+        self.assertEqual(sorted(calls), [False, True])
+        self.assertEqual(int(color[0, 0, 0]), 4)
+        self.assertEqual(int(depth[0, 0]), 1004)
+
+
+if __name__ == "__main__":
+    unittest.main()
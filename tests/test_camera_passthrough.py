@@ -0,0 +1,193 @@
+"""Compressed-passthrough MJPEG capture: decode lazily, once, and keep the original bytes."""
+
+import logging
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the camera packages)
+from lerobot_camera_cached.camera_opencv_cached import OpenCVCameraCached
+from lerobot_camera_cached.jpeg_frame import EncodedFrame, JpegFrame
+from utils import teleop_data
+from utils.camera_auto_exposure import CameraAutoExposure
+
+H, W = 24, 32
+
+
+def _jpeg(value: int) -> bytes:
+    image = np.full((H, W, 3), value, dtype=np.uint8)
+    return cv2.imencode(".jpg", image)[1].tobytes()
+
+
+class _MjpegCapture:
+    """VideoCapture with CONVERT_RGB off: read() returns the raw (1, N) MJPG buffer."""
+
+    def __init__(self, camera, frames):
+        self.camera = camera
+        self.frames = list(frames)
+
+    def read(self):
+        if not self.frames:
+            self.camera.stop_event.set()
+            return False, None
+        data = self.frames.pop(0)
+        return True, np.frombuffer(data, dtype=np.uint8).reshape(1, -1)
+
+
+def _camera(frames, rotation=None):
+    cam = OpenCVCameraCached.__new__(OpenCVCameraCached)
+    cam.config = types.SimpleNamespace(
+        compressed_passthrough=True, lazy_postprocess=False, consumer_fps=None
+    )
+    cam.fps = 30
+    cam.output = None
+    cam.rotation = rotation
+    cam.thread = types.SimpleNamespace(is_alive=lambda: True)
+    cam.stop_event = threading.Event()
+    cam.frame_lock = threading.Lock()
+    cam.new_frame_event = threading.Event()
+    cam.latest_frame = None
+    cam.latest_timestamp = None
+    cam.ready = False
+    cam.latest_frame_time = 0.0
+    cam.auto_exposure = None
+    cam.decodes = 0
+
+    def postprocess(image):
+        cam.decodes += 1
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    cam._postprocess_image = postprocess
+    cam.videocapture = _MjpegCapture(cam, frames)
+    return cam
+
+
+def _run_read_loop(cam) -> None:
+    def read():
+        ok, frame = cam.videocapture.read()
+        if not ok:
+            raise sys.modules["lerobot.utils.errors"].DeviceNotConnectedError()
+        return frame
+
+    cam._read_from_hardware = read
+    cam._read_loop()
+
+
+class TestEncodedFrame(unittest.TestCase):
+    def test_concurrent_consumers_decode_once(self):
+        calls = []
+        encoded = EncodedFrame(_jpeg(100))
+
+        def postprocess(image):
+            calls.append(1)
+            return image
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(encoded.decode(postprocess)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertIsInstance(results[0], JpegFrame)
+        self.assertEqual(results[0].jpeg, encoded.data)
+
+    def test_derived_arrays_and_rotated_frames_drop_the_jpeg(self):
+        frame = EncodedFrame(_jpeg(100)).decode(lambda image: image)
+        self.assertIsNone(frame[:, : W // 2].jpeg)
+        self.assertIsNone(frame.copy().jpeg)
+        rotated = EncodedFrame(_jpeg(100)).decode(lambda image: image, keep_jpeg=False)
+        self.assertIsNone(rotated.jpeg)
+
+
+class TestPassthroughCamera(unittest.TestCase):
+    def test_only_consumed_frames_are_decoded(self):
+        frames = [_jpeg(v) for v in (10, 60, 110, 160, 210)]
+        cam = _camera(frames)
+        _run_read_loop(cam)
+
+        self.assertEqual(cam.decodes, 0)
+        self.assertIsInstance(cam.latest_frame, EncodedFrame)
+
+        first = cam.async_read(timeout_ms=200)
+        second = cam.async_read(timeout_ms=200)
+        self.assertEqual(cam.decodes, 1)
+        self.assertIs(first, second)
+        self.assertEqual(first.shape, (H, W, 3))
+        self.assertAlmostEqual(float(first.mean()), 210, delta=3)
+        self.assertEqual(first.jpeg, frames[-1])
+
+    def test_rotated_camera_does_not_expose_jpeg(self):
+        cam = _camera([_jpeg(90)], rotation=cv2.ROTATE_180)
+        _run_read_loop(cam)
+        self.assertIsNone(cam.async_read(timeout_ms=200).jpeg)
+
+    def test_auto_exposure_reads_reduced_preview_without_full_decode(self):
+        cam = _camera([_jpeg(40)])
+        cam.auto_exposure = CameraAutoExposure(
+            device="/dev/video0",
+            exposure=50,
+            target=100,
+            deadband=5,
+            speed=0.5,
+            min_exposure=5,
+            max_exposure=200,
+            period_s=0.5,
+        )
+        with patch("utils.camera_auto_exposure._set_exposure") as set_exposure:
+            _run_read_loop(cam)
+
+        self.assertEqual(cam.decodes, 0)
+        set_exposure.assert_called_once()
+        self.assertGreater(cam.auto_exposure.exposure, 50)
+
+
+class TestTrajectoryJpegReuse(unittest.TestCase):
+    def test_saved_jpeg_is_the_camera_bytes(self):
+        data = _jpeg(120)
+        frame = EncodedFrame(data).decode(lambda image: image)
+        plain = np.full((H, W, 3), 30, dtype=np.uint8)
+        traj = [{"left_joint_1.pos": 0.0, "cams": {"wrist": frame, "top": plain}}]
+
+        with tempfile.TemporaryDirectory() as tmp, patch.object(
+            teleop_data, "TRAJECTORIES_DIR", Path(tmp)
+        ):
+            ep_dir = teleop_data.save_trajectory(traj, "task", logging.getLogger(__name__))
+            self.assertEqual((ep_dir / "wrist" / "000000.jpg").read_bytes(), data)
+            top = cv2.imread(str(ep_dir / "top" / "000000.jpg"))
+            self.assertAlmostEqual(float(top.mean()), 30, delta=3)
+
+    def test_passthrough_and_decoded_frames_save_the_same_colours(self):
+        bgr = np.zeros((H, W, 3), dtype=np.uint8)
+        bgr[..., 2] = 200  # red
+        data = cv2.imencode(".jpg", bgr)[1].tobytes()
+        passthrough = EncodedFrame(data).decode(
+            lambda image: cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        )
+        decoded = np.array(passthrough)
+        traj = [{"left_joint_1.pos": 0.0, "cams": {"wrist": passthrough, "top": decoded}}]
+
+        with tempfile.TemporaryDirectory() as tmp, patch.object(
+            teleop_data, "TRAJECTORIES_DIR", Path(tmp)
+        ):
+            ep_dir = teleop_data.save_trajectory(traj, "task", logging.getLogger(__name__))
+            wrist = cv2.imread(str(ep_dir / "wrist" / "000000.jpg")).astype(int)
+            top = cv2.imread(str(ep_dir / "top" / "000000.jpg")).astype(int)
+        self.assertLessEqual(int(np.abs(wrist - top).max()), 3)
+        self.assertGreater(float(top[..., 2].mean()), 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
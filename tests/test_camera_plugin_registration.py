@@ -0,0 +1,155 @@
+"""Camera config registration must not import camera SDKs.
+
+Runs in a subprocess against a minimal on-disk `lerobot` package whose
+`cameras.opencv` / `cameras.realsense` package __init__ files import the SDKs,
+mirroring upstream lerobot.
+"""
+
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+_FAKE_LEROBOT = {
+    "lerobot/__init__.py": "",
+    "lerobot/utils/__init__.py": "",
+    "lerobot/utils/errors.py": """
+        class DeviceNotConnectedError(Exception):
+            pass
+
+        class DeviceAlreadyConnectedError(Exception):
+            pass
+    """,
+    "lerobot/cameras/__init__.py": """
+        from .configs import CameraConfig, ColorMode, Cv2Rotation
+    """,
+    "lerobot/cameras/configs.py": """
+        from dataclasses import dataclass
+        from enum import Enum
+
+        REGISTRY = {}
+
+        class ColorMode(str, Enum):
+            RGB = "rgb"
+            BGR = "bgr"
+
+        class Cv2Rotation(int, Enum):
+            NO_ROTATION = 0
+            ROTATE_180 = 180
+
+        @dataclass
+        class CameraConfig:
+            fps: int | None = None
+            width: int | None = None
+            height: int | None = None
+
+            @classmethod
+            def register_subclass(cls, name):
+                def decorator(subclass):
+                    if name in REGISTRY:
+                        raise ValueError(f"{name} registered twice")
+                    REGISTRY[name] = subclass
+                    return subclass
+
+                return decorator
+    """,
+    "lerobot/cameras/opencv/__init__.py": """
+        import cv2
+        from .configuration_opencv import OpenCVCameraConfig
+    """,
+    "lerobot/cameras/opencv/configuration_opencv.py": """
+        from dataclasses import dataclass
+
+        from ..configs import CameraConfig
+
+        @CameraConfig.register_subclass("opencv")
+        @dataclass
+        class OpenCVCameraConfig(CameraConfig):
+            index_or_path: str = ""
+    """,
+    "lerobot/cameras/realsense/__init__.py": """
+        import pyrealsense2
+        from .configuration_realsense import RealSenseCameraConfig
+    """,
+    "lerobot/cameras/realsense/configuration_realsense.py": """
+        from dataclasses import dataclass
+
+        from ..configs import CameraConfig
+
+        @CameraConfig.register_subclass("intelrealsense")
+        @dataclass
+        class RealSenseCameraConfig(CameraConfig):
+            serial_number_or_name: str = ""
+    """,
+}
+
+_CHECK = """
+import importlib.abc
+import importlib.machinery
+import sys
+
+SDKS = ("cv2", "pyrealsense2", "pyzed")
+requested = []
+
+
+class _RecordSdkImports(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    # Serve every SDK import as an empty module and record it.
+
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] not in SDKS:
+            return None
+        requested.append(name)
+        return importlib.machinery.ModuleSpec(name, self)
+
+    def exec_module(self, module):
+        pass
+
+
+sys.meta_path.insert(0, _RecordSdkImports())
+
+import lerobot_camera_cached
+import lerobot_camera_zed
+from lerobot.cameras.configs import REGISTRY
+
+assert {"opencv-cached", "v4l2-cached", "subprocess", "intelrealsense-cached", "zed"} <= set(
+    REGISTRY
+), REGISTRY
+assert not requested, f"SDKs imported during registration: {requested}"
+
+# The full lerobot packages still import cleanly afterwards, without re-registering.
+import lerobot.cameras.opencv
+import lerobot.cameras.realsense
+
+assert lerobot.cameras.realsense.RealSenseCameraConfig is (
+    lerobot_camera_cached.RealSenseCameraCachedConfig.__mro__[1]
+)
+assert "pyrealsense2" in requested
+print("ok")
+"""
+
+
+class TestCameraPluginRegistration(unittest.TestCase):
+    def test_registration_does_not_import_camera_sdks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for rel, body in _FAKE_LEROBOT.items():
+                path = Path(tmp) / rel
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(textwrap.dedent(body))
+
+            result = subprocess.run(
+                [sys.executable, "-c", _CHECK],
+                capture_output=True,
+                text=True,
+                env={"PYTHONPATH": f"{tmp}:{SRC}"},
+            )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,17 +6,21 @@ it on synthetic pairs where the ground truth is known by construction
 """
 from __future__ import annotations
 import sys
+import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import cv2
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from utils.camera_pose import (
+from utils import camera_pose, disk_cache  # noqa: E402
+from utils.camera_pose import (  # noqa: E402
     DRIFT_MULTIPLIER,
     TOL_TY_PX,
+    PoseReference,
     evaluate_pose,
     measure_pose_topband,
     top_band_mask,
@@ -114,5 +118,63 @@ class TestEvaluatePose(unittest.TestCase):
         self.assertIn("obstructed", msg)
 
 
+class TestPoseReference(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = Path(tmp.name)
+        self.ref = _reference_image()
+        self.mask = top_band_mask(self.ref.shape[0], self.ref.shape[1])
+
+    def _assert_same_pose(self, live: np.ndarray, reference: PoseReference) -> None:
+        cv2.setRNGSeed(0)
+        expected = measure_pose_topband(live, self.ref, self.mask)
+        cv2.setRNGSeed(0)
+        self.assertEqual(reference.measure(live), expected)
+
+    def test_matches_measure_pose_topband(self) -> None:
+        reference = PoseReference(self.ref, cache_dir=self.cache_dir)
+        for live in (self.ref, _warp(self.ref, rot_deg=2.0), _warp(self.ref, tx=-7.0, ty=3.0)):
+            self._assert_same_pose(live, reference)
+        self.assertTrue(reference.measure(np.zeros_like(self.ref)).low_conf)
+
+    def test_features_are_reused_from_disk(self) -> None:
+        PoseReference(self.ref, cache_dir=self.cache_dir)
+        self.assertEqual(len(list(self.cache_dir.glob("*.npz"))), 1)
+
+        with patch.object(camera_pose, "_orb_features", side_effect=AssertionError):
+            cached = PoseReference(self.ref, cache_dir=self.cache_dir)
+        self._assert_same_pose(_warp(self.ref, ty=5.0), cached)
+
+        # A different reference image gets its own entry.
+        other = PoseReference(_warp(self.ref, tx=1.0), cache_dir=self.cache_dir)
+        self.assertNotEqual(other.key, cached.key)
+        self.assertEqual(len(list(self.cache_dir.glob("*.npz"))), 2)
+
+    def test_unreadable_cache_is_recomputed(self) -> None:
+        reference = PoseReference(self.ref, cache_dir=self.cache_dir)
+        valid = reference.cache_path.read_bytes()
+        for contents in (b"not an npz", b"", valid[:100]):
+            reference.cache_path.write_bytes(contents)
+            with self.assertLogs(disk_cache.logger, "WARNING"):
+                rebuilt = PoseReference(self.ref, cache_dir=self.cache_dir)
+            np.testing.assert_array_equal(rebuilt.points, reference.points)
+        self._assert_same_pose(self.ref, PoseReference(self.ref, cache_dir=self.cache_dir))
+
+    def test_featureless_reference_round_trips(self) -> None:
+        black = np.zeros_like(self.ref)
+        PoseReference(black, cache_dir=self.cache_dir)
+        cached = PoseReference(black, cache_dir=self.cache_dir)
+        self.assertIsNone(cached.descriptors)
+        self.assertTrue(cached.measure(self.ref).low_conf)
+
+    def test_evaluate_pose_accepts_a_reference(self) -> None:
+        warped = _warp(self.ref, rot_deg=5.0)
+        cv2.setRNGSeed(0)
+        expected = evaluate_pose(warped, self.ref)
+        cv2.setRNGSeed(0)
+        self.assertEqual(evaluate_pose(warped, PoseReference(self.ref, cache_dir=None)), expected)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,166 @@
+"""CAN link parsing from netlink payloads and sysfs, conditional reset, and the session monitor."""
+
+import logging
+import struct
+import sys
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from utils import can_health
+from utils.can_health import (
+    CanHealthMonitor,
+    CanLinkStatus,
+    parse_link_message,
+    read_link,
+    reset_unhealthy_links,
+    sysfs_link,
+)
+
+
+def _attr(kind: int, payload: bytes) -> bytes:
+    data = struct.pack("=HH", 4 + len(payload), kind) + payload
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _can_payload(up=True, state=0, bitrate=1_000_000, berr=(0, 0), xstats=(0,) * 6, errors=0):
+    info_data = (
+        _attr(1, struct.pack("=8I", bitrate, 875, 0, 0, 0, 0, 0, 0))
+        + _attr(4, struct.pack("=I", state))
+        + _attr(8, struct.pack("=HH", *berr))
+    )
+    linkinfo = (
+        _attr(1, b"can\0")
+        + _attr(0x8000 | 2, info_data)  # nested
+        + _attr(3, struct.pack("=6I", *xstats))
+    )
+    stats64 = struct.pack("=23Q", 10, 20, 0, 0, errors, 0, 1, 0, *([0] * 15))
+    return (
+        struct.pack("=BxHiII", 0, 280, 7, 0x1 if up else 0, 0)
+        + _attr(16, bytes([0]))
+        + _attr(23, stats64)
+        + _attr(18, linkinfo)
+    )
+
+
+class TestParseLinkMessage(unittest.TestCase):
+    def test_can_state_counters_and_bitrate(self):
+        status = parse_link_message(
+            "can0",
+            _can_payload(state=2, berr=(130, 7), xstats=(40, 3, 2, 1, 0, 1), errors=5),
+        )
+        self.assertTrue(status.up)
+        self.assertEqual(status.state, "ERROR-PASSIVE")
+        self.assertEqual(status.bitrate, 1_000_000)
+        self.assertEqual((status.tx_error_counter, status.rx_error_counter), (130, 7))
+        self.assertEqual((status.bus_errors, status.bus_off, status.restarts), (40, 1, 1))
+        self.assertEqual((status.rx_errors, status.rx_dropped), (5, 1))
+        self.assertTrue(status.degraded)
+        self.assertIsNone(status.problem(1_000_000))
+        self.assertIn("tec 130 rec 7", status.summary())
+
+    def test_problems(self):
+        self.assertEqual(parse_link_message("can0", _can_payload(up=False)).problem(), "down")
+        self.assertEqual(parse_link_message("can0", _can_payload(state=3)).problem(), "bus-off")
+        self.assertEqual(
+            parse_link_message("can0", _can_payload(bitrate=500_000)).problem(1_000_000),
+            "bitrate 500000",
+        )
+        self.assertEqual(CanLinkStatus("can9", present=False).problem(), "missing")
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "rtnetlink is Linux-only")
+    def test_real_netlink_query(self):
+        status = read_link("lo")
+        self.assertTrue(status.present and status.up)
+        self.assertIsNone(status.state)
+        self.assertFalse(read_link("no-such-can").present)
+
+
+class TestSysfsLink(unittest.TestCase):
+    def test_reads_flags_and_statistics(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "can0"
+            (root / "statistics").mkdir(parents=True)
+            (root / "flags").write_text("0x40081\n")
+            (root / "operstate").write_text("unknown\n")
+            for name, value in (("rx_errors", 3), ("tx_errors", 0), ("rx_dropped", 1)):
+                (root / "statistics" / name).write_text(f"{value}\n")
+
+            status = sysfs_link("can0", Path(tmp))
+            self.assertEqual((status.up, status.rx_errors, status.rx_dropped), (True, 3, 1))
+            self.assertEqual(status.source, "sysfs")
+            self.assertFalse(sysfs_link("can1", Path(tmp)).present)
+
+
+def _healthy(iface):
+    return CanLinkStatus(iface, present=True, up=True, state="ERROR-ACTIVE", bitrate=1_000_000)
+
+
+class TestResetUnhealthyLinks(unittest.TestCase):
+    def _reset(self, links):
+        commands = []
+        problems = reset_unhealthy_links(
+            list(links), read=lambda iface: links[iface], run=commands.append
+        )
+        return problems, commands
+
+    def test_healthy_links_are_left_alone(self):
+        problems, commands = self._reset({"can0": _healthy("can0"), "can1": _healthy("can1")})
+        self.assertEqual((problems, commands), ({}, []))
+
+    def test_only_the_bus_off_link_is_bounced(self):
+        links = {"can0": _healthy("can0"), "can1": replace(_healthy("can1"), state="BUS-OFF")}
+        problems, commands = self._reset(links)
+        self.assertEqual(problems, {"can1": "bus-off"})
+        self.assertEqual(commands, [
+            ["sudo", "ip", "link", "set", "can1", "down"],
+            ["sudo", "ip", "link", "set", "can1", "up", "type", "can", "bitrate", "1000000"],
+        ])
+
+    def test_missing_link_falls_back_to_the_full_reset_script(self):
+        problems, commands = self._reset(
+            {"can0": _healthy("can0"), "can1": CanLinkStatus("can1", present=False)}
+        )
+        self.assertEqual(problems, {"can1": "missing"})
+        self.assertEqual(commands, [["bash", str(can_health.RESET_ALL_CAN_SCRIPT)]])
+
+
+class TestCanHealthMonitor(unittest.TestCase):
+    def test_degradation_is_logged_and_counted(self):
+        links = {"can0": _healthy("can0")}
+        monitor = CanHealthMonitor(["can0"], read=lambda iface: links[iface])
+        monitor.poll()
+
+        links["can0"] = replace(_healthy("can0"), state="BUS-OFF", bus_off=1, rx_errors=4)
+        with self.assertLogs(can_health.logger, logging.WARNING) as logs:
+            monitor.poll()
+        self.assertIn("ERROR-ACTIVE -> BUS-OFF", logs.output[0])
+        self.assertIn("4 new frame errors", logs.output[0])
+
+        metrics = monitor.metrics()
+        self.assertEqual(metrics["warnings"], 1)
+        self.assertEqual(metrics["links"]["can0"]["problem"], "bus-off")
+        self.assertEqual(metrics["links"]["can0"]["new_rx_errors"], 4)
+
+    def test_thread_polls_until_stopped(self):
+        reads = []
+
+        def read(iface):
+            reads.append(iface)
+            return _healthy(iface)
+
+        monitor = CanHealthMonitor(["can0", "can1"], interval_s=0.01, read=read)
+        monitor.start()
+        deadline = time.monotonic() + 2.0
+        while len(reads) < 6 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        monitor.stop()
+        count = len(reads)
+        self.assertFalse(monitor._thread.is_alive())
+        self.assertEqual(len(reads), count)
+
+
+if __name__ == "__main__":
+    unittest.main()
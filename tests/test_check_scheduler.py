@@ -0,0 +1,141 @@
+"""Concurrent setup checks: dependencies, timeouts, cached passes and the timing report."""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from utils.check_scheduler import Check, HealthCache, run_checks, timing_report
+
+
+class TestRunChecks(unittest.TestCase):
+    def test_independent_checks_overlap(self):
+        barrier = threading.Barrier(3, timeout=2.0)
+        checks = [Check(f"device{i}", lambda i=i: (barrier.wait(), i)[1]) for i in range(3)]
+
+        start = time.perf_counter()
+        results = run_checks(checks)
+
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual([r.status for r in results], ["ok"] * 3)
+        self.assertEqual([r.value for r in results], [0, 1, 2])
+
+    def test_dependents_get_values_and_are_skipped_after_failures(self):
+        def broken():
+            raise RuntimeError("no frames\nsecond line")
+
+        checks = [
+            Check("pose", lambda burst: sum(burst), after=("capture",)),
+            Check("capture", lambda: [1, 2, 3]),
+            Check("wrist", broken),
+            Check("wrist_pose", lambda frame: frame, after=("wrist",)),
+        ]
+        reported = []
+        results = {r.name: r for r in run_checks(checks, on_result=reported.append)}
+
+        self.assertEqual(results["pose"].value, 6)
+        self.assertEqual(results["wrist"].status, "failed")
+        self.assertIsInstance(results["wrist"].error, RuntimeError)
+        self.assertEqual(results["wrist_pose"].status, "skipped")
+        self.assertEqual(len(reported), 4)
+        self.assertLess(reported.index(results["capture"]), reported.index(results["pose"]))
+
+    def test_slow_check_times_out_without_holding_up_the_rest(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        checks = [
+            Check("hung", lambda: release.wait(5.0), timeout_s=0.1),
+            Check("fast", lambda: "ok"),
+        ]
+
+        start = time.perf_counter()
+        hung, fast = run_checks(checks)
+
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual((hung.status, fast.status), ("timeout", "ok"))
+        self.assertIsInstance(hung.error, TimeoutError)
+
+    def test_timed_out_check_is_abandoned_until_its_thread_returns(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        hung, fast = run_checks([
+            Check("hung", lambda: release.wait(5.0), timeout_s=0.1),
+            Check("fast", lambda: "ok"),
+        ])
+
+        self.assertTrue(hung.abandoned)
+        self.assertFalse(fast.abandoned)
+        release.set()
+        hung.thread.join(1.0)
+        self.assertFalse(hung.abandoned)
+
+    def test_unknown_dependency_and_cycles(self):
+        with self.assertRaises(ValueError):
+            run_checks([Check("a", lambda: None, after=("missing",))])
+        results = run_checks([
+            Check("a", lambda _: None, after=("b",)),
+            Check("b", lambda _: None, after=("a",)),
+        ])
+        self.assertEqual([r.status for r in results], ["skipped", "skipped"])
+
+
+class TestHealthCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "checks.json"
+
+    def test_recent_pass_is_reused_while_the_fingerprint_matches(self):
+        calls = []
+        fingerprint = {"value": "dev-A"}
+        checks = [
+            Check("camera", lambda: calls.append(1), fingerprint=lambda: fingerprint["value"]),
+            Check("leader", lambda: calls.append(2)),
+        ]
+
+        cache = HealthCache(self.path)
+        self.assertEqual([r.status for r in run_checks(checks, cache)], ["ok", "ok"])
+        cache.save()
+
+        results = run_checks(checks, HealthCache(self.path))
+        self.assertEqual([r.status for r in results], ["cached", "ok"])
+        self.assertEqual(calls, [1, 2, 2])
+
+        fingerprint["value"] = "dev-B"  # replugged
+        self.assertEqual(run_checks(checks, HealthCache(self.path))[0].status, "ok")
+        self.assertEqual(run_checks(checks, HealthCache(self.path, max_age_s=-1))[0].status, "ok")
+
+    def test_failure_forgets_the_cached_pass(self):
+        cache = HealthCache(self.path)
+        run_checks([Check("camera", lambda: None, fingerprint=lambda: "dev")], cache)
+
+        def broken():
+            raise RuntimeError("unplugged")
+
+        cache.entries["camera"]["passed_at"] = 0.0  # expired, so the check runs
+        run_checks([Check("camera", broken, fingerprint=lambda: "dev")], cache)
+        self.assertNotIn("camera", cache.entries)
+
+    def test_unreadable_cache_is_ignored(self):
+        self.path.write_text("{not json")
+        self.assertEqual(HealthCache(self.path).entries, {})
+        self.path.write_text(json.dumps({"version": 0, "checks": {"camera": {}}}))
+        self.assertEqual(HealthCache(self.path).entries, {})
+
+
+class TestTimingReport(unittest.TestCase):
+    def test_report_is_json_and_names_the_critical_path(self):
+        results = run_checks([
+            Check("quick", lambda: None),
+            Check("slow", lambda: time.sleep(0.05)),
+        ])
+        report = json.loads(json.dumps(timing_report(results, wall_s=0.05)))
+        self.assertEqual(report["critical_path"], "slow")
+        self.assertEqual([c["name"] for c in report["checks"]], ["quick", "slow"])
+        self.assertGreaterEqual(report["serial_s"], 0.05 - 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
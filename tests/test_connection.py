@@ -0,0 +1,73 @@
+"""Finding and killing the holders of TCP ports and device paths through /proc."""
+
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from utils.connection import _pids_using, free_resources, pids_holding
+
+_HOLD_PORT = """
+import socket, sys, time
+s = socket.socket()
+s.bind(("127.0.0.1", 0))
+s.listen()
+print(s.getsockname()[1], flush=True)
+time.sleep(60)
+"""
+
+_HOLD_FILE = """
+import sys, time
+f = open(sys.argv[1])
+print("open", flush=True)
+time.sleep(60)
+"""
+
+
+@unittest.skipUnless(Path("/proc/self/fd").is_dir(), "needs /proc")
+class TestReclaim(unittest.TestCase):
+    def _spawn(self, code, *args):
+        proc = subprocess.Popen(
+            [sys.executable, "-c", code, *args], stdout=subprocess.PIPE, text=True
+        )
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.kill)
+        return proc, proc.stdout.readline().strip()
+
+    def test_holders_of_ports_and_paths_in_one_pass(self):
+        port_holder, port = self._spawn(_HOLD_PORT)
+        with tempfile.TemporaryDirectory() as tmp:
+            device = Path(tmp) / "ttyUSB0"
+            device.touch()
+            link = Path(tmp) / "usb-leader"
+            link.symlink_to(device)
+            file_holder, _ = self._spawn(_HOLD_FILE, str(device))
+
+            holders = pids_holding([int(port), str(link)])
+            self.assertEqual(holders, {int(port): [port_holder.pid], str(link): [file_holder.pid]})
+            self.assertEqual(_pids_using(f"{port}/tcp"), [port_holder.pid])
+
+    def test_free_resources_kills_and_waits_for_release(self):
+        holder, port = self._spawn(_HOLD_PORT)
+
+        start = time.perf_counter()
+        killed = free_resources(int(port), "/nonexistent/device")
+
+        self.assertLess(time.perf_counter() - start, 0.3)  # no fixed sleep
+        self.assertEqual(killed, {int(port): [holder.pid], "/nonexistent/device": []})
+        self.assertEqual(holder.wait(timeout=2.0), -9)
+        self.assertEqual(pids_holding([int(port)]), {int(port): []})
+
+    def test_own_process_is_never_killed(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            s.listen()
+            port = s.getsockname()[1]
+            self.assertEqual(free_resources(port), {port: []})
+
+
+if __name__ == "__main__":
+    unittest.main()
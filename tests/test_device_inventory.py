@@ -0,0 +1,148 @@
+"""DeviceInventory against a fake /dev, udev database and sysfs in a temp dir."""
+
+import os
+import subprocess
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from utils import device_inventory
+from utils.device_inventory import (
+    DeviceInventory,
+    camera_signature,
+    is_capture_device,
+    match_signatures,
+)
+
+
+class _FakeInventory(DeviceInventory):
+    """Regular files stand in for device nodes; video<N> is char device 81:<N>."""
+
+    def __init__(self, root: Path):
+        super().__init__(root / "dev", root / "run/udev/data", root / "sys/dev/char")
+        self.reads = 0
+
+    def _stat(self, path):
+        st = os.stat(path)
+        minor = int(Path(path).name.removeprefix("video"))
+        return types.SimpleNamespace(
+            st_rdev=os.makedev(81, minor), st_ino=st.st_ino, st_ctime_ns=st.st_ctime_ns
+        )
+
+    def _read(self, path, st):
+        self.reads += 1
+        return super()._read(path, st)
+
+
+class TestDeviceInventory(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for d in ("dev/v4l/by-id", "run/udev/data", "sys/class/video4linux", "sys/dev/char"):
+            (self.root / d).mkdir(parents=True)
+        self.inventory = _FakeInventory(self.root)
+
+    def _add_camera(self, minor, serial, capture=True):
+        node = self.root / "dev" / f"video{minor}"
+        node.touch()
+        (self.root / "dev/v4l/by-id" / f"usb-{serial}-video-index0").symlink_to(node)
+        (self.root / "run/udev/data" / f"c81:{minor}").write_text(
+            f"S:v4l/by-id/usb-{serial}-video-index0\n"
+            "I:123456\n"
+            f"E:ID_SERIAL=Cam_{serial}\n"
+            f"E:ID_SERIAL_SHORT={serial}\n"
+            f"E:ID_PATH=pci-0000:00:14.0-usb-0:{minor}:1.0\n"
+            f"E:ID_V4L_CAPABILITIES={':capture:' if capture else ':'}\n"
+            "G:uaccess\n"
+        )
+        sys_dev = self.root / "sys/class/video4linux" / f"video{minor}"
+        sys_dev.mkdir()
+        (sys_dev / "uevent").write_text(f"MAJOR=81\nMINOR={minor}\nDEVNAME=video{minor}\n")
+        (sys_dev / "subsystem").symlink_to(self.root / "sys/class/video4linux")
+        (self.root / "sys/dev/char" / f"81:{minor}").symlink_to(sys_dev)
+        return node
+
+    def test_properties_come_from_the_udev_db_and_sysfs(self):
+        node = self._add_camera(0, "AAA")
+        properties = self.inventory.properties(self.root / "dev/v4l/by-id/usb-AAA-video-index0")
+
+        self.assertEqual(properties["ID_SERIAL_SHORT"], "AAA")
+        self.assertEqual(properties["DEVNAME"], str(node))
+        self.assertEqual(properties["DEVPATH"], "/class/video4linux/video0")
+        self.assertEqual(properties["SUBSYSTEM"], "video4linux")
+        self.assertEqual(
+            properties["DEVLINKS"], str(self.root / "dev/v4l/by-id/usb-AAA-video-index0")
+        )
+        self.assertEqual(camera_signature(properties), {
+            "ID_SERIAL_SHORT": "AAA",
+            "ID_SERIAL": "Cam_AAA",
+            "ID_PATH": "pci-0000:00:14.0-usb-0:0:1.0",
+        })
+
+    def test_rescan_is_cached_until_the_node_or_db_changes(self):
+        self._add_camera(0, "AAA")
+        node = self._add_camera(1, "BBB")
+        self.assertEqual(len(self.inventory.video_devices()), 2)
+        self.assertEqual(self.inventory.reads, 2)
+
+        self.inventory.video_devices()
+        self.assertEqual(self.inventory.reads, 2)
+
+        # Replugged: the node is recreated with a new inode.
+        node.unlink()
+        node.touch()
+        db = self.root / "run/udev/data/c81:1"
+        db.write_text(db.read_text().replace("BBB", "CCC"))
+        devices = self.inventory.video_devices()
+        self.assertEqual(self.inventory.reads, 3)
+        self.assertEqual(devices[str(node)]["ID_SERIAL_SHORT"], "CCC")
+
+    def test_nodes_without_a_db_entry_fall_back_to_udevadm(self):
+        self._add_camera(0, "AAA")
+        (self.root / "dev/video1").touch()
+        (self.root / "dev/video2").touch()
+
+        def udevadm(args, **kwargs):
+            if args[-1].endswith("video2"):
+                raise subprocess.CalledProcessError(1, args)
+            return types.SimpleNamespace(stdout="ID_SERIAL_SHORT=FROMUDEVADM\nDEVNAME=x\n")
+
+        with patch.object(device_inventory.subprocess, "run", udevadm):
+            devices = self.inventory.video_devices()
+            with self.assertRaises(subprocess.CalledProcessError):
+                self.inventory.properties(self.root / "dev/video2")
+        self.assertEqual(
+            [d["ID_SERIAL_SHORT"] for d in devices.values()], ["AAA", "FROMUDEVADM"]
+        )
+
+    def test_missing_node_raises(self):
+        with self.assertRaises(OSError):
+            self.inventory.properties(self.root / "dev/video9")
+
+
+class TestSignatureMatching(unittest.TestCase):
+    def test_each_memoized_camera_needs_one_unused_match(self):
+        devices = {
+            "/dev/video0": {"ID_SERIAL_SHORT": "AAA"},
+            "/dev/video2": {"ID_SERIAL_SHORT": "BBB"},
+            "/dev/video4": {"ID_SERIAL_SHORT": "BBB"},
+        }
+        memo = {
+            "left_wrist": {"ID_SERIAL_SHORT": "AAA"},
+            "right_wrist": {"ID_SERIAL_SHORT": "BBB"},
+            "top": {},
+            "spare": {"ID_SERIAL_SHORT": "AAA"},
+        }
+        self.assertEqual(match_signatures(memo, devices), {"left_wrist": "/dev/video0"})
+
+    def test_metadata_nodes_are_not_capture_devices(self):
+        self.assertTrue(is_capture_device({"ID_V4L_CAPABILITIES": ":capture:"}))
+        self.assertFalse(is_capture_device({"ID_V4L_CAPABILITIES": ":"}))
+        self.assertTrue(is_capture_device({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from utils import disk_cache
+from utils.disk_cache import cache_key, read_cache, write_cache
+
+
+def _read_json(path: Path):
+    return json.loads(path.read_text())
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "sub" / "entry.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_leaves_only_the_entry(self):
+        write_cache(self.path, lambda f: f.write(b'{"a": 1}'), "test")
+        self.assertEqual(read_cache(self.path, _read_json, "test"), {"a": 1})
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_missing_entry_is_a_quiet_miss(self):
+        with self.assertNoLogs(disk_cache.logger):
+            self.assertIsNone(read_cache(self.path, _read_json, "test"))
+
+    def test_unreadable_entry_is_a_logged_miss(self):
+        self.path.parent.mkdir()
+        self.path.write_text("{trunc")
+        with self.assertLogs(disk_cache.logger, "WARNING"):
+            self.assertIsNone(read_cache(self.path, _read_json, "test"))
+
+    def test_failed_write_keeps_the_old_entry_and_no_temp_file(self):
+        write_cache(self.path, lambda f: f.write(b'{"a": 1}'), "test")
+
+        def dump(f):
+            f.write(b'{"a": ')
+            raise OSError("disk full")
+
+        with self.assertLogs(disk_cache.logger, "WARNING"):
+            write_cache(self.path, dump, "test")
+        self.assertEqual(read_cache(self.path, _read_json, "test"), {"a": 1})
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_concurrent_writers_never_share_a_temp_file(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow(f):
+            f.write(b'{"writer": ')
+            started.set()
+            release.wait(5)
+            f.write(b'"slow"}')
+
+        writer = threading.Thread(target=write_cache, args=(self.path, slow, "test"))
+        writer.start()
+        self.assertTrue(started.wait(5))
+        # The second writer finishes while the first is half-way through its file.
+        write_cache(self.path, lambda f: f.write(b'{"writer": "fast"}'), "test")
+        self.assertEqual(read_cache(self.path, _read_json, "test"), {"writer": "fast"})
+        release.set()
+        writer.join(5)
+
+        self.assertEqual(read_cache(self.path, _read_json, "test"), {"writer": "slow"})
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_key_depends_on_version_and_every_part(self):
+        key = cache_key(1, "fw", b"profile")
+        self.assertEqual(key, cache_key(1, "fw", b"profile"))
+        self.assertNotEqual(key, cache_key(2, "fw", b"profile"))
+        self.assertNotEqual(key, cache_key(1, "fwp", b"rofile"))
+
+
+if __name__ == "__main__":
+    unittest.main()
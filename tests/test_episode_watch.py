@@ -0,0 +1,226 @@
+"""EpisodeWatcher and frame sampling against generated mp4s in a temp dataset."""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from utils.episode_watch import (
+    EpisodeWatcher,
+    FrameAccumulator,
+    episode_label,
+    frame_count,
+    sample_mean,
+)
+
+CAMERA = "observation.images.topdown"
+
+
+def _frames(n: int, seed: int = 0) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    base = rng.integers(40, 200, size=(96, 128, 3), dtype=np.uint8)
+    return [np.roll(base, i, axis=1) for i in range(n)]
+
+
+def _write_mp4(path: Path, frames: list[np.ndarray]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30.0, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def _stacked_mean(frames: list[np.ndarray]) -> np.ndarray:
+    return np.mean(np.stack(frames).astype(np.float32), axis=0).astype(np.uint8)
+
+
+def _decode_all(path: Path) -> list[np.ndarray]:
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            return frames
+        frames.append(frame)
+
+
+class TestSampling(unittest.TestCase):
+    def test_accumulator_matches_stacked_mean(self):
+        frames = _frames(7)
+        acc = FrameAccumulator()
+        for frame in frames:
+            acc.add(frame)
+        np.testing.assert_array_equal(acc.mean(), _stacked_mean(frames))
+        self.assertIsNone(FrameAccumulator().mean())
+
+    def test_sample_mean_first_frames_and_stride(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "episode_000000.mp4"
+            _write_mp4(path, _frames(40))
+            decoded = _decode_all(path)
+
+            mean, n = sample_mean(path, n_frames=30)
+            self.assertEqual(n, 30)
+            np.testing.assert_array_equal(mean, _stacked_mean(decoded[:30]))
+
+            mean, n = sample_mean(path, n_frames=10, stride=3)
+            self.assertEqual(n, 10)
+            np.testing.assert_array_equal(mean, _stacked_mean(decoded[0:30:3]))
+
+            # Short video: everything available, and the caller sees the count.
+            self.assertEqual(sample_mean(path, n_frames=100)[1], 40)
+            self.assertEqual(sample_mean(path, n_frames=5, keyframes=True)[1], 5)
+            self.assertIsNone(sample_mean(Path(tmp) / "missing.mp4"))
+
+    def test_sample_mean_from_start_frame(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "file-000.mp4"
+            _write_mp4(path, _frames(20) + _frames(20, seed=1))
+            decoded = _decode_all(path)
+
+            mean, n = sample_mean(path, n_frames=10, start_frame=20)
+            self.assertEqual(n, 10)
+            np.testing.assert_array_equal(mean, _stacked_mean(decoded[20:30]))
+            self.assertEqual(frame_count(path), 40)
+            self.assertEqual(frame_count(Path(tmp) / "missing.mp4"), 0)
+
+    def test_episode_labels(self):
+        self.assertEqual(episode_label(Path("chunk-000/cam/episode_000012.mp4")), "000012")
+        self.assertEqual(episode_label(Path("cam/chunk-001/file-003.mp4")), "chunk-001/file-003")
+        self.assertEqual(
+            episode_label(Path("cam/chunk-001/file-003.mp4"), 240), "chunk-001/file-003@240"
+        )
+
+
+class TestEpisodeWatcher(unittest.TestCase):
+    use_inotify = True
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.video_dir = self.root / "videos" / "chunk-000" / CAMERA
+
+    def _watcher(self, **kwargs):
+        watcher = EpisodeWatcher(
+            self.root, n_frames=10, rescan_s=60.0, settle_s=0.05, use_inotify=self.use_inotify,
+            **kwargs,
+        )
+        self.addCleanup(watcher.close)
+        return watcher
+
+    def _poll_until(self, watcher, count, timeout_s=3.0):
+        samples, deadline = [], time.monotonic() + timeout_s
+        while len(samples) < count and time.monotonic() < deadline:
+            samples += watcher.poll(timeout_s=0.05)
+        return samples
+
+    def test_existing_and_new_episodes_are_published_once(self):
+        _write_mp4(self.video_dir / "episode_000000.mp4", _frames(12))
+        _write_mp4(self.root / "videos/chunk-000/observation.images.wrist/episode_000000.mp4",
+                   _frames(12))
+        watcher = self._watcher()
+        received = []
+        watcher.subscribe(received.append)
+
+        self.assertEqual([s.episode for s in self._poll_until(watcher, 1)], ["000000"])
+
+        # Written after the watcher started, in place.
+        _write_mp4(self.video_dir / "episode_000001.mp4", _frames(12, seed=1))
+        # Encoded elsewhere and moved in.
+        staged = self.root / "staging.mp4"
+        _write_mp4(staged, _frames(12, seed=2))
+        os.replace(staged, self.video_dir / "episode_000002.mp4")
+
+        samples = self._poll_until(watcher, 2)
+        self.assertEqual(sorted(s.episode for s in samples), ["000001", "000002"])
+        self.assertEqual([s.episode for s in received], ["000000", "000001", "000002"])
+        self.assertEqual(watcher.latest.n_frames, 10)
+        self.assertEqual(watcher.poll(timeout_s=0.05), [])
+
+    def test_videos_dir_created_later(self):
+        watcher = self._watcher()
+        self.assertEqual(watcher.poll(timeout_s=0.01), [])
+
+        _write_mp4(self.root / "videos" / CAMERA / "chunk-000" / "file-000.mp4", _frames(12))
+        self.assertEqual(
+            [s.episode for s in self._poll_until(watcher, 1)], ["chunk-000/file-000"]
+        )
+
+    def test_appended_chunk_file_samples_the_new_episode(self):
+        path = self.root / "videos" / CAMERA / "chunk-000" / "file-000.mp4"
+        first, second = _frames(12), _frames(12, seed=1)
+        _write_mp4(path, first)
+        watcher = self._watcher()
+        self.assertEqual([s.episode for s in self._poll_until(watcher, 1)], ["chunk-000/file-000"])
+
+        # The dataset writer appends the next episode by rewriting the file.
+        staged = self.root / "staging.mp4"
+        _write_mp4(staged, first + second)
+        os.replace(staged, path)
+
+        (sample,) = self._poll_until(watcher, 1)
+        self.assertEqual(sample.episode, "chunk-000/file-000@12")
+        np.testing.assert_array_equal(sample.mean, _stacked_mean(_decode_all(path)[12:22]))
+
+    def test_chunk_file_present_at_start_only_reports_what_is_appended(self):
+        path = self.root / "videos" / CAMERA / "chunk-000" / "file-000.mp4"
+        _write_mp4(path, _frames(12))
+        watcher = self._watcher(include_existing=False)
+        self.assertEqual(watcher.poll(timeout_s=0.01), [])
+
+        staged = self.root / "staging.mp4"
+        _write_mp4(staged, _frames(12) + _frames(12, seed=1))
+        os.replace(staged, path)
+
+        self.assertEqual(
+            [s.episode for s in self._poll_until(watcher, 1)], ["chunk-000/file-000@12"]
+        )
+
+    def test_short_video_waits_until_rewritten(self):
+        watcher = self._watcher(include_existing=False)
+        path = self.video_dir / "episode_000000.mp4"
+        path.parent.mkdir(parents=True)
+        watcher.poll(timeout_s=0.01)
+
+        _write_mp4(path, _frames(4))
+        self.assertEqual(self._poll_until(watcher, 1, timeout_s=0.3), [])
+        _write_mp4(path, _frames(12))
+        self.assertEqual(len(self._poll_until(watcher, 1)), 1)
+
+    def test_run_stops_and_subscriber_errors_are_contained(self):
+        _write_mp4(self.video_dir / "episode_000000.mp4", _frames(12))
+        watcher = self._watcher()
+        seen = []
+
+        def broken(sample):
+            raise RuntimeError("consumer bug")
+
+        watcher.subscribe(broken)
+        watcher.subscribe(seen.append)
+        stop = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(stop.is_set, 0.02))
+        thread.start()
+        deadline = time.monotonic() + 3.0
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stop.set()
+        thread.join(timeout=2.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(seen), 1)
+
+
+class TestEpisodeWatcherPolling(TestEpisodeWatcher):
+    """Same behaviour when inotify is unavailable and the tree is rescanned."""
+
+    use_inotify = False
+
+
+if __name__ == "__main__":
+    unittest.main()
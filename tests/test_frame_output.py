@@ -0,0 +1,100 @@
+import types
+import unittest
+
+import cv2
+import numpy as np
+
+from utils.frame_output import FrameOutput, FullResFrame, output_hw
+
+
+def _gradient(height: int, width: int) -> np.ndarray:
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    image = np.repeat(x[None, :, None], height, axis=0).repeat(3, axis=2)
+    return image.astype(np.uint8)
+
+
+def _config(**overrides):
+    base = dict(
+        width=640,
+        height=480,
+        output_crop=None,
+        output_size=None,
+        output_interpolation="area",
+        output_keep_full=False,
+    )
+    base.update(overrides)
+    return types.SimpleNamespace(**base)
+
+
+class TestFrameOutput(unittest.TestCase):
+    def test_crop_then_resize_matches_cv2(self):
+        image = _gradient(480, 640)
+        output = FrameOutput(crop=(80, 0, 480, 480), size=(224, 224))
+        expected = cv2.resize(image[:, 80:560], (224, 224), interpolation=cv2.INTER_AREA)
+        np.testing.assert_array_equal(output.apply(image), expected)
+
+    def test_crop_only_copies_out_of_the_full_frame(self):
+        image = _gradient(48, 64)
+        frame = FrameOutput(crop=(8, 4, 16, 12)).apply(image)
+        self.assertEqual(frame.shape, (12, 16, 3))
+        self.assertFalse(np.shares_memory(frame, image))
+
+    def test_buffers_are_reused_only_once_released(self):
+        image = _gradient(48, 64)
+        output = FrameOutput(size=(16, 12))
+        first = output.apply(image)
+        second = output.apply(image)
+        self.assertFalse(np.shares_memory(first, second))
+
+        del second
+        third = output.apply(image)
+        self.assertEqual(len(output._pool.buffers), 2)
+        self.assertIs(third, output._pool.buffers[1])
+        self.assertFalse(np.shares_memory(third, first))
+
+    def test_pool_does_not_grow_past_its_size(self):
+        image = _gradient(48, 64)
+        output = FrameOutput(size=(16, 12), pool_size=2)
+        held = [output.apply(image) for _ in range(5)]
+        self.assertEqual(len(output._pool.buffers), 2)
+        for i, a in enumerate(held):
+            for b in held[i + 1 :]:
+                self.assertFalse(np.shares_memory(a, b))
+
+    def test_keep_full_exposes_the_full_frame(self):
+        image = _gradient(48, 64)
+        frame = FrameOutput(size=(16, 12), keep_full=True).apply(image)
+        self.assertIsInstance(frame, FullResFrame)
+        self.assertIs(frame.full, image)
+        self.assertIsNone(frame[:4].full)
+        self.assertIsNone(frame.copy().full)
+
+    def test_depth_is_resized_nearest_neighbour(self):
+        depth = np.zeros((4, 4), dtype=np.uint16)
+        depth[:, 2:] = 1000
+        output = FrameOutput.from_config(_config(output_size=(2, 2)), depth=True)
+        self.assertEqual(set(np.unique(output.apply(depth))), {0, 1000})
+
+    def test_crop_outside_the_frame_is_an_error(self):
+        with self.assertRaises(ValueError):
+            FrameOutput(crop=(600, 0, 100, 100)).apply(_gradient(480, 640))
+
+    def test_invalid_specs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            FrameOutput(crop=(0, 0, 10))
+        with self.assertRaises(ValueError):
+            FrameOutput(size=(0, 224))
+        with self.assertRaises(ValueError):
+            FrameOutput(size=(224, 224), interpolation="bilinear")
+
+    def test_output_hw(self):
+        self.assertEqual(output_hw(_config()), (480, 640))
+        self.assertEqual(output_hw(_config(output_crop=(0, 0, 320, 240))), (240, 320))
+        self.assertEqual(
+            output_hw(_config(output_crop=(0, 0, 320, 240), output_size=[224, 168])), (168, 224)
+        )
+        self.assertIsNone(FrameOutput.from_config(_config()))
+
+
+if __name__ == "__main__":
+    unittest.main()
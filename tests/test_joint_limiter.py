@@ -0,0 +1,154 @@
+"""Replay aggressive synthetic leader trajectories through JointLimiter.
+
+Every output tick must respect the step, velocity, acceleration, joint1 and
+ground limits, and the follower must keep moving (no frozen ticks) and catch
+up with the leader once it stops.
+"""
+
+import unittest
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
+from _fake_arm import FakeArm
+from lerobot_robot_yams.bi_follower import BiYamsFollower, BiYamsFollowerConfig
+from lerobot_robot_yams.forward_kinematics import SafetyStatus, check_action_batch
+from lerobot_robot_yams.joint_limiter import JointLimiter
+
+DT = 1 / 250
+GROUND_Z = -0.07
+EE_LENGTH = 0.15
+MAX_STEP = np.array([0.5, 0.35, 0.3, 0.3, 0.7, 0.7])
+MAX_VEL = np.array([3.0, 3.0, 3.0, 4.0, 6.0, 6.0])
+MAX_ACC = np.array([30.0, 30.0, 30.0, 40.0, 60.0, 60.0])
+TOL = 1e-9
+
+
+def _limiter() -> JointLimiter:
+    return JointLimiter(MAX_STEP, MAX_VEL, MAX_ACC, GROUND_Z, EE_LENGTH)
+
+
+def _replay(limiter: JointLimiter, leader: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    out = [limiter.clamp(leader[0], None)]
+    ground_limited = [False]
+    for target in leader[1:]:
+        out.append(limiter.clamp(target, DT))
+        ground_limited.append(limiter.ground_limited)
+    return np.array(out), np.array(ground_limited)
+
+
+class TestJointLimiterReplay(unittest.TestCase):
+    def assert_within_limits(self, follower: np.ndarray, ground_limited: np.ndarray) -> None:
+        vel = np.diff(follower, axis=0) / DT
+        acc = np.diff(vel, axis=0) / DT
+        self.assertTrue(np.all(np.abs(np.diff(follower, axis=0)) <= MAX_STEP + TOL))
+        self.assertTrue(np.all(np.abs(vel) <= MAX_VEL + TOL))
+        # Stopping at the ground may brake harder than max_joint_acc; acc[i]
+        # spans ticks i..i+2, so skip windows that touch a ground-limited tick.
+        touches_ground = ground_limited[1:-1] | ground_limited[2:]
+        self.assertTrue(np.all(np.abs(acc[~touches_ground]) <= MAX_ACC + 1e-6))
+        self.assertTrue(np.all(np.abs(follower[:, 0]) <= np.pi / 2 + TOL))
+        status = check_action_batch(follower, GROUND_Z, EE_LENGTH)
+        self.assertTrue(np.all(status == SafetyStatus.OK))
+
+    def test_teleporting_leader_is_followed_continuously(self):
+        leader = np.zeros((500, 6))
+        leader[10:] = [0.8, 0.6, 0.9, -0.5, 1.2, -1.2]
+        follower, ground_limited = _replay(_limiter(), leader)
+
+        self.assert_within_limits(follower, ground_limited)
+        caught_up = np.flatnonzero(np.all(np.abs(follower - leader[-1]) < 1e-9, axis=1))[0]
+        moving = np.abs(np.diff(follower[10:caught_up], axis=0)).max(axis=1)
+        self.assertTrue(np.all(moving > 0), "follower froze during catch-up")
+        self.assertLess(caught_up, 200)
+
+    def test_fast_oscillation_respects_rate_limits(self):
+        t = np.arange(1000)[:, None] * DT
+        leader = 0.6 * np.sin(2 * np.pi * 4.0 * t + np.arange(6)) * [1, 0.5, 0.5, 1, 1, 1]
+        leader[:, 2] += 0.8
+        follower, ground_limited = _replay(_limiter(), leader)
+
+        self.assert_within_limits(follower, ground_limited)
+
+    def test_noisy_leader_respects_rate_limits(self):
+        rng = np.random.default_rng(0)
+        leader = np.cumsum(rng.normal(0.0, 0.05, size=(1000, 6)), axis=0)
+        leader[:, 0] = np.clip(leader[:, 0], -2.0, 2.0)
+        leader[:, 1:4] = np.clip(leader[:, 1:4], 0.0, 1.2)
+        follower, ground_limited = _replay(_limiter(), leader)
+
+        self.assert_within_limits(follower, ground_limited)
+
+    def test_ground_plunge_stops_at_the_plane(self):
+        leader = np.zeros((400, 6))
+        leader[:, 2] = np.linspace(0.0, -1.5, 400)
+        follower, ground_limited = _replay(_limiter(), leader)
+
+        self.assertTrue(ground_limited.any())
+        status = check_action_batch(follower, GROUND_Z, EE_LENGTH)
+        self.assertTrue(np.all(status == SafetyStatus.OK))
+        deepest = follower[:, 2].min()
+        self.assertLess(deepest, -0.3)
+        near_miss = np.array([0, 0, deepest - 0.02, 0, 0, 0])
+        self.assertNotEqual(check_action_batch(near_miss, GROUND_Z, EE_LENGTH)[0], SafetyStatus.OK)
+
+    def test_first_unsafe_target_is_refused(self):
+        self.assertIsNone(_limiter().clamp(np.array([0, 0, -1.5, 0, 0, 0]), None))
+
+    def test_joint1_is_clipped_not_rejected(self):
+        q = _limiter().clamp(np.array([2.0, 0, 0, 0, 0, 0]), None)
+        self.assertAlmostEqual(q[0], np.pi / 2)
+
+    def test_hold_after_first_command_forgets_it(self):
+        limiter = _limiter()
+        limiter.clamp(np.full(6, 0.2), None)
+        limiter.hold()  # e.g. blocked by the self-collision check, never sent
+
+        self.assertIsNone(limiter.last_command)
+        q = limiter.clamp(np.zeros(6), DT)
+        np.testing.assert_array_equal(q, np.zeros(6))
+
+    def test_hold_after_reset_does_not_restore_older_commands(self):
+        limiter = _limiter()
+        limiter.clamp(np.zeros(6), None)
+        limiter.clamp(np.full(6, 0.01), DT)
+        limiter.reset()
+        limiter.clamp(np.full(6, 0.3), None)
+        limiter.hold()
+
+        self.assertIsNone(limiter.last_command)
+
+        limiter.clamp(np.full(6, 0.3), None)
+        limiter.clamp(np.full(6, 0.31), DT)
+        limiter.hold()
+        np.testing.assert_array_equal(limiter.last_command, np.full(6, 0.3))
+
+
+class TestBiFollowerClampMode(unittest.TestCase):
+    def test_fast_leader_motion_is_clamped_not_rejected(self):
+        follower = BiYamsFollower.__new__(BiYamsFollower)
+        follower.config = BiYamsFollowerConfig()
+        follower.left_arm = FakeArm()
+        follower.right_arm = FakeArm()
+        follower._last_action_time = None
+        follower._limiters = {side: _limiter() for side in ("left", "right")}
+        follower._workspace_sdf = None
+
+        def action(q):
+            names = follower.left_arm.config.joint_names
+            return {
+                f"{side}_{n}.pos": float(v)
+                for side in ("left", "right")
+                for n, v in zip(names, np.r_[q, 0.0])
+            }
+
+        follower.send_action(action(np.zeros(6)))
+        sent = follower.send_action(action(np.array([1.0, 0, 0, 0, 0, 0])))
+
+        self.assertEqual(len(follower.left_arm.sent), 2)
+        self.assertGreater(sent["left_joint_1.pos"], 0.0)
+        self.assertLessEqual(sent["left_joint_1.pos"], MAX_STEP[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Live drift tracking on synthetic shifted and rotated topdown frames."""
+
+import logging
+import sys
+import types
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from test_camera_pose import _reference_image, _warp  # noqa: E402
+from utils import pose_drift  # noqa: E402
+from utils.camera_pose import measure_pose_topband, top_band_mask  # noqa: E402
+from utils.frame_output import FullResFrame  # noqa: E402
+from utils.pose_drift import PoseDriftTracker  # noqa: E402
+
+
+def _rgb(bgr: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+class TestPoseDriftTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ref = _rgb(_reference_image())
+        self.tracker = PoseDriftTracker(interval_s=1.0, baseline_samples=2, confirm_samples=3)
+        self.now = 0.0
+        for _ in range(2):
+            self.assertIsNone(self._offer(self.ref))
+
+    def _offer(self, frame: np.ndarray):
+        self.now += 1.0
+        return self.tracker.offer(frame, self.now)
+
+    def test_estimates_agree_with_the_pose_gate(self) -> None:
+        ref_bgr = _reference_image()
+        mask = top_band_mask(*ref_bgr.shape[:2])
+        for warp in ({"tx": 12.0}, {"ty": -6.0}, {"rot_deg": 2.0}, {"rot_deg": -1.5, "tx": 5.0}):
+            estimate = self._offer(_rgb(_warp(ref_bgr, **warp)))
+            gate = measure_pose_topband(_warp(ref_bgr, **warp), ref_bgr, mask)
+            with self.subTest(**warp):
+                self.assertLess(abs(estimate.roll_deg - gate.roll_deg), 0.3)
+                self.assertLess(abs(estimate.tx_px - gate.tx_px), 1.5)
+                self.assertLess(abs(estimate.ty_px - gate.ty_px), 1.5)
+                self.assertGreater(estimate.response, 0.3)
+
+    def test_bump_alerts_after_confirmation_and_clears(self) -> None:
+        bumped = _rgb(_warp(_reference_image(), tx=30.0))
+        self.assertLess(self._offer(self.ref).ratio, 0.1)
+
+        with self.assertLogs(pose_drift.logger, logging.WARNING) as logs:
+            for _ in range(3):
+                self.assertGreater(self._offer(bumped).ratio, 1.0)
+        self.assertTrue(self.tracker.alerting)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("moved since the session started", logs.output[0])
+
+        self._offer(self.ref)
+        self.assertFalse(self.tracker.alerting)
+        self.assertEqual(self.tracker.metrics()["alerts"], 1)
+
+    def test_occluded_band_does_not_confirm_drift(self) -> None:
+        noise = np.random.default_rng(1).integers(0, 255, self.ref.shape, dtype=np.uint8)
+        for _ in range(5):
+            estimate = self._offer(noise)
+            self.assertLess(estimate.response, self.tracker.min_response)
+        self.assertFalse(self.tracker.alerting)
+
+    def test_only_one_frame_per_interval_is_processed(self) -> None:
+        self.assertIsNotNone(self.tracker.offer(self.ref, 10.0))
+        for t in np.linspace(10.01, 10.99, 30):
+            self.assertIsNone(self.tracker.offer(self.ref, float(t)))
+        self.assertIsNotNone(self.tracker.offer(self.ref, 11.0))
+
+        metrics = self.tracker.metrics()
+        self.assertEqual(metrics["samples"], 2)
+        # Four processed frames so far, at well under a few ms each.
+        self.assertLess(metrics["busy_ms"], 4 * 5.0)
+
+    def test_frame_shape_change_restarts_the_baseline(self) -> None:
+        # Same aspect ratio is tracked at the new scale; a different one can't be.
+        self.assertIsNotNone(self._offer(cv2.resize(self.ref, (320, 240))))
+        with self.assertLogs(pose_drift.logger, logging.WARNING):
+            self.assertIsNone(self._offer(self.ref[:360]))
+        self.assertFalse(self.tracker.metrics()["baseline_ready"])
+
+
+class TestPoseDriftCameraOutput(unittest.TestCase):
+    """Frames cut down by output_crop/output_size are still measured in native pixels."""
+
+    WARP = {"rot_deg": -1.0, "tx": 12.0, "ty": -6.0}
+
+    @staticmethod
+    def _config(**kwargs):
+        fields = dict(
+            width=640, height=480, output_crop=None, output_size=None, output_keep_full=False
+        )
+        return types.SimpleNamespace(**{**fields, **kwargs})
+
+    def _track(self, tracker, prepare):
+        ref_bgr = _reference_image()
+        for t in (1.0, 2.0, 3.0):
+            tracker.offer(prepare(_rgb(ref_bgr)), t)
+        estimate = tracker.offer(prepare(_rgb(_warp(ref_bgr, **self.WARP))), 4.0)
+        gate = measure_pose_topband(
+            _warp(ref_bgr, **self.WARP), ref_bgr, top_band_mask(*ref_bgr.shape[:2])
+        )
+        self.assertLess(abs(estimate.roll_deg - gate.roll_deg), 0.3)
+        self.assertLess(abs(estimate.tx_px - gate.tx_px), 1.5)
+        self.assertLess(abs(estimate.ty_px - gate.ty_px), 1.5)
+
+    def test_resized_frames_are_scaled_to_the_capture_size(self):
+        config = self._config(output_size=(320, 320))  # half width, two thirds height
+        tracker = PoseDriftTracker.for_camera(config, 1.0, "topdown")
+        self.assertEqual(tracker.native_size, (640, 480))
+        self._track(
+            tracker, lambda frame: cv2.resize(frame, (320, 320), interpolation=cv2.INTER_AREA)
+        )
+
+    def test_cropped_frames_are_tracked_through_the_kept_full_frame(self):
+        config = self._config(output_crop=(160, 240, 320, 240), output_keep_full=True)
+
+        def crop(frame):
+            out = frame[240:, 160:480].copy().view(FullResFrame)
+            out.full = frame
+            return out
+
+        self._track(PoseDriftTracker.for_camera(config, 1.0, "topdown"), crop)
+
+    def test_cropped_frames_without_the_full_frame_are_not_tracked(self):
+        cropped = self._config(output_crop=(160, 240, 320, 240))
+        with self.assertLogs(pose_drift.logger, logging.WARNING):
+            self.assertIsNone(PoseDriftTracker.for_camera(cropped, 1.0, "topdown"))
+        # A subprocess camera hands back the inner camera's output without `full`.
+        inner = self._config(output_crop=(160, 240, 320, 240), output_keep_full=True)
+        with self.assertLogs(pose_drift.logger, logging.WARNING):
+            self.assertIsNone(
+                PoseDriftTracker.for_camera(types.SimpleNamespace(camera=inner), 1.0, "topdown")
+            )
+        plain = PoseDriftTracker.for_camera(self._config(), 1.0, "topdown")
+        self.assertIsNone(plain.native_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
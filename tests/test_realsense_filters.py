@@ -0,0 +1,243 @@
+"""RealSense depth filter pipeline against a fake librealsense and frameset source."""
+
+import threading
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the camera packages)
+from lerobot_camera_cached import realsense_filters
+from lerobot_camera_cached.camera_realsense_cached import RealSenseCameraCached
+from lerobot_camera_cached.realsense_filters import (
+    FilterPipeline,
+    FilterStage,
+    build_stages,
+)
+
+H, W = 8, 12
+
+
+class _Frame:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+
+class _Frameset:
+    def __init__(self, value):
+        self.color = _Frame(np.full((H, W, 3), value, np.uint8))
+        self.depth = _Frame(np.full((H, W), 1000 + value, np.uint16))
+        self.kept = False
+
+    def keep(self):
+        self.kept = True
+
+    def get_color_frame(self):
+        return self.color
+
+    def get_depth_frame(self):
+        return self.depth
+
+    def as_frameset(self):
+        return self
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Block:
+    """Depth filter that adds `offset` and takes `cost` seconds on the fake clock."""
+
+    def __init__(self, clock=None, offset=0, cost=0.0, step=1):
+        self.clock = clock
+        self.offset = offset
+        self.cost = cost
+        self.step = step
+        self.options = {}
+
+    def set_option(self, option, value):
+        self.options[option] = value
+
+    def process(self, frame):
+        if self.clock is not None:
+            self.clock.now += self.cost
+        return _Frame(frame.get_data()[:: self.step, :: self.step] + self.offset)
+
+
+class _Align:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def process(self, frameset):
+        frameset.depth = _Frame(frameset.depth.data + 1)
+        return frameset
+
+
+def _fake_rs():
+    return types.SimpleNamespace(
+        align=_Align,
+        stream=types.SimpleNamespace(color="color"),
+        option=types.SimpleNamespace(filter_magnitude="magnitude", holes_fill="holes_fill"),
+        decimation_filter=lambda: _Block(step=2),
+        spatial_filter=lambda: _Block(offset=10),
+        temporal_filter=lambda: _Block(offset=100),
+        hole_filling_filter=lambda: _Block(offset=1000),
+    )
+
+
+class TestBuildStages(unittest.TestCase):
+    def test_align_runs_first_and_options_are_applied(self):
+        stages = build_stages(
+            _fake_rs(),
+            ("temporal", "decimation"),
+            {"decimation": {"filter_magnitude": 2}},
+            align_to_color=True,
+        )
+        self.assertEqual([s.name for s in stages], ["align", "temporal", "decimation"])
+        self.assertEqual(stages[2].block.options, {"magnitude": 2})
+        self.assertEqual([s.droppable for s in stages], [False, True, False])
+
+    def test_bad_configs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            build_stages(_fake_rs(), ("median",))
+        with self.assertRaises(ValueError):
+            build_stages(_fake_rs(), ("spatial",), {"temporal": {"holes_fill": 1}})
+        with self.assertRaises(ValueError):
+            build_stages(_fake_rs(), ("spatial", "spatial"))
+
+
+class TestFilterPipeline(unittest.TestCase):
+    def _pipeline(self, stages, publish=None, budget_s=1.0):
+        pipeline = FilterPipeline(stages, publish or (lambda *a: None), budget_s)
+        self.addCleanup(pipeline.close)
+        return pipeline
+
+    def test_chain_runs_in_order_on_the_depth_of_each_frameset(self):
+        stages = build_stages(_fake_rs(), ("decimation", "spatial"), align_to_color=True)
+        pipeline = self._pipeline(stages)
+        color, depth = pipeline.process(_Frameset(5))
+
+        self.assertEqual(int(color.get_data()[0, 0, 0]), 5)
+        self.assertEqual(depth.get_data().shape, (H // 2, W // 2))
+        self.assertEqual(int(depth.get_data()[0, 0]), 1005 + 1 + 10)
+        self.assertEqual(pipeline.metrics()["stages"]["spatial"]["frames"], 1)
+
+    def test_worker_publishes_pairs_and_drops_the_oldest_when_behind(self):
+        entered = threading.Event()
+        release = threading.Event()
+        published = []
+
+        def publish(color, depth, capture_time):
+            entered.set()
+            release.wait(timeout=2.0)
+            published.append((int(color.get_data()[0, 0, 0]), int(depth.get_data()[0, 0])))
+
+        pipeline = self._pipeline(build_stages(_fake_rs(), ("spatial",)), publish)
+        framesets = [_Frameset(v) for v in range(4)]
+        pipeline.submit(framesets[0], time.perf_counter())
+        self.assertTrue(entered.wait(timeout=2.0))
+        for frameset in framesets[1:]:
+            pipeline.submit(frameset, time.perf_counter())
+        release.set()
+
+        deadline = time.monotonic() + 2.0
+        while len(published) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(published, [(0, 1010), (3, 1013)])
+        self.assertEqual(pipeline.metrics()["dropped"], 2)
+        self.assertTrue(all(f.kept for f in framesets))
+
+    def test_stale_framesets_are_not_filtered(self):
+        published = []
+        pipeline = self._pipeline([], lambda *a: published.append(a), budget_s=0.05)
+        pipeline.submit(_Frameset(1), time.perf_counter() - 1.0)
+
+        deadline = time.monotonic() + 2.0
+        while pipeline.stale == 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(pipeline.stale, 1)
+        self.assertEqual(published, [])
+
+    def test_expensive_stage_is_dropped_under_load_and_restored(self):
+        clock = _Clock()
+        spatial = FilterStage("spatial", _Block(clock, cost=0.003))
+        temporal = FilterStage("temporal", _Block(clock, cost=0.008))
+        decimation = FilterStage("decimation", _Block(clock, cost=0.009, step=2), droppable=False)
+        pipeline = self._pipeline([decimation, spatial, temporal], budget_s=0.015)
+
+        with patch.object(realsense_filters.time, "perf_counter", clock):
+            for _ in range(30):
+                pipeline.process(_Frameset(1))
+            enabled = [s.enabled for s in (decimation, spatial, temporal)]
+            self.assertEqual(enabled, [True, True, False])
+            self.assertLess(pipeline.metrics()["chain_ms"], 15.0)
+
+            # Load eases: decimation gets cheap, so temporal fits again.
+            decimation.block.cost = 0.001
+            for _ in range(realsense_filters._RECOVER_FRAMES + 40):
+                pipeline.process(_Frameset(1))
+        self.assertTrue(temporal.enabled)
+        self.assertAlmostEqual(pipeline.metrics()["stages"]["temporal"]["max_ms"], 8.0)
+
+
+class TestRealSenseFilteredReadLoop(unittest.TestCase):
+    def test_filtered_depth_is_published_with_its_colour_frame(self):
+        cam = RealSenseCameraCached.__new__(RealSenseCameraCached)
+        cam.config = types.SimpleNamespace(
+            lazy_postprocess=False, consumer_fps=None, filter_budget_ms=1000.0
+        )
+        cam.fps = 30
+        cam.use_depth = True
+        cam.capture_height, cam.capture_width = H, W
+        cam.rotation = None
+        cam.output = cam.depth_output = None
+        cam.thread = types.SimpleNamespace(is_alive=lambda: True)
+        cam.stop_event = threading.Event()
+        cam.frame_lock = threading.Lock()
+        cam.new_frame_event = threading.Event()
+        cam.latest_color_frame = None
+        cam.latest_depth_frame = None
+        cam.latest_timestamp = None
+        cam.ready = False
+        cam.latest_frame_time = 0.0
+        cam._depth_snapshot_lock = threading.Lock()
+        cam._last_depth_snapshot = None
+        cam.filter_stages = build_stages(_fake_rs(), ("decimation", "hole_filling"))
+
+        framesets = [_Frameset(v) for v in (1, 2, 3)]
+        submitted = []
+
+        def read():
+            # One frameset in flight at a time, so none is dropped.
+            deadline = time.monotonic() + 2.0
+            while cam.filters.frames < len(submitted) and time.monotonic() < deadline:
+                time.sleep(0.002)
+            if not framesets:
+                cam.stop_event.set()
+                raise RuntimeError("end of recording")
+            submitted.append(framesets[0])
+            return framesets.pop(0)
+
+        cam._read_from_hardware = read
+        cam._read_loop()
+
+        color = cam.async_read(timeout_ms=200)
+        depth = cam.pop_depth_snapshot()
+        self.assertEqual(int(color[0, 0, 0]), 3)
+        self.assertEqual(depth.shape, (H // 2, W // 2))
+        self.assertEqual(int(depth[0, 0]), 2003)
+        self.assertEqual(cam.filter_metrics()["frames"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
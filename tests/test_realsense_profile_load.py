@@ -1,8 +1,11 @@
+import json
 import sys
 import tempfile
+import time
 import types
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 
 def _install_stubs() -> None:
@@ -69,6 +72,7 @@ def _install_stubs() -> None:
 _install_stubs()
 
 from lerobot_camera_cached.camera_realsense_cached import RealSenseCameraCached
+from lerobot_camera_cached.realsense_profile import RealSenseProfileCache, profile_applied
 
 
 class _Device:
@@ -102,6 +106,9 @@ class _Advanced:
             raise self.errors.pop(0)
         self.loaded = text
 
+    def serialize_json(self):
+        return self.loaded or "{}"
+
 
 class TestRealSenseProfileLoad(unittest.TestCase):
     def test_wait_for_device_handles_temporary_disconnect(self):
@@ -129,7 +136,9 @@ class TestRealSenseProfileLoad(unittest.TestCase):
 
             advanced = _Advanced(enabled=True)
             mod.rs = types.SimpleNamespace(
-                camera_info=types.SimpleNamespace(serial_number="serial_number"),
+                camera_info=types.SimpleNamespace(
+                    serial_number="serial_number", firmware_version="firmware_version"
+                ),
                 context=lambda: types.SimpleNamespace(query_devices=lambda: [_Device("abc")]),
                 rs400_advanced_mode=lambda device: advanced,
             )
@@ -137,6 +146,7 @@ class TestRealSenseProfileLoad(unittest.TestCase):
             cam = RealSenseCameraCached.__new__(RealSenseCameraCached)
             cam.serial_number = "abc"
             cam.config = types.SimpleNamespace(profile_path=path)
+            cam.profile_cache = RealSenseProfileCache(Path(tmp) / "cache")
             cam._load_profile()
 
             self.assertEqual(advanced.loaded, '{"x":1}')
@@ -152,7 +162,9 @@ class TestRealSenseProfileLoad(unittest.TestCase):
             advanced = _Advanced(errors=[RuntimeError("Device or resource busy")])
             freed = []
             mod.rs = types.SimpleNamespace(
-                camera_info=types.SimpleNamespace(serial_number="serial_number"),
+                camera_info=types.SimpleNamespace(
+                    serial_number="serial_number", firmware_version="firmware_version"
+                ),
                 context=lambda: types.SimpleNamespace(query_devices=lambda: [device]),
                 rs400_advanced_mode=lambda device: advanced,
             )
@@ -161,6 +173,7 @@ class TestRealSenseProfileLoad(unittest.TestCase):
             cam = RealSenseCameraCached.__new__(RealSenseCameraCached)
             cam.serial_number = "abc"
             cam.config = types.SimpleNamespace(profile_path=path)
+            cam.profile_cache = RealSenseProfileCache(Path(tmp) / "cache")
             cam._load_profile()
 
             self.assertEqual(freed, ["RealSense"])
@@ -176,7 +189,9 @@ class TestRealSenseProfileLoad(unittest.TestCase):
 
             advanced = _Advanced(errors=[RuntimeError("bad-key key is not supported by the connected device!")])
             mod.rs = types.SimpleNamespace(
-                camera_info=types.SimpleNamespace(serial_number="serial_number"),
+                camera_info=types.SimpleNamespace(
+                    serial_number="serial_number", firmware_version="firmware_version"
+                ),
                 context=lambda: types.SimpleNamespace(query_devices=lambda: [_Device("abc")]),
                 rs400_advanced_mode=lambda device: advanced,
             )
@@ -184,11 +199,136 @@ class TestRealSenseProfileLoad(unittest.TestCase):
             cam = RealSenseCameraCached.__new__(RealSenseCameraCached)
             cam.serial_number = "abc"
             cam.config = types.SimpleNamespace(profile_path=path)
+            cam.profile_cache = RealSenseProfileCache(Path(tmp) / "cache")
             cam._load_profile()
 
             self.assertIn('"good-key": "2"', advanced.loaded)
             self.assertNotIn("bad-key", advanced.loaded)
 
 
+class _FirmwareAdvanced(_Advanced):
+    """Advanced mode of a firmware that rejects `unsupported` keys, counting loads."""
+
+    def __init__(self, unsupported=(), enabled=True):
+        super().__init__(enabled=enabled)
+        self.unsupported = unsupported
+        self.loads = 0
+
+    def load_json(self, text):
+        self.loads += 1
+        for key in self.unsupported:
+            if key in text:
+                raise RuntimeError(f"{key} key is not supported by the connected device!")
+        self.loaded = text
+
+
+class TestRealSenseProfileCache(unittest.TestCase):
+    PROFILE = '{"parameters":{"bad-key":"1","good-key":"2","param-rate":"0.5"}}'
+
+    def setUp(self):
+        import lerobot_camera_cached.camera_realsense_cached as mod
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "realsense.json"
+        self.path.write_text(self.PROFILE)
+        self.cache = RealSenseProfileCache(Path(tmp.name) / "cache")
+        self.devices = {}
+        self.mod = mod
+        mod.rs = types.SimpleNamespace(
+            camera_info=types.SimpleNamespace(
+                serial_number="serial_number", firmware_version="firmware_version"
+            ),
+            context=lambda: types.SimpleNamespace(query_devices=lambda: list(self.devices)),
+            rs400_advanced_mode=lambda device: self.devices[device],
+        )
+
+    def _plug(self, advanced, serial="abc"):
+        self.devices.clear()
+        self.devices[_Device(serial)] = advanced
+
+    def _camera(self):
+        cam = RealSenseCameraCached.__new__(RealSenseCameraCached)
+        cam.serial_number = "abc"
+        cam.config = types.SimpleNamespace(profile_path=self.path)
+        cam.profile_cache = self.cache
+        return cam
+
+    def test_warm_reconnect_skips_load_json(self):
+        advanced = _FirmwareAdvanced(unsupported=["bad-key"])
+        self._plug(advanced)
+        self._camera()._load_profile()
+        self.assertEqual(advanced.loads, 2)
+
+        with patch.object(self.mod.time, "sleep") as sleep:
+            start = time.perf_counter()
+            self._camera()._load_profile()
+            elapsed = time.perf_counter() - start
+        self.assertEqual(advanced.loads, 2)
+        sleep.assert_not_called()
+        self.assertLess(elapsed, 0.05)
+
+    def test_unsupported_keys_are_stripped_once_per_firmware(self):
+        self._plug(_FirmwareAdvanced(unsupported=["bad-key"]))
+        self._camera()._load_profile()
+
+        # Power-cycled (settings lost) or another unit with the same firmware.
+        advanced = _FirmwareAdvanced(unsupported=["bad-key"])
+        self._plug(advanced)
+        self._camera()._load_profile()
+        self.assertEqual(advanced.loads, 1)
+        self.assertNotIn("bad-key", advanced.loaded)
+
+    def test_changed_device_settings_or_profile_are_reloaded(self):
+        advanced = _FirmwareAdvanced()
+        self._plug(advanced)
+        self._camera()._load_profile()
+
+        advanced.loaded = '{"parameters":{"bad-key":"1","good-key":"3","param-rate":"0.5"}}'
+        self._camera()._load_profile()
+        self.assertEqual(advanced.loads, 2)
+
+        self.path.write_text(self.PROFILE.replace('"2"', '"4"'))
+        self._camera()._load_profile()
+        self.assertEqual(advanced.loads, 3)
+        self.assertIn('"good-key":"4"', advanced.loaded)
+
+    def test_advanced_mode_off_always_loads(self):
+        advanced = _FirmwareAdvanced(enabled=False)
+        advanced.loaded = self.PROFILE
+        self._plug(advanced)
+        with patch.object(self.mod.time, "sleep"):
+            self._camera()._load_profile()
+        self.assertEqual(advanced.toggled, [True])
+        self.assertEqual(advanced.loads, 1)
+
+    def test_profile_applied_compares_values_not_formatting(self):
+        device = json.dumps({"parameters": {"good-key": "2", "param-rate": "0.500000", "x": "9"}})
+        self.assertTrue(profile_applied('{"parameters":{"good-key":2,"param-rate":"0.5"}}', device))
+        self.assertFalse(profile_applied('{"good-key":"2","missing":"1"}', device))
+        self.assertFalse(profile_applied("not json", device))
+
+    def test_profile_applied_ignores_values_owned_by_auto_exposure(self):
+        profile = {
+            "controls-autoexposure-auto": "True",
+            "controls-autoexposure-manual": "33000",
+            "controls-depth-gain": "16",
+            "controls-laserpower": "150",
+        }
+        device = dict(profile, **{
+            "controls-autoexposure-manual": "8500",
+            "controls-depth-gain": "42",
+        })
+        self.assertTrue(profile_applied(json.dumps(profile), json.dumps(device)))
+
+        # Still compared when the profile asks for manual exposure.
+        manual = dict(profile, **{"controls-autoexposure-auto": "False"})
+        device["controls-autoexposure-auto"] = "False"
+        self.assertFalse(profile_applied(json.dumps(manual), json.dumps(device)))
+        # And the auto switch itself is always compared.
+        device = dict(profile, **{"controls-autoexposure-auto": "False"})
+        self.assertFalse(profile_applied(json.dumps(profile), json.dumps(device)))
+
+
 if __name__ == "__main__":
     unittest.main()
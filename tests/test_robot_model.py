@@ -0,0 +1,74 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
+from lerobot_robot_yams import robot_model
+from lerobot_robot_yams.robot_model import (
+    ARMS_CONFIG_PATH,
+    URDF_PATH,
+    compile_robot_model,
+    load_robot_model,
+    source_hash,
+)
+from utils import disk_cache
+
+
+class TestRobotModel(unittest.TestCase):
+    def test_compiled_model_matches_sources(self):
+        model = compile_robot_model()
+
+        self.assertEqual(model.joint_tfs.shape, (6, 4, 4))
+        np.testing.assert_allclose(model.joint_frames[0, 0], [0.0, 0.0, 0.0631], atol=1e-12)
+        np.testing.assert_allclose(model.right_base_offset, [0.0, -0.57, 0.0])
+        self.assertIn("ground_z", model.collision)
+
+    def test_cache_hit_skips_compilation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            first = load_robot_model(cache_dir)
+            self.assertEqual(len(list(cache_dir.glob("*.npz"))), 1)
+
+            load_robot_model.cache_clear()
+            with mock.patch.object(
+                robot_model, "compile_robot_model", side_effect=AssertionError("compiled")
+            ):
+                second = load_robot_model(cache_dir)
+            load_robot_model.cache_clear()
+
+            np.testing.assert_array_equal(first.joint_tfs, second.joint_tfs)
+            np.testing.assert_array_equal(first.right_base_offset, second.right_base_offset)
+            self.assertEqual(first.collision, second.collision)
+            self.assertEqual(first.workspace, second.workspace)
+
+    def test_truncated_cache_is_recompiled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            first = load_robot_model(cache_dir)
+            load_robot_model.cache_clear()
+            (path,) = cache_dir.glob("*.npz")
+            for contents in (b"", path.read_bytes()[:100], b"not an npz"):
+                path.write_bytes(contents)
+                with self.assertLogs(disk_cache.logger, "WARNING"):
+                    model = load_robot_model(cache_dir)
+                load_robot_model.cache_clear()
+                np.testing.assert_array_equal(model.joint_tfs, first.joint_tfs)
+
+    def test_hash_follows_source_contents(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            urdf = Path(tmp) / "dual_yam.urdf"
+            arms = Path(tmp) / "arms.yaml"
+            shutil.copy(URDF_PATH, urdf)
+            shutil.copy(ARMS_CONFIG_PATH, arms)
+            self.assertEqual(source_hash(urdf, arms), source_hash())
+
+            arms.write_text(arms.read_text().replace("ground_z: -0.07", "ground_z: -0.05"))
+            self.assertNotEqual(source_hash(urdf, arms), source_hash())
+
+
+if __name__ == "__main__":
+    unittest.main()
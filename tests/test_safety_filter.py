@@ -0,0 +1,210 @@
+import types
+import unittest
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
+from lerobot_robot_yams.bi_follower import BiYamsFollower
+from lerobot_robot_yams.follower import YamsFollower, YamsFollowerConfig
+from lerobot_robot_yams.forward_kinematics import (
+    SafetyStatus,
+    arm_fk_batch,
+    check_action,
+    check_action_batch,
+)
+from lerobot_robot_yams.robot_core.safety_filter import SafetyFilter, SafetyLimits
+from lerobot_robot_yams.robot_core.yams_server import YamsServer
+
+GROUND_Z = -0.07
+EE_LENGTH = 0.15
+MAX_STEP = [0.5, 0.35, 0.3, 0.3, 0.7, 0.7]
+
+
+class _FakeRobot:
+    def __init__(self):
+        self.commands = []
+
+    def num_dofs(self):
+        return 7
+
+    def get_joint_pos(self):
+        return np.zeros(7)
+
+    def command_joint_pos(self, joint_pos):
+        self.commands.append(np.asarray(joint_pos))
+
+    def command_joint_state(self, joint_state):
+        self.commands.append(np.asarray(joint_state["pos"]))
+
+    def get_observations(self):
+        return {"joint_pos": np.zeros(6), "gripper_pos": np.zeros(1)}
+
+    def get_robot_info(self):
+        return {}
+
+
+class _Future:
+    def __init__(self, result, on_result):
+        self._result = result
+        self._on_result = on_result
+
+    def result(self):
+        self._on_result()
+        return self._result
+
+
+class _ServerClient:
+    """portal.Client stand-in that calls a YamsServer's bound handlers in-process."""
+
+    def __init__(self, name, robot, safety, log):
+        self.name = name
+        self.robot = robot
+        self.log = log
+        self.bound = YamsServer(robot, 0, safety_filter=safety)._server.bound
+
+    def command_joint_pos(self, joint_pos):
+        self.log.append(("send", self.name))
+        status = self.bound["command_joint_pos"](joint_pos)
+        return _Future(status, lambda: self.log.append(("result", self.name)))
+
+    def get_observations(self):
+        return _Future(self.robot.get_observations(), lambda: None)
+
+
+def _lowest_z(q: np.ndarray) -> np.ndarray:
+    positions, T_tip = arm_fk_batch(q)
+    ee_end_z = positions[:, -1, 2] + EE_LENGTH * T_tip[:, 2, 2]
+    return np.minimum(positions[:, 1:, 2].min(axis=1), ee_end_z)
+
+
+class TestCheckActionBatch(unittest.TestCase):
+    def test_matches_scalar_check_action(self):
+        q = np.random.default_rng(0).uniform(-2.0, 2.0, size=(500, 6))
+        batch = check_action_batch(q, GROUND_Z, EE_LENGTH)
+
+        for qi, status in zip(q, batch):
+            rejected, _ = check_action(qi, None, GROUND_Z, EE_LENGTH, np.array(MAX_STEP))
+            self.assertEqual(rejected, status != SafetyStatus.OK)
+
+    def test_fk_batch_matches_scalar_fk(self):
+        from lerobot_robot_yams.forward_kinematics import arm_fk
+
+        q = np.random.default_rng(1).uniform(-1.0, 1.0, size=(8, 6))
+        positions, T_tip = arm_fk_batch(q)
+        for i, qi in enumerate(q):
+            ref_positions, ref_T = arm_fk(qi)
+            np.testing.assert_allclose(positions[i], np.array(ref_positions), atol=1e-12)
+            np.testing.assert_allclose(T_tip[i], ref_T, atol=1e-12)
+
+
+class TestSafetyFilter(unittest.TestCase):
+    def setUp(self):
+        self.filter = SafetyFilter(SafetyLimits(GROUND_Z, EE_LENGTH, MAX_STEP))
+
+    def test_rejects_joint_step_and_keeps_last_command(self):
+        start = np.zeros(6)
+        self.assertEqual(self.filter.filter_command(start), SafetyStatus.OK)
+
+        self.assertEqual(
+            self.filter.filter_command(start + [0.6, 0, 0, 0, 0, 0]), SafetyStatus.JOINT_STEP
+        )
+        np.testing.assert_array_equal(self.filter.last_command, start)
+
+    def test_rejects_joint1_limit(self):
+        q = np.array([1.7, 0, 0, 0, 0, 0])
+        self.assertEqual(self.filter.filter_command(q), SafetyStatus.JOINT1_LIMIT)
+
+    def test_interpolated_dip_below_ground_is_rejected(self):
+        rng = np.random.default_rng(2)
+        for _ in range(2000):
+            q_prev = rng.uniform(-1.2, 1.2, size=6)
+            q_new = q_prev + rng.uniform(-1.0, 1.0, size=6) * MAX_STEP
+            z_prev, z_mid, z_new = _lowest_z(np.stack([q_prev, 0.5 * (q_prev + q_new), q_new]))
+            if z_mid < min(z_prev, z_new) - 0.01:
+                break
+        else:
+            self.skipTest("no segment with an interior dip found")
+
+        ground_z = 0.5 * (z_mid + min(z_prev, z_new))
+        safety = SafetyFilter(SafetyLimits(ground_z, EE_LENGTH, MAX_STEP, substeps=8))
+        self.assertEqual(check_action_batch(q_new, ground_z, EE_LENGTH)[0], SafetyStatus.OK)
+        safety.last_command = q_prev
+
+        self.assertNotEqual(safety.filter_command(q_new), SafetyStatus.OK)
+
+
+class TestYamsServerSafety(unittest.TestCase):
+    def test_rejected_command_never_reaches_robot(self):
+        robot = _FakeRobot()
+        safety = SafetyFilter(SafetyLimits(GROUND_Z, EE_LENGTH, MAX_STEP))
+        server = YamsServer(robot, 0, safety_filter=safety)
+        command = server._server.bound["command_joint_pos"]
+
+        self.assertEqual(command(np.zeros(7)), SafetyStatus.OK)
+        self.assertEqual(command(np.r_[np.zeros(5), 1.0, 0.0]), SafetyStatus.JOINT_STEP)
+        self.assertEqual(len(robot.commands), 1)
+
+    def test_without_filter_commands_bind_straight_to_robot(self):
+        robot = _FakeRobot()
+        server = YamsServer(robot, 0)
+
+        self.assertEqual(server._server.bound["command_joint_pos"], robot.command_joint_pos)
+
+
+class TestBimanualServerSafety(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+        self.robots = {"left": _FakeRobot(), "right": _FakeRobot()}
+        self.follower = BiYamsFollower.__new__(BiYamsFollower)
+        self.follower.config = types.SimpleNamespace(
+            joint_limit_mode="reject",
+            server_side_safety=True,
+            self_collision_margin=None,
+        )
+        self.follower._workspace_sdf = None
+        limits = SafetyLimits(GROUND_Z, EE_LENGTH, MAX_STEP)
+        for side, robot in self.robots.items():
+            arm = YamsFollower.__new__(YamsFollower)
+            arm.config = YamsFollowerConfig(
+                can_port="can0", server_port=0, side=side, safety=limits
+            )
+            arm.connected_once = True
+            arm.cameras = {}
+            arm._state_subscriber = None
+            arm._last_accepted_action = None
+            arm._client = _ServerClient(side, robot, SafetyFilter(limits), self.log)
+            setattr(self.follower, f"{side}_arm", arm)
+
+    def _action(self, left_joint_6: float, right_joint_6: float) -> dict[str, float]:
+        action = {}
+        for side, value in (("left", left_joint_6), ("right", right_joint_6)):
+            for name in self.follower.left_arm.config.joint_names:
+                action[f"{side}_{name}.pos"] = value if name == "joint_6" else 0.0
+        return action
+
+    def test_both_commands_are_sent_before_either_verdict(self):
+        sent = self.follower.send_action(self._action(0.1, 0.2))
+
+        self.assertEqual([event for event, _ in self.log[:2]], ["send", "send"], msg=self.log)
+        self.assertEqual(sent, self._action(0.1, 0.2))
+        self.assertEqual([len(r.commands) for r in self.robots.values()], [1, 1])
+
+    def test_rejecting_one_arm_holds_both(self):
+        self.follower.send_action(self._action(0.1, 0.1))
+        # Right arm steps further than its joint-6 limit; the left step is fine.
+        held = self.follower.send_action(self._action(0.2, 1.0))
+
+        self.assertEqual(held, self._action(0.1, 0.1))
+        for side, robot in self.robots.items():
+            with self.subTest(side=side):
+                self.assertAlmostEqual(robot.commands[-1][5], 0.1)
+        # The left command was accepted and then undone; the right one never arrived.
+        self.assertEqual(len(self.robots["left"].commands), 3)
+        self.assertEqual(len(self.robots["right"].commands), 1)
+
+        # The next in-range action is checked against the held commands.
+        self.assertEqual(self.follower.send_action(self._action(0.3, 0.4)), self._action(0.3, 0.4))
+
+
+if __name__ == "__main__":
+    unittest.main()
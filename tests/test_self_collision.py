@@ -0,0 +1,124 @@
+import unittest
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
+from _fake_arm import FakeArm
+from lerobot_robot_yams.bi_follower import BiYamsFollower, BiYamsFollowerConfig
+from lerobot_robot_yams.robot_model import load_robot_model
+from lerobot_robot_yams.self_collision import (
+    arm_capsules,
+    bimanual_distances,
+    check_self_collision,
+    segment_distances,
+)
+
+EE_LENGTH = 0.15
+LINK_RADII = np.array([0.05, 0.05, 0.045, 0.04, 0.035, 0.035, 0.04])
+SAMPLES = 200
+
+
+def _brute_force_segment_distance(p1, q1, p2, q2) -> float:
+    t = np.linspace(0.0, 1.0, SAMPLES)[:, None]
+    a = p1 + t * (q1 - p1)
+    b = p2 + t * (q2 - p2)
+    return float(np.linalg.norm(a[:, None] - b[None], axis=-1).min())
+
+
+class TestSegmentDistances(unittest.TestCase):
+    def test_matches_point_sampling(self):
+        rng = np.random.default_rng(0)
+        p1, q1, p2, q2 = rng.uniform(-1.0, 1.0, size=(4, 300, 3))
+        exact = segment_distances(p1, q1, p2, q2)
+
+        for i in range(300):
+            sampled = _brute_force_segment_distance(p1[i], q1[i], p2[i], q2[i])
+            # Sampling can only overestimate, by at most one sample spacing.
+            spacing = max(np.linalg.norm(q1[i] - p1[i]), np.linalg.norm(q2[i] - p2[i]))
+            self.assertLessEqual(exact[i], sampled + 1e-12)
+            self.assertLessEqual(sampled - exact[i], spacing / (SAMPLES - 1))
+
+    def test_parallel_and_degenerate_segments(self):
+        p = np.array([0.0, 0.0, 0.0])
+        x = np.array([1.0, 0.0, 0.0])
+        y = np.array([0.0, 1.0, 0.0])
+        cases = [
+            ((p, x, p + y, x + y), 1.0),  # parallel, overlapping
+            ((p, x, p + 2 * x + y, 3 * x + y), np.sqrt(2.0)),  # parallel, disjoint
+            ((p, p, y, y), 1.0),  # point to point
+            ((y, y, p, x), 1.0),  # point to segment
+            ((p, x, 0.5 * x + y, 0.5 * x + y), 1.0),  # segment to point
+        ]
+        for (p1, q1, p2, q2), expected in cases:
+            self.assertAlmostEqual(float(segment_distances(p1, q1, p2, q2)), expected)
+
+
+class TestBimanualDistances(unittest.TestCase):
+    def test_matches_point_sampling_on_arm_configurations(self):
+        rng = np.random.default_rng(1)
+        q_left = rng.uniform(-1.5, 1.5, size=(8, 6))
+        q_right = rng.uniform(-1.5, 1.5, size=(8, 6))
+        distances = bimanual_distances(q_left, q_right, EE_LENGTH, LINK_RADII)
+        self.assertEqual(distances.shape, (8, 7, 7))
+
+        offset = load_robot_model().right_base_offset
+        np.testing.assert_allclose(offset, [0.0, -0.57, 0.0])
+        left_starts, left_ends = arm_capsules(q_left, EE_LENGTH)
+        right_starts, right_ends = arm_capsules(q_right, EE_LENGTH)
+        for n in range(8):
+            for i in range(7):
+                for j in range(7):
+                    sampled = _brute_force_segment_distance(
+                        left_starts[n, i],
+                        left_ends[n, i],
+                        right_starts[n, j] + offset,
+                        right_ends[n, j] + offset,
+                    )
+                    sampled -= LINK_RADII[i] + LINK_RADII[j]
+                    self.assertAlmostEqual(distances[n, i, j], sampled, delta=3e-3)
+
+    def test_home_pose_is_clear_and_reaching_across_collides(self):
+        home = np.zeros(6)
+        self.assertFalse(check_self_collision(home, home, EE_LENGTH, LINK_RADII, 0.02)[0])
+
+        # Both arms stretched out, base joints turning towards each other.
+        left = np.zeros((13, 6))
+        left[:, 0] = np.linspace(-np.pi / 2, np.pi / 2, 13)
+        left[:, 1:3] = 1.5
+        right = left.copy()
+        right[:, 0] *= -1
+        collides = check_self_collision(left, right, EE_LENGTH, LINK_RADII)
+        self.assertTrue(collides[0])
+        self.assertFalse(collides[-1])
+
+
+class TestBiFollowerSelfCollision(unittest.TestCase):
+    def test_colliding_action_is_not_sent(self):
+        follower = BiYamsFollower.__new__(BiYamsFollower)
+        follower.config = BiYamsFollowerConfig(joint_limit_mode="reject")
+        follower.left_arm = FakeArm()
+        follower.right_arm = FakeArm()
+        follower._last_angles = {"left": None, "right": None}
+        follower._workspace_sdf = None
+        follower.get_observation = lambda with_cameras=True: {}
+
+        def action(q_left, q_right):
+            names = follower.left_arm.config.joint_names
+            return {
+                f"{side}_{n}.pos": float(v)
+                for side, q in (("left", q_left), ("right", q_right))
+                for n, v in zip(names, np.r_[q, 0.0])
+            }
+
+        # Both arms stretched out towards each other.
+        left = np.array([-np.pi / 2, 1.5, 1.5, 0.0, 0.0, 0.0])
+        right = np.array([np.pi / 2, 1.5, 1.5, 0.0, 0.0, 0.0])
+        self.assertEqual(follower.send_action(action(left, right)), {})
+        self.assertEqual(follower.left_arm.sent, [])
+
+        follower.send_action(action(np.zeros(6), np.zeros(6)))
+        self.assertEqual(len(follower.left_arm.sent), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
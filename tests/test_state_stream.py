@@ -0,0 +1,172 @@
+import socket
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
+from lerobot_robot_yams.bi_follower import BiYamsFollower
+from lerobot_robot_yams.follower import YamsFollower, YamsFollowerConfig
+from lerobot_robot_yams.robot_core.state_stream import (
+    StateBuffer,
+    StatePublisher,
+    StateSubscriber,
+    decode_state,
+    encode_state,
+)
+
+
+def _free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _SimulatedArm:
+    """Arm whose joint trajectory is a known function of perf_counter time."""
+
+    amplitude = np.array([0.5, 0.3, 0.4, 0.2, 0.6, 0.6, 0.02])
+    freq_hz = np.array([0.5, 0.7, 0.9, 1.1, 1.3, 1.5, 0.4])
+
+    def position(self, t: float) -> np.ndarray:
+        return self.amplitude * np.sin(2 * np.pi * self.freq_hz * t)
+
+    def read_joint_pos(self) -> np.ndarray:
+        return self.position(time.perf_counter())
+
+
+class _StampedCamera:
+    def __init__(self, captured_at: float, read_delay_s: float):
+        self.latest_timestamp = captured_at
+        self.read_delay_s = read_delay_s
+
+    def async_read(self):
+        time.sleep(self.read_delay_s)
+        return "frame"
+
+
+class TestStateBuffer(unittest.TestCase):
+    def test_interpolates_between_samples(self):
+        buffer = StateBuffer()
+        for t in np.arange(0.0, 0.1, 0.002):
+            buffer.push(t, np.array([2.0 * t, -t]))
+
+        np.testing.assert_allclose(buffer.sample(0.0511), [0.1022, -0.0511])
+
+    def test_extrapolation_is_clamped(self):
+        buffer = StateBuffer(max_extrapolation_s=0.01)
+        for t in np.arange(0.0, 0.1, 0.002):
+            buffer.push(t, np.array([t]))
+        newest = buffer.latest_time
+
+        np.testing.assert_allclose(buffer.sample(newest + 0.005), [newest + 0.005])
+        np.testing.assert_allclose(buffer.sample(newest + 1.0), [newest + 0.01])
+
+    def test_before_window_returns_oldest(self):
+        buffer = StateBuffer(capacity=4)
+        for i in range(10):
+            buffer.push(float(i), np.array([float(i)]))
+
+        np.testing.assert_allclose(buffer.sample(0.0), [6.0])
+
+    def test_out_of_order_samples_are_dropped(self):
+        buffer = StateBuffer()
+        buffer.push(1.0, np.array([1.0]))
+        buffer.push(0.5, np.array([9.0]))
+
+        self.assertEqual(buffer.latest_time, 1.0)
+        np.testing.assert_allclose(buffer.sample(1.0), [1.0])
+
+    def test_empty_buffer_returns_none(self):
+        self.assertIsNone(StateBuffer().sample(0.0))
+
+    def test_packet_round_trip(self):
+        seq, t, q = decode_state(encode_state(7, 1.25, np.arange(7.0)))
+
+        self.assertEqual((seq, t), (7, 1.25))
+        np.testing.assert_array_equal(q, np.arange(7.0))
+
+
+class TestStateStreamSimulatedArm(unittest.TestCase):
+    def setUp(self):
+        self.arm = _SimulatedArm()
+        port = _free_udp_port()
+        self.subscriber = StateSubscriber(port, StateBuffer(max_extrapolation_s=0.02))
+        self.publisher = StatePublisher(self.arm.read_joint_pos, port, hz=500)
+        self.subscriber.start()
+        self.publisher.start()
+        time.sleep(0.3)
+
+    def tearDown(self):
+        self.publisher.stop()
+        self.subscriber.stop()
+
+    def test_publishes_at_fixed_rate(self):
+        times, _ = self.subscriber.buffer._snapshot()
+        rate = (len(times) - 1) / (times[-1] - times[0])
+
+        self.assertGreater(rate, 400)
+        self.assertLess(rate, 600)
+
+    def test_interpolated_sample_matches_trajectory(self):
+        t = time.perf_counter() - 0.05
+        np.testing.assert_allclose(
+            self.subscriber.buffer.sample(t), self.arm.position(t), atol=2e-3
+        )
+
+    def test_extrapolated_sample_tracks_trajectory(self):
+        t = time.perf_counter() + 0.005
+        np.testing.assert_allclose(
+            self.subscriber.buffer.sample(t), self.arm.position(t), atol=5e-3
+        )
+
+    def test_follower_reads_stream_without_rpc(self):
+        follower = YamsFollower.__new__(YamsFollower)
+        follower.config = YamsFollowerConfig(can_port="can0", server_port=0, state_stream_hz=500)
+        follower.connected_once = True
+        follower.cameras = {}
+        follower._client = None  # any RPC would raise AttributeError
+        follower._state_subscriber = self.subscriber
+
+        t = time.perf_counter() - 0.02
+        obs = follower.get_observation(timestamp=t)
+
+        expected = self.arm.position(t)
+        for i, name in enumerate(follower.config.joint_names):
+            self.assertAlmostEqual(obs[f"{name}.pos"], expected[i], delta=2e-3)
+
+    def _streaming_follower(self, side: str) -> YamsFollower:
+        follower = YamsFollower.__new__(YamsFollower)
+        follower.config = YamsFollowerConfig(
+            can_port="can0", server_port=0, side=side, state_stream_hz=500
+        )
+        follower.connected_once = True
+        follower.cameras = {}
+        follower._client = None
+        follower._state_subscriber = self.subscriber
+        return follower
+
+    def test_bimanual_state_is_sampled_at_the_camera_capture_time(self):
+        captured_at = time.perf_counter() - 0.03
+        camera = _StampedCamera(captured_at, read_delay_s=0.02)
+        bi = BiYamsFollower.__new__(BiYamsFollower)
+        bi._obs_pool = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(bi._obs_pool.shutdown)
+        bi.left_arm = self._streaming_follower("left")
+        bi.right_arm = self._streaming_follower("right")
+        bi.cameras = {"topdown": camera}
+
+        obs = bi.get_observation()
+
+        # Both arms come from the same trajectory here, so aligned samples are
+        # identical, and they match the frame's capture time rather than "now".
+        expected = self.arm.position(captured_at)
+        for i, name in enumerate(bi.left_arm.config.joint_names):
+            self.assertEqual(obs[f"left_{name}.pos"], obs[f"right_{name}.pos"])
+            self.assertAlmostEqual(obs[f"left_{name}.pos"], expected[i], delta=2e-3)
+        self.assertEqual(obs["topdown"], "frame")
+
+
+if __name__ == "__main__":
+    unittest.main()
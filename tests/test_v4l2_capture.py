@@ -0,0 +1,300 @@
+import ctypes
+import os
+import threading
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the camera packages)
+from lerobot_camera_cached import v4l2_capture
+from lerobot_camera_cached.camera_v4l2_cached import V4L2CameraCached
+from lerobot_camera_cached.lazy_frame import LazyFrame
+from lerobot_camera_cached.v4l2_capture import V4L2CaptureEngine
+from utils.camera_auto_exposure import CameraAutoExposure
+from utils.frame_output import FrameOutput
+
+
+class _PipeDevice:
+    """Stands in for a V4L2Device: each write to the pipe is one frame."""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+
+    def fileno(self):
+        return self.read_fd
+
+    def push(self, payload: bytes) -> None:
+        os.write(self.write_fd, payload)
+
+    def read_frame(self, on_frame):
+        try:
+            data = os.read(self.read_fd, 1 << 16)
+        except BlockingIOError:
+            return False
+        on_frame(memoryview(data), time.perf_counter())
+        return True
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+def _wait_for(predicate, timeout_s=2.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestV4L2Structs(unittest.TestCase):
+    def test_struct_layout_matches_videodev2_on_64bit(self):
+        if ctypes.sizeof(ctypes.c_void_p) != 8:
+            self.skipTest("layout checked for 64-bit ABIs")
+        self.assertEqual(ctypes.sizeof(v4l2_capture.v4l2_format), 208)
+        self.assertEqual(ctypes.sizeof(v4l2_capture.v4l2_requestbuffers), 20)
+        self.assertEqual(ctypes.sizeof(v4l2_capture.v4l2_buffer), 88)
+        self.assertEqual(ctypes.sizeof(v4l2_capture.v4l2_streamparm), 204)
+        self.assertEqual(v4l2_capture.v4l2_buffer.timestamp.offset, 24)
+        self.assertEqual(v4l2_capture.VIDIOC_DQBUF, 0xC0585611)
+        self.assertEqual(v4l2_capture.VIDIOC_S_FMT, 0xC0D05605)
+
+
+class TestV4L2CaptureEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = V4L2CaptureEngine(poll_timeout_s=0.01)
+        self.devices = [_PipeDevice() for _ in range(4)]
+
+    def tearDown(self):
+        for device in self.devices:
+            self.engine.remove(device)
+            device.close()
+
+    def test_one_thread_serves_all_devices(self):
+        received = {i: [] for i in range(len(self.devices))}
+        threads = set()
+
+        def callback(i):
+            def on_frame(data, _timestamp):
+                threads.add(threading.current_thread().name)
+                received[i].append(bytes(data))
+
+            return on_frame
+
+        for i, device in enumerate(self.devices):
+            self.engine.add(device, callback(i))
+        for i, device in enumerate(self.devices):
+            device.push(f"frame-{i}".encode())
+
+        self.assertTrue(_wait_for(lambda: all(received.values())))
+        self.assertEqual(threads, {"v4l2-capture"})
+        for i in received:
+            self.assertEqual(received[i], [f"frame-{i}".encode()])
+
+    def test_removed_device_gets_no_frames_and_last_remove_stops_thread(self):
+        received = []
+        self.engine.add(self.devices[0], lambda data, _t: received.append(bytes(data)))
+        self.engine.add(self.devices[1], lambda data, _t: None)
+        thread = self.engine.thread
+
+        self.engine.remove(self.devices[0])
+        self.devices[0].push(b"late")
+        time.sleep(0.05)
+        self.assertEqual(received, [])
+        self.assertTrue(thread.is_alive())
+
+        self.engine.remove(self.devices[1])
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.engine.thread)
+
+    def test_remove_waits_for_a_callback_in_progress(self):
+        entered, release = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+        finished = []
+
+        def blocking(_data, _timestamp):
+            entered.set()
+            release.wait(5.0)
+            finished.append(True)
+
+        self.engine.add(self.devices[0], blocking)
+        self.engine.add(self.devices[1], lambda data, _t: None)
+        self.devices[0].push(b"frame")
+        self.assertTrue(entered.wait(2.0))
+
+        remover = threading.Thread(target=self.engine.remove, args=(self.devices[0],))
+        remover.start()
+        remover.join(0.1)
+        self.assertTrue(remover.is_alive())  # still inside the callback, can't close yet
+
+        release.set()
+        remover.join(2.0)
+        self.assertFalse(remover.is_alive())
+        self.assertEqual(finished, [True])
+        self.assertTrue(self.engine.thread.is_alive())
+
+    def test_callback_error_does_not_stop_other_devices(self):
+        received = []
+
+        def broken(_data, _timestamp):
+            raise RuntimeError("corrupt frame")
+
+        self.engine.add(self.devices[0], broken)
+        self.engine.add(self.devices[1], lambda data, _t: received.append(bytes(data)))
+        self.devices[0].push(b"bad")
+        self.devices[1].push(b"good")
+
+        self.assertTrue(_wait_for(lambda: received == [b"good"]))
+        self.assertTrue(self.engine.thread.is_alive())
+
+
+class TestV4L2CameraCached(unittest.TestCase):
+    def _camera(self, engine, device):
+        cam = V4L2CameraCached.__new__(V4L2CameraCached)
+        cam.frame_lock = threading.Lock()
+        cam.new_frame_event = threading.Event()
+        cam.latest_frame = None
+        cam.latest_timestamp = None
+        cam.ready = False
+        cam.latest_frame_time = 0.0
+        cam.auto_exposure = None
+        cam.config = types.SimpleNamespace(compressed_passthrough=False, lazy_postprocess=False)
+        cam.decimator = None
+        cam.output = None
+        cam.device = types.SimpleNamespace(pixel_format="MJPG", width=32, height=24)
+        engine.add(device, cam._on_frame)
+        cam.thread = engine.thread
+        return cam
+
+    def test_mjpeg_frames_from_engine_reach_async_read(self):
+        engine = V4L2CaptureEngine(poll_timeout_s=0.01)
+        device = _PipeDevice()
+        cam = self._camera(engine, device)
+        try:
+            image = np.zeros((24, 32, 3), dtype=np.uint8)
+            image[:, 16:] = 255
+            ok, jpeg = cv2.imencode(".jpg", image)
+            self.assertTrue(ok)
+            before = time.perf_counter()
+            device.push(jpeg.tobytes())
+
+            frame = cam.async_read(timeout_ms=1000)
+
+            self.assertEqual(frame.shape, (24, 32, 3))
+            self.assertLess(frame[:, :8].mean(), 10)
+            self.assertGreater(frame[:, 24:].mean(), 245)
+            self.assertGreaterEqual(cam.latest_timestamp, before)
+        finally:
+            engine.remove(device)
+            device.close()
+
+    def test_output_spec_is_applied_in_the_capture_thread(self):
+        engine = V4L2CaptureEngine(poll_timeout_s=0.01)
+        device = _PipeDevice()
+        cam = self._camera(engine, device)
+        cam.output = FrameOutput(crop=(16, 0, 16, 24), size=(8, 12))
+        try:
+            image = np.zeros((24, 32, 3), dtype=np.uint8)
+            image[:, 16:] = 255
+            device.push(cv2.imencode(".jpg", image)[1].tobytes())
+
+            frame = cam.async_read(timeout_ms=1000)
+
+            self.assertEqual(frame.shape, (12, 8, 3))
+            self.assertGreater(frame[:, 2:].mean(), 245)
+            self.assertTrue(any(frame is buf for buf in cam.output._pool.buffers))
+        finally:
+            engine.remove(device)
+            device.close()
+
+
+class TestLazyV4L2AutoExposure(unittest.TestCase):
+    """Auto-exposure must read lazy frames without decoding or choking on raw bytes."""
+
+    def _camera(self, pixel_format):
+        cam = V4L2CameraCached.__new__(V4L2CameraCached)
+        cam.frame_lock = threading.Lock()
+        cam.new_frame_event = threading.Event()
+        cam.latest_frame = None
+        cam.latest_timestamp = None
+        cam.config = types.SimpleNamespace(compressed_passthrough=False, lazy_postprocess=True)
+        cam.decimator = None
+        cam.output = None
+        cam.device = types.SimpleNamespace(pixel_format=pixel_format, width=32, height=24)
+        cam.auto_exposure = CameraAutoExposure(
+            device="/dev/video0",
+            exposure=50,
+            target=100,
+            deadband=5,
+            speed=0.5,
+            min_exposure=5,
+            max_exposure=200,
+            period_s=0.5,
+        )
+        cam.decodes = 0
+        decode = cam._decode_and_postprocess
+
+        def counted(data):
+            cam.decodes += 1
+            return decode(data)
+
+        cam._decode_and_postprocess = counted
+        return cam
+
+    def _push(self, cam, data):
+        with patch("utils.camera_auto_exposure._set_exposure") as set_exposure:
+            cam._on_frame(memoryview(data), time.perf_counter())
+        return set_exposure
+
+    def test_dark_mjpeg_frame_raises_exposure_without_full_decode(self):
+        cam = self._camera("MJPG")
+        jpeg = cv2.imencode(".jpg", np.full((24, 32, 3), 40, dtype=np.uint8))[1].tobytes()
+
+        set_exposure = self._push(cam, jpeg)
+
+        self.assertIsInstance(cam.latest_frame, LazyFrame)
+        self.assertIsNotNone(cam.auto_exposure)
+        set_exposure.assert_called_once()
+        self.assertGreater(cam.auto_exposure.exposure, 50)
+        self.assertEqual(cam.decodes, 0)
+
+    def test_yuyv_preview_is_the_luma_plane(self):
+        cam = self._camera("YUYV")
+        yuyv = np.empty((24, 32, 2), dtype=np.uint8)
+        yuyv[:, :, 0] = 220  # bright Y, neutral chroma
+        yuyv[:, :, 1] = 128
+
+        set_exposure = self._push(cam, yuyv.tobytes())
+
+        self.assertIsNotNone(cam.auto_exposure)
+        set_exposure.assert_called_once()
+        self.assertLess(cam.auto_exposure.exposure, 50)
+        self.assertEqual(cam.decodes, 0)
+
+    def test_corrupt_mjpeg_frame_is_skipped_not_fatal(self):
+        cam = self._camera("MJPG")
+
+        set_exposure = self._push(cam, b"not a jpeg")
+
+        self.assertIsNotNone(cam.auto_exposure)
+        set_exposure.assert_not_called()
+        self.assertEqual(cam.auto_exposure.exposure, 50)
+
+    def test_preview_after_get_is_the_processed_image(self):
+        cam = self._camera("MJPG")
+        jpeg = cv2.imencode(".jpg", np.full((24, 32, 3), 40, dtype=np.uint8))[1].tobytes()
+        self._push(cam, jpeg)
+
+        image = cam.latest_frame.get()
+
+        self.assertIs(cam.latest_frame.preview(), image)
+
+
+if __name__ == "__main__":
+    unittest.main()
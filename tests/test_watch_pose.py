@@ -1,8 +1,8 @@
-"""Integration test for scripts/watch_pose.py helpers.
+"""Integration test for the path scripts/watch_pose.py takes per episode.
 
 The polling loop itself is exercised by a smoke run (see docs/manual test
-list). Here we test the two pure helpers: reading the first N frames from
-an mp4, and measuring pose on the average — because those are where the
+list). Here we test what it relies on: sampling the first N frames of an
+mp4, and measuring pose on their average — because those are where the
 real correctness risk lives.
 """
 from __future__ import annotations
@@ -16,11 +16,16 @@ import numpy as np
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
-sys.path.insert(0, str(ROOT / "scripts"))
 
-from utils.camera_pose import evaluate_
-pose  # noqa: E402
-from watch_pose import _average, _read_first_frames  # noqa: E402
+from utils.camera_pose import evaluate_pose  # noqa: E402
+from utils.episode_watch import FrameAccumulator, sample_mean  # noqa: E402
+
+
+def _average(frames: list[np.ndarray]) -> np.ndarray:
+    acc = FrameAccumulator()
+    for frame in frames:
+        acc.add(frame)
+    return acc.mean()
 
 
 def _make_synthetic_mp4(path: Path, frame: np.ndarray, n_frames: int) -> None:
@@ -44,21 +49,20 @@ def _textured_frame() -> np.ndarray:
 
 
 class TestWatchPoseHelpers(unittest.TestCase):
-    def test_read_first_frames_returns_n(self) -> None:
+    def test_sample_mean_reads_first_n(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             path = Path(td) / "episode_000000.mp4"
             _make_synthetic_mp4(path, _textured_frame(), n_frames=35)
-            frames = _read_first_frames(path, 30)
-            self.assertIsNotNone(frames)
-            self.assertEqual(len(frames), 30)
-            self.assertEqual(frames[0].shape, (480, 640, 3))
+            mean, n = sample_mean(path, 30)
+            self.assertEqual(n, 30)
+            self.assertEqual(mean.shape, (480, 640, 3))
 
-    def test_read_first_frames_partial_file(self) -> None:
+    def test_sample_mean_partial_file_reports_short_count(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             path = Path(td) / "episode_000000.mp4"
             _make_synthetic_mp4(path, _textured_frame(), n_frames=10)
-            frames = _read_first_frames(path, 30)
-            self.assertIsNone(frames)
+            _mean, n = sample_mean(path, 30)
+            self.assertLess(n, 30)
 
     def test_average_then_evaluate_happy_path(self) -> None:
         frame = _textured_frame()
@@ -0,0 +1,138 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the robot package)
+from _fake_arm import FakeArm
+from lerobot_robot_yams import workspace_sdf
+from lerobot_robot_yams.bi_follower import BiYamsFollower, BiYamsFollowerConfig
+from lerobot_robot_yams.forward_kinematics import arm_fk_batch
+from lerobot_robot_yams.workspace_sdf import (
+    WorkspaceSDF,
+    analytic_sdf,
+    obstacle_clearance,
+)
+from utils import disk_cache
+
+EE_LENGTH = 0.15
+LINK_RADII = np.array([0.05, 0.05, 0.045, 0.04, 0.035, 0.035, 0.04])
+BOUNDS = [[-0.5, -1.0, -0.15], [0.8, 0.45, 0.9]]
+RESOLUTION = 0.02
+OBSTACLES = [
+    {"type": "box", "center": [0.35, 0.0, 0.45], "size": [0.1, 0.2, 0.1]},
+    {"type": "halfspace", "point": [0.0, 0.0, -0.08], "normal": [0.0, 0.0, 1.0]},
+]
+
+
+class TestWorkspaceSDF(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sdf = WorkspaceSDF.bake(OBSTACLES, BOUNDS, RESOLUTION)
+
+    def test_trilinear_lookup_matches_analytic_primitives(self):
+        lo, hi = np.array(BOUNDS)
+        points = np.random.default_rng(0).uniform(lo, hi, size=(20000, 3))
+        exact = np.minimum(analytic_sdf(points, OBSTACLES), 0.5)
+
+        # Trilinear interpolation of a 1-Lipschitz field is off by at most
+        # half a voxel diagonal.
+        err = np.abs(self.sdf.query(points) - exact)
+        self.assertLess(err.max(), 0.5 * np.sqrt(3) * RESOLUTION)
+
+    def test_grid_points_are_exact(self):
+        nodes = np.array([[0, 0, 0], [25, 50, 7], [42, 17, 30]])
+        points = np.array(BOUNDS[0]) + RESOLUTION * nodes
+        np.testing.assert_allclose(
+            self.sdf.query(points), np.minimum(analytic_sdf(points, OBSTACLES), 0.5), atol=1e-6
+        )
+
+    def test_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = WorkspaceSDF.load_or_bake(OBSTACLES, BOUNDS, RESOLUTION, cache_dir=Path(tmp))
+            self.assertEqual(len(list(Path(tmp).glob("*.npz"))), 1)
+            second = WorkspaceSDF.load_or_bake(OBSTACLES, BOUNDS, RESOLUTION, cache_dir=Path(tmp))
+            np.testing.assert_array_equal(first.grid, second.grid)
+
+            WorkspaceSDF.load_or_bake(OBSTACLES[:1], BOUNDS, RESOLUTION, cache_dir=Path(tmp))
+            self.assertEqual(len(list(Path(tmp).glob("*.npz"))), 2)
+
+    def test_corrupt_cache_is_rebaked(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = WorkspaceSDF.load_or_bake(OBSTACLES, BOUNDS, RESOLUTION, cache_dir=Path(tmp))
+            (path,) = Path(tmp).glob("*.npz")
+            for contents in (b"", path.read_bytes()[:100], b"not an npz"):
+                path.write_bytes(contents)
+                with self.assertLogs(disk_cache.logger, "WARNING"):
+                    sdf = WorkspaceSDF.load_or_bake(
+                        OBSTACLES, BOUNDS, RESOLUTION, cache_dir=Path(tmp)
+                    )
+                np.testing.assert_array_equal(sdf.grid, first.grid)
+            # The rebuilt cache is readable again.
+            np.testing.assert_array_equal(WorkspaceSDF._load(path).grid, first.grid)
+
+    def test_format_version_is_part_of_the_cache_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            WorkspaceSDF.load_or_bake(OBSTACLES, BOUNDS, RESOLUTION, cache_dir=Path(tmp))
+            bumped = workspace_sdf._FORMAT_VERSION + 1
+            with mock.patch.object(workspace_sdf, "_FORMAT_VERSION", bumped):
+                WorkspaceSDF.load_or_bake(OBSTACLES, BOUNDS, RESOLUTION, cache_dir=Path(tmp))
+            self.assertEqual(len(list(Path(tmp).glob("*.npz"))), 2)
+
+    def test_unknown_obstacle_type_raises(self):
+        with self.assertRaises(ValueError):
+            analytic_sdf(np.zeros(3), [{"type": "cylinder"}])
+
+    def test_arm_reaching_into_box_has_negative_clearance(self):
+        home = np.zeros(6)
+        self.assertGreater(obstacle_clearance(self.sdf, home, EE_LENGTH, LINK_RADII)[0], 0.0)
+
+        # Raise the arm until its tip passes through the box.
+        reach = np.zeros((30, 6))
+        reach[:, 1] = np.linspace(0.0, 2.5, 30)
+        reach[:, 2] = 1.5
+        tips = arm_fk_batch(reach)[0][:, -1]
+        inside = analytic_sdf(tips, OBSTACLES[:1]) < 0
+        self.assertTrue(inside.any())
+        clearance = obstacle_clearance(self.sdf, reach, EE_LENGTH, LINK_RADII)
+        self.assertTrue(np.all(clearance[inside] < 0))
+
+    def test_right_arm_is_offset_by_its_base(self):
+        # The box is in front of the left arm only.
+        into_box = np.array([0.0, 1.5, 1.5, 0.0, 0.0, 0.0])
+        left = obstacle_clearance(self.sdf, into_box, EE_LENGTH, LINK_RADII, side="left")
+        right = obstacle_clearance(self.sdf, into_box, EE_LENGTH, LINK_RADII, side="right")
+        self.assertLess(left[0], 0.0)
+        self.assertGreater(right[0], 0.0)
+
+
+class TestBiFollowerWorkspace(unittest.TestCase):
+    def test_action_into_obstacle_is_not_sent(self):
+        follower = BiYamsFollower.__new__(BiYamsFollower)
+        follower.config = BiYamsFollowerConfig(joint_limit_mode="reject")
+        follower.left_arm = FakeArm()
+        follower.right_arm = FakeArm()
+        follower._last_angles = {"left": None, "right": None}
+        follower._workspace_sdf = WorkspaceSDF.bake(OBSTACLES, BOUNDS, RESOLUTION)
+        follower.get_observation = lambda with_cameras=True: {}
+
+        def action(q_left):
+            names = follower.left_arm.config.joint_names
+            return {
+                f"{side}_{n}.pos": float(v)
+                for side, q in (("left", q_left), ("right", np.zeros(6)))
+                for n, v in zip(names, np.r_[q, 0.0])
+            }
+
+        into_box = np.array([0.0, 1.5, 1.5, 0.0, 0.0, 0.0])
+        self.assertEqual(follower.send_action(action(into_box)), {})
+        self.assertEqual(follower.left_arm.sent, [])
+
+        follower.send_action(action(np.zeros(6)))
+        self.assertEqual(len(follower.left_arm.sent), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+"""ZEDCamera against a fake SDK: preallocated Mats, pooled output frames, depth snapshots."""
+
+import enum
+import threading
+import types
+import unittest
+
+import cv2
+import numpy as np
+
+import _lerobot_stubs  # noqa: F401  (must precede the camera packages)
+from lerobot.cameras.configs import ColorMode, Cv2Rotation
+from lerobot_camera_zed.zed_camera import ZEDCamera
+from lerobot_camera_zed.zed_config import ZEDCameraConfig
+
+W, H = 32, 24
+
+
+class _FakeSdk:
+    """The parts of pyzed.sl ZEDCamera uses, backed by lists of BGRA and depth frames."""
+
+    class ERROR_CODE(enum.Enum):
+        SUCCESS = 0
+        FAILURE = 1
+
+    VIEW = types.SimpleNamespace(LEFT="left")
+    MEM = types.SimpleNamespace(CPU="cpu")
+    MAT_TYPE = types.SimpleNamespace(U8_C4="u8c4", F32_C1="f32c1")
+    MEASURE = types.SimpleNamespace(DEPTH="depth")
+    UNIT = types.SimpleNamespace(MILLIMETER="mm")
+    RESOLUTION = types.SimpleNamespace(HD2K="2k", HD1080="1080", HD720="720", VGA="vga")
+    DEPTH_MODE = types.SimpleNamespace(
+        NONE="none", PERFORMANCE="perf", QUALITY="q", ULTRA="u", NEURAL="n"
+    )
+
+    def __init__(self, frames, depths=()):
+        sdk = self
+        self.frames = list(frames)
+        self.depths = list(depths)
+        self.mats = 0
+
+        class Mat:
+            def __init__(self, width=0, height=0, mat_type=None, mem=None):
+                sdk.mats += 1
+                if mat_type == sdk.MAT_TYPE.F32_C1:
+                    self.data = np.zeros((height, width), np.float32)
+                else:
+                    self.data = np.zeros((height, width, 4), np.uint8)
+
+            def get_data(self):
+                return self.data
+
+            def free(self, mem=None):
+                self.data = None
+
+        class Camera:
+            def open(self, init_params):
+                return sdk.ERROR_CODE.SUCCESS
+
+            def grab(self, runtime_params):
+                return sdk.ERROR_CODE.SUCCESS if sdk.frames else sdk.ERROR_CODE.FAILURE
+
+            def retrieve_image(self, mat, view, mem, resolution):
+                assert (resolution.width, resolution.height) == mat.data.shape[1::-1]
+                np.copyto(mat.data, sdk.frames.pop(0))
+
+            def retrieve_measure(self, mat, measure, mem, resolution):
+                assert measure == sdk.MEASURE.DEPTH
+                np.copyto(mat.data, sdk.depths.pop(0))
+
+            def get_camera_information(self):
+                return types.SimpleNamespace(
+                    camera_configuration=types.SimpleNamespace(
+                        fps=30, resolution=types.SimpleNamespace(width=W, height=H)
+                    )
+                )
+
+            def close(self):
+                pass
+
+        self.Mat = Mat
+        self.Camera = Camera
+        self.Resolution = lambda width, height: types.SimpleNamespace(width=width, height=height)
+        self.RuntimeParameters = types.SimpleNamespace
+        self.InitParameters = lambda: types.SimpleNamespace(set_from_camera_id=lambda _id: None)
+
+
+def _bgra(value: int) -> np.ndarray:
+    frame = np.zeros((H, W, 4), np.uint8)
+    frame[..., 0] = value  # blue
+    frame[..., 2] = 255 - value  # red
+    frame[..., 3] = 255
+    return frame
+
+
+def _depth(value: float) -> np.ndarray:
+    return np.full((H, W), value, np.float32)
+
+
+def _camera(frames, depths=(), **config):
+    sdk = _FakeSdk(frames, depths)
+    cam_cls = type("FakeSdkZEDCamera", (ZEDCamera,), {"load_sdk": staticmethod(lambda: sdk)})
+    defaults = {"fps": 30, "width": W, "height": H, "rotation": Cv2Rotation.NO_ROTATION}
+    cam = cam_cls(ZEDCameraConfig(**{**defaults, **config}))
+    cam.connect(warmup=False)
+    return cam, sdk
+
+
+class TestZEDCamera(unittest.TestCase):
+    def test_frames_are_converted_into_pooled_buffers_without_new_mats(self):
+        cam, sdk = _camera([_bgra(v) for v in (10, 20, 30, 40)])
+
+        first = cam.read()
+        np.testing.assert_array_equal(first, cv2.cvtColor(_bgra(10), cv2.COLOR_BGRA2RGB))
+        frames = [first] + [cam.read() for _ in range(3)]
+
+        self.assertEqual(sdk.mats, 1)
+        self.assertTrue(all(any(f is buf for buf in cam._frames.buffers) for f in frames))
+        # Frames still held by the caller were not overwritten by later grabs.
+        self.assertEqual([int(f[0, 0, 2]) for f in frames], [10, 20, 30, 40])
+
+    def test_rotation_and_bgr_mode(self):
+        # width/height are the rotated output size; the sensor still delivers W x H.
+        cam, _ = _camera(
+            [_bgra(50)], width=H, height=W, rotation=Cv2Rotation.ROTATE_90, color_mode=ColorMode.BGR
+        )
+        frame = cam.read()
+        expected = cv2.rotate(cv2.cvtColor(_bgra(50), cv2.COLOR_BGRA2BGR), cv2.ROTATE_90_CLOCKWISE)
+        np.testing.assert_array_equal(frame, expected)
+        self.assertEqual(frame.shape, (W, H, 3))
+
+    def test_output_spec_reads_from_scratch_buffers(self):
+        cam, _ = _camera([_bgra(60), _bgra(70)], output_size=(8, 6))
+        frames = [cam.read(), cam.read()]
+        self.assertEqual(frames[0].shape, (6, 8, 3))
+        self.assertEqual(cam._frames.buffers, [])
+        self.assertEqual([int(f[0, 0, 2]) for f in frames], [60, 70])
+
+    def test_read_loop_publishes_timestamp_and_sequence(self):
+        cam, sdk = _camera([_bgra(v) for v in (1, 2, 3)])
+        cam.stop_event = threading.Event()
+
+        def grab(runtime_params):
+            if not sdk.frames:
+                cam.stop_event.set()
+                return sdk.ERROR_CODE.FAILURE
+            return sdk.ERROR_CODE.SUCCESS
+
+        cam.zed.grab = grab
+        cam._read_loop()
+
+        self.assertEqual(cam.latest_seq, 3)
+        self.assertIsNotNone(cam.latest_timestamp)
+        self.assertEqual(int(cam.latest_frame[0, 0, 2]), 3)
+
+
+class TestZEDDepth(unittest.TestCase):
+    def test_depth_is_uint16_mm_with_invalid_as_zero(self):
+        depth = _depth(512.4)
+        depth[0, :5] = [np.nan, np.inf, -np.inf, 70000.0, -3.0]
+        cam, sdk = _camera([_bgra(1), _bgra(2)], [depth, _depth(800)], use_depth=True)
+
+        _, first, _ = cam._capture()
+        _, second, _ = cam._capture()
+
+        self.assertEqual(first.dtype, np.uint16)
+        self.assertEqual(first[0, :6].tolist(), [0, 0, 0, 0, 0, 512])
+        self.assertEqual(int(second[0, 0]), 800)
+        self.assertEqual(sdk.mats, 2)
+        self.assertTrue(cam.runtime_params.enable_depth)
+
+    def test_depth_follows_rotation_and_output_spec(self):
+        depth = _depth(100)
+        depth[0, 0] = 900
+        cam, _ = _camera(
+            [_bgra(1)], [depth], width=H, height=W, rotation=Cv2Rotation.ROTATE_90,
+            use_depth=True,
+        )
+        _, rotated, _ = cam._capture()
+        np.testing.assert_array_equal(
+            rotated, cv2.rotate(depth.astype(np.uint16), cv2.ROTATE_90_CLOCKWISE)
+        )
+
+        cam, _ = _camera([_bgra(1)], [_depth(100)], output_size=(8, 6), use_depth=True)
+        frame, small, _ = cam._capture()
+        self.assertEqual(small.shape, (6, 8))
+        self.assertEqual(frame.shape, (6, 8, 3))
+
+    def test_async_read_snapshots_the_depth_of_the_same_grab(self):
+        cam, sdk = _camera(
+            [_bgra(v) for v in (1, 2)], [_depth(v) for v in (1001, 1002)], use_depth=True
+        )
+        cam.thread = types.SimpleNamespace(is_alive=lambda: True)
+        cam.stop_event = threading.Event()
+
+        def grab(runtime_params):
+            if not sdk.frames:
+                cam.stop_event.set()
+                return sdk.ERROR_CODE.FAILURE
+            return sdk.ERROR_CODE.SUCCESS
+
+        cam.zed.grab = grab
+        cam._read_loop()
+
+        frame = cam.async_read()
+        depth = cam.pop_depth_snapshot()
+        self.assertEqual(int(frame[0, 0, 2]), 2)
+        self.assertEqual(int(depth[0, 0]), 1002)
+        self.assertIsNone(cam.pop_depth_snapshot())
+
+    def test_depth_off_skips_depth_computation(self):
+        cam, sdk = _camera([_bgra(1)])
+        self.assertFalse(cam.runtime_params.enable_depth)
+        self.assertIsNone(cam._capture()[1])
+        self.assertEqual(sdk.mats, 1)
+        self.assertIsNone(cam.pop_depth_snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()